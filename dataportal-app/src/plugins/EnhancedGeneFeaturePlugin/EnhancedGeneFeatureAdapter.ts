@@ -63,7 +63,10 @@ export default class EnhancedGeneFeatureAdapter extends BaseFeatureDataAdapter {
             
             // Add essentiality data for feature coloring if this is a type strain
             if (this.isTypeStrain && this.includeEssentiality) {
-                const essentialityData = await GeneService.fetchEssentialityData(this.apiUrl, region.refName);
+                // JBrowse regions are 0-based half-open; the API takes 1-based inclusive coordinates
+                const essentialityData = await GeneService.fetchEssentialityData(
+                    this.apiUrl, region.refName, region.start + 1, region.end
+                );
                 return FeatureProcessor.mergeAnnotationsWithEssentiality(flattenedFeatures, essentialityData);
             }
             
@@ -152,11 +152,16 @@ export class GeneService extends BaseService {
         }
     }
 
-    @cacheResponse(60 * 60 * 1000, (apiUrl: string, refName: string) => `${apiUrl}:${refName}`) // Cache for 60 minutes, uses combined key
-    static async fetchEssentialityData(apiUrl: string, refName: string): Promise<Record<string, any>> {
+    @cacheResponse(
+        60 * 60 * 1000,
+        (apiUrl: string, refName: string, start?: number, end?: number) => `${apiUrl}:${refName}:${start ?? ''}-${end ?? ''}`
+    ) // Cache for 60 minutes, uses combined key
+    static async fetchEssentialityData(apiUrl: string, refName: string, start?: number, end?: number): Promise<Record<string, any>> {
         try {
-            // console.log(`Fetching essentiality data from: ${apiUrl}/${refName}`);
-            const response = await fetch(`${apiUrl}/${refName}`);
+            // start/end are 1-based and inclusive; without them the whole contig is returned
+            const region = start !== undefined && end !== undefined ? `?start=${start}&end=${end}` : '';
+            // console.log(`Fetching essentiality data from: ${apiUrl}/${refName}${region}`);
+            const response = await fetch(`${apiUrl}/${refName}${region}`);
             if (!response.ok) {
                 console.warn(`Failed to fetch essentiality data for ${refName}: ${response.status} ${response.statusText}`);
                 return {};
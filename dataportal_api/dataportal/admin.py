@@ -11,6 +11,7 @@ from django.utils import timezone
 from django import forms
 from dataportal.models import APIToken, Role
 from dataportal.authentication import generate_jwt_token, APIRoles, RolePresets
+from dataportal.authentication.token_cache import token_cache
 
 
 @admin.register(Role)
@@ -127,9 +128,9 @@ class APITokenAdmin(admin.ModelAdmin):
     - Activate/deactivate tokens
     - Set expiration dates
     """
-    
+
     form = APITokenForm
-    
+
     list_display = [
         "name",
         "status_badge",
@@ -139,34 +140,34 @@ class APITokenAdmin(admin.ModelAdmin):
         "last_used_at",
         "created_by",
     ]
-    
+
     list_filter = [
         "is_active",
         "created_at",
         "expires_at",
     ]
-    
+
     search_fields = [
         "name",
         "description",
         "created_by",
     ]
-    
+
     readonly_fields = [
         "token_display",
         "created_at",
         "last_used_at",
         "token_info",
     ]
-    
+
     actions = ["activate_tokens", "deactivate_tokens", "generate_new_token"]
-    
+
     def roles_display(self, obj):
         """Display roles as badges."""
         roles = obj.roles.filter(is_active=True)
         if not roles.exists():
             return format_html('<span style="color: #999;">No roles assigned</span>')
-        
+
         badges = []
         for role in roles:
             # Color-code roles by category
@@ -178,16 +179,16 @@ class APITokenAdmin(admin.ModelAdmin):
                 'custom': '#6c757d',  # Gray for custom
             }
             color = color_map.get(role.category, '#6c757d')
-            
+
             badges.append(
                 f'<span style="background-color: {color}; color: white; padding: 2px 8px; '
                 f'border-radius: 3px; margin: 2px; display: inline-block; font-size: 11px;" '
                 f'title="{role.description}">{role.name}</span>'
             )
-        
+
         return format_html(' '.join(badges))
     roles_display.short_description = "Roles"
-    
+
     def get_fieldsets(self, request, obj=None):
         """
         Customize fieldsets based on whether we're adding or editing.
@@ -235,7 +236,7 @@ class APITokenAdmin(admin.ModelAdmin):
                     "description": "Set token status and optional expiration date.",
                 }),
             )
-    
+
     def status_badge(self, obj):
         """Display a colored badge for token status."""
         if not obj.is_active:
@@ -254,7 +255,7 @@ class APITokenAdmin(admin.ModelAdmin):
                 'border-radius: 3px;">Active</span>'
             )
     status_badge.short_description = "Status"
-    
+
     def token_display(self, obj):
         """Display the token in a copyable format."""
         if obj.token:
@@ -263,7 +264,7 @@ class APITokenAdmin(admin.ModelAdmin):
                 display_token = f"{obj.token[:20]}...{obj.token[-20:]}"
             else:
                 display_token = obj.token
-            
+
             return format_html(
                 '<div style="font-family: monospace; background-color: #f5f5f5; '
                 'padding: 10px; border-radius: 4px; word-break: break-all;">{}</div>'
@@ -275,34 +276,34 @@ class APITokenAdmin(admin.ModelAdmin):
             )
         return "-"
     token_display.short_description = "Token (Copy from textarea below)"
-    
+
     def token_info(self, obj):
         """Display decoded token information."""
         if not obj.token:
             return "-"
-        
+
         from dataportal.authentication import get_token_info
         info = get_token_info(obj.token)
-        
+
         if not info:
             return format_html(
                 '<span style="color: red;">Invalid token format</span>'
             )
-        
+
         html = '<table style="border-collapse: collapse;">'
         for key, value in info.items():
             # Format timestamps
             if key in ["iat", "exp"] and isinstance(value, (int, float)):
                 dt = timezone.datetime.fromtimestamp(value, tz=timezone.utc)
                 value = f"{dt.strftime('%Y-%m-%d %H:%M:%S UTC')} ({value})"
-            
+
             html += f'<tr><td style="padding: 5px; font-weight: bold;">{key}:</td>' \
                    f'<td style="padding: 5px; font-family: monospace;">{value}</td></tr>'
         html += '</table>'
-        
+
         return format_html(html)
     token_info.short_description = "Decoded Token Info (unverified)"
-    
+
     def save_model(self, request, obj, form, change):
         """
         Override save to auto-generate token if not provided and handle role presets.
@@ -311,13 +312,13 @@ class APITokenAdmin(admin.ModelAdmin):
         # Set created_by if not set
         if not obj.created_by and request.user.is_authenticated:
             obj.created_by = request.user.username
-        
+
         # Save the basic model first
         super().save_model(request, obj, form, change)
-        
+
         # Store flag for later use in save_related
         self._token_was_generated = False
-    
+
     def save_related(self, request, form, formsets, change):
         """
         Override to handle M2M relationships and regenerate token with roles.
@@ -325,9 +326,9 @@ class APITokenAdmin(admin.ModelAdmin):
         """
         # Save M2M relationships first (this saves the roles)
         super().save_related(request, form, formsets, change)
-        
+
         obj = form.instance
-        
+
         # Handle role preset selection (after super().save_related())
         role_preset = form.cleaned_data.get('role_preset')
         if role_preset:
@@ -343,18 +344,18 @@ class APITokenAdmin(admin.ModelAdmin):
                 # Get Role objects by code
                 roles_to_assign = Role.objects.filter(code__in=role_codes, is_active=True)
                 obj.roles.set(roles_to_assign)
-        
+
         # Get current role codes (after M2M save)
         role_codes = obj.get_role_codes()
-        
+
         # Check if we need to generate or regenerate token
         should_regenerate = False
-        
+
         # If no token exists, generate one
         if not obj.token or obj.token == "temporary":
             should_regenerate = True
             self._token_was_generated = True
-        
+
         # If roles changed, regenerate token
         elif change:
             # This is an edit - check if roles changed
@@ -362,7 +363,7 @@ class APITokenAdmin(admin.ModelAdmin):
             # Alternative: always regenerate on save with roles
             if role_codes:
                 should_regenerate = True
-        
+
         # Generate/regenerate token with roles
         if should_regenerate:
             obj.token = generate_jwt_token(
@@ -373,7 +374,7 @@ class APITokenAdmin(admin.ModelAdmin):
                 created_by=obj.created_by
             )
             obj.save(update_fields=['token'])
-            
+
             if self._token_was_generated:
                 # New token created
                 roles_str = ', '.join(role_codes) if role_codes else 'No roles'
@@ -392,25 +393,29 @@ class APITokenAdmin(admin.ModelAdmin):
                     f"Old token is now invalid!",
                     level='warning'
                 )
-    
+
     def activate_tokens(self, request, queryset):
         """Admin action to activate selected tokens."""
         updated = queryset.update(is_active=True)
+        # queryset.update() bypasses model signals
+        token_cache.clear()
         self.message_user(
             request,
             f"{updated} token(s) activated successfully."
         )
     activate_tokens.short_description = "Activate selected tokens"
-    
+
     def deactivate_tokens(self, request, queryset):
         """Admin action to deactivate selected tokens."""
         updated = queryset.update(is_active=False)
+        # queryset.update() bypasses model signals
+        token_cache.clear()
         self.message_user(
             request,
             f"{updated} token(s) deactivated successfully."
         )
     deactivate_tokens.short_description = "Deactivate selected tokens"
-    
+
     def generate_new_token(self, request, queryset):
         """Admin action to regenerate tokens for selected entries."""
         count = 0
@@ -422,14 +427,14 @@ class APITokenAdmin(admin.ModelAdmin):
             )
             token_obj.save()
             count += 1
-        
+
         self.message_user(
             request,
             f"{count} token(s) regenerated successfully. "
             "Note: Old tokens are now invalid!"
         )
     generate_new_token.short_description = "Regenerate tokens (WARNING: Invalidates old tokens)"
-    
+
     class Media:
         css = {
             'all': ('admin/css/forms.css',)
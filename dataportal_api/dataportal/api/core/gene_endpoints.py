@@ -16,25 +16,6 @@ from dataportal.schema.response_schemas import (
     create_success_response,
 )
 from dataportal.services.service_factory import ServiceFactory
-from dataportal.utils.constants import (
-    GENE_FIELD_PFAM,
-    GENE_FIELD_INTERPRO,
-    GENE_FIELD_COG_ID,
-    GENE_FIELD_COG_FUNCATS,
-    GENE_FIELD_KEGG,
-    GENOME_FIELD_ISOLATE_NAME,
-    GENE_FIELD_NAME,
-    GENE_FIELD_ALIAS,
-    GENOME_CONTIG_FIELD_SEQ_ID,
-    GENE_FIELD_LOCUS_TAG,
-    GENE_FIELD_PRODUCT,
-    GENE_FIELD_UNIPROT_ID,
-    GENE_FIELD_ESSENTIALITY,
-    GENE_FIELD_AMR,
-    GENE_FIELD_AMR_DRUG_CLASS,
-    GENE_FIELD_AMR_DRUG_SUBCLASS,
-    GENE_FIELD_FEATURE_TYPE,
-)
 from dataportal.utils.errors import (
     raise_not_found_error,
     raise_internal_server_error,
@@ -44,6 +25,7 @@ from dataportal.utils.exceptions import (
     GeneNotFoundError,
     ServiceError,
     InvalidGenomeIdError,
+    ValidationError,
 )
 from dataportal.utils.response_wrappers import wrap_success_response, wrap_paginated_response
 
@@ -82,6 +64,8 @@ async def search_genes_by_string(request, query: GeneSearchQuerySchema = Query(.
     try:
         result = await gene_service.search_genes(query)
         return result
+    except ValidationError as e:
+        raise_validation_error(str(e))
     except ServiceError as e:
         logger.error(f"Service error in gene search: {e}")
         raise_internal_server_error(f"Failed to search genes: {str(e)}")
@@ -232,102 +216,35 @@ async def download_genes_tsv(request, query: GeneDownloadTSVQuerySchema = Query(
         )
 
         # Use streaming response for large datasets
+        from django.core.handlers.asgi import ASGIRequest
         from django.http import StreamingHttpResponse
 
-        def generate_tsv():
-            # Define the columns to include in the TSV export
-            columns = [
-                GENOME_FIELD_ISOLATE_NAME,
-                GENE_FIELD_NAME,
-                GENE_FIELD_ALIAS,
-                GENOME_CONTIG_FIELD_SEQ_ID,
-                GENE_FIELD_LOCUS_TAG,
-                GENE_FIELD_PRODUCT,
-                GENE_FIELD_UNIPROT_ID,
-                GENE_FIELD_ESSENTIALITY,
-                GENE_FIELD_PFAM,
-                GENE_FIELD_INTERPRO,
-                GENE_FIELD_KEGG,
-                GENE_FIELD_COG_FUNCATS,
-                GENE_FIELD_COG_ID,
-                GENE_FIELD_AMR,
-                GENE_FIELD_FEATURE_TYPE,
-            ]
-
-            # Yield header row
-            yield "\t".join(columns) + "\n"
-
-            # Stream genes directly from the service
-            import asyncio
-
-            async def stream_genes():
-                async for gene in gene_service.stream_genes_with_scroll(
-                    isolates=query.isolates,
-                    species_acronym=query.species_acronym,
-                    query=query.query,
-                    filter=query.filter,
-                    filter_operators=query.filter_operators,
-                    sort_field=query.sort_field,
-                    sort_order=query.sort_order,
-                ):
-                    row_data = []
-                    for col in columns:
-                        value = getattr(gene, col, "")
-
-                        # Handle special cases
-                        if col == GENE_FIELD_ALIAS and value:
-                            value = "; ".join(value) if isinstance(value, list) else str(value)
-                        elif col == GENE_FIELD_PFAM and value:
-                            value = "; ".join(value) if isinstance(value, list) else str(value)
-                        elif col == GENE_FIELD_INTERPRO and value:
-                            value = "; ".join(value) if isinstance(value, list) else str(value)
-                        elif col == GENE_FIELD_KEGG and value:
-                            value = "; ".join(value) if isinstance(value, list) else str(value)
-                        elif col == GENE_FIELD_COG_ID and value:
-                            value = "; ".join(value) if isinstance(value, list) else str(value)
-                        elif col == GENE_FIELD_AMR and value:
-                            # Format AMR data
-                            amr_parts = []
-                            for amr_item in value:
-                                # Handle both dictionary and Pydantic model cases
-                                if (
-                                    hasattr(amr_item, GENE_FIELD_AMR_DRUG_CLASS)
-                                    and amr_item.drug_class
-                                ):
-                                    drug_class = amr_item.drug_class
-                                    drug_subclass = getattr(
-                                        amr_item, GENE_FIELD_AMR_DRUG_SUBCLASS, ""
-                                    )
-                                    amr_parts.append(f"{drug_class}({drug_subclass})")
-                                elif isinstance(amr_item, dict) and amr_item.get(
-                                    GENE_FIELD_AMR_DRUG_CLASS
-                                ):
-                                    drug_class = amr_item[GENE_FIELD_AMR_DRUG_CLASS]
-                                    drug_subclass = amr_item.get(GENE_FIELD_AMR_DRUG_SUBCLASS, "")
-                                    amr_parts.append(f"{drug_class}({drug_subclass})")
-                            value = "; ".join(amr_parts) if amr_parts else ""
-                        else:
-                            value = str(value) if value is not None else ""
+        columns = gene_service.TSV_EXPORT_COLUMNS
+        header = "\t".join(columns) + "\n"
+        es_query, sort = await gene_service.export_search(
+            isolates=query.isolates,
+            species_acronym=query.species_acronym,
+            query=query.query,
+            filter=query.filter,
+            filter_operators=query.filter_operators,
+            sort_field=query.sort_field,
+            sort_order=query.sort_order,
+        )
 
-                        # Escape tabs and newlines in the value
-                        value = value.replace("\t", " ").replace("\n", " ").replace("\r", " ")
-                        row_data.append(value)
+        # One buffered chunk per PIT batch, formatted straight from `_source`
+        if isinstance(request, ASGIRequest):
 
-                    yield "\t".join(row_data) + "\n"
+            async def generate_tsv():
+                yield header
+                async for batch in gene_service.stream_gene_sources(es_query, sort, source=columns):
+                    yield "".join(gene_service.format_tsv_row(source) for source in batch)
 
-            # Run the async generator in a new event loop
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                async_gen = stream_genes()
-                while True:
-                    try:
-                        result = loop.run_until_complete(async_gen.__anext__())
-                        yield result
-                    except StopAsyncIteration:
-                        break
-            finally:
-                loop.close()
+        else:
+            # WSGI (gunicorn) reads an async iterator into memory before sending it
+            def generate_tsv():
+                yield header
+                for batch in gene_service.iter_gene_sources(es_query, sort, source=columns):
+                    yield "".join(gene_service.format_tsv_row(source) for source in batch)
 
         # Return streaming response
         response = StreamingHttpResponse(generate_tsv(), content_type="text/tab-separated-values")
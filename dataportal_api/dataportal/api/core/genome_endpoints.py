@@ -1,4 +1,5 @@
 import logging
+from typing import Optional
 
 from ninja import Router, Query, Path
 
@@ -11,6 +12,7 @@ from dataportal.schema.core.genome_schemas import (
     GenomeDownloadTSVQuerySchema,
 )
 from dataportal.schema.response_schemas import (
+    ErrorCode,
     GenomePaginatedResponseSchema,
     GenePaginatedResponseSchema,
     SuccessResponseSchema,
@@ -25,10 +27,17 @@ from dataportal.utils.constants import (
     GENOME_FIELD_ISOLATE_NAME,
     SCROLL_MAX_RESULTS,
 )
-from dataportal.utils.errors import raise_http_error, raise_internal_server_error
+from dataportal.utils.errors import (
+    raise_http_error,
+    raise_internal_server_error,
+    raise_not_found_error,
+    raise_validation_error,
+)
 from dataportal.utils.exceptions import (
     ServiceError,
+    ValidationError,
 )
+from dataportal.utils.utils import split_comma_param
 from dataportal.utils.response_wrappers import wrap_paginated_response, wrap_success_response
 
 logger = logging.getLogger(__name__)
@@ -92,6 +101,8 @@ async def search_genomes_by_string(request, query: GenomeSearchQuerySchema = Que
     try:
         result = await genome_service.search_genomes_by_string(query)
         return result
+    except ValidationError as e:
+        raise_validation_error(str(e))
     except ServiceError as e:
         logger.error(f"Service error in genome search: {e}")
         raise_internal_server_error(f"Failed to search genomes: {str(e)}")
@@ -133,6 +144,8 @@ async def get_all_genomes(request, query: GetAllGenomesQuerySchema = Query(...))
     try:
         result = await genome_service.get_genomes(query)
         return result
+    except ValidationError as e:
+        raise_validation_error(str(e))
     except ServiceError as e:
         logger.error(f"Service error in get all genomes: {e}")
         raise_internal_server_error("Failed to fetch genomes")
@@ -171,6 +184,7 @@ async def get_genes_by_genome(
             query.per_page,
             query.sort_field,
             query.sort_order,
+            query.cursor,
         )
         return result
     except ServiceError as e:
@@ -187,7 +201,8 @@ async def get_genes_by_genome(
     summary="Get essentiality data by genome and contig",
     description=(
         "Retrieves cached essentiality data for a given genome isolate and reference name (e.g. contig_1). "
-        "Returns gene essentiality information grouped by contig. "
+        "Returns gene essentiality information grouped by contig, restricted to the genes overlapping "
+        "start-end (1-based, inclusive) when given. "
         "This data is typically precomputed and used to visualize gene essentiality in genome browsers or analysis tools."
     ),
 )
@@ -204,10 +219,16 @@ async def get_essentiality_data_by_contig(
         description="Reference sequence (e.g. contig_1) name to retrieve essentiality data for.",
         example="contig_1",
     ),
+    start: Optional[int] = Query(
+        None, ge=1, description="Region start (1-based); whole contig when omitted."
+    ),
+    end: Optional[int] = Query(
+        None, ge=1, description="Region end (inclusive); whole contig when omitted."
+    ),
 ):
     try:
         essentiality_data = await essentiality_service.get_essentiality_data_by_strain_and_ref(
-            isolate_name, ref_name
+            isolate_name, ref_name, start, end
         )
         if not essentiality_data:
             return create_success_response(
@@ -228,6 +249,71 @@ async def get_essentiality_data_by_contig(
         )
 
 
+@genome_router.get(
+    "/{isolate_name}/features/{ref_name}",
+    response=SuccessResponseSchema,
+    summary="Get genome browser features by genome and region",
+    description=(
+        "Returns the features overlapping start-end (1-based, inclusive) of a contig, read from the "
+        "feature index so portal annotations (has_essentiality, has_fitness, has_proteomics, "
+        "has_mutant_growth, has_reactions, has_amr_info, essentiality) are always current. "
+        "With bin_size, or when the window holds too many features, per-bin feature and flag "
+        "counts are returned instead, for low zoom levels."
+    ),
+)
+@wrap_success_response
+async def get_features_by_region(
+    request,
+    isolate_name: str = Path(
+        ..., description="Isolate name identifying the genome.", example="BU_ATCC8492"
+    ),
+    ref_name: str = Path(..., description="Reference sequence (contig) name.", example="contig_1"),
+    start: Optional[int] = Query(
+        None, ge=1, description="Region start (1-based); contig start when omitted."
+    ),
+    end: Optional[int] = Query(
+        None, ge=1, description="Region end (inclusive); contig end when omitted."
+    ),
+    bin_size: Optional[int] = Query(
+        None,
+        ge=1,
+        description="Return density per bin of this many bases (raised so at most 2000 bins are returned).",
+    ),
+    feature_types: Optional[str] = Query(
+        None, description="Comma-separated feature types, e.g. gene,IG."
+    ),
+):
+    try:
+        track = await gene_service.get_feature_track(
+            isolate_name,
+            ref_name,
+            start=start,
+            end=end,
+            bin_size=bin_size,
+            feature_types=split_comma_param(feature_types) if feature_types else None,
+        )
+    except ValidationError as e:
+        raise_validation_error(str(e))
+    except ServiceError as e:
+        logger.error(f"Error retrieving features for {isolate_name}/{ref_name}: {e}")
+        raise_internal_server_error(
+            f"Failed to retrieve features for {isolate_name} and refName {ref_name}."
+        )
+
+    if track is None:
+        raise_not_found_error(
+            f"No features found for genome {isolate_name} and contig {ref_name}",
+            error_code=ErrorCode.GENOME_NOT_FOUND,
+        )
+    shown = (
+        f"{len(track['bins'])} bins" if track["bin_size"] else f"{len(track['features'])} features"
+    )
+    return create_success_response(
+        data=track,
+        message=f"{shown} for {isolate_name}/{track['seq_id']}:{track['start']}-{track['end']}",
+    )
+
+
 @genome_router.get(
     "/download/tsv",
     summary="Download all genomes in TSV format",
@@ -258,7 +344,7 @@ async def download_genomes_tsv(request, query: GenomeDownloadTSVQuerySchema = Qu
         # Get all records without pagination using the existing service method
         data_response = await genome_service.search_genomes_by_string(
             params=search_params,
-            use_scroll=True,  # Use scroll API for large downloads
+            use_scroll=True,  # Walk a point-in-time for large downloads
         )
 
         # Use streaming response for large datasets
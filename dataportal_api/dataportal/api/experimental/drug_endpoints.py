@@ -4,6 +4,7 @@ Drug-specific API endpoints for MIC and metabolism data.
 
 import logging
 
+from django.conf import settings
 from ninja import Router, Query, Path
 
 from dataportal.api.core import genome_router
@@ -15,8 +16,6 @@ from dataportal.schema.experimental.drug_schemas import (
     PaginatedStrainDrugMICResponseSchema,
     PaginatedStrainDrugMetabolismResponseSchema,
     StrainDrugDataResponseSchema,
-    DrugMICPaginationSchema,
-    DrugMetabolismPaginationSchema,
 )
 from dataportal.schema.response_schemas import (
     PaginatedResponseSchema,
@@ -32,6 +31,8 @@ from dataportal.utils.response_wrappers import wrap_paginated_response, wrap_suc
 logger = logging.getLogger(__name__)
 
 drug_service = DrugService()
+if getattr(settings, "DRUG_MATRIX_PRELOAD", False):
+    drug_service.matrices.preload()
 
 ROUTER_DRUG = "Drugs"
 drug_router = Router(tags=[ROUTER_DRUG])
@@ -184,22 +185,9 @@ async def get_drug_mic_by_drug(
 ):
     """Get paginated MIC data for a specific drug."""
     try:
-        # Get all MIC records for this drug, then paginate at the record level
-        all_results = await drug_service.get_drug_mic_by_drug(drug_name, species_acronym)
-
-        total_results = len(all_results)
-        total_pages = (total_results + per_page - 1) // per_page if total_results > 0 else 1
-        start_index = (page - 1) * per_page
-        end_index = start_index + per_page
-        page_results = all_results[start_index:end_index]
-
-        return DrugMICPaginationSchema(
-            results=page_results,
-            page_number=page,
-            num_pages=total_pages,
-            has_previous=page > 1,
-            has_next=page < total_pages,
-            total_results=total_results,
+        # Paginated at the record level from the in-memory strain x drug matrix
+        return await drug_service.get_drug_mic_by_drug_paginated(
+            drug_name, species_acronym, page, per_page
         )
     except ServiceError as e:
         logger.error(f"Service error getting MIC data for drug {drug_name}: {e}")
@@ -295,22 +283,9 @@ async def get_drug_metabolism_by_drug(
 ):
     """Get paginated metabolism data for a specific drug."""
     try:
-        # Get all metabolism records for this drug, then paginate at the record level
-        all_results = await drug_service.get_drug_metabolism_by_drug(drug_name, species_acronym)
-
-        total_results = len(all_results)
-        total_pages = (total_results + per_page - 1) // per_page if total_results > 0 else 1
-        start_index = (page - 1) * per_page
-        end_index = start_index + per_page
-        page_results = all_results[start_index:end_index]
-
-        return DrugMetabolismPaginationSchema(
-            results=page_results,
-            page_number=page,
-            num_pages=total_pages,
-            has_previous=page > 1,
-            has_next=page < total_pages,
-            total_results=total_results,
+        # Paginated at the record level from the in-memory strain x drug matrix
+        return await drug_service.get_drug_metabolism_by_drug_paginated(
+            drug_name, species_acronym, page, per_page
         )
     except ServiceError as e:
         logger.error(f"Service error getting metabolism data for drug {drug_name}: {e}")
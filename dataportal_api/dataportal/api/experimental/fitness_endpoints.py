@@ -1,10 +1,14 @@
 import logging
 
+from django.http import HttpResponse
 from ninja import Router, Query, Path
 
 from dataportal.api.core.gene_endpoints import gene_router
 from dataportal.authentication import APIRoles, RoleBasedJWTAuth
-from dataportal.schema.experimental.fitness_schemas import FitnessSearchQuerySchema
+from dataportal.schema.experimental.fitness_schemas import (
+    FitnessMatrixQuerySchema,
+    FitnessSearchQuerySchema,
+)
 from dataportal.schema.response_schemas import SuccessResponseSchema, create_success_response
 from dataportal.services.experimental.fitness_data_service import FitnessDataService
 from dataportal.utils.errors import (
@@ -12,7 +16,12 @@ from dataportal.utils.errors import (
     raise_internal_server_error,
     raise_validation_error,
 )
-from dataportal.utils.exceptions import GeneNotFoundError, ServiceError
+from dataportal.utils.exceptions import (
+    GeneNotFoundError,
+    GenomeNotFoundError,
+    ServiceError,
+    ValidationError,
+)
 from dataportal.utils.response_wrappers import wrap_success_response
 from dataportal.utils.utils import split_comma_param
 
@@ -110,3 +119,51 @@ async def search_fitness(
     except ServiceError as e:
         logger.error(f"Service error in fitness search: {e}")
         raise_internal_server_error(f"Failed to search fitness data: {str(e)}")
+
+
+@fitness_router.get(
+    "/matrix",
+    response=SuccessResponseSchema,
+    summary="Gene x contrast fitness matrix",
+    description=(
+        "Returns LFC (and optionally FDR / barcode count) values for any subset of genes and "
+        "contrasts of one isolate, read from the precomputed fitness matrices. Genes and/or "
+        "contrasts can be reordered by hierarchical clustering for heatmaps. "
+        "format=npz returns a compressed NumPy archive instead of JSON."
+    ),
+    auth=RoleBasedJWTAuth(required_roles=[APIRoles.FITNESS]),
+)
+@wrap_success_response
+async def get_fitness_matrix(
+    request,
+    query: FitnessMatrixQuerySchema = Query(...),
+):
+    """Slice the fitness matrices of one isolate."""
+    try:
+        matrix, sliced = await fitness_service.get_matrix(
+            isolate=query.isolate,
+            identifiers=split_comma_param(query.locus_tags) if query.locus_tags else None,
+            contrasts=split_comma_param(query.contrasts) if query.contrasts else None,
+            values=tuple(split_comma_param(query.values)) or ("lfc",),
+            cluster=query.cluster,
+        )
+        if query.format == "npz":
+            response = HttpResponse(
+                fitness_service.matrix_to_npz(matrix, sliced),
+                content_type="application/octet-stream",
+            )
+            response["Content-Disposition"] = f'attachment; filename="{matrix.isolate}_fitness.npz"'
+            return response
+
+        data = fitness_service.matrix_to_schema(matrix, sliced)
+        return create_success_response(
+            data=data,
+            message=f"Fitness matrix: {len(data.genes)} genes x {len(data.contrasts)} contrasts",
+        )
+    except ValidationError as e:
+        raise_validation_error(str(e))
+    except GenomeNotFoundError as e:
+        raise_not_found_error(str(e), error_code="GENOME_NOT_FOUND")
+    except ServiceError as e:
+        logger.error(f"Service error reading fitness matrix: {e}")
+        raise_internal_server_error(f"Failed to read fitness matrix: {str(e)}")
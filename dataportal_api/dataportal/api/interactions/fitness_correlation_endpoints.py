@@ -6,7 +6,7 @@ correlations, finding correlated genes, and analyzing correlation networks.
 """
 
 import logging
-from typing import Optional
+from typing import Literal, Optional
 from ninja import Router, Query
 from ninja.errors import HttpError
 
@@ -21,8 +21,15 @@ from dataportal.schema.response_schemas import (
 from dataportal.utils.errors import (
     raise_not_found_error,
     raise_internal_server_error,
+    raise_validation_error,
 )
-from dataportal.utils.exceptions import ServiceError
+from dataportal.utils.exceptions import (
+    GeneNotFoundError,
+    GenomeNotFoundError,
+    ServiceError,
+    ValidationError,
+)
+from dataportal.utils.utils import split_comma_param
 from dataportal.utils.response_wrappers import wrap_success_response, wrap_paginated_response
 
 logger = logging.getLogger(__name__)
@@ -113,6 +120,70 @@ async def get_gene_pair_correlation(
         raise_internal_server_error("Internal server error")
 
 
+@fitness_correlation_router.get(
+    "/cofitness",
+    summary="Compute co-fitness partners",
+    description=(
+        "Correlates the fitness (LFC) profile of one or more genes with every gene of the isolate, "
+        "computed on demand from the fitness matrices instead of the precomputed pairs. Restrict "
+        "the contrasts and require a minimum barcode count per cell to get co-fitness for any "
+        "condition subset."
+    ),
+    auth=RoleBasedJWTAuth(required_roles=[APIRoles.FITNESS_CORRELATION]),
+)
+@wrap_success_response
+async def get_cofitness(
+    request,
+    locus_tags: str = Query(
+        ..., description="Comma-separated locus tags or UniProt ids of the query genes"
+    ),
+    isolate_name: Optional[str] = Query(
+        None, description="Isolate; derived from the locus tags when omitted"
+    ),
+    contrasts: Optional[str] = Query(
+        None, description="Comma-separated contrasts to correlate over (default: all)"
+    ),
+    method: Literal["pearson", "spearman"] = Query("pearson"),
+    min_barcodes: Optional[int] = Query(None, ge=0, description="Ignore cells with fewer barcodes"),
+    min_conditions: int = Query(3, ge=2, description="Minimum number of shared contrasts per pair"),
+    min_correlation: Optional[float] = Query(
+        None, description="Minimum absolute correlation value"
+    ),
+    max_results: int = Query(
+        100, ge=1, le=1000, description="Maximum number of partners per query gene"
+    ),
+):
+    """Compute co-fitness partners of genes from the fitness matrices."""
+    try:
+        result = await fitness_correlation_service.compute_cofitness(
+            locus_tags=split_comma_param(locus_tags),
+            isolate_name=isolate_name,
+            contrasts=split_comma_param(contrasts) if contrasts else None,
+            method=method,
+            min_barcodes=min_barcodes,
+            min_conditions=min_conditions,
+            min_correlation=min_correlation,
+            max_results=max_results,
+        )
+
+        return create_success_response(
+            data={**result, "count": len(result["correlations"])},
+            message=f"Computed {len(result['correlations'])} co-fitness partners over {result['contrasts']} contrasts",
+        )
+    except ValidationError as e:
+        raise_validation_error(str(e))
+    except GeneNotFoundError as e:
+        raise_not_found_error(str(e), error_code=ErrorCode.GENE_NOT_FOUND)
+    except GenomeNotFoundError as e:
+        raise_not_found_error(str(e), error_code=ErrorCode.GENOME_NOT_FOUND)
+    except ServiceError as e:
+        logger.error(f"Service error: {e}")
+        raise_internal_server_error(f"Failed to compute co-fitness: {str(e)}")
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}")
+        raise_internal_server_error("Internal server error")
+
+
 @fitness_correlation_router.get(
     "/top",
     summary="Get top correlations",
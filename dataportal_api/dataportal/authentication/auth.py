@@ -10,10 +10,10 @@ from ninja.security import HttpBearer
 from django.http import HttpRequest
 from functools import wraps
 import logging
-import django.utils.timezone
 from asgiref.sync import sync_to_async
 
 from dataportal.models import APIToken
+from dataportal.authentication.token_cache import CachedToken, token_cache
 from dataportal.authentication.utils import decode_jwt_token
 from dataportal.authentication.roles import APIRoles
 from dataportal.schema.response_schemas import ErrorCode
@@ -66,9 +66,12 @@ class JWTAuth(HttpBearer):
     1. Token format and JWT signature
     2. Token exists in database
     3. Token is active and not expired
-    4. Updates last_used_at timestamp
+    4. Updates last_used_at timestamp (batched, see token_cache)
     5. Extracts roles from token
 
+    Validated tokens are cached in-process for API_TOKEN_CACHE_TTL seconds,
+    so repeat requests skip the database entirely.
+
     Usage:
         from dataportal.authentication import JWTAuth
         from ninja import Router
@@ -133,6 +136,13 @@ class JWTAuth(HttpBearer):
         roles_from_jwt = payload.get("roles", [])
         logger.debug(f"[JWT Auth] Roles in JWT payload: {roles_from_jwt}")
 
+        cached = token_cache.get(token)
+        if cached is not None:
+            token_cache.record_use(cached.token_id)
+            await self._maybe_flush_last_used()
+            logger.debug(f"[JWT Auth] Token served from cache (ID: {cached.token_id})")
+            return AuthenticatedUser(name=name, roles=list(cached.roles))
+
         # Check if token exists in database and is valid
         # Use sync_to_async for all database operations
         try:
@@ -180,14 +190,18 @@ class JWTAuth(HttpBearer):
                     f"M2M relationship may not be set up correctly."
                 )
 
-            # Update last used timestamp in a non-blocking way
-            @sync_to_async
-            def update_last_used():
-                APIToken.objects.filter(pk=api_token.pk).update(
-                    last_used_at=django.utils.timezone.now()
-                )
+            token_cache.set(
+                token,
+                CachedToken(
+                    token_id=api_token.pk,
+                    roles=tuple(roles),
+                    expires_at=api_token.expires_at,
+                ),
+            )
 
-            await update_last_used()
+            # Record usage; last_used_at is written in periodic batches
+            token_cache.record_use(api_token.pk)
+            await self._maybe_flush_last_used()
 
             # Return AuthenticatedUser object
             user = AuthenticatedUser(name=name, roles=roles)
@@ -209,6 +223,12 @@ class JWTAuth(HttpBearer):
             )
             return None
 
+    @staticmethod
+    async def _maybe_flush_last_used() -> None:
+        """Write buffered last_used_at timestamps once the flush interval has passed."""
+        if token_cache.flush_due():
+            await sync_to_async(token_cache.flush_last_used)()
+
 
 class RoleBasedJWTAuth(JWTAuth):
     """
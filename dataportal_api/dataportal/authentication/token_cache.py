@@ -0,0 +1,164 @@
+"""
+In-process cache of validated API tokens.
+
+Authenticating a request used to cost a token lookup, a roles query and a
+last_used_at write against the database. Validated tokens are now kept for
+API_TOKEN_CACHE_TTL seconds (never past their own expiry) and last_used_at
+writes are coalesced into one UPDATE every API_TOKEN_LAST_USED_FLUSH_INTERVAL
+seconds.
+
+Entries are dropped when a token or role is saved/deleted or token roles
+change (signals below). The signals only reach the process that made the
+change: other workers (and the admin, if it runs elsewhere) keep serving
+their cached entry until its TTL runs out, so a deactivated or deleted token
+stays usable for up to API_TOKEN_CACHE_TTL seconds. Set it to 0 where
+revocation has to take effect immediately.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import django.utils.timezone
+from cachetools import TTLCache
+from django.conf import settings
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from dataportal.models import APIToken, Role
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOKEN_CACHE_TTL = 60
+DEFAULT_LAST_USED_FLUSH_INTERVAL = 60
+DEFAULT_TOKEN_CACHE_SIZE = 1024
+
+
+@dataclass(frozen=True)
+class CachedToken:
+    """A token that passed database validation."""
+
+    token_id: int
+    roles: Tuple[str, ...]
+    expires_at: Optional[datetime]
+
+    def is_expired(self) -> bool:
+        return self.expires_at is not None and django.utils.timezone.now() > self.expires_at
+
+
+class TokenCache:
+    """TTL cache of validated tokens plus a buffer of pending last_used_at updates."""
+
+    def __init__(
+        self,
+        ttl: int = DEFAULT_TOKEN_CACHE_TTL,
+        flush_interval: int = DEFAULT_LAST_USED_FLUSH_INTERVAL,
+        maxsize: int = DEFAULT_TOKEN_CACHE_SIZE,
+    ):
+        self.ttl = ttl
+        self.flush_interval = flush_interval
+        self._entries: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self._pending_last_used: Dict[int, datetime] = {}
+        self._last_flush = time.monotonic()
+
+    # ---------- Validated tokens ----------
+
+    def get(self, token: str) -> Optional[CachedToken]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None and entry.is_expired():
+                self._entries.pop(token, None)
+                return None
+            return entry
+
+    def set(self, token: str, entry: CachedToken) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[token] = entry
+
+    def invalidate_token_id(self, token_id: int) -> None:
+        with self._lock:
+            for token, entry in list(self._entries.items()):
+                if entry.token_id == token_id:
+                    self._entries.pop(token, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    # ---------- last_used_at batching ----------
+
+    def record_use(self, token_id: int) -> None:
+        with self._lock:
+            self._pending_last_used[token_id] = django.utils.timezone.now()
+
+    def flush_due(self) -> bool:
+        return bool(self._pending_last_used) and (
+            time.monotonic() - self._last_flush >= self.flush_interval
+        )
+
+    def flush_last_used(self) -> int:
+        """Write pending last_used_at timestamps (blocking DB call). Returns rows updated."""
+        with self._lock:
+            pending, self._pending_last_used = self._pending_last_used, {}
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+
+        # bulk_update writes each token's own timestamp in one CASE/WHEN UPDATE
+        # and, unlike save(), sends no post_save (which would evict the tokens).
+        try:
+            return APIToken.objects.bulk_update(
+                [
+                    APIToken(pk=token_id, last_used_at=used_at)
+                    for token_id, used_at in pending.items()
+                ],
+                ["last_used_at"],
+            )
+        except Exception as e:
+            logger.warning(
+                f"[Token Cache] Failed to flush last_used_at for {len(pending)} tokens: {e}"
+            )
+            with self._lock:
+                for token_id, used_at in pending.items():
+                    self._pending_last_used.setdefault(token_id, used_at)
+            return 0
+
+
+token_cache = TokenCache(
+    ttl=int(getattr(settings, "API_TOKEN_CACHE_TTL", DEFAULT_TOKEN_CACHE_TTL)),
+    flush_interval=int(
+        getattr(settings, "API_TOKEN_LAST_USED_FLUSH_INTERVAL", DEFAULT_LAST_USED_FLUSH_INTERVAL)
+    ),
+)
+
+
+# ---------- Invalidation ----------
+
+
+@receiver(post_save, sender=APIToken)
+@receiver(post_delete, sender=APIToken)
+def _invalidate_token(sender, instance, **kwargs):
+    token_cache.invalidate_token_id(instance.pk)
+
+
+@receiver(m2m_changed, sender=APIToken.roles.through)
+def _invalidate_token_roles(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if reverse:
+        # instance is a Role; its token set changed
+        token_cache.clear()
+    else:
+        token_cache.invalidate_token_id(instance.pk)
+
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+def _invalidate_role(sender, instance, **kwargs):
+    token_cache.clear()
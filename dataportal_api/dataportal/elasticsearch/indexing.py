@@ -9,6 +9,48 @@ from elasticsearch_dsl import Document, Index, connections
 DEFAULT_VERSION_FMT = "%Y.%m.%d"
 
 
+def _signature_entries(stats_body: dict) -> Dict[str, tuple]:
+    """{concrete: (concrete, uuid, docs, deleted, index_total, delete_total)} from an indices.stats body."""
+    entries = {}
+    for concrete, data in stats_body.get("indices", {}).items():
+        primaries = data.get("primaries", {})
+        entries[concrete] = (
+            concrete,
+            data.get("uuid"),
+            primaries.get("docs", {}).get("count"),
+            primaries.get("docs", {}).get("deleted"),
+            primaries.get("indexing", {}).get("index_total"),
+            primaries.get("indexing", {}).get("delete_total"),
+        )
+    return entries
+
+
+def index_signature(index_name: str) -> tuple:
+    """
+    Identity of the data behind `index_name` (alias or concrete index): the
+    concrete indices with their UUID and doc / indexing counters. It changes
+    on an alias swap, a recreated index and on any write, so in-memory
+    structures built from the index can tell when to rebuild.
+    """
+    client = connections.get_connection()
+    res = client.indices.stats(index=index_name, metric="docs,indexing")
+    entries = _signature_entries(getattr(res, "body", res))
+    return tuple(entries[concrete] for concrete in sorted(entries))
+
+
+def index_generation(index_name: str) -> tuple:
+    """
+    Coarser identity of `index_name` for data persisted across restarts: the
+    concrete indices with their UUID and doc count. Unlike index_signature it
+    ignores deleted docs and indexing counters, which move on segment merges
+    and shard restarts without the content changing.
+    """
+    client = connections.get_connection()
+    res = client.indices.stats(index=index_name, metric="docs")
+    entries = _signature_entries(getattr(res, "body", res))
+    return tuple(entries[concrete][:3] for concrete in sorted(entries))
+
+
 @dataclass(frozen=True)
 class IndexConfig:
     """Configuration for a single ES index family (one Document model)."""
@@ -70,6 +112,41 @@ class ModelIndexManager:
         res = client.indices.get(index=f"{self.config.base_name}-*")
         return sorted(res.keys())
 
+    def versions_by_age(self) -> List[str]:
+        """Concrete indices of this family, oldest first (by creation date, not name)."""
+        client = connections.get_connection()
+        res = client.indices.get_settings(
+            index=f"{self.config.base_name}-*", name="index.creation_date", allow_no_indices=True
+        )
+        created = {
+            name: int(body["settings"]["index"]["creation_date"]) for name, body in res.items()
+        }
+        return sorted(created, key=lambda name: (created[name], name))
+
+    def next_version_name(self, version: Optional[str] = None) -> str:
+        """Concrete name for a new version; same-day rebuilds get a .1, .2, ... suffix."""
+        name = self.concrete_name(version)
+        n = 0
+        candidate = name
+        while self.exists(candidate):
+            n += 1
+            candidate = f"{name}.{n}"
+        return candidate
+
+    # ---------- Aliases ----------
+
+    def alias_targets(self) -> List[str]:
+        """Concrete indices the base alias currently points to ([] if it is not an alias)."""
+        client = connections.get_connection()
+        if not client.indices.exists_alias(name=self.config.base_name):
+            return []
+        return sorted(client.indices.get_alias(name=self.config.base_name).keys())
+
+    def is_concrete_base(self) -> bool:
+        """True when the base name is a plain index (pre-alias deployment) rather than an alias."""
+        client = connections.get_connection()
+        return bool(client.indices.exists(index=self.config.base_name)) and not self.alias_targets()
+
 
 class ProjectIndexManager:
     """Coordinates multiple Document models (index families)."""
@@ -109,3 +186,94 @@ class ProjectIndexManager:
                 mgr.create(concrete)
             results[base] = concrete
         return results
+
+    # ---------- Aliases ----------
+
+    def swap_aliases(
+        self, targets: Dict[str, str], replace_concrete: bool = False
+    ) -> Dict[str, List[str]]:
+        """
+        Point each base alias at its new concrete index in ONE update_aliases call,
+        so readers see either all old or all new versions.
+        targets: { base_name: new_concrete }. Returns { base_name: previous targets }.
+
+        A base that is still a plain index cannot become an alias; with
+        replace_concrete=True that index is deleted in the same atomic call.
+        """
+        client = connections.get_connection()
+        actions: List[dict] = []
+        previous: Dict[str, List[str]] = {}
+        for base, concrete in targets.items():
+            mgr = self._managers[base]
+            if mgr.is_concrete_base():
+                if not replace_concrete:
+                    raise RuntimeError(
+                        f"{base} is a concrete index, not an alias; "
+                        "re-run with replace_concrete to delete it during the swap"
+                    )
+                actions.append({"remove_index": {"index": base}})
+                previous[base] = [base]
+                continue
+            previous[base] = mgr.alias_targets()
+            for old in previous[base]:
+                if old != concrete:
+                    actions.append({"remove": {"index": old, "alias": base}})
+        for base, concrete in targets.items():
+            actions.append({"add": {"index": concrete, "alias": base}})
+        client.indices.update_aliases(actions=actions)
+        return previous
+
+    def retire(self, keep: int = 2, dry_run: bool = False) -> List[str]:
+        """
+        Delete old versions of every family, keeping the newest `keep` and anything
+        an alias still points to. Returns the deleted (or, with dry_run, deletable) names.
+        """
+        retired: List[str] = []
+        for mgr in self._managers.values():
+            live = set(mgr.alias_targets())
+            versions = mgr.versions_by_age()
+            keep_names = set(versions[-keep:]) if keep > 0 else set()
+            for name in versions:
+                if name in live or name in keep_names:
+                    continue
+                if not dry_run:
+                    mgr.delete(name)
+                retired.append(name)
+        return retired
+
+    # ---------- Versions ----------
+
+    def current_versions(self) -> Dict[str, List[str]]:
+        """
+        Resolve every base name (alias or concrete index) to the concrete indices
+        currently behind it, each tagged with its index_signature() entry (UUID,
+        doc and indexing counters) so a recreated index of the same name and an
+        in-place re-ingest both count as a new version.
+        Returns { base_name: ["<concrete>@<uuid>:<docs>:...", ...] }; unresolved bases map to [].
+        """
+        client = connections.get_connection()
+        res = client.indices.get_alias(
+            index=",".join(self._managers),
+            ignore_unavailable=True,
+            allow_no_indices=True,
+        )
+        body = getattr(res, "body", res)
+
+        concretes: Dict[str, List[str]] = {base: [] for base in self._managers}
+        for concrete, data in body.items():
+            aliases = (data or {}).get("aliases") or {}
+            for base in concretes:
+                if concrete == base or base in aliases:
+                    concretes[base].append(concrete)
+
+        names = sorted({c for found in concretes.values() for c in found})
+        entries: Dict[str, tuple] = {}
+        if names:
+            stats = client.indices.stats(index=",".join(names), metric="docs,indexing")
+            entries = _signature_entries(getattr(stats, "body", stats))
+
+        def version(concrete: str) -> str:
+            entry = entries.get(concrete, (concrete, ""))
+            return f"{concrete}@" + ":".join("" if v is None else str(v) for v in entry[1:])
+
+        return {base: sorted(version(c) for c in found) for base, found in concretes.items()}
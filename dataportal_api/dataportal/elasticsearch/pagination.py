@@ -0,0 +1,203 @@
+"""
+Cursor pagination and bulk reads over point-in-time (PIT) + search_after.
+
+from/size gets slower with depth and stops at max_result_window; scroll is
+deprecated for this. Both are replaced here:
+
+- Cursor pages: the client passes an opaque cursor (CURSOR_START for the first
+  page); each page returns the next cursor, encoding the last hit's sort values
+  and the PIT id. Every page costs the same regardless of depth.
+- Exports: iter_pit_batches / aiter_pit_batches walk a PIT in batches of raw
+  hit dicts, closing the PIT when done.
+
+A PIT adds an implicit _shard_doc tiebreaker, so sort values are unique and
+search_after never skips or repeats documents.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from elasticsearch import BadRequestError, NotFoundError
+from elasticsearch_dsl import Search, connections
+
+from dataportal.utils.constants import CURSOR_START, PIT_BATCH_SIZE, PIT_KEEP_ALIVE
+from dataportal.utils.exceptions import ValidationError
+
+logger = logging.getLogger(__name__)
+
+
+# ---------- Cursor encoding ----------
+
+
+def encode_cursor(search_after: List[Any], pit_id: Optional[str] = None) -> str:
+    payload = {"sa": search_after}
+    if pit_id:
+        payload["pit"] = pit_id
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[List[Any]], Optional[str]]:
+    """Return (search_after, pit_id). CURSOR_START decodes to (None, None)."""
+    if cursor == CURSOR_START:
+        return None, None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        search_after = payload["sa"]
+        if not isinstance(search_after, list):
+            raise ValueError("search_after must be a list")
+        return search_after, payload.get("pit")
+    except Exception:
+        raise ValidationError(f"Invalid pagination cursor: {cursor!r}")
+
+
+# ---------- PIT lifecycle ----------
+
+
+def open_pit(index: str, keep_alive: str = PIT_KEEP_ALIVE) -> str:
+    client = connections.get_connection()
+    return client.open_point_in_time(index=index, keep_alive=keep_alive)["id"]
+
+
+def close_pit(pit_id: Optional[str]) -> None:
+    if not pit_id:
+        return
+    try:
+        connections.get_connection().close_point_in_time(id=pit_id)
+    except Exception as e:
+        # PITs expire on their own after keep_alive; closing early is best effort
+        logger.debug(f"Failed to close PIT: {e}")
+
+
+# ---------- Cursor pages ----------
+
+
+def fetch_cursor_page(
+    index: str,
+    search: Search,
+    size: int,
+    cursor: str,
+    keep_alive: str = PIT_KEEP_ALIVE,
+):
+    """
+    Execute one cursor page of `search` (query/sort/source already applied).
+
+    Returns (response, total_hits, next_cursor). next_cursor is None on the last
+    page, at which point the PIT has been closed.
+    """
+    search_after, cursor_pit = decode_cursor(cursor)
+    pit_id = cursor_pit or open_pit(index, keep_alive)
+
+    s = search.index().extra(
+        pit={"id": pit_id, "keep_alive": keep_alive},
+        size=size,
+        track_total_hits=True,
+    )
+    if search_after:
+        s = s.extra(search_after=search_after)
+
+    try:
+        response = s.execute()
+    except (NotFoundError, BadRequestError) as e:
+        if cursor_pit is None:
+            raise
+        # the cursor's PIT expired (keep_alive passed), is unknown, or does not fit this search
+        raise ValidationError(
+            f"Pagination cursor has expired or is invalid; start again with cursor={CURSOR_START!r}"
+        ) from e
+    # ES may hand back a refreshed PIT id; always continue with the latest one
+    pit_id = response.to_dict().get("pit_id", pit_id)
+
+    hits = response.hits
+    total = hits.total.value if hasattr(hits.total, "value") else len(hits)
+
+    if len(hits) < size:
+        close_pit(pit_id)
+        return response, total, None
+    return response, total, encode_cursor(list(hits[-1].meta.sort), pit_id)
+
+
+# ---------- Bulk reads (exports) ----------
+
+
+def iter_pit_batches(
+    index: str,
+    query: Dict[str, Any],
+    sort: List[Dict[str, Any]],
+    source: Optional[List[str]] = None,
+    batch_size: int = PIT_BATCH_SIZE,
+    max_results: Optional[int] = None,
+    keep_alive: str = PIT_KEEP_ALIVE,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Yield lists of raw hit dicts (with `_source` and `sort`) for every match."""
+    client = connections.get_connection()
+    pit_id = open_pit(index, keep_alive)
+    search_after = None
+    fetched = 0
+    try:
+        while True:
+            size = batch_size
+            if max_results is not None:
+                size = min(size, max_results - fetched)
+                if size <= 0:
+                    logger.warning(
+                        f"Reached maximum result limit of {max_results}. "
+                        "Some results may be truncated."
+                    )
+                    return
+
+            kwargs = {
+                "query": query,
+                "sort": sort,
+                "size": size,
+                "pit": {"id": pit_id, "keep_alive": keep_alive},
+                "track_total_hits": False,
+            }
+            if source is not None:
+                kwargs["source"] = source
+            if search_after is not None:
+                kwargs["search_after"] = search_after
+
+            response = client.search(**kwargs)
+            pit_id = response.get("pit_id", pit_id)
+            hits = response["hits"]["hits"]
+            if not hits:
+                return
+
+            fetched += len(hits)
+            yield hits
+
+            if len(hits) < size:
+                return
+            search_after = hits[-1]["sort"]
+    finally:
+        close_pit(pit_id)
+
+
+async def aiter_pit_batches(
+    index: str,
+    query: Dict[str, Any],
+    sort: List[Dict[str, Any]],
+    source: Optional[List[str]] = None,
+    batch_size: int = PIT_BATCH_SIZE,
+    max_results: Optional[int] = None,
+    keep_alive: str = PIT_KEEP_ALIVE,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Async counterpart of iter_pit_batches; each ES round trip runs off the event loop."""
+    batches = iter_pit_batches(index, query, sort, source, batch_size, max_results, keep_alive)
+    _done = object()
+    next_batch = sync_to_async(lambda: next(batches, _done), thread_sensitive=False)
+    try:
+        while True:
+            batch = await next_batch()
+            if batch is _done:
+                return
+            yield batch
+    finally:
+        await sync_to_async(batches.close, thread_sensitive=False)()
@@ -0,0 +1,227 @@
+"""
+Blue/green index rebuilds.
+
+The API reads every index family through an alias named after its base
+(`feature_index`, `ppi_index`, ...). A rebuild never writes into what the API
+is reading:
+
+  1. prepare  - create the next concrete version of each family (<base>-<version>)
+  2. ingest   - run the import commands against those concrete names; they wrap
+                writes in an ingest session (refresh off; pass --drop-replicas
+                and --force-merge, safe here as nothing reads the new index)
+  3. promote  - check every new index is settled (ingest session closed, no
+                running merges, health, non-empty), run a warm-up query set
+                (autocomplete, facets, top genomes, ...) against it, then swap
+                all aliases in ONE update_aliases call
+  4. retire   - delete old versions no alias points to, keeping the newest few
+
+Serving traffic therefore only ever sees fully loaded, merged and warmed indices.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Dict, List, Optional
+
+from elasticsearch_dsl import connections
+
+from dataportal.elasticsearch.indexing import ProjectIndexManager
+from dataportal.utils.constants import (
+    FACET_FIELDS,
+    GENE_FIELD_ALIAS,
+    GENE_FIELD_LOCUS_TAG,
+    GENE_FIELD_NAME,
+    GENE_FIELD_PRODUCT,
+)
+
+logger = logging.getLogger(__name__)
+
+# Autocomplete prefixes used to warm the edge-ngram fields
+WARMUP_PREFIXES = ("dna", "rec", "BU_", "PV_")
+
+MERGE_WAIT_SECS = 600
+
+
+def _autocomplete(prefix: str) -> dict:
+    return {
+        "size": 10,
+        "query": {
+            "bool": {
+                "filter": [{"term": {"feature_type": "gene"}}],
+                "must": [
+                    {
+                        "multi_match": {
+                            "query": prefix,
+                            "fields": [
+                                f"{GENE_FIELD_ALIAS}^3",
+                                f"{GENE_FIELD_NAME}^2",
+                                GENE_FIELD_LOCUS_TAG,
+                                GENE_FIELD_PRODUCT,
+                            ],
+                            "type": "best_fields",
+                        }
+                    }
+                ],
+            }
+        },
+    }
+
+
+def _terms(field: str, size: int = 50, query: Optional[dict] = None) -> dict:
+    body = {"size": 0, "aggs": {field: {"terms": {"field": field, "size": size}}}}
+    if query:
+        body["query"] = query
+    return body
+
+
+def warmup_queries() -> Dict[str, List[dict]]:
+    """Representative API queries per base name (unknown bases get a match_all)."""
+    genes = {"bool": {"filter": [{"term": {"feature_type": "gene"}}]}}
+    return {
+        "feature_index": [
+            *(_autocomplete(p) for p in WARMUP_PREFIXES),
+            {
+                "size": 0,
+                "query": genes,
+                "aggs": {f: {"terms": {"field": f, "size": 100}} for f in FACET_FIELDS},
+            },
+            _terms("isolate_name", size=100, query=genes),  # top genomes
+            _terms("species_acronym", size=10),
+        ],
+        "strain_index": [
+            {"size": 50, "query": {"match_all": {}}, "sort": [{"isolate_name.keyword": "asc"}]},
+            _terms("species_acronym", size=10),
+        ],
+        "species_index": [{"size": 50, "query": {"match_all": {}}}],
+        "ppi_index": [
+            _terms("species_acronym", size=10),
+            {"size": 20, "query": {"bool": {"filter": [{"term": {"has_string": True}}]}}},
+        ],
+        "ortholog_index": [
+            _terms("isolate_a", size=100),
+            {"size": 20, "query": {"term": {"is_one_to_one": True}}},
+        ],
+    }
+
+
+class IndexRebuild:
+    """Blue/green workflow over the index families of a ProjectIndexManager."""
+
+    def __init__(self, manager: ProjectIndexManager):
+        self.manager = manager
+
+    def _conn(self):
+        return connections.get_connection()
+
+    # ---------- prepare ----------
+
+    def prepare(self, version: Optional[str] = None) -> Dict[str, str]:
+        """Create the next concrete version of every family. Returns { base: concrete }."""
+        targets: Dict[str, str] = {}
+        for base, mgr in self.manager.managers.items():
+            concrete = mgr.next_version_name(version)
+            mgr.create(concrete)
+            targets[base] = concrete
+        return targets
+
+    def latest(self) -> Dict[str, str]:
+        """Newest concrete version of every family (the promote candidates)."""
+        targets: Dict[str, str] = {}
+        for base, mgr in self.manager.managers.items():
+            versions = mgr.versions_by_age()
+            if versions:
+                targets[base] = versions[-1]
+        return targets
+
+    # ---------- promote ----------
+
+    def check_ready(
+        self,
+        concrete: str,
+        wait_for_status: str = "yellow",
+        allow_empty: bool = False,
+        merge_wait_secs: int = MERGE_WAIT_SECS,
+    ) -> int:
+        """Raise unless `concrete` is safe to serve. Returns its document count."""
+        es = self._conn()
+        idx = es.indices.get_settings(index=concrete)[concrete]["settings"]["index"]
+        if str(idx.get("refresh_interval", "1s")) == "-1":
+            raise RuntimeError(
+                f"{concrete} still has refresh disabled (ingest session not closed?)"
+            )
+
+        deadline = time.monotonic() + merge_wait_secs
+        while True:
+            stats = es.indices.stats(index=concrete, metric="merge")
+            if not stats["_all"]["primaries"]["merges"]["current"]:
+                break
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"{concrete} is still merging after {merge_wait_secs}s")
+            time.sleep(5)
+
+        health = es.cluster.health(index=concrete, wait_for_status=wait_for_status, timeout="120s")
+        if health.get("timed_out"):
+            raise RuntimeError(f"{concrete} did not reach {wait_for_status} health")
+
+        es.indices.refresh(index=concrete)
+        count = int(es.count(index=concrete)["count"])
+        if not count and not allow_empty:
+            raise RuntimeError(f"{concrete} is empty")
+        return count
+
+    def warm_up(self, base: str, concrete: str, rounds: int = 2) -> float:
+        """Run the warm-up set against `concrete`; returns the last round's total ms."""
+        es = self._conn()
+        queries = warmup_queries().get(base) or [{"size": 10, "query": {"match_all": {}}}]
+        took = 0.0
+        for _ in range(max(rounds, 1)):
+            took = 0.0
+            for body in queries:
+                try:
+                    took += es.search(index=concrete, body=body, request_cache=True)["took"]
+                except Exception as e:
+                    # a query the mapping cannot serve should not block the rebuild
+                    logger.warning(f"[rebuild] warm-up query failed on {concrete}: {e}")
+        return took
+
+    def promote(
+        self,
+        targets: Dict[str, str],
+        warm_up: bool = True,
+        wait_for_status: str = "yellow",
+        allow_empty: bool = False,
+        replace_concrete: bool = False,
+    ) -> Dict[str, List[str]]:
+        """Check, warm up, then atomically swap every alias. Returns previous alias targets."""
+        for base, concrete in targets.items():
+            count = self.check_ready(
+                concrete, wait_for_status=wait_for_status, allow_empty=allow_empty
+            )
+            msg = f"[rebuild] {base}: {concrete} ready ({count:,} docs)"
+            if warm_up:
+                msg += f", warm-up {self.warm_up(base, concrete):.0f} ms"
+            print(msg)
+
+        previous = self.manager.swap_aliases(targets, replace_concrete=replace_concrete)
+
+        # API workers re-resolve versions after INDEX_VERSION_TTL; drop ours right away
+        from dataportal.middleware import IndexVersionETagMiddleware
+
+        IndexVersionETagMiddleware.reset_index_versions()
+        return previous
+
+    # ---------- retire ----------
+
+    def retire(self, keep: int = 2, dry_run: bool = False) -> List[str]:
+        return self.manager.retire(keep=keep, dry_run=dry_run)
+
+    def status(self) -> Dict[str, Dict[str, object]]:
+        out: Dict[str, Dict[str, object]] = {}
+        for base, mgr in self.manager.managers.items():
+            out[base] = {
+                "alias": mgr.alias_targets(),
+                "concrete_base": mgr.is_concrete_base(),
+                "versions": mgr.versions_by_age(),
+            }
+        return out
@@ -0,0 +1,13 @@
+from .harness import FLOWS, FlowResult, run_benchmark
+from .sinks import FakeBulkSink, LocalESSink
+from .synthetic import SyntheticScale, generate
+
+__all__ = [
+    "FLOWS",
+    "FakeBulkSink",
+    "FlowResult",
+    "LocalESSink",
+    "SyntheticScale",
+    "generate",
+    "run_benchmark",
+]
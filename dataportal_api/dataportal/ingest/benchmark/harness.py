@@ -0,0 +1,273 @@
+"""
+Runs ingest flows against a sink and measures them.
+
+Every flow is run through its normal entry point (GFFGenes.run, Fitness.run,
+Orthologs.run, PPICSVFlow.run, ...) with the shared bulk engine bound to the
+sink's client. By default each flow runs in a forked child so that its peak RSS
+is its own and one flow's caches cannot speed up the next.
+
+GFFGenes reads the synthetic FTP tree from disk: LocalFTPTree stands in for
+the FTP connection and LocalArtifactCache for the FTP artifact cache.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import resource
+import time
+import traceback
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+from elasticsearch import Elasticsearch
+from elasticsearch_dsl import connections
+
+from dataportal.ingest import bulk
+from dataportal.ingest.benchmark.synthetic import PPI_SPECIES, SyntheticInputs
+from dataportal.ingest.es_repo import PPIIndexRepository
+from dataportal.ingest.feature.flows.essentiality import Essentiality
+from dataportal.ingest.feature.flows.fitness import Fitness
+from dataportal.ingest.feature.flows.gff_features import GFFGenes
+from dataportal.ingest.ftp_cache import FTPArtifactCache, register_ftp_cache
+from dataportal.ingest.ortholog.flows.orthologs import Orthologs
+from dataportal.ingest.ppi.flows.ppi_csv import PPICSVFlow
+from dataportal.models import FeatureDocument, OrthologDocument, ProteinProteinDocument
+
+BENCH_FTP_SERVER = "bench.local"
+
+FLOWS = ("gff_genes", "fitness", "essentiality", "orthologs", "ppi")
+
+
+@dataclass
+class FlowResult:
+    flow: str
+    rows: int
+    seconds: float
+    bulk_requests: int = 0
+    bulk_actions: int = 0
+    bulk_bytes: int = 0
+    peak_rss_mb: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "rows_per_sec": round(self.rows_per_sec, 1)}
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# -----------------------------
+# Local stand-ins for the FTP source
+# -----------------------------
+
+
+class LocalFTPTree:
+    """The parts of ftplib.FTP that GFFGenes uses, served from a local directory."""
+
+    def __init__(self, host: str, local_root: str):
+        self.host = host
+        self.local_root = local_root
+
+    def local_path(self, remote: str) -> str:
+        return os.path.join(self.local_root, remote.lstrip("/"))
+
+    def nlst(self, remote_dir: str) -> List[str]:
+        names = sorted(os.listdir(self.local_path(remote_dir)))
+        return [f"{remote_dir.rstrip('/')}/{n}" for n in names]
+
+    def quit(self) -> None:
+        pass
+
+
+class LocalArtifactCache(FTPArtifactCache):
+    """Artifact cache whose "downloads" are the files of a LocalFTPTree."""
+
+    def __init__(self, tree: LocalFTPTree):
+        super().__init__(tree.host)
+        self.tree = tree
+
+    def fetch(self, remote: str, ftp=None) -> str:
+        local = self.tree.local_path(remote)
+        if not os.path.exists(local):
+            raise FileNotFoundError(remote)
+        self._count(hit=True)
+        return local
+
+    def prefetch(self, remotes: Iterable[str]) -> Dict[str, Optional[str]]:
+        return {r: self.fetch(r) for r in remotes}
+
+
+class LocalGFFGenes(GFFGenes):
+    def __init__(self, tree: LocalFTPTree, ftp_root: str, index_name: str):
+        super().__init__(tree.host, ftp_root, index_name=index_name)
+        self.tree = tree
+
+    def _connect(self):
+        return self.tree
+
+
+# -----------------------------
+# Flow runners
+# -----------------------------
+
+
+def index_names(prefix: str) -> Dict[str, str]:
+    return {
+        "feature": f"{prefix}_feature_index",
+        "ortholog": f"{prefix}_ortholog_index",
+        "ppi": f"{prefix}_ppi_index",
+    }
+
+
+def _gff_genes(inputs: SyntheticInputs, client: Elasticsearch, names: Dict[str, str]) -> None:
+    tree = LocalFTPTree(BENCH_FTP_SERVER, os.path.join(inputs.root, "ftp"))
+    register_ftp_cache(tree.host, LocalArtifactCache(tree))
+    LocalGFFGenes(tree, inputs.ftp_root, index_name=names["feature"]).run(inputs.isolates)
+
+
+def _fitness(inputs, client, names) -> None:
+    Fitness(index_name=names["feature"]).run(inputs.fitness_csv)
+
+
+def _essentiality(inputs, client, names) -> None:
+    Essentiality(index_name=names["feature"]).run(inputs.essentiality_csv)
+
+
+def _orthologs(inputs, client, names) -> None:
+    Orthologs(index_name=names["ortholog"]).run(inputs.orthologs_tsv)
+
+
+def _ppi(inputs, client, names) -> None:
+    flow = PPICSVFlow(
+        repo=PPIIndexRepository(names["ppi"], client=client),
+        species_map={PPI_SPECIES: inputs.isolates[0]},
+    )
+    flow.run(inputs.ppi_dir, log_every=0, optimize_indexing=False)
+
+
+RUNNERS: Dict[str, Callable[[SyntheticInputs, Elasticsearch, Dict[str, str]], None]] = {
+    "gff_genes": _gff_genes,
+    "fitness": _fitness,
+    "essentiality": _essentiality,
+    "orthologs": _orthologs,
+    "ppi": _ppi,
+}
+
+
+def create_indices(client: Elasticsearch, prefix: str) -> None:
+    """(Re)create the benchmark indices with the real mappings (LocalESSink only)."""
+    names = index_names(prefix)
+    for key, doc in (
+        ("feature", FeatureDocument),
+        ("ortholog", OrthologDocument),
+        ("ppi", ProteinProteinDocument),
+    ):
+        client.indices.delete(index=names[key], ignore_unavailable=True)
+        doc.init(index=names[key], using=client)
+
+
+@contextmanager
+def bound_to(client: Elasticsearch, threads: Optional[int] = None):
+    """Point the shared bulk engine and the default DSL connection at `client`."""
+    previous_engine = bulk.get_bulk_engine()
+    try:
+        previous_conn = connections.get_connection()
+    except KeyError:
+        previous_conn = None
+    bulk.configure_bulk_engine(client=client, threads=threads or previous_engine.threads)
+    connections.add_connection("default", client)
+    try:
+        yield
+    finally:
+        bulk._engine = previous_engine
+        if previous_conn is not None:
+            connections.add_connection("default", previous_conn)
+        else:
+            connections.remove_connection("default")
+
+
+def run_flow(
+    name: str, inputs: SyntheticInputs, sink, threads: Optional[int] = None, prefix: str = "bench"
+) -> FlowResult:
+    """Run one flow in this process and return its measurements."""
+    client = sink.client()
+    before = sink.stats.snapshot()
+    error = None
+    started = time.perf_counter()
+    with bound_to(client, threads):
+        try:
+            RUNNERS[name](inputs, client, index_names(prefix))
+        except Exception:
+            error = traceback.format_exc(limit=5)
+    seconds = time.perf_counter() - started
+    after = sink.stats.snapshot()
+    return FlowResult(
+        flow=name,
+        rows=inputs.rows.get(name, 0),
+        seconds=seconds,
+        bulk_requests=after["bulk_requests"] - before["bulk_requests"],
+        bulk_actions=after["bulk_actions"] - before["bulk_actions"],
+        bulk_bytes=after["bulk_bytes"] - before["bulk_bytes"],
+        peak_rss_mb=peak_rss_mb(),
+        error=error,
+    )
+
+
+def _child(queue, name, inputs, sink, threads, prefix) -> None:
+    queue.put(run_flow(name, inputs, sink, threads, prefix).as_dict())
+
+
+def run_flow_isolated(
+    name: str, inputs: SyntheticInputs, sink, threads: Optional[int] = None, prefix: str = "bench"
+) -> FlowResult:
+    """Run one flow in a forked child so its peak RSS is measured on its own."""
+    ctx = multiprocessing.get_context("fork")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_child, args=(queue, name, inputs, sink, threads, prefix))
+    proc.start()
+    try:
+        data = queue.get()
+    finally:
+        proc.join()
+    data.pop("rows_per_sec", None)
+    return FlowResult(**data)
+
+
+def run_benchmark(
+    inputs: SyntheticInputs,
+    sink,
+    flows: Iterable[str] = FLOWS,
+    threads: Optional[int] = None,
+    isolated: bool = True,
+    prefix: str = "bench",
+    report: Optional[Callable[[FlowResult], None]] = None,
+) -> List[FlowResult]:
+    unknown = [f for f in flows if f not in RUNNERS]
+    if unknown:
+        raise ValueError(f"Unknown flow(s): {', '.join(unknown)}; available: {', '.join(FLOWS)}")
+    runner = run_flow_isolated if isolated else run_flow
+    results = []
+    for name in flows:
+        result = runner(name, inputs, sink, threads, prefix)
+        results.append(result)
+        if report is not None:
+            report(result)
+    return results
+
+
+def compare(results: List[FlowResult], baseline: Dict[str, dict]) -> Dict[str, float]:
+    """Rows/sec change in percent per flow against a baseline {flow: result dict}."""
+    out = {}
+    for r in results:
+        base = (baseline.get(r.flow) or {}).get("rows_per_sec")
+        if base and not r.error:
+            out[r.flow] = (r.rows_per_sec - base) / base * 100
+    return out
@@ -0,0 +1,189 @@
+"""
+Bulk sinks for the ingest benchmark.
+
+Both sinks hand the flows a real `Elasticsearch` client, so requests go
+through the same serialization, chunking and transport code as production;
+only the node at the bottom of the transport is swapped:
+
+  - FakeBulkSink: an in-process node that parses the bulk action lines and
+    acknowledges every item (optionally after a fixed latency). Reads come back
+    empty (no hits, no docs), so flows behave as on an empty index.
+  - LocalESSink: the regular urllib3 node against a real (local) cluster.
+
+Each sink counts the bulk requests, bulk actions and request bytes it saw.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from elastic_transport import ApiResponseMeta, BaseNode, HttpHeaders, Urllib3HttpNode
+from elastic_transport._node import NodeApiResponse
+from elasticsearch import Elasticsearch
+
+FAKE_ES_URL = "http://bench.local:9200"
+
+_RESPONSE_HEADERS = {"X-Elastic-Product": "Elasticsearch", "content-type": "application/json"}
+_OP_TYPES = ("index", "create", "update", "delete")
+
+
+@dataclass
+class SinkStats:
+    bulk_requests: int = 0
+    bulk_actions: int = 0
+    bulk_bytes: int = 0
+    other_requests: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, target: str, body: Optional[bytes], actions: int = 0) -> None:
+        with self._lock:
+            if target.split("?", 1)[0].endswith("/_bulk"):
+                self.bulk_requests += 1
+                self.bulk_actions += actions
+                self.bulk_bytes += len(body or b"")
+            else:
+                self.other_requests += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "bulk_requests": self.bulk_requests,
+                "bulk_actions": self.bulk_actions,
+                "bulk_bytes": self.bulk_bytes,
+                "other_requests": self.other_requests,
+            }
+
+
+def _bulk_items(body: bytes) -> list:
+    """One acknowledged item per action line of an ndjson bulk body."""
+    items = []
+    expect_source = False
+    for line in body.splitlines():
+        if not line.strip():
+            continue
+        if expect_source:
+            expect_source = False
+            continue
+        header = json.loads(line)
+        op = next(iter(header))
+        meta = header[op]
+        status = 201 if op == "create" else 200
+        items.append(
+            {
+                op: {
+                    "_index": meta.get("_index"),
+                    "_id": meta.get("_id"),
+                    "status": status,
+                    "result": "ok",
+                }
+            }
+        )
+        expect_source = op != "delete"
+    return items
+
+
+class FakeBulkNode(BaseNode):
+    """Transport node that answers in-process; see FakeBulkSink."""
+
+    stats: SinkStats = SinkStats()
+    latency: float = 0.0
+
+    def perform_request(self, method, target, body=None, headers=None, request_timeout=None):
+        started = time.perf_counter()
+        path = target.split("?", 1)[0]
+        status = 200
+        if path.endswith("/_bulk"):
+            items = _bulk_items(body or b"")
+            self.stats.record(target, body, len(items))
+            payload = {"took": 1, "errors": False, "items": items}
+            if self.latency:
+                time.sleep(self.latency)
+        else:
+            self.stats.record(target, body)
+            if method == "HEAD":
+                payload = None
+            elif path.endswith("/_mget"):
+                ids = (json.loads(body) if body else {}).get("ids", [])
+                payload = {"docs": [{"_id": i, "found": False} for i in ids]}
+            elif "/_search" in path:
+                payload = {
+                    "took": 0,
+                    "timed_out": False,
+                    "_scroll_id": "bench",
+                    "_shards": {"total": 1, "successful": 1, "skipped": 0, "failed": 0},
+                    "hits": {
+                        "total": {"value": 0, "relation": "eq"},
+                        "max_score": None,
+                        "hits": [],
+                    },
+                }
+            elif method == "GET" and "/_doc/" in path:
+                status, payload = 404, {"found": False}
+            else:
+                payload = {"acknowledged": True}
+
+        raw = b"" if payload is None else json.dumps(payload).encode()
+        meta = ApiResponseMeta(
+            status=status,
+            http_version="1.1",
+            headers=HttpHeaders(_RESPONSE_HEADERS),
+            duration=time.perf_counter() - started,
+            node=self.config,
+        )
+        return NodeApiResponse(meta, raw)
+
+
+class CountingUrllib3Node(Urllib3HttpNode):
+    """urllib3 node that counts what it sends."""
+
+    stats: SinkStats = SinkStats()
+
+    def perform_request(self, method, target, body=None, headers=None, request_timeout=None):
+        actions = 0
+        if body and target.split("?", 1)[0].endswith("/_bulk"):
+            actions = sum(
+                1
+                for line in body.splitlines()
+                if line.strip() and next(iter(json.loads(line)), None) in _OP_TYPES
+            )
+        self.stats.record(target, body, actions)
+        return super().perform_request(
+            method, target, body=body, headers=headers, request_timeout=request_timeout
+        )
+
+
+class FakeBulkSink:
+    """In-process fake bulk endpoint. `latency` (seconds) is added to every bulk request."""
+
+    name = "fake"
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.stats = SinkStats()
+
+    def client(self) -> Elasticsearch:
+        node_class = type(
+            "FakeBulkNode", (FakeBulkNode,), {"stats": self.stats, "latency": self.latency}
+        )
+        return Elasticsearch(FAKE_ES_URL, node_class=node_class, request_timeout=60)
+
+
+class LocalESSink:
+    """A real cluster (e.g. a local single-node ES), with request counting."""
+
+    name = "es"
+
+    def __init__(self, url: str = "http://localhost:9200", **client_kwargs):
+        self.url = url
+        self.client_kwargs = client_kwargs
+        self.stats = SinkStats()
+
+    def client(self) -> Elasticsearch:
+        node_class = type("CountingUrllib3Node", (CountingUrllib3Node,), {"stats": self.stats})
+        return Elasticsearch(
+            self.url, node_class=node_class, request_timeout=120, **self.client_kwargs
+        )
@@ -0,0 +1,210 @@
+"""
+Synthetic ingest inputs at configurable scale.
+
+Files follow the real layouts closely enough to exercise the same parsing and
+document-building paths as production data:
+  - GFF/FAA under an FTP-like tree: <root>/<isolate>/functional_annotation/{merged_gff,prokka}/
+  - fitness and essentiality CSVs keyed by the generated locus tags
+  - OMA-style ortholog pairs (headerless TSV with a comment line)
+  - PPI CSVs with the SP2 score columns
+
+Generation is seeded, so two runs at the same scale produce identical files.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List
+
+BENCH_FTP_ROOT = "/bench/annotations"
+PPI_SPECIES = "Bacteroides uniformis"
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+
+
+@dataclass
+class SyntheticScale:
+    isolates: int = 4
+    genes_per_isolate: int = 2_000
+    fitness_conditions: int = 10
+    essentiality_conditions: int = 3
+    ortholog_pairs: int = 50_000
+    ppi_pairs: int = 50_000
+    ppi_files: int = 2
+    seed: int = 7
+
+    def scaled(self, factor: float) -> "SyntheticScale":
+        """Same shape, `factor` times the rows (the isolate count is kept)."""
+        data = asdict(self)
+        for key in ("genes_per_isolate", "ortholog_pairs", "ppi_pairs"):
+            data[key] = max(1, int(data[key] * factor))
+        return SyntheticScale(**data)
+
+    @property
+    def isolate_names(self) -> List[str]:
+        return [f"BU_BENCH{i:03d}" for i in range(1, self.isolates + 1)]
+
+
+@dataclass
+class SyntheticInputs:
+    """Paths of one generated data set and the number of input rows per flow."""
+
+    root: str
+    ftp_root: str
+    isolates: List[str]
+    fitness_csv: str
+    essentiality_csv: str
+    orthologs_tsv: str
+    ppi_dir: str
+    rows: Dict[str, int] = field(default_factory=dict)
+
+
+def locus_tag(isolate: str, n: int) -> str:
+    return f"{isolate}_{n:05d}"
+
+
+def _gff(path: str, isolate: str, genes: int, rng: random.Random) -> int:
+    lines = ["##gff-version 3\n"]
+    pos = 1
+    for n in range(1, genes + 1):
+        start, end = pos, pos + rng.randint(300, 2_400)
+        pos = end + rng.randint(20, 400)
+        lt = locus_tag(isolate, n)
+        attrs = [
+            f"ID={lt}",
+            f"locus_tag={lt}",
+            f"Name=gen{n % 997}",
+            f"product=Synthetic protein {n % 313}",
+            f"Dbxref=UniProt:Q{n:05d}{isolate[-1]},COG:COG{n % 4000:04d}",
+            f"Ontology_term=GO:{n % 9999:07d}",
+            f"kegg=K{n % 20000:05d}",
+            f"pfam=PF{n % 15000:05d}",
+            f"interpro=IPR{n % 40000:06d}",
+            f"cog={'JKLMNOP'[n % 7]}",
+            f"eC_number=1.1.1.{n % 300}",
+        ]
+        strand = "+" if n % 2 else "-"
+        lines.append(f"contig_1\tProkka\tgene\t{start}\t{end}\t.\t{strand}\t.\t{';'.join(attrs)}\n")
+        lines.append(
+            f"contig_1\tProkka\tCDS\t{start}\t{end}\t.\t{strand}\t0\tID={lt}_cds;locus_tag={lt}\n"
+        )
+    with open(path, "w") as f:
+        f.writelines(lines)
+    return genes
+
+
+def _faa(path: str, isolate: str, genes: int, rng: random.Random) -> None:
+    with open(path, "w") as f:
+        for n in range(1, genes + 1):
+            seq = "".join(rng.choices(AMINO_ACIDS, k=rng.randint(100, 500)))
+            f.write(f">{locus_tag(isolate, n)} synthetic\n")
+            for i in range(0, len(seq), 60):
+                f.write(seq[i : i + 60] + "\n")
+
+
+def generate(out_dir: str, scale: SyntheticScale) -> SyntheticInputs:
+    """Write a full synthetic data set under `out_dir`."""
+    rng = random.Random(scale.seed)
+    os.makedirs(out_dir, exist_ok=True)
+    ftp_local = os.path.join(out_dir, "ftp")
+    isolates = scale.isolate_names
+    genes = scale.genes_per_isolate
+    rows: Dict[str, int] = {}
+
+    # GFF + FAA in the FTP layout read by GFFGenes
+    rows["gff_genes"] = 0
+    for iso in isolates:
+        base = os.path.join(ftp_local, BENCH_FTP_ROOT.lstrip("/"), iso, "functional_annotation")
+        os.makedirs(os.path.join(base, "merged_gff"), exist_ok=True)
+        os.makedirs(os.path.join(base, "prokka"), exist_ok=True)
+        rows["gff_genes"] += _gff(
+            os.path.join(base, "merged_gff", f"{iso}_annotations.gff"), iso, genes, rng
+        )
+        _faa(os.path.join(base, "prokka", f"{iso}.faa"), iso, genes, rng)
+
+    # fitness: every gene x condition
+    fitness_csv = os.path.join(out_dir, "fitness.csv")
+    with open(fitness_csv, "w") as f:
+        f.write("locus_tag,experimental_condition,media,contrast,lfc,fdr,number_of_barcodes\n")
+        for iso in isolates:
+            for n in range(1, genes + 1):
+                lt = locus_tag(iso, n)
+                for c in range(scale.fitness_conditions):
+                    f.write(
+                        f"{lt},cond_{c},media_{c % 3},contrast_{c},"
+                        f"{rng.gauss(0, 1.5):.4f},{rng.random():.4g},{rng.randint(1, 40)}\n"
+                    )
+    rows["fitness"] = len(isolates) * genes * scale.fitness_conditions
+
+    # essentiality: genes plus one intergenic region per 10 genes
+    essentiality_csv = os.path.join(out_dir, "essentiality.csv")
+    calls = ("essential", "not_essential", "unclear", "essential_liquid")
+    ess_rows = 0
+    with open(essentiality_csv, "w") as f:
+        f.write("locus_tag,element,TAs_in_locus,TAs_hit,essentiality_call,experimental_condition\n")
+        for iso in isolates:
+            for n in range(1, genes + 1):
+                for c in range(scale.essentiality_conditions):
+                    tas = rng.randint(1, 60)
+                    f.write(
+                        f"{locus_tag(iso, n)},gene,{tas},{rng.randint(0, tas)},{rng.choice(calls)},ess_{c}\n"
+                    )
+                    ess_rows += 1
+                    if n % 10 == 0 and n < genes:
+                        ig = f"IG-between-{locus_tag(iso, n)}-and-{locus_tag(iso, n + 1)}"
+                        f.write(
+                            f"{ig},intergenic,{tas},{rng.randint(0, tas)},{rng.choice(calls)},ess_{c}\n"
+                        )
+                        ess_rows += 1
+    rows["essentiality"] = ess_rows
+
+    # orthologs: random cross-isolate pairs, some with descriptions
+    orthologs_tsv = os.path.join(out_dir, "orthologs.txt")
+    with open(orthologs_tsv, "w") as f:
+        f.write("# Format: Protein 1<tab>Protein 2<tab>Orthology type<tab>OMA group (if any)\n")
+        for i in range(scale.ortholog_pairs):
+            a_iso, b_iso = (
+                rng.sample(isolates, 2) if len(isolates) > 1 else (isolates[0], isolates[0])
+            )
+            a = locus_tag(a_iso, rng.randint(1, genes))
+            b = locus_tag(b_iso, rng.randint(1, genes))
+            if i % 4 == 0:
+                a += f" Synthetic protein {i % 313}"
+            kind = "1:1" if i % 3 else rng.choice(("1:m", "m:1", "m:n"))
+            f.write(f"{i}\t{i}\t{a}\t{b}\t{kind}\t{i % 5000 if i % 7 else ''}\n")
+    rows["orthologs"] = scale.ortholog_pairs
+
+    # PPI: pairs split over several CSVs
+    ppi_dir = os.path.join(out_dir, "ppi")
+    os.makedirs(ppi_dir, exist_ok=True)
+    header = (
+        "species,id,protein_a,protein_b,ds_score,tt_score,perturb_score,gp_score,melt_score,"
+        "sec_score,bn_score,string_physical_score,operon_score,ecocyc_score,xlms_peptides,xlms_files\n"
+    )
+    per_file = -(-scale.ppi_pairs // max(scale.ppi_files, 1))
+    written = 0
+    for k in range(max(scale.ppi_files, 1)):
+        with open(os.path.join(ppi_dir, f"ppi_{k:02d}.csv"), "w") as f:
+            f.write(header)
+            for _ in range(min(per_file, scale.ppi_pairs - written)):
+                a = f"Q{rng.randint(1, genes):05d}1"
+                b = f"Q{rng.randint(1, genes):05d}1"
+                scores = ",".join(
+                    f"{rng.random():.4f}" if rng.random() < 0.6 else "" for _ in range(10)
+                )
+                xl = "PEPTIDEK" if rng.random() < 0.05 else ""
+                f.write(f"{PPI_SPECIES},{written},{a},{b},{scores},{xl},\n")
+                written += 1
+    rows["ppi"] = written
+
+    return SyntheticInputs(
+        root=out_dir,
+        ftp_root=BENCH_FTP_ROOT,
+        isolates=isolates,
+        fitness_csv=fitness_csv,
+        essentiality_csv=essentiality_csv,
+        orthologs_tsv=orthologs_tsv,
+        ppi_dir=ppi_dir,
+        rows=rows,
+    )
@@ -0,0 +1,318 @@
+"""
+Shared bulk-indexing engine and ingest sessions.
+
+Every flow writes through BulkEngine.run() (via es_repo.bulk_exec or the
+repositories' bulk_index):
+  - batches by action count AND request size (max_chunk_bytes),
+  - sends batches from `threads` worker threads,
+  - retries rejected items (429) with exponential backoff,
+  - returns a BulkResult with success/failure counts and the first
+    BULK_MAX_KEPT_ERRORS failed items.
+
+ingest_session() wraps a whole import: it turns refresh off on the target
+concrete index(es) and restores the previous settings at the end. Dropping
+replicas and the final force-merge are opt-in, since both hurt an index that is
+already serving queries.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from elasticsearch import Elasticsearch
+from elasticsearch.helpers import streaming_bulk
+from elasticsearch_dsl import connections
+
+from dataportal.ingest.constants import (
+    BULK_CHUNK_SIZE,
+    BULK_INITIAL_BACKOFF,
+    BULK_MAX_BACKOFF,
+    BULK_MAX_CHUNK_BYTES,
+    BULK_MAX_KEPT_ERRORS,
+    BULK_MAX_RETRIES,
+    BULK_RETRY_ON_CONFLICT,
+    BULK_THREADS,
+    FORCE_MERGE_MAX_SEGMENTS,
+)
+
+
+@dataclass
+class BulkResult:
+    success: int = 0
+    failed: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def merge(self, other: "BulkResult", keep_errors: bool = True) -> None:
+        self.success += other.success
+        self.failed += other.failed
+        self.elapsed += other.elapsed
+        if keep_errors:
+            room = max(0, BULK_MAX_KEPT_ERRORS - len(self.errors))
+            self.errors.extend(other.errors[:room])
+
+    def summary(self) -> str:
+        rate = self.success / self.elapsed if self.elapsed else 0.0
+        return f"{self.success:,} ok, {self.failed:,} failed in {self.elapsed:.1f}s ({rate:,.0f} docs/s)"
+
+
+def _prepare(action: Dict[str, Any]) -> Dict[str, Any]:
+    if action.get("_op_type") == "update":
+        action.setdefault("retry_on_conflict", BULK_RETRY_ON_CONFLICT)
+    return action
+
+
+def _batches(actions: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch: List[Dict[str, Any]] = []
+    for action in actions:
+        batch.append(_prepare(action))
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class BulkEngine:
+    """Threaded bulk writer with byte-size batching and 429 backoff."""
+
+    def __init__(
+        self,
+        client: Optional[Elasticsearch] = None,
+        threads: int = BULK_THREADS,
+        chunk_size: int = BULK_CHUNK_SIZE,
+        max_chunk_bytes: int = BULK_MAX_CHUNK_BYTES,
+        max_retries: int = BULK_MAX_RETRIES,
+        initial_backoff: float = BULK_INITIAL_BACKOFF,
+        max_backoff: float = BULK_MAX_BACKOFF,
+    ):
+        self.client = client
+        self.threads = max(1, threads)
+        self.chunk_size = chunk_size
+        self.max_chunk_bytes = max_chunk_bytes
+        self.max_retries = max_retries
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        # running totals across run() calls (counts only), read by ingest_session
+        self.totals = BulkResult()
+        self._totals_lock = threading.Lock()
+
+    def _conn(self) -> Elasticsearch:
+        return self.client or connections.get_connection()
+
+    def _send(
+        self, batch: List[Dict[str, Any]], refresh=None, chunk_size: Optional[int] = None
+    ) -> BulkResult:
+        result = BulkResult()
+        kwargs = {"refresh": refresh} if refresh is not None else {}
+        for ok, item in streaming_bulk(
+            self._conn(),
+            batch,
+            chunk_size=chunk_size or self.chunk_size,
+            max_chunk_bytes=self.max_chunk_bytes,
+            raise_on_error=False,
+            raise_on_exception=False,
+            max_retries=self.max_retries,
+            initial_backoff=self.initial_backoff,
+            max_backoff=self.max_backoff,
+            **kwargs,
+        ):
+            if ok:
+                result.success += 1
+            else:
+                result.failed += 1
+                if len(result.errors) < BULK_MAX_KEPT_ERRORS:
+                    result.errors.append(item)
+        return result
+
+    def run(
+        self, actions: Iterable[Dict[str, Any]], refresh=None, chunk_size: Optional[int] = None
+    ) -> BulkResult:
+        """
+        Index `actions` and return the per-call BulkResult (never raises on item
+        failures). chunk_size overrides the engine's actions-per-request.
+        """
+        started = time.monotonic()
+        result = BulkResult()
+        chunk_size = chunk_size or self.chunk_size
+
+        if self.threads == 1:
+            result.merge(self._send([_prepare(a) for a in actions], refresh, chunk_size))
+        else:
+            max_in_flight = self.threads * 2
+            with ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="bulk") as pool:
+                in_flight = set()
+                for batch in _batches(actions, chunk_size):
+                    in_flight.add(pool.submit(self._send, batch, refresh, chunk_size))
+                    if len(in_flight) >= max_in_flight:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for f in done:
+                            result.merge(f.result())
+                for f in in_flight:
+                    result.merge(f.result())
+
+        result.elapsed = time.monotonic() - started
+        with self._totals_lock:
+            self.totals.merge(result, keep_errors=False)
+
+        if result.failed:
+            print(f"[bulk] {result.failed} failures (first 3 shown)")
+            for f in result.errors[:3]:
+                print(f"  -> {f}")
+        return result
+
+
+_engine = BulkEngine()
+
+
+def get_bulk_engine() -> BulkEngine:
+    return _engine
+
+
+def configure_bulk_engine(**kwargs) -> BulkEngine:
+    """Replace the shared engine, e.g. configure_bulk_engine(threads=8)."""
+    global _engine
+    _engine = BulkEngine(**{k: v for k, v in kwargs.items() if v is not None})
+    return _engine
+
+
+# -----------------------------
+# Ingest session
+# -----------------------------
+
+_active_sessions: set = set()
+
+
+def _concrete_indices(es: Elasticsearch, index: str) -> Dict[str, Dict[str, Any]]:
+    """{concrete_name: current index settings} for an index name or alias."""
+    resp = es.indices.get_settings(index=index)
+    return {name: body["settings"]["index"] for name, body in resp.items()}
+
+
+@contextmanager
+def ingest_session(
+    index: str,
+    client: Optional[Elasticsearch] = None,
+    drop_replicas: bool = False,
+    force_merge: bool = False,
+    max_num_segments: int = FORCE_MERGE_MAX_SEGMENTS,
+):
+    """
+    Fast-ingest settings for the duration of a block:
+
+        with ingest_session("feature_index-2025.09.03"):
+            Fitness(index_name=...).run(path)
+
+    Refresh is always turned off. Pass drop_replicas / force_merge only for an
+    index that is not serving traffic yet (e.g. a fresh build behind an alias).
+
+    Nested sessions on the same index are no-ops, so flows can open one even
+    when the calling command already did.
+    """
+    if index in _active_sessions:
+        yield get_bulk_engine()
+        return
+
+    es = client or connections.get_connection()
+    previous: Dict[str, Dict[str, Any]] = {}
+    try:
+        fast: Dict[str, Any] = {"refresh_interval": "-1"}
+        if drop_replicas:
+            fast["number_of_replicas"] = 0
+        for name, current in _concrete_indices(es, index).items():
+            previous[name] = {"refresh_interval": current.get("refresh_interval", "1s")}
+            if drop_replicas:
+                previous[name]["number_of_replicas"] = current.get("number_of_replicas", "1")
+        if previous:
+            es.indices.put_settings(index=",".join(previous), body={"index": fast})
+            print(
+                f"[bulk] ingest session on {', '.join(previous)}: refresh off"
+                + (", replicas 0" if drop_replicas else "")
+            )
+    except Exception as e:
+        print(f"[bulk] warn: could not apply ingest settings on {index}: {e}")
+
+    engine = get_bulk_engine()
+    written_before = engine.totals.success
+    _active_sessions.add(index)
+    try:
+        yield engine
+    finally:
+        _active_sessions.discard(index)
+        for name, settings in previous.items():
+            try:
+                es.indices.put_settings(index=name, body={"index": settings})
+            except Exception as e:
+                print(f"[bulk] warn: restore settings failed for {name}: {e}")
+        if previous:
+            try:
+                es.indices.refresh(index=",".join(previous))
+                if force_merge and engine.totals.success > written_before:
+                    es.options(request_timeout=3600).indices.forcemerge(
+                        index=",".join(previous),
+                        max_num_segments=max_num_segments,
+                        wait_for_completion=True,
+                    )
+            except Exception as e:
+                print(f"[bulk] warn: refresh/force-merge failed for {index}: {e}")
+            print(f"[bulk] ingest session on {index} done: {engine.totals.summary()}")
+
+
+# -----------------------------
+# Management command helpers
+# -----------------------------
+
+
+def add_bulk_arguments(parser) -> None:
+    parser.add_argument(
+        "--bulk-threads",
+        type=int,
+        default=None,
+        help=f"Bulk indexing threads (default: {BULK_THREADS})",
+    )
+    parser.add_argument(
+        "--bulk-max-mb",
+        type=int,
+        default=None,
+        help=f"Max bulk request size in MB (default: {BULK_MAX_CHUNK_BYTES // (1024 * 1024)})",
+    )
+    parser.add_argument(
+        "--no-ingest-session",
+        action="store_true",
+        help="Keep the refresh interval untouched during the import",
+    )
+    parser.add_argument(
+        "--drop-replicas",
+        action="store_true",
+        help="Set replicas to 0 during the import (only for an index not serving traffic yet)",
+    )
+    parser.add_argument(
+        "--force-merge",
+        action="store_true",
+        help=f"Force-merge to {FORCE_MERGE_MAX_SEGMENTS} segment(s) after the import",
+    )
+
+
+def configure_bulk_engine_from_options(options: Dict[str, Any]) -> BulkEngine:
+    max_mb = options.get("bulk_max_mb")
+    return configure_bulk_engine(
+        threads=options.get("bulk_threads"),
+        max_chunk_bytes=max_mb * 1024 * 1024 if max_mb else None,
+    )
+
+
+def ingest_session_from_options(index: str, options: Dict[str, Any]):
+    """Configure the shared engine from add_bulk_arguments() options and open a session."""
+    configure_bulk_engine_from_options(options)
+    if options.get("no_ingest_session") or not index:
+        return nullcontext(get_bulk_engine())
+    return ingest_session(
+        index,
+        drop_replicas=bool(options.get("drop_replicas")),
+        force_merge=bool(options.get("force_merge")),
+    )
@@ -0,0 +1,266 @@
+"""
+Resumable ingest checkpoints.
+
+Each import command is a *job* (command + target index). Within a job, every
+input unit (a CSV/TSV file, or e.g. an isolate's GFFs) gets a row in a small
+SQLite state store with its content fingerprint, the last committed chunk, the
+number of committed source rows, write counts and whether it completed.
+
+Flows mark chunks as handed to their writers (chunk_done) and commit once the
+writers have flushed, so a committed chunk is always durable in Elasticsearch.
+A fresh run resets the job; `--resume` keeps the state, skips completed units
+and continues partially ingested files after their last committed chunk. Units
+whose fingerprint changed since the checkpoint are restarted from the top.
+
+Re-sending the chunks after the last commit is safe because the writes are
+idempotent (index ops, or nested merges that de-duplicate entries).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from dataportal.ingest.constants import INGEST_STATE_DB
+
+_SAMPLE_BYTES = 1024 * 1024
+
+_DDL = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    job TEXT NOT NULL,
+    unit TEXT NOT NULL,
+    fingerprint TEXT,
+    chunk INTEGER NOT NULL DEFAULT -1,
+    rows INTEGER NOT NULL DEFAULT 0,
+    success INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    done INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL,
+    PRIMARY KEY (job, unit)
+)
+"""
+
+
+def file_fingerprint(path: str) -> str:
+    """Cheap content fingerprint: size plus sha256 of the first and last MiB."""
+    size = os.path.getsize(path)
+    h = hashlib.sha256(str(size).encode())
+    with open(path, "rb") as f:
+        h.update(f.read(_SAMPLE_BYTES))
+        if size > _SAMPLE_BYTES:
+            f.seek(max(size - _SAMPLE_BYTES, _SAMPLE_BYTES))
+            h.update(f.read(_SAMPLE_BYTES))
+    return h.hexdigest()
+
+
+class CheckpointStore:
+    """SQLite table of per-unit progress, shared by all import commands."""
+
+    def __init__(self, path: str = INGEST_STATE_DB):
+        self.path = os.path.expanduser(path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=60, check_same_thread=False)
+            self._conn.execute(_DDL)
+        return self._conn
+
+    def load(self, job: str, unit: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            cur = self._db().execute(
+                "SELECT fingerprint, chunk, rows, success, failed, done FROM checkpoints "
+                "WHERE job = ? AND unit = ?",
+                (job, unit),
+            )
+            row = cur.fetchone()
+        if row is None:
+            return None
+        keys = ("fingerprint", "chunk", "rows", "success", "failed", "done")
+        return dict(zip(keys, row))
+
+    def save(self, job: str, unit: str, **state) -> None:
+        with self._lock, self._db() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO checkpoints "
+                "(job, unit, fingerprint, chunk, rows, success, failed, done, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job,
+                    unit,
+                    state.get("fingerprint"),
+                    state.get("chunk", -1),
+                    state.get("rows", 0),
+                    state.get("success", 0),
+                    state.get("failed", 0),
+                    int(bool(state.get("done"))),
+                    time.time(),
+                ),
+            )
+
+    def reset(self, job: str) -> None:
+        with self._lock, self._db() as db:
+            db.execute("DELETE FROM checkpoints WHERE job = ?", (job,))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+
+
+class FileCheckpoint:
+    """
+    Progress of one input unit. Typical flow usage:
+
+        for i, chunk in enumerate(chunks):
+            if checkpoint.skip(i):
+                continue
+            ...hand rows to writers...
+            checkpoint.chunk_done(i, len(chunk))
+        # writers call checkpoint.commit() after each flush
+    """
+
+    def __init__(
+        self,
+        store: Optional[CheckpointStore],
+        job: str,
+        unit: str,
+        fingerprint: Optional[str] = None,
+        state: Optional[Dict[str, Any]] = None,
+    ):
+        self.store = store
+        self.job = job
+        self.unit = unit
+        self.fingerprint = fingerprint
+        state = state or {}
+        self.chunk = state.get("chunk", -1)  # last committed chunk
+        self.rows = state.get("rows", 0)  # source rows up to that chunk
+        self.success = state.get("success", 0)
+        self.failed = state.get("failed", 0)
+        self.done = bool(state.get("done"))
+        self._pending_chunk = self.chunk
+        self._pending_rows = self.rows
+        # a flush had failed writes this run: the checkpoint stays before them
+        self.blocked = False
+
+    @property
+    def next_chunk(self) -> int:
+        return self.chunk + 1
+
+    def skip(self, chunk_index: int) -> bool:
+        """True for chunks committed by a previous run."""
+        return chunk_index <= self.chunk
+
+    def chunk_done(self, chunk_index: int, rows: int) -> None:
+        """All rows of `chunk_index` were handed to the writers (not necessarily flushed yet)."""
+        self._pending_chunk = chunk_index
+        self._pending_rows += rows
+
+    def commit(self, success: int = 0, failed: int = 0) -> None:
+        """
+        Writers flushed: everything up to the last chunk_done() is durable.
+
+        If the flush had failed writes the checkpoint does not move, for the
+        rest of the run, so --resume sends those chunks again.
+        """
+        self.success += success
+        self.failed += failed
+        if failed and not self.blocked:
+            self.blocked = True
+            print(
+                f"[checkpoint] {failed:,} writes failed in {self.unit}; "
+                f"keeping its checkpoint after chunk {self.chunk} for --resume"
+            )
+        if not self.blocked:
+            self.chunk = self._pending_chunk
+            self.rows = self._pending_rows
+        self._save()
+
+    def finish(self) -> None:
+        self.commit()
+        if self.blocked:
+            print(f"[checkpoint] {self.unit} not marked complete because of failed writes")
+            return
+        self.done = True
+        self._save()
+
+    def _save(self) -> None:
+        if self.store is not None:
+            self.store.save(
+                self.job,
+                self.unit,
+                fingerprint=self.fingerprint,
+                chunk=self.chunk,
+                rows=self.rows,
+                success=self.success,
+                failed=self.failed,
+                done=self.done,
+            )
+
+
+class IngestCheckpoints:
+    """Checkpoints of one import job (command + index)."""
+
+    def __init__(self, job: str, resume: bool = False, store: Optional[CheckpointStore] = None):
+        self.job = job
+        self.resume = resume
+        self.store = store
+        if store is not None and not resume:
+            store.reset(job)
+
+    def unit(self, name: str, fingerprint: Optional[str] = None) -> FileCheckpoint:
+        state = None
+        if self.store is not None and self.resume:
+            state = self.store.load(self.job, name)
+            if state and fingerprint and state["fingerprint"] not in (None, fingerprint):
+                print(f"[checkpoint] {name} changed since the last run; restarting it")
+                state = None
+        ck = FileCheckpoint(self.store, self.job, name, fingerprint, state)
+        if ck.done:
+            print(f"[checkpoint] skipping completed {name} ({ck.rows:,} rows)")
+        elif ck.chunk >= 0:
+            print(f"[checkpoint] resuming {name} after chunk {ck.chunk} ({ck.rows:,} rows)")
+        return ck
+
+    def file(self, path: str) -> FileCheckpoint:
+        path = os.path.abspath(path)
+        return self.unit(path, file_fingerprint(path))
+
+    def pending(self, paths: Iterable[str]) -> Iterator[Tuple[str, FileCheckpoint]]:
+        """Yield (path, checkpoint) for every file not completed by a previous run."""
+        for path in paths:
+            ck = self.file(path)
+            if not ck.done:
+                yield path, ck
+
+
+# -----------------------------
+# Management command helpers
+# -----------------------------
+
+
+def add_checkpoint_arguments(parser) -> None:
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue from the last committed chunk of a previous run of this command and index",
+    )
+    parser.add_argument(
+        "--state-db",
+        default=None,
+        help=f"Checkpoint store (default: {INGEST_STATE_DB})",
+    )
+
+
+def checkpoints_from_options(
+    command: str, index: str, options: Dict[str, Any]
+) -> IngestCheckpoints:
+    store = CheckpointStore(options.get("state_db") or INGEST_STATE_DB)
+    return IngestCheckpoints(f"{command}:{index}", resume=bool(options.get("resume")), store=store)
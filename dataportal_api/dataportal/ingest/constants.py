@@ -1,4 +1,19 @@
-BATCH_SIZE = 500
+import os
+
+# Actions a flow buffers before handing them to the bulk engine; the engine
+# splits them into BULK_CHUNK_SIZE requests spread over BULK_THREADS threads.
+BATCH_SIZE = 5000
+
+BULK_THREADS = 4
+BULK_CHUNK_SIZE = 500
+BULK_MAX_CHUNK_BYTES = 10 * 1024 * 1024
+BULK_MAX_RETRIES = 5  # retries of 429-rejected items, with exponential backoff
+BULK_INITIAL_BACKOFF = 2
+BULK_MAX_BACKOFF = 60
+# parallel batches may update the same doc concurrently
+BULK_RETRY_ON_CONFLICT = 3
+BULK_MAX_KEPT_ERRORS = 100  # failed items kept on a BulkResult; `failed` counts them all
+FORCE_MERGE_MAX_SEGMENTS = 1
 
 VALID_ESSENTIALITY = {
     "essential", "essential_liquid", "essential_solid",
@@ -15,3 +30,28 @@ SPECIES_BY_NAME = {
     "Phocaeicola vulgatus": "PV",
 }
 
+
+# Grouped nested-array ingest: flush buffered per-document groups once this many
+# entries are held in memory (a doc split across flushes is merged server-side).
+GROUP_FLUSH_ENTRIES = 200_000
+# ... and cap nested entries per bulk engine hand-off (the engine splits by bytes)
+GROUP_BULK_MAX_ENTRIES = 50_000
+
+# Local cache for FTP inputs (GFF/FAA/FASTA), keyed by remote path + size + MDTM
+FTP_CACHE_DIR = os.getenv(
+    "METT_FTP_CACHE_DIR", os.path.join("~", ".cache", "mett-dataportal", "ftp")
+)
+FTP_MAX_CONNECTIONS = int(os.getenv("METT_FTP_MAX_CONNECTIONS", "4"))
+
+# Compiled gene annotation stores (one SQLite file per annotation release)
+ANNOTATION_STORE_DIR = os.getenv(
+    "METT_ANNOTATION_STORE_DIR", os.path.join("~", ".cache", "mett-dataportal", "annotations")
+)
+
+# PPI CSV files parsed in parallel reader processes (see ppi/flows/ppi_csv.py)
+PPI_FILE_WORKERS = int(os.getenv("METT_PPI_FILE_WORKERS", "2"))
+
+# Per-file/per-chunk checkpoints of import commands (see ingest/checkpoints.py)
+INGEST_STATE_DB = os.getenv(
+    "METT_INGEST_STATE_DB", os.path.join("~", ".cache", "mett-dataportal", "ingest_state.sqlite")
+)
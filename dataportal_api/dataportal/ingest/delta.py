@@ -0,0 +1,242 @@
+"""
+Delta ingest: skip documents whose content did not change.
+
+Flows that build whole documents (GFF gene features, orthologs, PPI) get a
+DeltaFilter. It stamps a content fingerprint (`content_fingerprint`, keyword)
+on every generated document, compares each batch against the fingerprints
+already stored in the index and drops unchanged documents before they reach
+the bulk engine. A routine refresh therefore writes only new and changed
+documents; documents in the filter's scope that the run no longer produced can
+be deleted at the end (`--delete-missing`).
+
+Existing fingerprints come either from one scan loaded into memory up front
+(mode="scan": one pass over the index, best for full refreshes) or from an
+mget per batch (mode="mget": no memory cost, best when only part of the corpus
+is re-ingested).
+
+Nested analytics (fitness, essentiality, ...) are not fingerprinted; their
+merge scripts are already idempotent and keep being applied per file.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+from elasticsearch import Elasticsearch
+from elasticsearch.helpers import scan
+from elasticsearch_dsl import connections
+
+from dataportal.ingest.constants import BATCH_SIZE
+from dataportal.ingest.es_repo import bulk_exec
+
+FINGERPRINT_FIELD = "content_fingerprint"
+DELTA_MODES = ("scan", "mget")
+
+_MISSING = object()
+
+
+def doc_fingerprint(source: Dict[str, Any]) -> str:
+    """Stable hash of a document body (key order independent, fingerprint field excluded)."""
+    payload = {k: v for k, v in source.items() if k != FINGERPRINT_FIELD}
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(blob.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass
+class DeltaStats:
+    new: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"new={self.new:,} changed={self.changed:,} "
+            f"unchanged={self.unchanged:,} deleted={self.deleted:,}"
+        )
+
+
+class DeltaFilter:
+    """
+    Drops index actions whose document is unchanged in `index`.
+
+    `query` limits the scope used for the fingerprint scan and for stale-doc
+    deletion (e.g. the gene features of the isolates being ingested).
+    """
+
+    def __init__(
+        self,
+        index: str,
+        client: Optional[Elasticsearch] = None,
+        mode: str = "scan",
+        query: Optional[Dict[str, Any]] = None,
+        delete_missing: bool = False,
+    ):
+        if mode not in DELTA_MODES:
+            raise ValueError(f"Unknown delta mode {mode!r}; expected one of {DELTA_MODES}")
+        self.index = index
+        self.client = client
+        self.mode = mode
+        self.query = query
+        self.delete_missing = delete_missing
+        self.stats = DeltaStats()
+        self._existing: Optional[Dict[str, Optional[str]]] = None
+        self._seen: set = set()
+
+    def _conn(self) -> Elasticsearch:
+        return self.client or connections.get_connection()
+
+    def restrict(self, query: Dict[str, Any]) -> None:
+        """Set the scope before the first batch (the scan is loaded lazily)."""
+        if self._existing is not None:
+            raise RuntimeError("DeltaFilter scope must be set before the first batch")
+        self.query = query
+
+    # ---------- existing fingerprints ----------
+
+    def _scan(self, source) -> Iterable[Dict[str, Any]]:
+        body = {"query": self.query or {"match_all": {}}, "_source": source}
+        return scan(self._conn(), index=self.index, query=body, size=BATCH_SIZE)
+
+    def _load(self) -> Dict[str, Optional[str]]:
+        if self._existing is None:
+            es = self._conn()
+            if not es.indices.exists(index=self.index):
+                self._existing = {}
+            else:
+                self._existing = {
+                    hit["_id"]: (hit.get("_source") or {}).get(FINGERPRINT_FIELD)
+                    for hit in self._scan([FINGERPRINT_FIELD])
+                }
+            print(f"[delta] {self.index}: {len(self._existing):,} existing fingerprints loaded")
+        return self._existing
+
+    def _lookup(self, ids: List[str]) -> Dict[str, Optional[str]]:
+        if not ids:
+            return {}
+        if self.mode == "scan":
+            existing = self._load()
+            return {i: existing[i] for i in ids if i in existing}
+        resp = self._conn().mget(index=self.index, ids=ids, _source=[FINGERPRINT_FIELD])
+        return {
+            d["_id"]: (d.get("_source") or {}).get(FINGERPRINT_FIELD)
+            for d in resp["docs"]
+            if d.get("found")
+        }
+
+    # ---------- filtering ----------
+
+    def filter(self, actions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Stamp fingerprints on index/create actions and return only the actions
+        that must be written. Other action types pass through untouched.
+        """
+        keep: List[Dict[str, Any]] = []
+        candidates = []
+        for action in actions:
+            if (
+                action.get("_op_type", "index") not in ("index", "create")
+                or "_source" not in action
+            ):
+                keep.append(action)
+                continue
+            source = action["_source"]
+            fp = doc_fingerprint(source)
+            source[FINGERPRINT_FIELD] = fp
+            candidates.append((str(action["_id"]), fp, action))
+
+        existing = self._lookup([c[0] for c in candidates])
+        for doc_id, fp, action in candidates:
+            self._seen.add(doc_id)
+            old = existing.get(doc_id, _MISSING)
+            if old == fp:
+                self.stats.unchanged += 1
+                continue
+            if old is _MISSING:
+                self.stats.new += 1
+            else:
+                self.stats.changed += 1
+            keep.append(action)
+            if self._existing is not None:
+                # a later batch may rebuild the same doc; compare against what we just sent
+                self._existing[doc_id] = fp
+        return keep
+
+    # ---------- deletions ----------
+
+    def stale_ids(self) -> List[str]:
+        """Ids in scope that this run did not produce."""
+        if self._existing is not None:
+            return sorted(set(self._existing) - self._seen)
+        if not self._conn().indices.exists(index=self.index):
+            return []
+        return sorted(hit["_id"] for hit in self._scan(False) if hit["_id"] not in self._seen)
+
+    def delete_stale(self) -> int:
+        ids = self.stale_ids()
+        if ids:
+            bulk_exec({"_op_type": "delete", "_index": self.index, "_id": i} for i in ids)
+        self.stats.deleted += len(ids)
+        if self._existing is not None:
+            for i in ids:
+                self._existing.pop(i, None)
+        return len(ids)
+
+    def finish(self, delete: bool = True) -> DeltaStats:
+        """Delete stale docs (when enabled and `delete`) and print the diff summary."""
+        if self.delete_missing:
+            if delete:
+                self.delete_stale()
+            else:
+                print(f"[delta] {self.index}: not deleting missing docs after an incomplete run")
+        print(f"[delta] {self.index}: {self.stats.summary()}")
+        return self.stats
+
+
+# -----------------------------
+# Management command helpers
+# -----------------------------
+
+
+def add_delta_arguments(parser) -> None:
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help="Fingerprint generated documents and write only new or changed ones",
+    )
+    parser.add_argument(
+        "--delta-mode",
+        choices=DELTA_MODES,
+        default="scan",
+        help="How existing fingerprints are read: one scan into memory, or an mget per batch (default: scan)",
+    )
+    parser.add_argument(
+        "--delete-missing",
+        action="store_true",
+        help="With --delta, delete documents in scope that this run no longer produced",
+    )
+
+
+def delta_from_options(
+    index: str,
+    options: Dict[str, Any],
+    query: Optional[Dict[str, Any]] = None,
+    client: Optional[Elasticsearch] = None,
+) -> Optional[DeltaFilter]:
+    if not options.get("delta"):
+        return None
+    delete_missing = bool(options.get("delete_missing"))
+    if delete_missing and options.get("resume"):
+        # units skipped by --resume are not seen, so they would look deleted
+        print("[delta] --delete-missing is ignored together with --resume")
+        delete_missing = False
+    return DeltaFilter(
+        index,
+        client=client,
+        mode=options.get("delta_mode") or "scan",
+        query=query,
+        delete_missing=delete_missing,
+    )
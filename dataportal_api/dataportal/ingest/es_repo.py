@@ -4,9 +4,11 @@ from dataclasses import dataclass
 from typing import Iterable, Optional, Tuple, List, Dict, Any
 
 from elasticsearch import Elasticsearch, NotFoundError
-from elasticsearch.helpers import bulk as es_bulk, BulkIndexError, bulk
+from elasticsearch.helpers import BulkIndexError
 from elasticsearch_dsl import connections
 
+from dataportal.ingest.bulk import BulkEngine, get_bulk_engine
+
 from dataportal.models import (
     StrainDocument,
     FeatureDocument,
@@ -95,6 +97,14 @@ class PPIIndexRepository:
     def _conn(self) -> Elasticsearch:
         return self.client or connections.get_connection()
 
+    def _engine(self) -> BulkEngine:
+        shared = get_bulk_engine()
+        if self.client is None:
+            return shared
+        return BulkEngine(
+            client=self.client, threads=shared.threads, max_chunk_bytes=shared.max_chunk_bytes
+        )
+
     def ensure_index(self) -> None:
         es = self._conn()
         # If concrete index exists, we're good.
@@ -140,26 +150,10 @@ class PPIIndexRepository:
         if not acts:
             return 0, []
 
-        try:
-            success, failures = es_bulk(
-                self._conn(),
-                acts,
-                chunk_size=chunk_size,
-                raise_on_error=raise_on_error,
-                refresh=refresh,
-            )
-            if failures:
-                # keep your lightweight logging style
-                print(f"[es_repo] PPI bulk failures: {len(failures)} (first 3 shown)")
-                for f in failures[:3]:
-                    print(f"  -> {f}")
-            return success, failures
-        except BulkIndexError as e:
-            errs = getattr(e, "errors", [])
-            print(f"[es_repo] PPI BulkIndexError with {len(errs)} errors (first 3 shown)")
-            for f in errs[:3]:
-                print(f"  -> {f}")
-            return 0, errs
+        result = self._engine().run(acts, refresh=refresh, chunk_size=chunk_size)
+        if result.failed and raise_on_error:
+            raise BulkIndexError(f"{result.failed} document(s) failed to index", result.errors)
+        return result.success, result.errors
 
 @dataclass
 class OperonIndexRepository:
@@ -195,6 +189,14 @@ class GeneFitnessCorrelationIndexRepository:
     def _conn(self) -> Elasticsearch:
         return self.client or connections.get_connection()
 
+    def _engine(self) -> BulkEngine:
+        shared = get_bulk_engine()
+        if self.client is None:
+            return shared
+        return BulkEngine(
+            client=self.client, threads=shared.threads, max_chunk_bytes=shared.max_chunk_bytes
+        )
+
     def ensure_index(self) -> None:
         es = self._conn()
         if es.indices.exists(index=self.concrete_index):
@@ -238,25 +240,10 @@ class GeneFitnessCorrelationIndexRepository:
         if not acts:
             return 0, []
 
-        try:
-            success, failures = es_bulk(
-                self._conn(),
-                acts,
-                chunk_size=chunk_size,
-                raise_on_error=raise_on_error,
-                refresh=refresh,
-            )
-            if failures:
-                print(f"[es_repo] GeneFitnessCorrelation bulk failures: {len(failures)} (first 3 shown)")
-                for f in failures[:3]:
-                    print(f"  -> {f}")
-            return success, failures
-        except BulkIndexError as e:
-            errs = getattr(e, "errors", [])
-            print(f"[es_repo] GeneFitnessCorrelation BulkIndexError with {len(errs)} errors (first 3 shown)")
-            for f in errs[:3]:
-                print(f"  -> {f}")
-            return 0, errs
+        result = self._engine().run(acts, refresh=refresh, chunk_size=chunk_size)
+        if result.failed and raise_on_error:
+            raise BulkIndexError(f"{result.failed} document(s) failed to index", result.errors)
+        return result.success, result.errors
 
 # -----------------------------
 # Bulk utilities
@@ -266,8 +253,9 @@ def bulk_exec(
         actions: Iterable[Dict[str, Any]],
 ) -> Tuple[int, List[Dict[str, Any]]]:
     """
-    Execute a bulk request using the default elasticsearch_dsl connection.
-    Returns (success_count, failures_list). Does not raise on partial failures.
+    Execute bulk actions through the shared bulk engine (threaded, byte-size
+    batched, 429 retries). Returns (success_count, failures_list).
+    Does not raise on partial failures.
     """
     # materialize once so we can check emptiness and reuse
     if not isinstance(actions, list):
@@ -276,23 +264,8 @@ def bulk_exec(
     if not actions:
         return 0, []
 
-    try:
-        success, failures = bulk(
-            connections.get_connection(),
-            actions,
-            raise_on_error=False,
-        )
-        if failures:
-            print(f"[es_repo] Bulk failures: {len(failures)} (first 3 shown)")
-            for f in failures[:3]:
-                print(f"  -> {f}")
-        return success, failures
-    except BulkIndexError as e:
-        errs = getattr(e, "errors", [])
-        print(f"[es_repo] BulkIndexError with {len(errs)} errors (first 3 shown)")
-        for f in errs[:3]:
-            print(f"  -> {f}")
-        return 0, errs
+    result = get_bulk_engine().run(actions)
+    return result.success, result.errors
 
 
 # -----------------------------
@@ -322,7 +295,8 @@ ctx._source[params.field].add(params.entry);
 
 SCRIPT_APPEND_AND_SET_FLAG = """
 if (ctx._source[params.field] == null) { ctx._source[params.field] = []; }
-ctx._source[params.field].add(params.entry);
+// skip exact duplicates so replayed rows (resumed runs) do not append twice
+if (!ctx._source[params.field].contains(params.entry)) { ctx._source[params.field].add(params.entry); }
 ctx._source[params.flag_field] = true;
 """
 
@@ -379,3 +353,40 @@ if (params.legacy != null && ctx._source.essentiality == null) {
   ctx._source.essentiality = params.legacy;
 }
 """
+
+
+SCRIPT_MERGE_NESTED_GROUPED = """
+if (ctx._source == null) { ctx._source = [:]; }
+
+// 1) Merge base fields (only if missing to avoid clobbering)
+if (params.base != null) {
+  for (entry in params.base.entrySet()) {
+    if (ctx._source[entry.getKey()] == null) { ctx._source[entry.getKey()] = entry.getValue(); }
+  }
+}
+
+// 2) Merge the whole group of entries; de-dup by keys with one pass over the existing array
+def field = params.field;
+if (ctx._source[field] == null) { ctx._source[field] = []; }
+def items = ctx._source[field];
+if (params.keys == null) {
+  // exact-duplicate check keeps re-sent groups (e.g. resumed runs) idempotent
+  for (ent in params.entries) {
+    if (!items.contains(ent)) { items.add(ent); }
+  }
+} else {
+  Set seen = new HashSet();
+  for (item in items) {
+    List key = new ArrayList();
+    for (k in params.keys) { key.add(item[k]); }
+    seen.add(key);
+  }
+  for (ent in params.entries) {
+    List key = new ArrayList();
+    for (k in params.keys) { key.add(ent[k]); }
+    if (seen.add(key)) { items.add(ent); }
+  }
+}
+
+if (params.flag_field != null) { ctx._source[params.flag_field] = true; }
+"""
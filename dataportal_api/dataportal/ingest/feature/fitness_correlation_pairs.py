@@ -0,0 +1,115 @@
+"""
+All-pairs gene fitness correlations computed from the fitness matrices
+(dataportal/utils/fitness_matrix.py) instead of an externally produced CSV.
+
+The gene x gene correlation matrix is never held in memory: it is computed in
+square blocks of `block_size` genes (upper triangle only) as float32 matrix
+products, spread over a pool of worker processes. Each block is thresholded
+on |r| and the shared contrast count before it leaves the worker, so only
+surviving pairs travel back, as frames with the FitnessCorrelationFlow columns
+(gene_a, gene_b, value).
+"""
+
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from dataportal.utils.fitness_matrix import FitnessMatrix, correlate, fitness_profiles
+
+# per worker process: (locus tags, profiles, masks), set by _init_worker
+_profiles: Optional[Tuple[List[str], np.ndarray, np.ndarray]] = None
+
+
+def _init_worker(
+    path: str, cols: Optional[np.ndarray], method: str, min_barcodes: Optional[int]
+) -> None:
+    global _profiles
+    matrix = FitnessMatrix(path)
+    x, mask = fitness_profiles(matrix, cols, method, min_barcodes, dtype=np.float32)
+    _profiles = (matrix.locus_tags, x, mask)
+
+
+def _block_pairs(
+    rows: Tuple[int, int], cols: Tuple[int, int], min_correlation: float, min_conditions: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(row, col, r) of the pairs of one block passing both thresholds; self pairs excluded."""
+    _, x, mask = _profiles
+    (r0, r1), (c0, c1) = rows, cols
+    r, n = correlate(x[r0:r1], mask[r0:r1], x[c0:c1], mask[c0:c1])
+    keep = (n >= min_conditions) & (np.abs(r) >= min_correlation)  # NaN never passes
+    if r0 == c0:
+        keep &= np.triu(np.ones(keep.shape, dtype=bool), k=1)
+    i, j = np.nonzero(keep)
+    return i + r0, j + c0, r[i, j]
+
+
+def _blocks(genes: int, block_size: int) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    bounds = [(start, min(start + block_size, genes)) for start in range(0, genes, block_size)]
+    return [(bounds[a], bounds[b]) for a in range(len(bounds)) for b in range(a, len(bounds))]
+
+
+def correlation_pairs(
+    matrix: FitnessMatrix,
+    cols: Optional[np.ndarray] = None,
+    method: str = "pearson",
+    min_barcodes: Optional[int] = None,
+    min_conditions: int = 3,
+    min_correlation: float = 0.3,
+    block_size: int = 1024,
+    workers: int = 1,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield one frame (gene_a, gene_b, value, plus the genes' names and UniProt
+    IDs from the matrix as gene_a_name, gene_a_uniprot_id, ...) per block of
+    gene pairs whose
+    correlation over the contrasts `cols` has |r| >= min_correlation and at
+    least `min_conditions` shared contrasts. With workers > 1 blocks are
+    computed in forked processes, at most two per worker in flight.
+    """
+    blocks = _blocks(matrix.shape[0], block_size)
+    locus_tags = np.array(matrix.locus_tags, dtype=object)
+    gene_names = np.array(matrix.gene_names, dtype=object)
+    uniprot_ids = np.array(matrix.uniprot_ids, dtype=object)
+    initargs = (matrix.path, cols, method, min_barcodes)
+    thresholds = (min_correlation, min_conditions)
+
+    def frame(result) -> pd.DataFrame:
+        i, j, r = result
+        return pd.DataFrame(
+            {
+                "gene_a": locus_tags[i],
+                "gene_b": locus_tags[j],
+                "value": r.astype(np.float64),
+                "gene_a_name": gene_names[i],
+                "gene_b_name": gene_names[j],
+                "gene_a_uniprot_id": uniprot_ids[i],
+                "gene_b_uniprot_id": uniprot_ids[j],
+            }
+        )
+
+    if workers <= 1 or len(blocks) == 1:
+        _init_worker(*initargs)
+        for rows, block_cols in blocks:
+            yield frame(_block_pairs(rows, block_cols, *thresholds))
+        return
+
+    ctx = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=ctx, initializer=_init_worker, initargs=initargs
+    ) as pool:
+        pending = iter(blocks)
+        inflight = set()
+        while True:
+            # bounded: no more than two blocks per worker computed ahead of the writer
+            for rows, block_cols in pending:
+                inflight.add(pool.submit(_block_pairs, rows, block_cols, *thresholds))
+                if len(inflight) >= workers * 2:
+                    break
+            if not inflight:
+                break
+            done, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield frame(future.result())
@@ -0,0 +1,191 @@
+"""
+Materialises the gene fitness data as dense per-isolate gene x contrast
+matrices (see dataportal/utils/fitness_matrix.py for the on-disk format).
+
+Input is either the fitness LFC CSVs (same columns as the Fitness flow) or the
+`fitness` nested arrays already ingested into the feature index. Only genes
+are kept; intergenic (IG) features have no place in a gene matrix.
+"""
+
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from elasticsearch_dsl import Search
+
+from dataportal.ingest.utils import extract_isolate_from_locus_tag, pick
+from dataportal.utils.fitness_matrix import write_matrix
+
+
+def _float(value) -> float:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return np.nan
+    return value
+
+
+def _int(value) -> int:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return -1
+    return -1 if np.isnan(value) else int(value)
+
+
+class FitnessMatrixBuilder:
+    """
+    Collects fitness entries per isolate and writes one matrix per isolate.
+
+    A (gene, contrast) seen twice keeps the last entry. Columns are keyed by
+    contrast, falling back to the experimental condition like the Fitness flow.
+    """
+
+    def __init__(self):
+        # isolate -> {(locus_tag, contrast): (lfc, fdr, barcodes)}
+        self._cells: Dict[str, Dict[Tuple[str, str], Tuple[float, float, int]]] = {}
+        # isolate -> {locus_tag: (uniprot_id, gene_name)}
+        self._genes: Dict[str, Dict[str, Tuple[Optional[str], Optional[str]]]] = {}
+        # isolate -> {contrast: experimental_condition}
+        self._conditions: Dict[str, Dict[str, Optional[str]]] = {}
+        self.sources = []
+
+    def add_gene(
+        self,
+        isolate: str,
+        locus_tag: str,
+        uniprot_id: Optional[str] = None,
+        gene_name: Optional[str] = None,
+    ) -> None:
+        genes = self._genes.setdefault(isolate, {})
+        known = genes.get(locus_tag, (None, None))
+        genes[locus_tag] = (uniprot_id or known[0], gene_name or known[1])
+
+    def add(
+        self,
+        isolate: str,
+        locus_tag: str,
+        contrast: str,
+        lfc=None,
+        fdr=None,
+        barcodes=None,
+        condition: Optional[str] = None,
+    ) -> None:
+        self.add_gene(isolate, locus_tag)
+        self._cells.setdefault(isolate, {})[(locus_tag, contrast)] = (
+            _float(lfc),
+            _float(fdr),
+            _int(barcodes),
+        )
+        conditions = self._conditions.setdefault(isolate, {})
+        if conditions.get(contrast) is None:
+            conditions[contrast] = condition
+
+    def _add_entry(self, isolate: str, locus_tag: str, entry: dict) -> bool:
+        contrast = pick(entry, "contrast", "experimental_condition")
+        if contrast is None:
+            return False
+        self.add(
+            isolate,
+            locus_tag,
+            str(contrast),
+            lfc=pick(entry, "lfc", "LFC"),
+            fdr=pick(entry, "fdr", "FDR"),
+            barcodes=entry.get("number_of_barcodes"),
+            condition=pick(entry, "experimental_condition", "contrast"),
+        )
+        return True
+
+    def add_csv(self, csv_path: str, isolates: Optional[Iterable[str]] = None) -> int:
+        """Add the rows of one fitness LFC CSV; returns the number of entries kept."""
+        wanted = set(isolates) if isolates else None
+        kept = 0
+        for chunk in pd.read_csv(csv_path, chunksize=10000):
+            for rec in chunk.to_dict(orient="records"):
+                rec = {k: v for k, v in rec.items() if not (isinstance(v, float) and np.isnan(v))}
+                locus_tag = str(pick(rec, "locus_tag", "Name", default="") or "").strip()
+                if not locus_tag or locus_tag.startswith(("IG-between-", "IG:")):
+                    continue
+                isolate = extract_isolate_from_locus_tag(locus_tag)
+                if not isolate or (wanted is not None and isolate not in wanted):
+                    continue
+                kept += self._add_entry(isolate, locus_tag, rec)
+        self.sources.append(csv_path)
+        return kept
+
+    def add_index(self, index_name: str, isolates: Optional[Iterable[str]] = None) -> int:
+        """Add the fitness arrays of every gene document in `index_name`; returns genes read."""
+        search = (
+            Search(index=index_name)
+            .filter("term", has_fitness=True)
+            .filter("term", feature_type="gene")
+            .source(["isolate_name", "locus_tag", "uniprot_id", "gene_name", "fitness"])
+            .params(size=1000)
+        )
+        if isolates:
+            search = search.filter("terms", isolate_name=list(isolates))
+        genes = 0
+        for hit in search.scan():
+            doc = hit.to_dict()
+            locus_tag = doc.get("locus_tag") or hit.meta.id
+            isolate = doc.get("isolate_name") or extract_isolate_from_locus_tag(locus_tag)
+            if not isolate:
+                continue
+            self.add_gene(isolate, locus_tag, doc.get("uniprot_id"), doc.get("gene_name"))
+            for entry in doc.get("fitness") or []:
+                self._add_entry(isolate, locus_tag, entry)
+            genes += 1
+        self.sources.append(f"index:{index_name}")
+        return genes
+
+    def isolates(self):
+        return sorted(self._cells)
+
+    def shape(self, isolate: str) -> Tuple[int, int]:
+        return len(self._genes.get(isolate, {})), len(self._conditions.get(isolate, {}))
+
+    def arrays(self, isolate: str):
+        """(locus_tags, contrasts, {field: array}) of one isolate, genes and contrasts sorted."""
+        cells = self._cells.get(isolate, {})
+        genes = self._genes.get(isolate, {})
+        locus_tags = sorted(genes)
+        contrasts = sorted(self._conditions.get(isolate, {}))
+        row = {t: i for i, t in enumerate(locus_tags)}
+        col = {c: j for j, c in enumerate(contrasts)}
+        shape = (len(locus_tags), len(contrasts))
+
+        arrays = {
+            "lfc": np.full(shape, np.nan, dtype=np.float32),
+            "fdr": np.full(shape, np.nan, dtype=np.float32),
+            "barcodes": np.full(shape, -1, dtype=np.int32),
+        }
+        if cells:
+            keys = list(cells)
+            rows = np.fromiter((row[t] for t, _ in keys), dtype=np.intp, count=len(keys))
+            cols = np.fromiter((col[c] for _, c in keys), dtype=np.intp, count=len(keys))
+            values = np.array(list(cells.values()), dtype=np.float64)
+            arrays["lfc"][rows, cols] = values[:, 0]
+            arrays["fdr"][rows, cols] = values[:, 1]
+            arrays["barcodes"][rows, cols] = values[:, 2]
+        return locus_tags, contrasts, arrays
+
+    def write(self, root: str, keep: int = 2) -> Dict[str, str]:
+        """Write every isolate's matrix; returns {isolate: build path}."""
+        written = {}
+        for isolate in self.isolates():
+            locus_tags, contrasts, arrays = self.arrays(isolate)
+            genes = self._genes[isolate]
+            conditions = self._conditions[isolate]
+            written[isolate] = write_matrix(
+                root,
+                isolate,
+                locus_tags,
+                contrasts,
+                arrays,
+                uniprot_ids=[genes[t][0] for t in locus_tags],
+                gene_names=[genes[t][1] for t in locus_tags],
+                conditions=[conditions[c] for c in contrasts],
+                source=", ".join(self.sources) or None,
+                keep=keep,
+            )
+        return written
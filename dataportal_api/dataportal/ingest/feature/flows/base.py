@@ -1,13 +1,17 @@
+import json
 from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Sequence
 
-from dataportal.ingest.constants import BATCH_SIZE
-from dataportal.ingest.es_repo import bulk_exec
+from dataportal.ingest.constants import BATCH_SIZE, GROUP_BULK_MAX_ENTRIES, GROUP_FLUSH_ENTRIES
+from dataportal.ingest.es_repo import bulk_exec, SCRIPT_MERGE_NESTED_GROUPED
 
 
 class Flow(ABC):
     def __init__(self, index_name: str = "feature_index"):
         self.index = index_name
         self.buffer = []
+        # optional DeltaFilter: drops unchanged docs from each flush
+        self.delta = None
 
     @abstractmethod
     def run(self, *args, **kwargs):
@@ -21,5 +25,115 @@ class Flow(ABC):
     def flush(self):
         if not self.buffer:
             return
-        bulk_exec(self.buffer)
-        self.buffer.clear()
\ No newline at end of file
+        actions = self.delta.filter(self.buffer) if self.delta is not None else self.buffer
+        if actions:
+            bulk_exec(actions)
+        self.buffer.clear()
+
+
+class NestedGroupWriter:
+    """
+    Group-then-write buffer for nested experimental arrays.
+
+    Rows are collected per feature id and de-duplicated client-side; flush() then
+    issues ONE scripted upsert per document carrying the whole group, instead of
+    one update per row. The merge script de-dups against what is already stored,
+    so a document split across flushes (or files) ends up the same as if it had
+    been written in one go.
+
+    keys=None keeps append semantics (only exact duplicate entries are dropped).
+
+    on_flush(docs_written, docs_failed) is called after every flush, e.g. to
+    commit an ingest checkpoint once the buffered groups are durable.
+    """
+
+    def __init__(
+        self,
+        index: str,
+        field: str,
+        keys: Optional[Sequence[str]] = None,
+        flag_field: Optional[str] = None,
+        max_entries: int = GROUP_FLUSH_ENTRIES,
+        on_flush: Optional[Callable[[int, int], None]] = None,
+    ):
+        self.index = index
+        self.field = field
+        self.keys = list(keys) if keys else None
+        self.flag_field = flag_field
+        self.max_entries = max_entries
+        self.on_flush = on_flush
+        self._groups: Dict[str, Dict[str, Any]] = {}
+        self._entry_count = 0
+        self.docs_written = 0
+
+    def _dedup_key(self, entry: Dict[str, Any]):
+        if self.keys is None:
+            # entries may hold lists and dicts, so hash their canonical JSON
+            return json.dumps(entry, sort_keys=True, default=str)
+        return tuple(entry.get(k) for k in self.keys)
+
+    def add(self, fid: str, entry: Dict[str, Any], base: Optional[Dict[str, Any]] = None) -> None:
+        group = self._groups.get(fid)
+        if group is None:
+            group = self._groups[fid] = {"base": {}, "entries": [], "seen": set()}
+        if base:
+            # first value wins, like the server-side "only if missing" merge
+            for k, v in base.items():
+                if v is not None:
+                    group["base"].setdefault(k, v)
+
+        key = self._dedup_key(entry)
+        if key in group["seen"]:
+            return
+        group["seen"].add(key)
+        group["entries"].append(entry)
+        self._entry_count += 1
+
+        if self._entry_count >= self.max_entries:
+            self.flush()
+
+    def _action(self, fid: str, group: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "_op_type": "update",
+            "_index": self.index,
+            "_id": fid,
+            "script": {
+                "source": SCRIPT_MERGE_NESTED_GROUPED,
+                "params": {
+                    "base": group["base"],
+                    "field": self.field,
+                    "entries": group["entries"],
+                    "keys": self.keys,
+                    "flag_field": self.flag_field,
+                },
+            },
+            "upsert": {},
+            "scripted_upsert": True,
+        }
+
+    def flush(self) -> int:
+        """Write all buffered groups. Returns the number of documents sent."""
+        if not self._groups:
+            if self.on_flush is not None:
+                self.on_flush(0, 0)
+            return 0
+        actions: List[Dict[str, Any]] = []
+        sent = failed = 0
+        pending_entries = 0
+        for fid, group in self._groups.items():
+            actions.append(self._action(fid, group))
+            pending_entries += len(group["entries"])
+            if len(actions) >= BATCH_SIZE or pending_entries >= GROUP_BULK_MAX_ENTRIES:
+                failed += len(bulk_exec(actions)[1])
+                sent += len(actions)
+                actions = []
+                pending_entries = 0
+        if actions:
+            failed += len(bulk_exec(actions)[1])
+            sent += len(actions)
+        self._groups.clear()
+        self._entry_count = 0
+        self.docs_written += sent
+        if self.on_flush is not None:
+            self.on_flush(sent - failed, failed)
+        return sent
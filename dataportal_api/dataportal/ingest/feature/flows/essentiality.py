@@ -1,9 +1,9 @@
 from typing import Any, Dict
 import pandas as pd
 
-from dataportal.ingest.constants import VALID_ESSENTIALITY
+from dataportal.ingest.constants import BATCH_SIZE, VALID_ESSENTIALITY
 from dataportal.ingest.es_repo import bulk_exec, SCRIPT_UPSERT_ESSENTIALITY
-from dataportal.ingest.feature.flows.base import Flow
+from dataportal.ingest.feature.flows.base import Flow, NestedGroupWriter
 from dataportal.ingest.utils import (
     canonical_ig_id_from_neighbors, 
     chunks_from_table,
@@ -20,16 +20,43 @@ class Essentiality(Flow):
     Expected columns:
       locus_tag, element, TAs_in_locus, TAs_hit, essentiality_call, experimental_condition
       (For IG rows, 'locus_tag' is the legacy label "IG-between-LEFT-and-RIGHT")
+
+    grouped=True (default) writes one upsert per feature per file carrying all of
+    its essentiality calls; grouped=False keeps the one-update-per-row path.
+    With a checkpoint, committed chunks are skipped on resume.
     """
 
-    def __init__(self, index_name: str = "feature_index"):
+    ENTRY_KEYS = [
+        "experimental_condition",
+        "TAs_in_locus",
+        "TAs_hit",
+        "essentiality_call",
+        "element",
+    ]
+
+    def __init__(self, index_name: str = "feature_index", grouped: bool = True):
         super().__init__(index_name=index_name)
+        self.grouped = grouped
         self._species_cache = {}  # Cache for species lookups
 
-    def run(self, csv_path: str, chunksize: int = 10_000) -> None:
+    def run(self, csv_path: str, chunksize: int = 10_000, checkpoint=None) -> None:
         actions: list[Dict[str, Any]] = []
-
-        for chunk in chunks_from_table(csv_path, chunksize=chunksize):
+        writer = (
+            NestedGroupWriter(
+                self.index,
+                "essentiality_data",
+                keys=self.ENTRY_KEYS,
+                flag_field="has_essentiality",
+                on_flush=checkpoint.commit if checkpoint is not None else None,
+            )
+            if self.grouped
+            else None
+        )
+
+        for i, chunk in enumerate(chunks_from_table(csv_path, chunksize=chunksize)):
+            if checkpoint is not None and checkpoint.skip(i):
+                continue
+            failed = 0
             for rec in chunk.to_dict(orient="records"):
                 raw_id = self._str(rec.get("locus_tag"))
                 if not raw_id:
@@ -63,7 +90,7 @@ class Essentiality(Flow):
                         if isolate_name:
                             species_metadata = get_species_metadata_from_isolate(isolate_name, self._species_cache)
                             base.update(species_metadata)
-                        
+
                         base.update({
                             "ig_locus_tag_a": left,
                             "ig_locus_tag_b": right,
@@ -80,30 +107,47 @@ class Essentiality(Flow):
                     "essentiality_call": call,
                     "element": element,
                 }
+                legacy = call if call in VALID_ESSENTIALITY else None
+
+                if writer is not None:
+                    # legacy flat essentiality rides along as a base field: set once, if missing
+                    writer.add(fid, entry, {**base, "essentiality": legacy})
+                    continue
 
-                actions.append({
-                    "_op_type": "update",
-                    "_index": self.index,
-                    "_id": fid,
-                    "script": {
-                        "source": SCRIPT_UPSERT_ESSENTIALITY,
-                        "params": {
-                            "base": base,
-                            "field": "essentiality_data",
-                            "entry": entry,
-                            "keys": ["experimental_condition", "TAs_in_locus", "TAs_hit", "essentiality_call", "element"],
-                            "legacy": (call if call in VALID_ESSENTIALITY else None),
+                actions.append(
+                    {
+                        "_op_type": "update",
+                        "_index": self.index,
+                        "_id": fid,
+                        "script": {
+                            "source": SCRIPT_UPSERT_ESSENTIALITY,
+                            "params": {
+                                "base": base,
+                                "field": "essentiality_data",
+                                "entry": entry,
+                                "keys": self.ENTRY_KEYS,
+                                "legacy": legacy,
+                            },
                         },
-                    },
-                    "upsert": {},
-                    "scripted_upsert": True,
-                })
+                        "upsert": {},
+                        "scripted_upsert": True,
+                    }
+                )
 
-                if len(actions) >= 500:
-                    bulk_exec(actions); actions.clear()
+                if len(actions) >= BATCH_SIZE:
+                    failed += len(bulk_exec(actions)[1])
+                    actions.clear()
 
             if actions:
-                bulk_exec(actions); actions.clear()
+                failed += len(bulk_exec(actions)[1])
+                actions.clear()
+            if checkpoint is not None:
+                checkpoint.chunk_done(i, len(chunk))
+                if writer is None:
+                    checkpoint.commit(failed=failed)
+
+        if writer is not None:
+            writer.flush()
 
     # ---------- helpers ----------
     @staticmethod
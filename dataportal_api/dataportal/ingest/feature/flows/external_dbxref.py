@@ -7,8 +7,9 @@ and appends them to the dbxref nested array in the feature documents.
 
 import pandas as pd
 
+from dataportal.ingest.constants import BATCH_SIZE
 from dataportal.ingest.es_repo import bulk_exec, SCRIPT_APPEND_NESTED_DEDUP_BY_KEYS
-from dataportal.ingest.feature.flows.base import Flow
+from dataportal.ingest.feature.flows.base import Flow, NestedGroupWriter
 
 
 class ExternalDBXRef(Flow):
@@ -23,16 +24,20 @@ class ExternalDBXRef(Flow):
     The flow supports multiple database types by specifying the database name.
     """
 
-    def __init__(self, index_name: str = "feature_index", db_name: str = "STRING"):
+    def __init__(
+        self, index_name: str = "feature_index", db_name: str = "STRING", grouped: bool = True
+    ):
         """
         Initialize the ExternalDBXRef flow.
 
         Args:
             index_name: Target Elasticsearch index name
             db_name: Name of the external database (e.g., "STRING", "UniProt", etc.)
+            grouped: Group mappings per locus_tag and write each document once (default: True)
         """
         super().__init__(index_name=index_name)
         self.db_name = db_name
+        self.grouped = grouped
 
     def run(self, tsv_path: str, chunksize: int = 10000):
         """
@@ -44,6 +49,9 @@ class ExternalDBXRef(Flow):
         """
         actions = []
         processed_count = 0
+        writer = (
+            NestedGroupWriter(self.index, "dbxref", keys=["db", "ref"]) if self.grouped else None
+        )
 
         print(f"[ExternalDBXRef] Processing {tsv_path} for database '{self.db_name}'")
 
@@ -81,6 +89,13 @@ class ExternalDBXRef(Flow):
                 # Create dbxref entry
                 dbxref_entry = {"db": self.db_name, "ref": external_db_id}
 
+                if writer is not None:
+                    writer.add(
+                        locus_tag, dbxref_entry, {"feature_id": locus_tag, "feature_type": "gene"}
+                    )
+                    processed_count += 1
+                    continue
+
                 # Prepare update action
                 action = {
                     "_op_type": "update",
@@ -105,7 +120,7 @@ class ExternalDBXRef(Flow):
                 processed_count += 1
 
                 # Execute bulk operations in batches
-                if len(actions) >= 500:
+                if len(actions) >= BATCH_SIZE:
                     bulk_exec(actions)
                     actions.clear()
 
@@ -113,6 +128,8 @@ class ExternalDBXRef(Flow):
         if actions:
             bulk_exec(actions)
             actions.clear()
+        if writer is not None:
+            writer.flush()
 
         print(
             f"[ExternalDBXRef] Processed {processed_count} mappings for database '{self.db_name}'"
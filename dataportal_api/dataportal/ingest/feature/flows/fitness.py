@@ -1,5 +1,6 @@
 import pandas as pd
-from dataportal.ingest.feature.flows.base import Flow
+from dataportal.ingest.feature.flows.base import Flow, NestedGroupWriter
+from dataportal.ingest.constants import BATCH_SIZE
 from dataportal.ingest.es_repo import bulk_exec, SCRIPT_APPEND_AND_SET_FLAG
 from dataportal.models import FeatureDocument
 from dataportal.ingest.utils import (
@@ -11,26 +12,45 @@ from dataportal.ingest.utils import (
 )
 
 
-
 class Fitness(Flow):
     """
     CSV flexible columns:
       - prefer: locus_tag, experimental_condition, media, contrast, lfc, fdr, number_of_barcodes
       - fallback: 'Name' for locus_tag, 'LFC'/'FDR' for values
+
+    grouped=True (default) writes one update per gene per file with all its
+    conditions; grouped=False keeps the one-update-per-row path.
+
+    With a checkpoint, chunks committed by a previous run are skipped and a
+    chunk is committed once its writes have been flushed.
     """
 
-    def __init__(self, index_name: str = "feature_index"):
+    def __init__(self, index_name: str = "feature_index", grouped: bool = True):
         super().__init__(index_name=index_name)
+        self.grouped = grouped
         self._species_cache = {}  # Cache for species lookups
 
-    def run(self, csv_path):
+    def run(self, csv_path, checkpoint=None):
         actions = []
-        for chunk in pd.read_csv(csv_path, chunksize=10000):
+        writer = (
+            NestedGroupWriter(
+                self.index,
+                "fitness",
+                flag_field="has_fitness",
+                on_flush=checkpoint.commit if checkpoint is not None else None,
+            )
+            if self.grouped
+            else None
+        )
+        for i, chunk in enumerate(pd.read_csv(csv_path, chunksize=10000)):
+            if checkpoint is not None and checkpoint.skip(i):
+                continue
+            failed = 0
             for rec in chunk.to_dict(orient="records"):
                 fid = str(pick(rec, "locus_tag", "Name", default="") or "").strip()
                 if not fid:
                     continue
-                
+
                 # Determine feature type and normalize ID for intergenic regions
                 if fid.startswith("IG-between-"):
                     feature_type = "IG"
@@ -40,7 +60,7 @@ class Fitness(Flow):
                         fid = canonical_ig_id_from_neighbors(left, right) or fid
                 else:
                     feature_type = "gene"
-                
+
                 # Extract number of barcodes if available
                 num_barcodes = rec.get("number_of_barcodes")
                 if num_barcodes is not None:
@@ -48,7 +68,7 @@ class Fitness(Flow):
                         num_barcodes = int(num_barcodes)
                     except (ValueError, TypeError):
                         num_barcodes = None
-                
+
                 entry = {
                     "experimental_condition": pick(rec, "experimental_condition", "contrast"),
                     "media": rec.get("media"),
@@ -57,7 +77,7 @@ class Fitness(Flow):
                     "fdr": float(rec.get("fdr", rec.get("FDR"))) if pick(rec, "fdr", "FDR") is not None else None,
                     "number_of_barcodes": num_barcodes,
                 }
-                
+
                 # Build upsert data
                 upsert_data = {
                     "feature_id": fid,
@@ -65,14 +85,21 @@ class Fitness(Flow):
                     "fitness": [entry],
                     "has_fitness": True,
                 }
-                
+
                 # Add genome/species metadata for IG features
                 if feature_type == "IG":
                     isolate_name = extract_isolate_from_locus_tag(fid)
                     if isolate_name:
                         species_metadata = get_species_metadata_from_isolate(isolate_name, self._species_cache)
                         upsert_data.update(species_metadata)
-                
+
+                if writer is not None:
+                    base = {
+                        k: v for k, v in upsert_data.items() if k not in ("fitness", "has_fitness")
+                    }
+                    writer.add(fid, entry, base)
+                    continue
+
                 actions.append({
                     "_op_type": "update",
                     "_index": self.index,
@@ -83,7 +110,17 @@ class Fitness(Flow):
                     },
                     "upsert": upsert_data,
                 })
-                if len(actions) >= 500:
-                    bulk_exec(actions); actions.clear()
+                if len(actions) >= BATCH_SIZE:
+                    failed += len(bulk_exec(actions)[1])
+                    actions.clear()
+            if checkpoint is not None:
+                checkpoint.chunk_done(i, len(chunk))
+                if writer is None:
+                    if actions:
+                        failed += len(bulk_exec(actions)[1])
+                        actions.clear()
+                    checkpoint.commit(failed=failed)
         if actions:
             bulk_exec(actions)
+        if writer is not None:
+            writer.flush()
@@ -7,15 +7,31 @@ into the GeneFitnessCorrelationDocument Elasticsearch index.
 
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 import logging
 
-from dataportal.ingest.ppi.gff_parser import GFFParser
+from dataportal.ingest.ppi.gff_parser import GFFParser, GeneInfo
 from dataportal.ingest.es_repo import GeneFitnessCorrelationIndexRepository
+from dataportal.ingest.utils import read_table_chunks, resolve_columns, str_column
+from dataportal.utils.fitness_matrix import correlation_strength
 
 logger = logging.getLogger(__name__)
 
+# canonical field -> accepted column names, resolved once per file
+CORRELATION_COLUMNS = {
+    "gene_a": ("Gene1", "gene_1", "gene_a"),
+    "gene_b": ("Gene2", "gene_2", "gene_b"),
+    "value": ("value", "correlation", "correlation_value"),
+}
+# optional gene annotation columns, used when there is no GFF (or it lacks the gene)
+ANNOTATION_COLUMNS = {
+    f"gene_{side}_{field}": (f"gene_{side}_{field}",)
+    for side in ("a", "b")
+    for field in ("name", "uniprot_id", "product")
+}
+
 
 def canonical_pair(a: str, b: str) -> Tuple[str, str]:
     """Return sorted pair for canonical ordering."""
@@ -62,117 +78,178 @@ def _extract_isolate_from_locus(locus_tag: str) -> Optional[str]:
     """
     if not locus_tag or not isinstance(locus_tag, str):
         return None
-    
+
     parts = locus_tag.split("_")
     if len(parts) >= 3:
         return f"{parts[0]}_{parts[1]}"
     return None
 
 
+def _locus_taxonomy(loci: pd.Series) -> pd.DataFrame:
+    """Species acronym/name and isolate once per distinct locus tag, broadcast to the column."""
+    codes, uniques = pd.factorize(loci)
+    per_unique = np.array(
+        [(*_extract_species_from_locus(u), _extract_isolate_from_locus(u)) for u in uniques],
+        dtype=object,
+    ).reshape(-1, 3)
+    return pd.DataFrame(
+        per_unique[codes], columns=["acronym", "species", "isolate"], index=loci.index
+    )
+
+
 @dataclass
 class FitnessCorrelationFlow:
     """
     Flow for ingesting gene-gene fitness correlation data.
-    
+
     Expected CSV columns:
       - Gene1: locus tag of first gene
       - Gene2: locus tag of second gene
       - value: correlation coefficient (-1 to 1)
+      - gene_a_name, gene_a_uniprot_id, gene_a_product (and gene_b_*):
+        optional annotations, e.g. from the fitness matrix; GFF values win
     """
     repo: GeneFitnessCorrelationIndexRepository
     gff_parser: Optional[GFFParser] = None
     chunk_size: int = 20000  # Increased for large datasets (240K+ records)
     batch_size: int = 5000   # Increased for better I/O efficiency
 
-    def _row_to_action(self, row: Dict) -> Optional[Dict]:
-        """Convert a CSV row to an Elasticsearch bulk action."""
-        gene_a = row.get("Gene1")
-        gene_b = row.get("Gene2")
-        
-        if not gene_a or not gene_b:
-            return None
-        
-        # Get correlation value
-        try:
-            corr_value = float(row.get("value", 0))
-        except (ValueError, TypeError):
-            logger.warning(f"Invalid correlation value for {gene_a} - {gene_b}")
-            return None
-        
-        # Extract species information from locus tags
-        acronym_a, species_a = _extract_species_from_locus(gene_a)
-        acronym_b, species_b = _extract_species_from_locus(gene_b)
-        
+    def _chunk_to_actions(self, chunk: pd.DataFrame, cols: Dict[str, Optional[str]]) -> List[Dict]:
+        """
+        Convert one CSV chunk to Elasticsearch bulk actions. Ids, taxonomy,
+        canonical ordering and strength labels are computed column-wise; only
+        the final document assembly walks the rows.
+        """
+        gene_a = str_column(chunk, cols["gene_a"])
+        gene_b = str_column(chunk, cols["gene_b"])
+        values = pd.to_numeric(str_column(chunk, cols["value"]), errors="coerce")
+
+        has_genes = (gene_a != "") & (gene_b != "")
+        invalid = has_genes & values.isna()
+        if invalid.any():
+            logger.warning(f"Skipping {int(invalid.sum())} rows with invalid correlation values")
+        keep = has_genes & values.notna()
+        if not keep.any():
+            return []
+        gene_a, gene_b, values = gene_a[keep], gene_b[keep], values[keep].astype(float)
+        annotations = {
+            field: str_column(chunk, cols.get(field))[keep].tolist()
+            for field in ANNOTATION_COLUMNS
+            if cols.get(field) is not None
+        }
+
         # Use first gene's species info (they should match in same-species correlations)
-        species_acronym = acronym_a or acronym_b or "UNKNOWN"
-        species_scientific_name = species_a or species_b
-        isolate_name = _extract_isolate_from_locus(gene_a) or _extract_isolate_from_locus(gene_b)
-        
+        tax_a, tax_b = _locus_taxonomy(gene_a), _locus_taxonomy(gene_b)
+        species_acronym = (
+            tax_a["acronym"].where(tax_a["acronym"].notna(), tax_b["acronym"]).fillna("UNKNOWN")
+        )
+        species_name = tax_a["species"].where(tax_a["species"].notna(), tax_b["species"])
+        isolate_name = tax_a["isolate"].where(tax_a["isolate"].notna(), tax_b["isolate"])
+
         # Canonical ordering
-        gene_a_sorted, gene_b_sorted = canonical_pair(gene_a, gene_b)
-        pair_id = build_pair_id(species_acronym, gene_a, gene_b)
-        
-        # Build base document
-        src = {
-            "pair_id": pair_id,
-            "species_scientific_name": species_scientific_name,
-            "species_acronym": species_acronym,
-            "isolate_name": isolate_name,
-            "gene_a": gene_a,
-            "gene_b": gene_b,
-            "genes": [gene_a, gene_b],
-            "genes_sorted": [gene_a_sorted, gene_b_sorted],
-            "is_self_correlation": (gene_a == gene_b),
-            "correlation_value": corr_value,
-            "abs_correlation": abs(corr_value),
-        }
-        
+        swap = gene_a > gene_b
+        sorted_a = gene_a.where(~swap, gene_b)
+        sorted_b = gene_b.where(~swap, gene_a)
+        pair_ids = species_acronym + ":" + sorted_a + "__" + sorted_b
+
         # Categorize correlation strength
-        abs_val = abs(corr_value)
-        if abs_val >= 0.7:
-            strength = "strong"
-        elif abs_val >= 0.4:
-            strength = "moderate"
-        else:
-            strength = "weak"
-        
-        direction = "positive" if corr_value >= 0 else "negative"
-        src["correlation_strength"] = f"{strength}_{direction}" if abs_val > 0.1 else "weak"
-        
-        # Enrich with gene information from GFF if available
-        if self.gff_parser:
-            # Get gene info for gene_a
-            gene_a_info = self.gff_parser.get_gene_info(species_scientific_name, gene_a)
-            if gene_a_info:
-                src.update({
-                    "gene_a_locus_tag": gene_a_info.locus_tag,
-                    "gene_a_uniprot_id": gene_a_info.uniprot_id,
-                    "gene_a_name": gene_a_info.name,
-                    "gene_a_product": gene_a_info.product,
-                    "gene_a_seq_id": gene_a_info.seqid,
-                    "gene_a_start": gene_a_info.start,
-                    "gene_a_end": gene_a_info.end,
-                })
-            
-            # Get gene info for gene_b
-            gene_b_info = self.gff_parser.get_gene_info(species_scientific_name, gene_b)
-            if gene_b_info:
-                src.update({
-                    "gene_b_locus_tag": gene_b_info.locus_tag,
-                    "gene_b_uniprot_id": gene_b_info.uniprot_id,
-                    "gene_b_name": gene_b_info.name,
-                    "gene_b_product": gene_b_info.product,
-                    "gene_b_seq_id": gene_b_info.seqid,
-                    "gene_b_start": gene_b_info.start,
-                    "gene_b_end": gene_b_info.end,
-                })
-        
-        # Return bulk action
-        return {
-            "_op_type": "index",
-            "_id": pair_id,
-            "_source": src,
-        }
+        abs_values = values.abs()
+        labels = correlation_strength(values.to_numpy())
+
+        # annotation lookups once per distinct (species, locus tag) in the chunk
+        gene_infos: Dict[Tuple[Optional[str], str], Optional[GeneInfo]] = {}
+
+        def gene_info(species: Optional[str], locus_tag: str) -> Optional[GeneInfo]:
+            key = (species, locus_tag)
+            if key not in gene_infos:
+                gene_infos[key] = self.gff_parser.get_gene_info(species, locus_tag)
+            return gene_infos[key]
+
+        actions = []
+        for row, (
+            pair_id,
+            a,
+            b,
+            sa,
+            sb,
+            value,
+            abs_value,
+            label,
+            acronym,
+            species,
+            isolate,
+        ) in enumerate(
+            zip(
+                pair_ids.tolist(),
+                gene_a.tolist(),
+                gene_b.tolist(),
+                sorted_a.tolist(),
+                sorted_b.tolist(),
+                values.tolist(),
+                abs_values.tolist(),
+                labels.tolist(),
+                species_acronym.tolist(),
+                species_name.tolist(),
+                isolate_name.tolist(),
+            )
+        ):
+            src = {
+                "pair_id": pair_id,
+                "species_scientific_name": species,
+                "species_acronym": acronym,
+                "isolate_name": isolate,
+                "gene_a": a,
+                "gene_b": b,
+                "genes": [a, b],
+                "genes_sorted": [sa, sb],
+                "is_self_correlation": (a == b),
+                "correlation_value": value,
+                "abs_correlation": abs_value,
+                "correlation_strength": label,
+            }
+
+            # Enrich with gene information from GFF if available
+            if self.gff_parser:
+                gene_a_info = gene_info(species, a)
+                if gene_a_info:
+                    src.update(
+                        {
+                            "gene_a_locus_tag": gene_a_info.locus_tag,
+                            "gene_a_uniprot_id": gene_a_info.uniprot_id,
+                            "gene_a_name": gene_a_info.name,
+                            "gene_a_product": gene_a_info.product,
+                            "gene_a_seq_id": gene_a_info.seqid,
+                            "gene_a_start": gene_a_info.start,
+                            "gene_a_end": gene_a_info.end,
+                        }
+                    )
+
+                gene_b_info = gene_info(species, b)
+                if gene_b_info:
+                    src.update(
+                        {
+                            "gene_b_locus_tag": gene_b_info.locus_tag,
+                            "gene_b_uniprot_id": gene_b_info.uniprot_id,
+                            "gene_b_name": gene_b_info.name,
+                            "gene_b_product": gene_b_info.product,
+                            "gene_b_seq_id": gene_b_info.seqid,
+                            "gene_b_start": gene_b_info.start,
+                            "gene_b_end": gene_b_info.end,
+                        }
+                    )
+
+            for field, column in annotations.items():
+                if column[row] and not src.get(field):
+                    src[field] = column[row]
+
+            actions.append(
+                {
+                    "_op_type": "index",
+                    "_id": pair_id,
+                    "_source": src,
+                }
+            )
+        return actions
 
     def run(self, csv_path: str) -> Tuple[int, int]:
         """
@@ -182,43 +259,48 @@ class FitnessCorrelationFlow:
             Tuple of (total_processed, total_indexed)
         """
         logger.info(f"Processing fitness correlation file: {csv_path}")
-        
+        try:
+            return self.index_frames(read_table_chunks(csv_path, chunksize=self.chunk_size))
+        except Exception as e:
+            logger.error(f"Error processing fitness correlation file: {e}")
+            raise
+
+    def index_frames(self, frames: Iterable[pd.DataFrame]) -> Tuple[int, int]:
+        """
+        Index correlation pairs arriving as data frames (CSV chunks, or blocks
+        computed by ingest/feature/fitness_correlation_pairs.py), in batches of
+        `batch_size` actions.
+
+        Returns:
+            Tuple of (total_processed, total_indexed)
+        """
         total_processed = 0
         total_indexed = 0
         actions = []
-        
-        try:
-            # Read CSV in chunks
-            for chunk in pd.read_csv(csv_path, chunksize=self.chunk_size):
-                for _, row in chunk.iterrows():
-                    total_processed += 1
-                    
-                    action = self._row_to_action(row.to_dict())
-                    if action:
-                        actions.append(action)
-                    
-                    # Batch insert
-                    if len(actions) >= self.batch_size:
-                        success, failures = self.repo.bulk_index(actions)
-                        total_indexed += success
-                        
-                        if failures:
-                            logger.warning(f"Failed to index {len(failures)} correlation records")
-                        
-                        actions.clear()
-            
-            # Insert remaining actions
-            if actions:
-                success, failures = self.repo.bulk_index(actions)
+        cols: Optional[Dict[str, Optional[str]]] = None
+
+        for chunk in frames:
+            if cols is None:
+                cols = resolve_columns(chunk.columns, {**CORRELATION_COLUMNS, **ANNOTATION_COLUMNS})
+            total_processed += len(chunk)
+            actions.extend(self._chunk_to_actions(chunk, cols))
+
+            # Batch insert
+            while len(actions) >= self.batch_size:
+                batch, actions = actions[: self.batch_size], actions[self.batch_size :]
+                success, failures = self.repo.bulk_index(batch)
                 total_indexed += success
-                
+
                 if failures:
                     logger.warning(f"Failed to index {len(failures)} correlation records")
-        
-        except Exception as e:
-            logger.error(f"Error processing fitness correlation file: {e}")
-            raise
-        
+
+        # Insert remaining actions
+        if actions:
+            success, failures = self.repo.bulk_index(actions)
+            total_indexed += success
+
+            if failures:
+                logger.warning(f"Failed to index {len(failures)} correlation records")
+
         logger.info(f"Processed {total_processed} rows, indexed {total_indexed} correlations")
         return total_processed, total_indexed
-
@@ -1,11 +1,24 @@
 # ingest/feature/flows/gff_features.py
-import tempfile, os
 from dataportal.ingest.feature.flows.base import Flow
 from dataportal.ingest.feature.sources import ftp_connect, load_protein_seqs
 from dataportal.ingest.feature.parsing import parse_dbxref
+from dataportal.ingest.ftp_cache import get_ftp_cache
 from dataportal.ingest.utils import species_name_for_isolate, strain_prefix
 from dataportal.models import FeatureDocument  # your ES DSL document
 
+
+def gene_scope(isolates: list[str]) -> dict:
+    """Query matching the GFF-built gene features of `isolates` (IG docs are left alone)."""
+    return {
+        "bool": {
+            "filter": [
+                {"term": {"feature_type": "gene"}},
+                {"terms": {"isolate_name": list(isolates)}},
+            ]
+        }
+    }
+
+
 class GFFGenes(Flow):
     """
     Builds gene features from GFFs on FTP. IGs are created by Essentiality flow.
@@ -17,31 +30,66 @@ class GFFGenes(Flow):
         self.ftp_root = ftp_root
         self.mapping = mapping or {}
 
-    def run(self, raw_isolates: list[str], norm_isolates: list[str] | None = None):
+    def run(
+        self, raw_isolates: list[str], norm_isolates: list[str] | None = None, checkpoints=None
+    ):
         """
         raw_isolates: directory names as listed on FTP
         norm_isolates: not used anymore - we use raw names directly
+        checkpoints: optional IngestCheckpoints; isolates completed by a previous run are skipped
         """
         # Use raw isolate names directly
         pairs = [(raw_isolate, raw_isolate) for raw_isolate in raw_isolates]
+        units = {}
+        if checkpoints is not None:
+            units = {raw: checkpoints.unit(f"gff:{raw}") for raw, _ in pairs}
+            pairs = [(raw, norm) for raw, norm in pairs if not units[raw].done]
 
-        ftp = ftp_connect(self.ftp_server)
+        ftp = self._connect()
+        cache = get_ftp_cache(self.ftp_server)
         try:
+            plans = []
             for raw_isolate, norm_isolate in pairs:
-                self._ingest_isolate(ftp, raw_isolate, norm_isolate)
+                gffs = self._list_gff_files(ftp, raw_isolate)
+                if gffs is not None:
+                    plans.append((raw_isolate, norm_isolate, gffs))
+
+            if self.delta is not None:
+                # compare/delete only the gene docs of isolates this run rebuilds
+                self.delta.restrict(gene_scope([raw for raw, _, _ in plans]))
+
+            # fetch every FAA/GFF up front over parallel connections (cache hits are free)
+            cache.prefetch(
+                remote
+                for raw_isolate, _, gffs in plans
+                for remote in (self._faa_path(raw_isolate), *gffs)
+            )
+
+            for raw_isolate, norm_isolate, gffs in plans:
+                self._ingest_isolate(ftp, raw_isolate, norm_isolate, gffs)
+                if raw_isolate in units:
+                    self.flush()
+                    units[raw_isolate].finish()
             self.flush()
         finally:
             ftp.quit()
 
-    def _ingest_isolate(self, ftp, raw_isolate: str, norm_isolate: str):
+    def _connect(self):
+        return ftp_connect(self.ftp_server)
+
+    def _faa_path(self, raw_isolate: str) -> str:
+        return f"{self.ftp_root}/{raw_isolate}/functional_annotation/prokka/{raw_isolate}.faa"
+
+    def _list_gff_files(self, ftp, raw_isolate: str):
         # FTP paths must use the raw directory name
         gff_dir = f"{self.ftp_root}/{raw_isolate}/functional_annotation/merged_gff/"
         try:
-            gffs = [p for p in ftp.nlst(gff_dir) if p.endswith("_annotations.gff")]
+            return [p for p in ftp.nlst(gff_dir) if p.endswith("_annotations.gff")]
         except Exception:
-            return
+            return None
 
-        faa = f"{self.ftp_root}/{raw_isolate}/functional_annotation/prokka/{raw_isolate}.faa"
+    def _ingest_isolate(self, ftp, raw_isolate: str, norm_isolate: str, gffs: list[str]):
+        faa = self._faa_path(raw_isolate)
         protein_seqs = {}
         try:
             protein_seqs = load_protein_seqs(ftp, faa)
@@ -80,83 +128,78 @@ class GFFGenes(Flow):
         return [amr_entry], True
 
     def _ingest_gff_file(self, ftp, remote, raw_isolate, norm_isolate, sp_acronym, sp_name, prot_seqs):
-        local = tempfile.NamedTemporaryFile(delete=False)
-        try:
-            with open(local.name, "wb") as out:
-                ftp.retrbinary(f"RETR {remote}", out.write)
-            with open(local.name, "r") as f:
-                for line in f:
-                    if not line or line.startswith("#"):
-                        continue
-                    cols = line.rstrip("\n").split("\t")
-                    if len(cols) != 9 or cols[2] != "gene":
-                        continue
-                    seq_id, _, _, start, end, _, strand, _, attributes = cols
-                    attr = dict(item.split("=", 1) for item in attributes.split(";") if "=" in item)
-
-                    locus_tag = attr.get("locus_tag")
-                    if not locus_tag:
-                        continue
-
-                    amr_entries, has_amr_info = self.parse_amr_attributes(attr)
-                    dbxref, uniprot_id, cog_id = parse_dbxref(attr.get("Dbxref", ""))
-
-                    ontology_terms = [
-                        {
-                            "ontology_type": "GO",
-                            "ontology_id": term,
-                            "ontology_description": None,
-                        }
-                        for term in attr.get("Ontology_term", "").split(",")
-                        if term
-                    ]
-
-                    uf_ontology_terms = (
-                        attr.get("uf_ontology_term", "").split(",")
-                        if "uf_ontology_term" in attr
-                        else []
-                    )
-                    uf_prot_rec_fullname = attr.get("uf_prot_rec_fullname")
-
-                    doc = FeatureDocument(
-                        meta={"id": locus_tag},
-                        feature_id=locus_tag,
-                        feature_type="gene",
-                        element="gene",
-                        locus_tag=locus_tag,
-                        uniprot_id=uniprot_id,
-                        seq_id=seq_id,
-                        start=int(start),
-                        end=int(end),
-                        strand=strand,
-                        gene_name=attr.get("Name"),
-                        alias=[a for a in attr.get("Alias", "").split(",") if a],
-                        product=attr.get("product"),
-                        product_source=attr.get("product_source"),
-                        inference=attr.get("inference"),
-                        eggnog=attr.get("eggNOG") or attr.get("eggnog"),
-                        species_scientific_name=sp_name,
-                        species_acronym=sp_acronym,
-                        isolate_name=raw_isolate,           # <-- use raw isolate name
-                        kegg=[x for x in attr.get("kegg", "").split(",") if x],
-                        pfam=[x for x in attr.get("pfam", "").split(",") if x],
-                        interpro=[x for x in attr.get("interpro", "").split(",") if x],
-                        has_amr_info=has_amr_info,
-                        amr=amr_entries,
-                        dbxref=dbxref,
-                        ec_number=attr.get("eC_number"),
-                        cog_id=[cog_id] if cog_id else [],
-                        cog_funcats=[x for x in attr.get("cog", "").split(",") if x],
-                        protein_sequence=prot_seqs.get(locus_tag, ""),
-                        has_reactions=False, has_proteomics=False, has_fitness=False, has_mutant_growth=False,
-                        ontology_terms=ontology_terms,
-                        uf_ontology_terms=uf_ontology_terms,
-                        uf_prot_rec_fullname=uf_prot_rec_fullname,
-                    )
-                    doc.meta.index = self.index
-                    self.add(doc.to_dict(include_meta=True))
-        finally:
-            try:
-                os.unlink(local.name)
-            except Exception:
-                pass
+        local = get_ftp_cache(self.ftp_server).fetch(remote, ftp=ftp)
+        with open(local, "r") as f:
+            for line in f:
+                if not line or line.startswith("#"):
+                    continue
+                cols = line.rstrip("\n").split("\t")
+                if len(cols) != 9 or cols[2] != "gene":
+                    continue
+                seq_id, _, _, start, end, _, strand, _, attributes = cols
+                attr = dict(item.split("=", 1) for item in attributes.split(";") if "=" in item)
+
+                locus_tag = attr.get("locus_tag")
+                if not locus_tag:
+                    continue
+
+                amr_entries, has_amr_info = self.parse_amr_attributes(attr)
+                dbxref, uniprot_id, cog_id = parse_dbxref(attr.get("Dbxref", ""))
+
+                ontology_terms = [
+                    {
+                        "ontology_type": "GO",
+                        "ontology_id": term,
+                        "ontology_description": None,
+                    }
+                    for term in attr.get("Ontology_term", "").split(",")
+                    if term
+                ]
+
+                uf_ontology_terms = (
+                    attr.get("uf_ontology_term", "").split(",")
+                    if "uf_ontology_term" in attr
+                    else []
+                )
+                uf_prot_rec_fullname = attr.get("uf_prot_rec_fullname")
+
+                doc = FeatureDocument(
+                    meta={"id": locus_tag},
+                    feature_id=locus_tag,
+                    feature_type="gene",
+                    element="gene",
+                    locus_tag=locus_tag,
+                    uniprot_id=uniprot_id,
+                    seq_id=seq_id,
+                    start=int(start),
+                    end=int(end),
+                    strand=strand,
+                    gene_name=attr.get("Name"),
+                    alias=[a for a in attr.get("Alias", "").split(",") if a],
+                    product=attr.get("product"),
+                    product_source=attr.get("product_source"),
+                    inference=attr.get("inference"),
+                    eggnog=attr.get("eggNOG") or attr.get("eggnog"),
+                    species_scientific_name=sp_name,
+                    species_acronym=sp_acronym,
+                    isolate_name=raw_isolate,  # <-- use raw isolate name
+                    kegg=[x for x in attr.get("kegg", "").split(",") if x],
+                    pfam=[x for x in attr.get("pfam", "").split(",") if x],
+                    interpro=[x for x in attr.get("interpro", "").split(",") if x],
+                    has_amr_info=has_amr_info,
+                    amr=amr_entries,
+                    dbxref=dbxref,
+                    ec_number=attr.get("eC_number"),
+                    cog_id=[cog_id] if cog_id else [],
+                    cog_funcats=[x for x in attr.get("cog", "").split(",") if x],
+                    protein_sequence=prot_seqs.get(locus_tag, ""),
+                    has_reactions=False,
+                    has_proteomics=False,
+                    has_fitness=False,
+                    has_mutant_growth=False,
+                    ontology_terms=ontology_terms,
+                    uf_ontology_terms=uf_ontology_terms,
+                    uf_prot_rec_fullname=uf_prot_rec_fullname,
+                )
+                doc.meta.index = self.index
+                self.add(doc.to_dict(include_meta=True))
@@ -10,7 +10,8 @@ from dataclasses import dataclass
 from typing import Optional
 import pandas as pd
 
-from dataportal.ingest.feature.flows.base import Flow
+from dataportal.ingest.feature.flows.base import Flow, NestedGroupWriter
+from dataportal.ingest.constants import BATCH_SIZE
 from dataportal.ingest.es_repo import bulk_exec
 from dataportal.ingest.utils import extract_isolate_from_locus_tag, get_species_metadata_from_isolate
 
@@ -36,7 +37,7 @@ ctx._source[params.flag_field] = true;
 class MutantGrowthFlow(Flow):
     """
     Flow for importing mutant growth data into FeatureDocument.
-    
+
     CSV expected columns:
     - locus_tag: Gene identifier (e.g., PV_ATCC8482_04295)
     - doubling_time: Doubling time in hours (core numeric readout)
@@ -45,6 +46,9 @@ class MutantGrowthFlow(Flow):
     - Plate384: Plate number in 384-well array (1-16)
     - Well384: Well position (A17, C16, etc.)
     - Percent_from_start: Transposon insertion position (0-1)
+
+    grouped=True (default) writes one upsert per locus per file with all of its
+    replicates; grouped=False keeps the one-update-per-row path.
     """
 
     def __init__(
@@ -52,18 +56,21 @@ class MutantGrowthFlow(Flow):
         index_name: str = "feature_index",
         media: Optional[str] = None,
         experimental_condition: Optional[str] = None,
+        grouped: bool = True,
     ):
         """
         Initialize the mutant growth flow.
-        
+
         Args:
             index_name: Elasticsearch index name (default: feature_index)
             media: Media type for the experiment (optional)
             experimental_condition: Experimental condition context (optional)
+            grouped: Group rows per locus and write each document once (default: True)
         """
         super().__init__(index_name)
         self.media = media
         self.experimental_condition = experimental_condition
+        self.grouped = grouped
         self._species_cache = {}  # Cache for species lookups
 
     def run(self, csv_path: str) -> None:
@@ -74,7 +81,22 @@ class MutantGrowthFlow(Flow):
             csv_path: Path to CSV file with mutant growth data
         """
         actions = []
-        
+
+        # Define dedup keys: media + experimental_condition + brep uniquely identify an entry
+        dedup_keys = ["brep"]
+        if self.media is not None:
+            dedup_keys.append("media")
+        if self.experimental_condition is not None:
+            dedup_keys.append("experimental_condition")
+
+        writer = (
+            NestedGroupWriter(
+                self.index, "mutant_growth", keys=dedup_keys, flag_field="has_mutant_growth"
+            )
+            if self.grouped
+            else None
+        )
+
         for chunk in pd.read_csv(csv_path, chunksize=10000):
             for rec in chunk.to_dict(orient="records"):
                 locus_tag = str(rec.get("locus_tag", "")).strip()
@@ -88,7 +110,7 @@ class MutantGrowthFlow(Flow):
                 doubling_time = rec.get("doubling_time")
                 if doubling_time is None or pd.isna(doubling_time):
                     continue
-                    
+
                 try:
                     doubling_time = float(doubling_time)
                 except (ValueError, TypeError):
@@ -109,7 +131,7 @@ class MutantGrowthFlow(Flow):
                 # Extract plate and well information
                 plate384 = rec.get("Plate384")
                 well384 = str(rec.get("Well384", "")).strip()
-                
+
                 # Handle plate384 conversion
                 plate_number = None
                 if plate384 is not None and not pd.isna(plate384):
@@ -134,13 +156,13 @@ class MutantGrowthFlow(Flow):
                     "isdoublepicked": isdoublepicked,
                     "brep": brep,
                 }
-                
+
                 # Add media and experimental_condition if provided
                 if self.media is not None:
                     entry["media"] = self.media
                 if self.experimental_condition is not None:
                     entry["experimental_condition"] = self.experimental_condition
-                
+
                 # Add optional fields if available
                 if plate_number is not None:
                     entry["plate384"] = plate_number
@@ -156,7 +178,7 @@ class MutantGrowthFlow(Flow):
                     "mutant_growth": [entry],
                     "has_mutant_growth": True,
                 }
-                
+
                 # Add genome/species metadata for IG features
                 if feature_type == "IG":
                     isolate_name = extract_isolate_from_locus_tag(locus_tag)
@@ -164,12 +186,14 @@ class MutantGrowthFlow(Flow):
                         species_metadata = get_species_metadata_from_isolate(isolate_name, self._species_cache)
                         upsert_data.update(species_metadata)
 
-                # Define dedup keys: media + experimental_condition + brep uniquely identify an entry
-                dedup_keys = ["brep"]
-                if self.media is not None:
-                    dedup_keys.append("media")
-                if self.experimental_condition is not None:
-                    dedup_keys.append("experimental_condition")
+                if writer is not None:
+                    base = {
+                        k: v
+                        for k, v in upsert_data.items()
+                        if k not in ("mutant_growth", "has_mutant_growth")
+                    }
+                    writer.add(locus_tag, entry, base)
+                    continue
 
                 # Create bulk action with deduplication and flag setting
                 actions.append({
@@ -190,11 +214,12 @@ class MutantGrowthFlow(Flow):
                 })
 
                 # Bulk index when batch is ready
-                if len(actions) >= 500:
+                if len(actions) >= BATCH_SIZE:
                     bulk_exec(actions)
                     actions.clear()
 
         # Process remaining actions
         if actions:
             bulk_exec(actions)
-            bulk_exec(actions)
\ No newline at end of file
+        if writer is not None:
+            writer.flush()
@@ -1,5 +1,6 @@
 import pandas as pd
 
+from dataportal.ingest.constants import BATCH_SIZE
 from dataportal.ingest.es_repo import bulk_exec, SCRIPT_APPEND_NESTED_DEDUP_BY_KEYS, SCRIPT_APPEND_AND_SET_FLAG
 from dataportal.ingest.feature.flows.base import Flow
 from dataportal.ingest.utils import pick
@@ -53,7 +54,7 @@ class ProteinCompound(Flow):
                                "has_proteomics": True},
                 })
 
-                if len(actions) >= 500:
+                if len(actions) >= BATCH_SIZE:
                     bulk_exec(actions);
                     actions.clear()
         if actions:
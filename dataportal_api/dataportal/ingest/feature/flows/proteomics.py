@@ -1,5 +1,6 @@
 from typing import Any, Dict
 
+from dataportal.ingest.constants import BATCH_SIZE
 from dataportal.ingest.es_repo import bulk_exec
 from dataportal.ingest.feature.flows.base import Flow
 from dataportal.ingest.utils import (
@@ -37,10 +38,10 @@ class Proteomics(Flow):
                     "unique_intensity": unique_intensity,
                     "evidence": evidence,
                 }
-                
+
                 # Determine feature type
                 feature_type = "IG" if fid.startswith("IG:") or fid.startswith("IG-between-") else "gene"
-                
+
                 # Build upsert data
                 upsert_data = {
                     "feature_id": fid,
@@ -48,14 +49,14 @@ class Proteomics(Flow):
                     "proteomics": [entry],
                     "has_proteomics": True,
                 }
-                
+
                 # Add genome/species metadata for IG features
                 if feature_type == "IG":
                     isolate_name = extract_isolate_from_locus_tag(fid)
                     if isolate_name:
                         species_metadata = get_species_metadata_from_isolate(isolate_name, self._species_cache)
                         upsert_data.update(species_metadata)
-                
+
                 actions.append({
                     "_op_type": "update",
                     "_index": self.index,
@@ -71,7 +72,7 @@ class Proteomics(Flow):
                     "upsert": upsert_data,
                     "scripted_upsert": True,
                 })
-                if len(actions) >= 500:
+                if len(actions) >= BATCH_SIZE:
                     bulk_exec(actions);
                     actions.clear()
         if actions:
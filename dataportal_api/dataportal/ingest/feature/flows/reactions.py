@@ -1,6 +1,7 @@
 from collections import defaultdict
 from typing import Dict, Any, List
 
+from dataportal.ingest.constants import BATCH_SIZE
 from dataportal.ingest.es_repo import bulk_exec, SCRIPT_APPEND_NESTED_DEDUP_BY_KEYS
 from dataportal.ingest.feature.flows.base import Flow
 from dataportal.ingest.utils import chunks_from_table
@@ -104,7 +105,7 @@ ctx._source.has_reactions = true;
                     "scripted_upsert": True,
                 })
 
-                if len(actions) >= 1000:
+                if len(actions) >= BATCH_SIZE:
                     bulk_exec(actions);
                     total_actions += len(actions);
                     actions.clear()
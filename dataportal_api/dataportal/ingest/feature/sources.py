@@ -1,4 +1,6 @@
-import ftplib, time, tempfile, os
+import ftplib, time
+
+from dataportal.ingest.ftp_cache import get_ftp_cache
 
 def ftp_connect(host, retries=3, delay=2):
     for i in range(retries):
@@ -9,17 +11,16 @@ def ftp_connect(host, retries=3, delay=2):
             else: raise
 
 def load_protein_seqs(ftp, faa_path):
+    # served from the local FTP artifact cache; only downloaded when changed
+    local = get_ftp_cache(ftp.host).fetch(faa_path, ftp=ftp)
     seqs, cur, buf = {}, None, []
-    with tempfile.NamedTemporaryFile(mode="w+b", delete=False) as tmp:
-        ftp.retrbinary(f"RETR {faa_path}", tmp.write)
-        tmp.flush(); tmp.seek(0)
-        for raw in tmp:
-            line = raw.decode("utf-8").strip()
+    with open(local, "r") as fh:
+        for raw in fh:
+            line = raw.strip()
             if line.startswith(">"):
                 if cur: seqs[cur] = "".join(buf); buf = []
                 cur = line.split()[0][1:]
             elif line:
                 buf.append(line)
         if cur: seqs[cur] = "".join(buf)
-    os.unlink(tmp.name)
     return seqs
@@ -0,0 +1,247 @@
+"""
+Local on-disk cache for FTP-sourced ingest inputs (GFF / FAA / FASTA).
+
+Files are stored content-addressed under FTP_CACHE_DIR, keyed by
+server + remote path + SIZE + MDTM, so a re-run (or another import command
+reading the same GFFs) only pays two metadata round trips per file. When the
+remote file changes, its size or modification time changes and it is fetched
+again.
+
+prefetch() downloads many files in parallel over a bounded pool of FTP
+connections (one per worker thread), so first ingests are limited by bandwidth
+rather than per-file latency. The pool and its connections live until close();
+commands close the shared caches on exit with @closing_ftp_caches.
+"""
+
+from __future__ import annotations
+
+import ftplib
+import functools
+import hashlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dataportal.ingest.constants import FTP_CACHE_DIR, FTP_MAX_CONNECTIONS
+
+logger = logging.getLogger(__name__)
+
+
+class FTPArtifactCache:
+    """Content-addressed local copies of remote FTP files."""
+
+    def __init__(
+        self,
+        server: str,
+        cache_dir: str = FTP_CACHE_DIR,
+        max_connections: int = FTP_MAX_CONNECTIONS,
+        retries: int = 3,
+    ):
+        self.server = server
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.max_connections = max(1, max_connections)
+        self.retries = retries
+        self._local = threading.local()
+        self._connections: List[ftplib.FTP] = []
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # ---------- connections ----------
+
+    def _connect(self) -> ftplib.FTP:
+        for attempt in range(self.retries):
+            try:
+                ftp = ftplib.FTP(self.server)
+                ftp.login()
+                ftp.voidcmd("TYPE I")
+                return ftp
+            except ftplib.all_errors as e:
+                if attempt == self.retries - 1:
+                    raise
+                delay = 2**attempt
+                logger.warning(
+                    f"[ftp_cache] connect to {self.server} failed ({e}); retrying in {delay}s"
+                )
+                time.sleep(delay)
+
+    @staticmethod
+    def _quit(ftp: ftplib.FTP) -> None:
+        try:
+            ftp.quit()
+        except Exception:
+            ftp.close()
+
+    def _thread_conn(self, reset: bool = False) -> ftplib.FTP:
+        ftp = getattr(self._local, "ftp", None)
+        if ftp is not None and reset:
+            with self._lock:
+                if ftp in self._connections:
+                    self._connections.remove(ftp)
+            self._quit(ftp)
+            ftp = None
+        if ftp is None:
+            ftp = self._connect()
+            self._local.ftp = ftp
+            with self._lock:
+                self._connections.append(ftp)
+        return ftp
+
+    def _executor(self) -> ThreadPoolExecutor:
+        # one pool per cache: its threads keep their connections across prefetch() calls
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_connections, thread_name_prefix="ftp"
+                )
+            return self._pool
+
+    def close(self) -> None:
+        """Stop the prefetch pool and quit every connection; the cache reconnects if used again."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+        for ftp in connections:
+            self._quit(ftp)
+
+    def __enter__(self) -> "FTPArtifactCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    # ---------- cache keys ----------
+
+    @staticmethod
+    def _remote_meta(ftp: ftplib.FTP, remote: str) -> Tuple[Optional[int], Optional[str]]:
+        size = mdtm = None
+        try:
+            ftp.voidcmd("TYPE I")
+            size = ftp.size(remote)
+        except ftplib.all_errors:
+            pass
+        try:
+            mdtm = ftp.voidcmd(f"MDTM {remote}").split()[-1]
+        except ftplib.all_errors:
+            pass
+        return size, mdtm
+
+    def _cache_path(self, remote: str, size: Optional[int], mdtm: Optional[str]) -> str:
+        key = hashlib.sha256(f"{self.server}:{remote}:{size}:{mdtm}".encode()).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], f"{key[:16]}-{os.path.basename(remote)}")
+
+    # ---------- fetch ----------
+
+    def fetch(self, remote: str, ftp: Optional[ftplib.FTP] = None) -> str:
+        """
+        Return a local path for `remote`, downloading it only when the cached copy
+        is missing or stale. Uses `ftp` if given, else this thread's pooled connection.
+        Raises ftplib errors when the file cannot be fetched.
+        """
+        conn = ftp or self._thread_conn()
+        size, mdtm = self._remote_meta(conn, remote)
+        local = self._cache_path(remote, size, mdtm)
+        cacheable = size is not None or mdtm is not None
+
+        if cacheable and os.path.exists(local) and (size is None or os.path.getsize(local) == size):
+            self._count(hit=True)
+            return local
+
+        self._count(hit=False)
+        os.makedirs(os.path.dirname(local), exist_ok=True)
+        part = f"{local}.{os.getpid()}.{threading.get_ident()}.part"
+        try:
+            with open(part, "wb") as out:
+                conn.retrbinary(f"RETR {remote}", out.write)
+            if size is not None and os.path.getsize(part) != size:
+                raise ftplib.error_temp(
+                    f"short read for {remote}: {os.path.getsize(part)} != {size}"
+                )
+            os.replace(part, local)  # atomic: readers never see partial files
+        finally:
+            if os.path.exists(part):
+                os.remove(part)
+        return local
+
+    def _fetch_with_retry(self, remote: str) -> Optional[str]:
+        for attempt in range(self.retries):
+            try:
+                return self.fetch(remote, self._thread_conn(reset=attempt > 0))
+            except ftplib.error_perm as e:
+                logger.warning(f"[ftp_cache] {remote}: {e}")
+                return None
+            except (*ftplib.all_errors, OSError) as e:
+                if attempt == self.retries - 1:
+                    logger.error(f"[ftp_cache] failed to fetch {remote}: {e}")
+                    return None
+                time.sleep(2**attempt)
+        return None
+
+    def prefetch(self, remotes: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Fetch many files in parallel. Returns {remote: local path or None on failure}."""
+        remotes = list(dict.fromkeys(remotes))
+        if not remotes:
+            return {}
+        started = time.monotonic()
+        hits_before = self.hits
+        paths = dict(zip(remotes, self._executor().map(self._fetch_with_retry, remotes)))
+        logger.info(
+            f"[ftp_cache] prefetched {len(remotes)} file(s) from {self.server} in "
+            f"{time.monotonic() - started:.1f}s ({self.hits - hits_before} cached)"
+        )
+        return paths
+
+
+_caches: Dict[str, FTPArtifactCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_ftp_cache(server: str) -> FTPArtifactCache:
+    """Shared cache per FTP server."""
+    with _caches_lock:
+        cache = _caches.get(server)
+        if cache is None:
+            cache = _caches[server] = FTPArtifactCache(server)
+        return cache
+
+
+def register_ftp_cache(server: str, cache: FTPArtifactCache) -> None:
+    """Use `cache` for `server` (e.g. a local-directory stand-in for benchmarks)."""
+    with _caches_lock:
+        _caches[server] = cache
+
+
+def close_ftp_caches() -> None:
+    """Close the connections and prefetch pools of all shared caches."""
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.close()
+
+
+def closing_ftp_caches(handle):
+    """Decorator for a command's handle(): closes the shared caches when it returns or raises."""
+
+    @functools.wraps(handle)
+    def wrapper(*args, **kwargs):
+        try:
+            return handle(*args, **kwargs)
+        finally:
+            close_ftp_caches()
+
+    return wrapper
@@ -0,0 +1,222 @@
+"""
+Compiled on-disk gene annotation store.
+
+One SQLite file per annotation release (FTP server + annotations directory)
+holds every compiled isolate's genes, indexed by (isolate, locus_tag),
+(isolate, uniprot_id) and locus_tag. Isolates are compiled from their GFF the
+first time any ingest command needs them (or up front with
+`build_annotation_store`); after that, orthologs, operons, PPI and fitness
+correlation imports open the same file read-only, so startup is a file open and
+lookups are served from the shared OS page cache instead of per-process dicts.
+
+A release directory is immutable, so a compiled isolate is never re-parsed;
+use `build_annotation_store --rebuild` to recompile.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from dataportal.ingest.constants import ANNOTATION_STORE_DIR
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+_GENE_COLUMNS = (
+    "locus_tag",
+    "uniprot_id",
+    "name",
+    "seqid",
+    "source",
+    "type",
+    "start",
+    "end",
+    "score",
+    "strand",
+    "phase",
+    "product",
+)
+_SELECT = ", ".join(f'"{c}"' for c in _GENE_COLUMNS)
+
+_DDL = f"""
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS isolates (
+    isolate TEXT PRIMARY KEY,
+    gff_file TEXT,
+    gene_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS genes (
+    isolate TEXT NOT NULL,
+    {", ".join(f'"{c}"' for c in _GENE_COLUMNS)},
+    PRIMARY KEY (isolate, locus_tag)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS genes_uniprot ON genes (isolate, uniprot_id);
+CREATE INDEX IF NOT EXISTS genes_locus ON genes (locus_tag);
+"""
+
+
+def store_path_for_release(
+    ftp_server: str, ftp_directory: str, store_dir: str = ANNOTATION_STORE_DIR
+) -> str:
+    """Stable file path for the store of one annotation release."""
+    release = ftp_directory.rstrip("/")
+    label = re.sub(r"[^A-Za-z0-9._-]+", "_", os.path.basename(release)) or "release"
+    key = hashlib.sha256(f"{ftp_server}:{release}".encode()).hexdigest()[:12]
+    return os.path.join(os.path.expanduser(store_dir), f"{label}-{key}.sqlite")
+
+
+class AnnotationStore:
+    """Read-mostly SQLite store of GeneInfo rows, keyed by isolate."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._reader: Optional[sqlite3.Connection] = None
+        self._reader_pid: Optional[int] = None
+        self._isolates: Optional[set] = None
+
+    @classmethod
+    def for_release(
+        cls, ftp_server: str, ftp_directory: str, store_dir: str = ANNOTATION_STORE_DIR
+    ) -> "AnnotationStore":
+        return cls(store_path_for_release(ftp_server, ftp_directory, store_dir))
+
+    # ---------- connections ----------
+
+    def _connect_ro(self) -> Optional[sqlite3.Connection]:
+        if not os.path.exists(self.path):
+            return None
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+        conn.execute("PRAGMA query_only = ON")
+        # let SQLite read pages through mmap so concurrent importers share the page cache
+        conn.execute("PRAGMA mmap_size = 268435456")
+        return conn
+
+    def _ro(self) -> Optional[sqlite3.Connection]:
+        # connections must not cross fork(); reopen in a child process
+        if self._reader is None or self._reader_pid != os.getpid():
+            self._reader = self._connect_ro()
+            self._reader_pid = os.getpid()
+        return self._reader
+
+    def _connect_rw(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=60)
+        conn.executescript(_DDL)
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+            (str(SCHEMA_VERSION),),
+        )
+        return conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._reader is not None:
+                self._reader.close()
+            self._reader = None
+            self._isolates = None
+
+    # ---------- writes ----------
+
+    def add_isolate(self, isolate: str, genes: Iterable, gff_file: Optional[str] = None) -> int:
+        """Compile (or recompile) one isolate's GeneInfo records. Returns the gene count."""
+        rows = [(isolate, *(getattr(g, c) for c in _GENE_COLUMNS)) for g in genes]
+        conn = self._connect_rw()
+        try:
+            with conn:
+                conn.execute("DELETE FROM genes WHERE isolate = ?", (isolate,))
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO genes (isolate, {_SELECT}) "
+                    f"VALUES ({', '.join('?' * (len(_GENE_COLUMNS) + 1))})",
+                    rows,
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO isolates (isolate, gff_file, gene_count) VALUES (?, ?, ?)",
+                    (isolate, gff_file, len(rows)),
+                )
+        finally:
+            conn.close()
+        with self._lock:
+            if self._isolates is not None:
+                self._isolates.add(isolate)
+        logger.info(f"[annotation_store] compiled {len(rows)} genes for {isolate} into {self.path}")
+        return len(rows)
+
+    def drop(self) -> None:
+        """Delete the store file (used by --rebuild)."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    # ---------- reads ----------
+
+    def isolates(self) -> set:
+        with self._lock:
+            if self._isolates is None:
+                conn = self._ro()
+                self._isolates = (
+                    {r[0] for r in conn.execute("SELECT isolate FROM isolates")}
+                    if conn is not None
+                    else set()
+                )
+            return set(self._isolates)
+
+    def has_isolate(self, isolate: str) -> bool:
+        return isolate in self.isolates()
+
+    def _query_one(self, sql: str, params: tuple, gene_cls):
+        with self._lock:
+            conn = self._ro()
+            row = conn.execute(sql, params).fetchone() if conn is not None else None
+        return gene_cls(**dict(zip(_GENE_COLUMNS, row))) if row else None
+
+    def get(self, isolate: str, locus_tag: str, gene_cls):
+        return self._query_one(
+            f"SELECT {_SELECT} FROM genes WHERE isolate = ? AND locus_tag = ?",
+            (isolate, locus_tag),
+            gene_cls,
+        )
+
+    def get_by_uniprot(self, isolate: str, uniprot_id: str, gene_cls):
+        return self._query_one(
+            f"SELECT {_SELECT} FROM genes WHERE isolate = ? AND uniprot_id = ? "
+            "ORDER BY locus_tag LIMIT 1",
+            (isolate, uniprot_id),
+            gene_cls,
+        )
+
+    def find_locus(self, locus_tag: str, gene_cls, isolates: Optional[Iterable[str]] = None):
+        """Look a locus tag up in any compiled isolate (optionally restricted to `isolates`)."""
+        sql = f"SELECT {_SELECT} FROM genes WHERE locus_tag = ?"
+        params: List = [locus_tag]
+        if isolates is not None:
+            isolates = list(isolates)
+            if not isolates:
+                return None
+            sql += f" AND isolate IN ({', '.join('?' * len(isolates))})"
+            params.extend(isolates)
+        return self._query_one(sql + " LIMIT 1", tuple(params), gene_cls)
+
+    def gene_rows(self, isolate: str) -> List[tuple]:
+        """All genes of an isolate as tuples in GeneInfo field order, sorted by locus_tag."""
+        with self._lock:
+            conn = self._ro()
+            if conn is None:
+                return []
+            return conn.execute(
+                f"SELECT {_SELECT} FROM genes WHERE isolate = ? ORDER BY locus_tag", (isolate,)
+            ).fetchall()
+
+    def count_genes(self) -> Dict[str, int]:
+        with self._lock:
+            conn = self._ro()
+            if conn is None:
+                return {}
+            return dict(conn.execute("SELECT isolate, gene_count FROM isolates"))
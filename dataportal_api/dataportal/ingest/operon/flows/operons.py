@@ -1,40 +1,48 @@
 from __future__ import annotations
 
-from collections import Counter
+from collections import Counter, namedtuple
 from typing import Any, Dict, List, Optional
 
-from dataportal.ingest.constants import SPECIES_BY_ACRONYM
+import numpy as np
+import pandas as pd
+
+from dataportal.ingest.constants import BATCH_SIZE, SPECIES_BY_ACRONYM
 from dataportal.ingest.es_repo import bulk_exec
 from dataportal.ingest.feature.flows.base import Flow
 from dataportal.ingest.gff.parser import GFFParser
-from dataportal.ingest.utils import canonical_pair_id
-from dataportal.ingest.utils import chunks_from_table
+from dataportal.ingest.utils import (
+    canonical_pair_ids,
+    chunks_from_table,
+    resolve_columns,
+    str_column,
+)
+
+
+# canonical field -> accepted column names, resolved once per file
+OPERON_COLUMNS = {
+    "gene_a": ("gene_a_locus_tag", "gene1", "gene_a", "left", "locus_a"),
+    "gene_b": ("gene_b_locus_tag", "gene2", "gene_b", "right", "locus_b"),
+    "gene_a_name": ("gene_a_name", "gene_a_gene_name", "gene_a_symbol", "name_a", "gene1_name"),
+    "gene_b_name": ("gene_b_name", "gene_b_gene_name", "gene_b_symbol", "name_b", "gene2_name"),
+    "gene_a_uniprot_id": ("gene_a_uniprot_id", "uniprot_a", "uniprot_id_a", "gene1_uniprot"),
+    "gene_b_uniprot_id": ("gene_b_uniprot_id", "uniprot_b", "uniprot_id_b", "gene2_uniprot"),
+    "gene_a_product": ("gene_a_product", "product_a", "gene1_product", "product_left"),
+    "gene_b_product": ("gene_b_product", "product_b", "gene2_product", "product_right"),
+    "gene_a_isolate_name": ("gene_a_isolate_name", "isolate_a", "isolate_left"),
+    "gene_b_isolate_name": ("gene_b_isolate_name", "isolate_b", "isolate_right"),
+    "operon_id": ("operon_id", "operon"),
+    # explicit fields (if present)
+    "isolate_name": ("isolate_name", "isolate"),
+    "species_acronym": ("species_acronym", "species_acr", "acr"),
+    "species_scientific_name": ("species_scientific_name", "species", "species_name"),
+    "has_tss": ("has_tss",),
+    "has_terminator": ("has_terminator",),
+}
+
+TRUE_VALUES = ("true", "t", "1", "y", "yes")
 
 
 # ---------- helpers (module-level) ----------
-def _keys_map(cols) -> Dict[str, str]:
-    return {str(c).lower().strip(): c for c in cols}
-
-
-def _get(rec: Dict[str, Any], km: Dict[str, str], *names, default=None):
-    for n in names:
-        k = km.get(str(n).lower().strip())
-        if k is not None:
-            return rec.get(k, default)
-    return default
-
-
-def _to_bool(v: Any) -> bool | None:
-    if v is None:
-        return None
-    s = str(v).strip().lower()
-    if s in ("true", "t", "1", "y", "yes"):
-        return True
-    if s in ("false", "f", "0", "n", "no"):
-        return False
-    return None
-
-
 def parse_species_acronym(locus: str) -> str | None:
     if not locus:
         return None
@@ -51,6 +59,14 @@ def parse_isolate_name(locus: str) -> str | None:
     return s[:j] if j > 0 else None
 
 
+def _locus_taxonomy(loci: pd.Series) -> pd.DataFrame:
+    """parse_species_acronym()/parse_isolate_name() once per distinct locus tag, broadcast to the column."""
+    codes, uniques = pd.factorize(loci)
+    acronyms = np.array([parse_species_acronym(u) or "" for u in uniques], dtype=object)
+    isolates = np.array([parse_isolate_name(u) or "" for u in uniques], dtype=object)
+    return pd.DataFrame({"acronym": acronyms[codes], "isolate": isolates[codes]}, index=loci.index)
+
+
 def species_name_from_acronym(acr: str) -> str | None:
     if not acr:
         return None
@@ -72,172 +88,147 @@ class Operons(Flow):
         self._scratch: Dict[str, Dict[str, Counter]] = {}  # oid -> {"acronyms": Counter(), "isolates": Counter()}
         self.gff_parser = gff_parser
 
-    def run(self, path: str, chunksize: int = 5_000) -> None:
+    def _chunk_columns(self, chunk: pd.DataFrame, cols: Dict[str, Optional[str]]) -> pd.DataFrame:
+        """
+        Column-wise preparation of one chunk: stripped values for every known
+        field, operon ids (falling back to the canonical gene pair), taxonomy
+        parsed from both locus tags and the rollup flags.
+        """
+        frame = pd.DataFrame({field: str_column(chunk, col) for field, col in cols.items()})
+        frame["oid"] = frame["operon_id"].where(
+            frame["operon_id"] != "", canonical_pair_ids(frame["gene_a"], frame["gene_b"])
+        )
+        for side in ("a", "b"):
+            taxonomy = _locus_taxonomy(frame[f"gene_{side}"])
+            frame[f"acr_{side}"] = taxonomy["acronym"]
+            frame[f"iso_{side}"] = taxonomy["isolate"]
+        frame["has_tss"] = frame["has_tss"].str.lower().isin(TRUE_VALUES)
+        frame["has_terminator"] = frame["has_terminator"].str.lower().isin(TRUE_VALUES)
+        return frame.drop(columns=["operon_id"])
+
+    def _new_doc(self, oid: str) -> Dict[str, Any]:
+        doc = {
+            "operon_id": oid,
+            "isolate_name": None,
+            "species_acronym": None,
+            "species_scientific_name": None,
+            "genes": [],
+            # gene A
+            "gene_a_locus_tag": None,
+            "gene_a_uniprot_id": None,
+            "gene_a_name": None,
+            "gene_a_product": None,
+            "gene_a_isolate_name": None,
+            # gene B
+            "gene_b_locus_tag": None,
+            "gene_b_uniprot_id": None,
+            "gene_b_name": None,
+            "gene_b_product": None,
+            "gene_b_isolate_name": None,
+            "has_tss": False,
+            "has_terminator": False,
+        }
+        self._docs[oid] = doc
+        self._scratch[oid] = {"acronyms": Counter(), "isolates": Counter()}
+        return doc
+
+    def _enrich_from_gff(
+        self, doc: Dict[str, Any], side: str, locus: str, acr: str, iso: str, lookup
+    ) -> None:
+        """Fill missing gene_<side>_* details from the annotation store without overwriting."""
+        if not locus or (
+            doc[f"gene_{side}_name"]
+            and doc[f"gene_{side}_product"]
+            and doc[f"gene_{side}_uniprot_id"]
+        ):
+            return
+        species_name = species_name_from_acronym(acr) if acr else None
+        if not (species_name and iso):
+            return
+        gi = lookup(f"{species_name}_{iso}", locus)
+        if not gi:
+            return
+        if not doc[f"gene_{side}_name"] and gi.name:
+            doc[f"gene_{side}_name"] = gi.name
+        if not doc[f"gene_{side}_product"] and gi.product:
+            doc[f"gene_{side}_product"] = gi.product
+        if not doc[f"gene_{side}_uniprot_id"] and gi.uniprot_id:
+            doc[f"gene_{side}_uniprot_id"] = gi.uniprot_id
+        if not doc[f"gene_{side}_isolate_name"]:
+            doc[f"gene_{side}_isolate_name"] = iso
+
+    def run(self, path: str, chunksize: int = 50_000) -> None:
         rows = 0
         ignored = 0
+        cols: Optional[Dict[str, Optional[str]]] = None
 
         for chunk in chunks_from_table(path, chunksize=chunksize):
-            km = _keys_map(chunk.columns)
-            for rec in chunk.to_dict(orient="records"):
-                rows += 1
-
-                # gene locus tags
-                ga = _get(rec, km, "gene_a_locus_tag", "gene1", "gene_a", "left", "locus_a")
-                gb = _get(rec, km, "gene_b_locus_tag", "gene2", "gene_b", "right", "locus_b")
-                ga = str(ga).strip() if ga else None
-                gb = str(gb).strip() if gb else None
-
-                # gene A/B details (optional columns)
-                ga_name = _get(rec, km, "gene_a_name", "gene_a_gene_name", "gene_a_symbol", "name_a", "gene1_name")
-                gb_name = _get(rec, km, "gene_b_name", "gene_b_gene_name", "gene_b_symbol", "name_b", "gene2_name")
-
-                ga_uniprot = _get(rec, km, "gene_a_uniprot_id", "uniprot_a", "uniprot_id_a", "gene1_uniprot")
-                gb_uniprot = _get(rec, km, "gene_b_uniprot_id", "uniprot_b", "uniprot_id_b", "gene2_uniprot")
-
-                ga_product = _get(rec, km, "gene_a_product", "product_a", "gene1_product", "product_left")
-                gb_product = _get(rec, km, "gene_b_product", "product_b", "gene2_product", "product_right")
-
-                ga_isolate = _get(rec, km, "gene_a_isolate_name", "isolate_a", "isolate_left")
-                gb_isolate = _get(rec, km, "gene_b_isolate_name", "isolate_b", "isolate_right")
-
-                operon_id = _get(rec, km, "operon_id", "operon")
-                if operon_id in (None, "", "nan", "NaN"):
-                    oid = canonical_pair_id(ga, gb)
-                else:
-                    oid = str(operon_id).strip()
-
-                # explicit fields (if present)
-                explicit_isolate = _get(rec, km, "isolate_name", "isolate")
-                explicit_acr = _get(rec, km, "species_acronym", "species_acr", "acr")
-                explicit_sci = _get(rec, km, "species_scientific_name", "species", "species_name")
-
-                has_tss = _to_bool(_get(rec, km, "has_tss"))
-                has_term = _to_bool(_get(rec, km, "has_terminator"))
-
-                doc = self._docs.get(oid)
-                if not doc:
-                    doc = {
-                        "operon_id": oid,
-                        "isolate_name": None,
-                        "species_acronym": None,
-                        "species_scientific_name": None,
-                        "genes": [],
-                        # gene A
-                        "gene_a_locus_tag": None,
-                        "gene_a_uniprot_id": None,
-                        "gene_a_name": None,
-                        "gene_a_product": None,
-                        "gene_a_isolate_name": None,
-                        # gene B
-                        "gene_b_locus_tag": None,
-                        "gene_b_uniprot_id": None,
-                        "gene_b_name": None,
-                        "gene_b_product": None,
-                        "gene_b_isolate_name": None,
-                        "has_tss": False,
-                        "has_terminator": False,
-                    }
-                    self._docs[oid] = doc
-                    self._scratch[oid] = {"acronyms": Counter(), "isolates": Counter()}
-
-                # accumulate unique genes
-                for g in (ga, gb):
-                    if g and g not in doc["genes"]:
-                        doc["genes"].append(g)
-
-                # infer from locus tags (per-row)
-                for g in (ga, gb):
+            if cols is None:
+                cols = resolve_columns(chunk.columns, OPERON_COLUMNS)
+            rows += len(chunk)
+            frame = self._chunk_columns(chunk, cols)
+            # no operon_id and no genes: nothing to key the row on
+            unkeyed = frame["oid"] == "__"
+            ignored += int(unkeyed.sum())
+            frame = frame[~unkeyed]
+
+            # annotation lookups once per distinct (species key, locus tag) in the chunk
+            gene_infos: Dict[tuple, Any] = {}
+
+            def lookup(species_key: str, locus: str):
+                key = (species_key, locus)
+                if key not in gene_infos:
+                    gene_infos[key] = self.gff_parser.get_gene_info(species_key, locus)
+                return gene_infos[key]
+
+            row_type = namedtuple("OperonRow", frame.columns)
+            for r in map(row_type._make, zip(*(frame[c].tolist() for c in frame.columns))):
+                oid = r.oid
+                doc = self._docs.get(oid) or self._new_doc(oid)
+                scratch = self._scratch[oid]
+
+                # accumulate unique genes and infer taxonomy from locus tags (per-row)
+                for g, acr, iso in ((r.gene_a, r.acr_a, r.iso_a), (r.gene_b, r.acr_b, r.iso_b)):
                     if not g:
                         continue
-                    acr = parse_species_acronym(g)
-                    iso = parse_isolate_name(g)
+                    if g not in doc["genes"]:
+                        doc["genes"].append(g)
                     if acr:
-                        self._scratch[oid]["acronyms"][acr] += 1
+                        scratch["acronyms"][acr] += 1
                     if iso:
-                        self._scratch[oid]["isolates"][iso] += 1
+                        scratch["isolates"][iso] += 1
 
                 # set per-gene details without overwriting once present
-                if ga and not doc["gene_a_locus_tag"]:
-                    doc["gene_a_locus_tag"] = ga
-                if gb and not doc["gene_b_locus_tag"]:
-                    doc["gene_b_locus_tag"] = gb
-
-                if ga_name and not doc["gene_a_name"]:
-                    doc["gene_a_name"] = str(ga_name).strip()
-                if gb_name and not doc["gene_b_name"]:
-                    doc["gene_b_name"] = str(gb_name).strip()
-
-                if ga_uniprot and not doc["gene_a_uniprot_id"]:
-                    doc["gene_a_uniprot_id"] = str(ga_uniprot).strip()
-                if gb_uniprot and not doc["gene_b_uniprot_id"]:
-                    doc["gene_b_uniprot_id"] = str(gb_uniprot).strip()
-
-                if ga_product and not doc["gene_a_product"]:
-                    doc["gene_a_product"] = str(ga_product).strip()
-                if gb_product and not doc["gene_b_product"]:
-                    doc["gene_b_product"] = str(gb_product).strip()
+                for side, values in (
+                    ("a", (r.gene_a, r.gene_a_name, r.gene_a_uniprot_id, r.gene_a_product)),
+                    ("b", (r.gene_b, r.gene_b_name, r.gene_b_uniprot_id, r.gene_b_product)),
+                ):
+                    for field, value in zip(("locus_tag", "name", "uniprot_id", "product"), values):
+                        if value and not doc[f"gene_{side}_{field}"]:
+                            doc[f"gene_{side}_{field}"] = value
 
                 # infer isolates per gene from explicit columns or locus tag
-                if not doc["gene_a_isolate_name"]:
-                    inferred_ga_iso = ga_isolate or parse_isolate_name(ga) if ga else None
-                    if inferred_ga_iso:
-                        doc["gene_a_isolate_name"] = str(inferred_ga_iso).strip()
-                if not doc["gene_b_isolate_name"]:
-                    inferred_gb_iso = gb_isolate or parse_isolate_name(gb) if gb else None
-                    if inferred_gb_iso:
-                        doc["gene_b_isolate_name"] = str(inferred_gb_iso).strip()
+                if not doc["gene_a_isolate_name"] and r.gene_a:
+                    doc["gene_a_isolate_name"] = r.gene_a_isolate_name or r.iso_a or None
+                if not doc["gene_b_isolate_name"] and r.gene_b:
+                    doc["gene_b_isolate_name"] = r.gene_b_isolate_name or r.iso_b or None
 
                 # set rollups
-                if has_tss is True:
+                if r.has_tss:
                     doc["has_tss"] = True
-                if has_term is True:
+                if r.has_terminator:
                     doc["has_terminator"] = True
 
                 # opportunistically fill explicit values if provided (don’t overwrite once set)
-                if explicit_isolate and not doc["isolate_name"]:
-                    doc["isolate_name"] = str(explicit_isolate).strip()
-                if explicit_acr and not doc["species_acronym"]:
-                    doc["species_acronym"] = str(explicit_acr).strip()
-                if explicit_sci and not doc["species_scientific_name"]:
-                    doc["species_scientific_name"] = str(explicit_sci).strip()
+                for field in ("isolate_name", "species_acronym", "species_scientific_name"):
+                    value = getattr(r, field)
+                    if value and not doc[field]:
+                        doc[field] = value
 
                 # Enrich per-gene details from preloaded GFF if available
                 if self.gff_parser:
-                    # Gene A
-                    if ga and (not doc["gene_a_name"] or not doc["gene_a_product"] or not doc["gene_a_uniprot_id"]):
-                        acr_a = parse_species_acronym(ga)
-                        iso_a = parse_isolate_name(ga)
-                        species_name_a = species_name_from_acronym(acr_a) if acr_a else None
-                        if species_name_a and iso_a:
-                            unique_species_a = f"{species_name_a}_{iso_a}"
-                            gi_a = self.gff_parser.get_gene_info(unique_species_a, ga)
-                            if gi_a:
-                                if not doc["gene_a_name"] and gi_a.name:
-                                    doc["gene_a_name"] = gi_a.name
-                                if not doc["gene_a_product"] and gi_a.product:
-                                    doc["gene_a_product"] = gi_a.product
-                                if not doc["gene_a_uniprot_id"] and gi_a.uniprot_id:
-                                    doc["gene_a_uniprot_id"] = gi_a.uniprot_id
-                                if not doc["gene_a_isolate_name"] and iso_a:
-                                    doc["gene_a_isolate_name"] = iso_a
-
-                    # Gene B
-                    if gb and (not doc["gene_b_name"] or not doc["gene_b_product"] or not doc["gene_b_uniprot_id"]):
-                        acr_b = parse_species_acronym(gb)
-                        iso_b = parse_isolate_name(gb)
-                        species_name_b = species_name_from_acronym(acr_b) if acr_b else None
-                        if species_name_b and iso_b:
-                            unique_species_b = f"{species_name_b}_{iso_b}"
-                            gi_b = self.gff_parser.get_gene_info(unique_species_b, gb)
-                            if gi_b:
-                                if not doc["gene_b_name"] and gi_b.name:
-                                    doc["gene_b_name"] = gi_b.name
-                                if not doc["gene_b_product"] and gi_b.product:
-                                    doc["gene_b_product"] = gi_b.product
-                                if not doc["gene_b_uniprot_id"] and gi_b.uniprot_id:
-                                    doc["gene_b_uniprot_id"] = gi_b.uniprot_id
-                                if not doc["gene_b_isolate_name"] and iso_b:
-                                    doc["gene_b_isolate_name"] = iso_b
+                    self._enrich_from_gff(doc, "a", r.gene_a, r.acr_a, r.iso_a, lookup)
+                    self._enrich_from_gff(doc, "b", r.gene_b, r.acr_b, r.iso_b, lookup)
 
         # finalize per-operon taxonomy after reading all rows
         for oid, doc in self._docs.items():
@@ -271,7 +262,7 @@ class Operons(Flow):
                 "_source": src,
             })
 
-            if len(actions) >= 1000:
+            if len(actions) >= BATCH_SIZE:
                 bulk_exec(actions)
                 actions.clear()
 
@@ -282,6 +273,3 @@ class Operons(Flow):
         # Optional
         # self._docs.clear()
         # self._scratch.clear()
-
-
-
@@ -1,26 +1,54 @@
-
 from __future__ import annotations
 
 import gc
-from typing import Any, Dict, List, Optional
+from collections import namedtuple
+from typing import Any, Dict, List, Optional, Tuple
 from dataportal.ingest.feature.flows.base import Flow
+from dataportal.ingest.constants import BATCH_SIZE
 from dataportal.ingest.es_repo import bulk_exec
-from dataportal.ingest.utils import canonical_pair_id
+from dataportal.ingest.utils import (
+    canonical_pair_ids,
+    read_table_chunks,
+    resolve_columns,
+    str_column,
+)
 from dataportal.ingest.gff.parser import GFFParser
 
+import numpy as np
 import pandas as pd
 
-
-def _keys_map(cols) -> Dict[str, str]:
-    return {str(c).lower().strip(): c for c in cols}
-
-
-def _get(rec: Dict[str, Any], km: Dict[str, str], *names, default=None):
-    for n in names:
-        k = km.get(str(n).lower().strip())
-        if k is not None:
-            return rec.get(k, default)
-    return default
+SPECIES_NAME_BY_ACRONYM = {
+    "BU": "Bacteroides uniformis",
+    "PV": "Phocaeicola vulgatus",
+}
+
+# canonical field -> accepted column names, resolved once per file
+ORTHOLOG_COLUMNS = {
+    "gene_a": (
+        "protein_id_a",
+        "protein_id_1",
+        "Protein 1",
+        "protein 1",
+        "Gene 1",
+        "gene 1",
+        "gene_a_locus_tag",
+        "genea",
+        "gene_a",
+    ),
+    "gene_b": (
+        "protein_id_b",
+        "protein_id_2",
+        "Protein 2",
+        "protein 2",
+        "Gene 2",
+        "gene 2",
+        "gene_b_locus_tag",
+        "geneb",
+        "gene_b",
+    ),
+    "orthology_type": ("orthology_type", "Orthology type", "orthology type"),
+    "oma_group": ("oma_group", "OMA group", "oma group", "OMA group (if any)"),
+}
 
 
 def _split_locus_and_desc(cell: Any) -> tuple[str, str]:
@@ -51,14 +79,14 @@ def _extract_species_from_locus(locus_tag: str) -> tuple[str, str, str]:
     """
     if not locus_tag or "_" not in locus_tag:
         return "UNKNOWN", "Unknown species", "UNKNOWN"
-    
+
     # Find the first underscore to get species acronym
     first_underscore = locus_tag.find("_")
     if first_underscore == -1:
         return "UNKNOWN", "Unknown species", "UNKNOWN"
-    
+
     species_acronym = locus_tag[:first_underscore]
-    
+
     # Find the second underscore to get isolate name
     second_underscore = locus_tag.find("_", first_underscore + 1)
     if second_underscore == -1:
@@ -67,25 +95,40 @@ def _extract_species_from_locus(locus_tag: str) -> tuple[str, str, str]:
     else:
         # Extract isolate name (species_acronym + everything up to second underscore)
         isolate = locus_tag[:second_underscore]
-    
-    # Map acronyms to full species names
-    species_map = {
-        "BU": "Bacteroides uniformis",
-        "PV": "Phocaeicola vulgatus",
-    }
-    
-    species_name = species_map.get(species_acronym, f"Unknown {species_acronym}")
+
+    species_name = SPECIES_NAME_BY_ACRONYM.get(species_acronym, f"Unknown {species_acronym}")
     return species_acronym, species_name, isolate
 
 
-def _get_gene_info_for_locus(gff_parser: Optional[GFFParser], locus_tag: str) -> Optional[Dict[str, Any]]:
+def _split_locus_and_desc_series(cells: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """Vectorized _split_locus_and_desc() over a column of already stripped strings."""
+    parts = cells.str.partition(" ")
+    return parts[0], parts[2].str.lstrip()
+
+
+def _species_columns(ids: pd.Series) -> pd.DataFrame:
+    """
+    _extract_species_from_locus() for a whole column: evaluated once per distinct
+    locus tag and broadcast back with the factorized codes.
+    """
+    codes, uniques = pd.factorize(ids)
+    per_unique = np.array([_extract_species_from_locus(u) for u in uniques], dtype=object).reshape(
+        -1, 3
+    )
+    taken = per_unique[codes]
+    return pd.DataFrame(taken, columns=["acronym", "species", "isolate"], index=ids.index)
+
+
+def _get_gene_info_for_locus(
+    gff_parser: Optional[GFFParser], locus_tag: str
+) -> Optional[Dict[str, Any]]:
     """Get gene information from GFF parser for a given locus tag."""
     if not gff_parser or not locus_tag:
         return None
-    
+
     # Extract species from locus tag
     species_acronym, species_name, isolate = _extract_species_from_locus(locus_tag)
-    
+
     # Try to get gene info using the unique species name format
     unique_species_name = f"{species_name}_{isolate}"
     gene_info = gff_parser.get_gene_info(unique_species_name, locus_tag)
@@ -104,28 +147,27 @@ def _get_gene_info_for_locus(gff_parser: Optional[GFFParser], locus_tag: str) ->
             "phase": gene_info.phase,
             "product": gene_info.product,
         }
-    
+
     # If direct lookup fails, try to find the gene in the loaded GFF data
     # This handles cases where the locus tag is from a different isolate of the same species
-    if hasattr(gff_parser, '_gene_cache'):
-        for loaded_isolate, gene_cache in gff_parser._gene_cache.items():
-            if locus_tag in gene_cache:
-                gene_info = gene_cache[locus_tag]
-                return {
-                    "locus_tag": gene_info.locus_tag,
-                    "uniprot_id": gene_info.uniprot_id,
-                    "name": gene_info.name,
-                    "seqid": gene_info.seqid,
-                    "source": gene_info.source,
-                    "type": gene_info.type,
-                    "start": gene_info.start,
-                    "end": gene_info.end,
-                    "score": gene_info.score,
-                    "strand": gene_info.strand,
-                    "phase": gene_info.phase,
-                    "product": gene_info.product,
-                }
-    
+    if hasattr(gff_parser, "find_gene_info"):
+        gene_info = gff_parser.find_gene_info(locus_tag)
+        if gene_info:
+            return {
+                "locus_tag": gene_info.locus_tag,
+                "uniprot_id": gene_info.uniprot_id,
+                "name": gene_info.name,
+                "seqid": gene_info.seqid,
+                "source": gene_info.source,
+                "type": gene_info.type,
+                "start": gene_info.start,
+                "end": gene_info.end,
+                "score": gene_info.score,
+                "strand": gene_info.strand,
+                "phase": gene_info.phase,
+                "product": gene_info.product,
+            }
+
     return None
 
 
@@ -173,6 +215,7 @@ class Orthologs(Flow):
         super().__init__(index_name=index_name)
         self._docs: Dict[str, Dict[str, Any]] = {}
         self.gff_parser = gff_parser
+        self._checkpoint = None
 
     def _iter_chunks(self, path: str, chunksize: int):
         """
@@ -193,229 +236,228 @@ class Orthologs(Flow):
             "oma_group",      # OMA group ID (if any)
         ]
 
-        return pd.read_csv(
+        return read_table_chunks(
             path,
+            chunksize=chunksize,
             sep="\t",
             comment="#",
             header=None,  # there is no real header after comments
-            names=expected_cols,  # consistent names for our _get()
+            names=expected_cols,  # consistent names for resolve_columns()
             usecols=list(range(6)),  # guard against ragged rows
-            dtype=str,  # keep raw strings
-            chunksize=chunksize,
-            engine="python",  # more forgiving with comments/mixed rows
-            on_bad_lines="skip",
             na_filter=False,
             memory_map=False,
         )
 
-    def run(self, path: str, chunksize: int = 100_000, flush_every: int = 200_000) -> None:
+    def _chunk_columns(self, chunk: pd.DataFrame, cols: Dict[str, Optional[str]]) -> pd.DataFrame:
+        """
+        Column-wise preparation of one chunk: split ids from descriptions, compute
+        canonical pair ids and species/isolate for both genes. Rows without both
+        ids are dropped.
+        """
+        a_id, a_desc = _split_locus_and_desc_series(str_column(chunk, cols["gene_a"]))
+        b_id, b_desc = _split_locus_and_desc_series(str_column(chunk, cols["gene_b"]))
+        keep = (a_id != "") & (b_id != "")
+
+        frame = pd.DataFrame(
+            {
+                "gene_a": a_id,
+                "gene_b": b_id,
+                "desc_a": a_desc,
+                "desc_b": b_desc,
+                "orthology_type": str_column(chunk, cols["orthology_type"]),
+                "oma_group": str_column(chunk, cols["oma_group"]),
+            }
+        )[keep]
+        if frame.empty:
+            return frame
+
+        frame["pair_id"] = canonical_pair_ids(frame["gene_a"], frame["gene_b"])
+        species_a = _species_columns(frame["gene_a"]).add_suffix("_a")
+        species_b = _species_columns(frame["gene_b"]).add_suffix("_b")
+        return pd.concat([frame, species_a, species_b], axis=1)
+
+    def _build_doc(self, r, gene_a_info, gene_b_info) -> Dict[str, Any]:
+        a_id, b_id = r.gene_a, r.gene_b
+        gene_a_info = gene_a_info or {}
+        gene_b_info = gene_b_info or {}
+        return {
+            "pair_id": r.pair_id,
+            "doc_type": "ortholog",
+            "gene_a": a_id,
+            "gene_b": b_id,
+            "orthology_type": None,
+            "oma_group_id": None,
+            "members": [a_id, b_id],
+            "is_one_to_one": False,  # Initialize to False, will be updated if orthology_type is 1:1
+            # Species information
+            "species_a_acronym": r.acronym_a,
+            "species_b_acronym": r.acronym_b,
+            "isolate_a": r.isolate_a,
+            "isolate_b": r.isolate_b,
+            # Gene A information (from GFF or defaults)
+            "gene_a_locus_tag": a_id,
+            "gene_a_uniprot_id": gene_a_info.get("uniprot_id"),
+            "gene_a_name": gene_a_info.get("name"),
+            "gene_a_source": gene_a_info.get("source"),
+            "gene_a_type": gene_a_info.get("type"),
+            "gene_a_start": gene_a_info.get("start"),
+            "gene_a_end": gene_a_info.get("end"),
+            "gene_a_score": gene_a_info.get("score"),
+            "gene_a_strand": gene_a_info.get("strand"),
+            "gene_a_phase": gene_a_info.get("phase"),
+            "gene_a_product": gene_a_info.get("product"),
+            "gene_a_desc": r.desc_a,
+            # Gene B information (from GFF or defaults)
+            "gene_b_locus_tag": b_id,
+            "gene_b_uniprot_id": gene_b_info.get("uniprot_id"),
+            "gene_b_name": gene_b_info.get("name"),
+            "gene_b_source": gene_b_info.get("source"),
+            "gene_b_type": gene_b_info.get("type"),
+            "gene_b_start": gene_b_info.get("start"),
+            "gene_b_end": gene_b_info.get("end"),
+            "gene_b_score": gene_b_info.get("score"),
+            "gene_b_strand": gene_b_info.get("strand"),
+            "gene_b_phase": gene_b_info.get("phase"),
+            "gene_b_product": gene_b_info.get("product"),
+            "gene_b_desc": r.desc_b,
+            # Cross-species analysis flags
+            "same_species": r.species_a == r.species_b,
+            "same_isolate": r.isolate_a == r.isolate_b,
+        }
+
+    def run(
+        self, path: str, chunksize: int = 100_000, flush_every: int = 200_000, checkpoint=None
+    ) -> None:
+        """
+        With a checkpoint, chunks committed by a previous run are skipped; every
+        flush commits the chunks completed before it (docs are index ops, so
+        re-sending the rest of a half-flushed chunk is harmless).
+        """
         rows = 0
+        self._checkpoint = checkpoint
         seen_since_flush = 0
+        cols: Optional[Dict[str, Optional[str]]] = None
 
         # Note: GFF files are now pre-loaded at the command level for better caching
         # This avoids re-downloading the same GFF files for each ortholog file
 
         try:
-            for chunk in self._iter_chunks(path, chunksize=chunksize):
-                km = _keys_map(chunk.columns)
-
-                for rec in chunk.to_dict(orient="records"):
-                    rows += 1
-
-                    raw_a = _get(
-                        rec, km,
-                        "protein_id_a", "protein_id_1", "Protein 1", "protein 1", 
-                        "Gene 1", "gene 1", "gene_a_locus_tag", "genea", "gene_a"
-                    )
-                    raw_b = _get(
-                        rec, km,
-                        "protein_id_b", "protein_id_2", "Protein 2", "protein 2", 
-                        "Gene 2", "gene 2", "gene_b_locus_tag", "geneb", "gene_b"
-                    )
-                    if not raw_a or not raw_b:
-                        continue
-
-                    # Trim description text, keep only IDs in gene_a/gene_b
-                    a_id, a_desc = _split_locus_and_desc(raw_a)
-                    b_id, b_desc = _split_locus_and_desc(raw_b)
-                    if not a_id or not b_id:
-                        continue
-
-                    pid = canonical_pair_id(a_id, b_id)
-
-                    otype = _get(rec, km, "orthology_type", "Orthology type", "orthology type")
-                    oma = _get(rec, km, "oma_group", "OMA group", "oma group", "OMA group (if any)")
+            for chunk_index, chunk in enumerate(self._iter_chunks(path, chunksize=chunksize)):
+                if checkpoint is not None and checkpoint.skip(chunk_index):
+                    continue
+                if cols is None:
+                    cols = resolve_columns(chunk.columns, ORTHOLOG_COLUMNS)
+                rows += len(chunk)
+                frame = self._chunk_columns(chunk, cols)
+                del chunk
+
+                # annotation lookups once per distinct locus tag in the chunk
+                gene_infos: Dict[str, Optional[Dict[str, Any]]] = {}
+
+                def gene_info(locus_tag: str):
+                    if locus_tag not in gene_infos:
+                        gene_infos[locus_tag] = _get_gene_info_for_locus(self.gff_parser, locus_tag)
+                    return gene_infos[locus_tag]
 
+                # plain-list columns: iterating lists is much cheaper than itertuples()
+                row_type = namedtuple("OrthologRow", frame.columns)
+                for r in map(row_type._make, zip(*(frame[c].tolist() for c in frame.columns))):
+                    pid = r.pair_id
                     doc = self._docs.get(pid)
                     if not doc:
-                        # Extract species information for both genes
-                        species_a_acronym, species_a_name, isolate_a = _extract_species_from_locus(a_id)
-                        species_b_acronym, species_b_name, isolate_b = _extract_species_from_locus(b_id)
-                        
-                        # Get gene information from GFF parser
                         if self.gff_parser:
-                            gene_a_info = _get_gene_info_for_locus(self.gff_parser, a_id)
-                            gene_b_info = _get_gene_info_for_locus(self.gff_parser, b_id)
+                            doc = self._build_doc(r, gene_info(r.gene_a), gene_info(r.gene_b))
                         else:
-                            gene_a_info = None
-                            gene_b_info = None
-                        
-                        # Build comprehensive document
-                        doc = {
-                            "pair_id": pid,
-                            "doc_type": "ortholog",
-                            "gene_a": a_id,
-                            "gene_b": b_id,
-                            "orthology_type": None,
-                            "oma_group_id": None,
-                            "members": [a_id, b_id],
-                            "is_one_to_one": False,  # Initialize to False, will be updated if orthology_type is 1:1
-                            
-                            # Species information
-                            "species_a_acronym": species_a_acronym,
-                            "species_b_acronym": species_b_acronym,
-                            "isolate_a": isolate_a,
-                            "isolate_b": isolate_b,
-                            
-                            # Gene A information (from GFF or defaults)
-                            "gene_a_locus_tag": a_id,
-                            "gene_a_uniprot_id": gene_a_info.get("uniprot_id") if gene_a_info else None,
-                            "gene_a_name": gene_a_info.get("name") if gene_a_info else None,
-                            "gene_a_source": gene_a_info.get("source") if gene_a_info else None,
-                            "gene_a_type": gene_a_info.get("type") if gene_a_info else None,
-                            "gene_a_start": gene_a_info.get("start") if gene_a_info else None,
-                            "gene_a_end": gene_a_info.get("end") if gene_a_info else None,
-                            "gene_a_score": gene_a_info.get("score") if gene_a_info else None,
-                            "gene_a_strand": gene_a_info.get("strand") if gene_a_info else None,
-                            "gene_a_phase": gene_a_info.get("phase") if gene_a_info else None,
-                            "gene_a_product": gene_a_info.get("product") if gene_a_info else None,
-                            "gene_a_desc": a_desc,
-                            
-                            # Gene B information (from GFF or defaults)
-                            "gene_b_locus_tag": b_id,
-                            "gene_b_uniprot_id": gene_b_info.get("uniprot_id") if gene_b_info else None,
-                            "gene_b_name": gene_b_info.get("name") if gene_b_info else None,
-                            "gene_b_source": gene_b_info.get("source") if gene_b_info else None,
-                            "gene_b_type": gene_b_info.get("type") if gene_b_info else None,
-                            "gene_b_start": gene_b_info.get("start") if gene_b_info else None,
-                            "gene_b_end": gene_b_info.get("end") if gene_b_info else None,
-                            "gene_b_score": gene_b_info.get("score") if gene_b_info else None,
-                            "gene_b_strand": gene_b_info.get("strand") if gene_b_info else None,
-                            "gene_b_phase": gene_b_info.get("phase") if gene_b_info else None,
-                            "gene_b_product": gene_b_info.get("product") if gene_b_info else None,
-                            "gene_b_desc": b_desc,
-                            
-                            # Cross-species analysis flags
-                            "same_species": species_a_name == species_b_name,
-                            "same_isolate": isolate_a == isolate_b,
-                        }
-
+                            doc = self._build_doc(r, None, None)
                         self._docs[pid] = doc
                         seen_since_flush += 1
 
                     # set if provided; do not override with empty values
-                    if otype not in (None, "", "nan", "NaN"):
-                        orthology_type = str(otype).strip()
+                    orthology_type = r.orthology_type
+                    if orthology_type:
                         doc["orthology_type"] = orthology_type
-                        
-                        # Set orthology type flags
                         doc["is_one_to_one"] = orthology_type == "1:1"
-                    
-                    if oma not in (None, "", "nan", "NaN"):
-                        try:
-                            doc["oma_group_id"] = int(str(oma).strip())
-                        except (ValueError, TypeError):
-                            # If OMA group is not a valid integer, store as None
-                            doc["oma_group_id"] = None
+
+                    oma = r.oma_group
+                    if oma:
+                        # If OMA group is not a valid integer, store as None
+                        doc["oma_group_id"] = int(oma) if oma.lstrip("+-").isdigit() else None
 
                     # Periodic flush to cap memory on huge files
                     if flush_every and seen_since_flush >= flush_every:
                         self._flush_partial()
                         seen_since_flush = 0
 
+                if checkpoint is not None:
+                    checkpoint.chunk_done(chunk_index, len(frame))
+
                 # drop chunk ASAP and GC
-                del km
-                del chunk
+                del frame
                 gc.collect()
 
         finally:
             # IMPORTANT: flush any stragglers at the end of THIS FILE
             if self._docs:
                 self._flush_partial()
+            elif checkpoint is not None:
+                checkpoint.commit()
+            self._checkpoint = None
 
         print(f"[orthologs] processed rows from {path}: {rows}")
 
+    def _sample_locus_species(self, path: str) -> pd.DataFrame:
+        """Species/isolate of the locus tags in the first chunk of a file, in row order (A then B)."""
+        for chunk in self._iter_chunks(path, chunksize=1000):
+            cols = resolve_columns(chunk.columns, ORTHOLOG_COLUMNS)
+            ids = [
+                _split_locus_and_desc_series(str_column(chunk, cols[g]))[0]
+                for g in ("gene_a", "gene_b")
+            ]
+            interleaved = pd.Series(np.column_stack([ids[0].to_numpy(), ids[1].to_numpy()]).ravel())
+            species = _species_columns(interleaved[interleaved != ""])
+            known = (species["species"] != "Unknown species") & (species["isolate"] != "UNKNOWN")
+            return species[known]
+        return _species_columns(pd.Series([], dtype=object))
+
     def _get_all_isolates_from_file(self, path: str) -> List[str]:
         """Get all unique isolates from ortholog file by sampling locus tags."""
-        isolates = set()
-        
         try:
-            # Sample first few chunks to get all unique isolates
-            for chunk in self._iter_chunks(path, chunksize=1000):
-                km = _keys_map(chunk.columns)
-                
-                for rec in chunk.to_dict(orient="records"):
-                    raw_a = _get(rec, km, "protein_id_a", "protein_id_1", "Protein 1", "protein 1", "Gene 1", "gene 1")
-                    raw_b = _get(rec, km, "protein_id_b", "protein_id_2", "Protein 2", "protein 2", "Gene 2", "gene 2")
-                    
-                    for raw_protein in [raw_a, raw_b]:
-                        if raw_protein:
-                            protein_id, _ = _split_locus_and_desc(raw_protein)
-                            if protein_id:
-                                species_acronym, species_name, isolate_name = _extract_species_from_locus(protein_id)
-                                if species_name != "Unknown species" and isolate_name != "UNKNOWN":
-                                    isolates.add(isolate_name)
-                
-                # Only sample first few chunks to avoid processing entire file
-                break
-                
+            return self._sample_locus_species(path)["isolate"].unique().tolist()
         except Exception as e:
             print(f"[orthologs] Warning: Error sampling isolates from file {path}: {e}")
-        
-        return list(isolates)
+            return []
 
     def _get_species_isolate_mapping(self, path: str) -> Dict[str, str]:
         """Get species to isolate mapping from ortholog file by sampling locus tags."""
-        species_isolate_map = {}
-        
         try:
-            # Sample first few chunks to get species and isolate information
-            for chunk in self._iter_chunks(path, chunksize=1000):
-                km = _keys_map(chunk.columns)
-                
-                for rec in chunk.to_dict(orient="records"):
-                    raw_a = _get(rec, km, "protein_id_a", "protein_id_1", "Protein 1", "protein 1", "Gene 1", "gene 1")
-                    raw_b = _get(rec, km, "protein_id_b", "protein_id_2", "Protein 2", "protein 2", "Gene 2", "gene 2")
-                    
-                    for raw_protein in [raw_a, raw_b]:
-                        if raw_protein:
-                            protein_id, _ = _split_locus_and_desc(raw_protein)
-                            if protein_id:
-                                species_acronym, species_name, isolate_name = _extract_species_from_locus(protein_id)
-                                if species_name != "Unknown species" and isolate_name != "UNKNOWN":
-                                    # Map species name to isolate name for GFF lookup
-                                    # Keep the first isolate found for each species
-                                    if species_name not in species_isolate_map:
-                                        species_isolate_map[species_name] = isolate_name
-                
-                # Only sample first few chunks to avoid processing entire file
-                break
-                
+            # Keep the first isolate found for each species
+            species = self._sample_locus_species(path).drop_duplicates("species")
+            return dict(zip(species["species"], species["isolate"]))
         except Exception as e:
             print(f"[orthologs] Warning: Error sampling species from file {path}: {e}")
-        
-        return species_isolate_map
+            return {}
 
     def _get_unique_species_from_file(self, path: str) -> List[str]:
         """Get unique species from ortholog file by sampling locus tags."""
         species_isolate_map = self._get_species_isolate_mapping(path)
         return list(species_isolate_map.keys())
 
+    def _send(self, actions: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """Bulk-index `actions`; returns (success, failed)."""
+        if self.delta is not None:
+            actions = self.delta.filter(actions)
+        if not actions:
+            return 0, 0
+        success, errors = bulk_exec(actions)
+        return success, len(errors)
+
     def _flush_partial(self) -> None:
         if not self._docs:
             return
         actions: List[Dict[str, Any]] = []
-        # keep batch small (1000) to avoid big lists in RAM
+        success = failed = 0
+        # hand over BATCH_SIZE actions at a time so the action list stays bounded;
+        # the bulk engine splits each batch into byte-capped requests
         for pid, src in self._docs.items():
             actions.append({
                 "_op_type": "index",
@@ -423,12 +465,16 @@ class Orthologs(Flow):
                 "_id": pid,
                 "_source": src,
             })
-            if len(actions) >= 1000:
-                bulk_exec(actions)
+            if len(actions) >= BATCH_SIZE:
+                ok, bad = self._send(actions)
+                success, failed = success + ok, failed + bad
                 actions.clear()
         if actions:
-            bulk_exec(actions)
-        print(f"[orthologs] partial index flush: {len(self._docs)} docs")
+            ok, bad = self._send(actions)
+            success, failed = success + ok, failed + bad
+        print(f"[orthologs] partial index flush: {len(self._docs)} docs, {failed} failed")
+        if self._checkpoint is not None:
+            self._checkpoint.commit(success=success, failed=failed)
         # FREE the cache
         self._docs.clear()
 
@@ -444,11 +490,11 @@ class Orthologs(Flow):
                 "_id": pid,
                 "_source": src,
             })
-            if len(actions) >= 1000:
-                bulk_exec(actions);
+            if len(actions) >= BATCH_SIZE:
+                self._send(actions)
                 actions.clear()
         if actions:
-            bulk_exec(actions);
+            self._send(actions)
             actions.clear()
         print(f"[orthologs] indexed docs: {len(self._docs)}")
         self._docs.clear()
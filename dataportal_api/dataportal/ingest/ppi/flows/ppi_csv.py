@@ -1,11 +1,22 @@
 from __future__ import annotations
+import glob
+import multiprocessing
+import os
+import traceback
+from contextlib import closing, nullcontext
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
+import pandas as pd
 from django.utils.timezone import now
 
-from dataportal.ingest.ppi.parsing import iter_ppi_rows
-from dataportal.ingest.ppi.gff_parser import GFFParser
+from dataportal.ingest.constants import PPI_FILE_WORKERS
+from dataportal.ingest.ppi.parsing import iter_ppi_file_frames
+from dataportal.ingest.ppi.gff_parser import GENE_INFO_FIELDS, GFFParser
+from dataportal.ingest.bulk import ingest_session
+from dataportal.ingest.checkpoints import IngestCheckpoints
+from dataportal.ingest.delta import DeltaFilter
 from dataportal.ingest.es_repo import PPIIndexRepository
 
 
@@ -80,13 +91,36 @@ def _flags_and_rollups(src: Dict) -> None:
     #     src["confidence_bin"] = "low"
 
 
+# (kind, path, rows read, actions) messages from the CSV readers to the writer
+Event = Tuple[str, str, int, Optional[List[Dict]]]
+
+
 @dataclass
 class PPICSVFlow:
+    """
+    PPI CSVs -> ProteinProteinDocument actions.
+
+    Files are read in columnar batches (iter_ppi_file_frames); scores, flags
+    and pair ids are computed per column and gene information is joined per
+    batch against the species' GeneTable. With workers > 1, files are parsed in
+    forked worker processes that feed their batches to this process, which
+    alone talks to Elasticsearch (shared bulk engine, delta filter, checkpoints).
+    """
     repo: PPIIndexRepository
     species_map: Dict[str, str]
     gff_parser: Optional[GFFParser] = None
     # Optional mapping from UniProt → STRING protein id
     string_map: Optional[Dict[str, str]] = None
+    # Optional DeltaFilter: only new/changed pairs are written
+    delta: Optional[DeltaFilter] = None
+
+    def _index_batch(self, buffer: List[Dict], refresh=None) -> Tuple[int, int]:
+        """Bulk-index a batch; returns (success, failed)."""
+        actions = self.delta.filter(buffer) if self.delta is not None else buffer
+        if not actions:
+            return 0, 0
+        success, failures = self.repo.bulk_index(actions, refresh=refresh)
+        return success, len(failures)
 
     def _row_to_action(self, row: Dict) -> Optional[Dict]:
         a, b = row.get("protein_a"), row.get("protein_b")
@@ -187,19 +221,187 @@ class PPICSVFlow:
             "_source": src,
         }
 
+    def _frame_to_actions(self, frame: pd.DataFrame) -> List[Dict]:
+        """Columnar _row_to_action over one batch from iter_ppi_file_frames."""
+        a = frame["protein_a"].to_numpy(dtype=object)
+        b = frame["protein_b"].to_numpy(dtype=object)
+        keep = (a != "") & (b != "")
+        if not keep.all():
+            frame, a, b = frame[keep], a[keep], b[keep]
+        n = len(frame)
+        if not n:
+            return []
+
+        species = frame["species"].to_numpy(dtype=object)
+        uniq = pd.unique(species)
+        key_of = {sp: _species_key(sp, self.species_map) for sp in uniq}
+        isolate_of = {sp: _get_isolate_name(sp, self.species_map) for sp in uniq}
+        sp_key = [key_of[sp] for sp in species]
+
+        aa = np.where(a <= b, a, b)
+        bb = np.where(a <= b, b, a)
+
+        # gene info: one GeneTable join per species in the batch
+        genes_a = np.full((n, len(GENE_INFO_FIELDS)), None, dtype=object)
+        genes_b = np.full((n, len(GENE_INFO_FIELDS)), None, dtype=object)
+        if self.gff_parser is not None:
+            for sp in uniq:
+                table = self.gff_parser.gene_table(sp) if sp else None
+                if table is None:
+                    continue
+                rows = species == sp
+                genes_a[rows] = table.take(a[rows])
+                genes_b[rows] = table.take(b[rows])
+
+        locus = [[x for x in pair if x] for pair in zip(genes_a[:, 0], genes_b[:, 0])]
+        string_a = string_b = [None] * n
+        if self.string_map:
+            string_a = [self.string_map.get(u or p) for u, p in zip(genes_a[:, 1], a)]
+            string_b = [self.string_map.get(u or p) for u, p in zip(genes_b[:, 1], b)]
+
+        peptides = frame["xlms_peptides"].to_numpy(dtype=object)
+        files = frame["xlms_files"].to_numpy(dtype=object)
+        columns = {
+            "pair_id": [f"{k}:{x}__{y}" for k, x, y in zip(sp_key, aa, bb)],
+            "species_scientific_name": species,
+            "species_acronym": sp_key,
+            "isolate_name": [isolate_of[sp] for sp in species],
+            "protein_a": aa,
+            "protein_b": bb,
+            "participants": [[x, y] for x, y in zip(a, b)],
+            "participants_sorted": [[x, y] for x, y in zip(aa, bb)],
+            "is_self_interaction": (aa == bb).tolist(),
+            "participants_locus_tag": [p or None for p in locus],
+            "participants_locus_tag_sorted": [sorted(p) if p else None for p in locus],
+            "xlms_peptides": peptides,
+            "xlms_files": files,
+            "string_protein_a_id": string_a,
+            "string_protein_b_id": string_b,
+            "has_xlms": [bool(p or f) for p, f in zip(peptides, files)],
+        }
+        for field in (
+            "ds_score",
+            "tt_score",
+            "perturbation_score",
+            "abundance_score",
+            "melt_score",
+            "secondary_score",
+            "bayesian_score",
+            "string_score",
+            "operon_score",
+            "ecocyc_score",
+        ):
+            columns[field] = frame[field].to_numpy(dtype=object)
+        for flag, field in (
+            ("has_string", "string_score"),
+            ("has_operon", "operon_score"),
+            ("has_ecocyc", "ecocyc_score"),
+        ):
+            columns[flag] = pd.notna(columns[field]).tolist()
+        for i, name in enumerate(GENE_INFO_FIELDS):
+            columns[f"protein_a_{name}"] = genes_a[:, i]
+            columns[f"protein_b_{name}"] = genes_b[:, i]
+
+        names = list(columns)
+        index = self.repo.concrete_index
+        return [
+            {"_op_type": "index", "_index": index, "_id": src["pair_id"], "_source": src}
+            for src in (dict(zip(names, values)) for values in zip(*columns.values()))
+        ]
+
+    # ---------- readers ----------
+
+    def _file_events(self, path: str, batch_size: int, skip_rows: int = 0) -> Iterator[Event]:
+        for frame in iter_ppi_file_frames(path, chunksize=batch_size, skip_rows=skip_rows):
+            yield "batch", path, len(frame), self._frame_to_actions(frame)
+        yield "done", path, 0, None
+
+    def _worker(self, tasks, out, batch_size: int) -> None:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            path, skip_rows = task
+            try:
+                for event in self._file_events(path, batch_size, skip_rows):
+                    out.put(event)
+            except Exception:
+                out.put(("error", path, 0, traceback.format_exc()))
+        out.put(("exit", "", 0, None))
+
+    def _parallel_events(
+        self, files: List[Tuple[str, int]], batch_size: int, workers: int
+    ) -> Iterator[Event]:
+        ctx = multiprocessing.get_context("fork")
+        tasks = ctx.Queue()
+        out = ctx.Queue(maxsize=workers * 2)  # bounded: readers wait for the writer
+        for task in files:
+            tasks.put(task)
+        for _ in range(workers):
+            tasks.put(None)
+        procs = [
+            ctx.Process(
+                target=self._worker,
+                args=(tasks, out, batch_size),
+                name=f"ppi-reader-{n}",
+                daemon=True,
+            )
+            for n in range(workers)
+        ]
+        for proc in procs:
+            proc.start()
+
+        failed = []
+        running = workers
+        try:
+            while running:
+                event = out.get()
+                if event[0] == "exit":
+                    running -= 1
+                elif event[0] == "error":
+                    failed.append(event[1])
+                    print(f"[ppi] reader failed on {event[1]}:\n{event[3]}")
+                else:
+                    yield event
+        finally:
+            for proc in procs:
+                if proc.is_alive():
+                    proc.terminate()
+                proc.join()
+        if failed:
+            raise RuntimeError(
+                f"PPI CSV parsing failed for {len(failed)} file(s): {', '.join(failed)}"
+            )
+
+    def _events(
+        self, files: List[Tuple[str, int]], batch_size: int, workers: int
+    ) -> Iterator[Event]:
+        if workers > 1 and len(files) > 1:
+            return self._parallel_events(files, batch_size, min(workers, len(files)))
+        return (
+            event
+            for path, skip_rows in files
+            for event in self._file_events(path, batch_size, skip_rows)
+        )
+
     def run(
         self,
         folder: str,
         pattern: str = "*.csv",
         batch_size: int = 5000,
-        refresh: Optional[str | bool] = None,  # set "wait_for" at the end if needed
+        refresh: Optional[str | bool] = None,  # refresh once at the end if set
         log_every: int = 100_000,
         optimize_indexing: bool = True,
         refresh_every_rows: int | None = None,
         refresh_every_secs: float | None = None,
+        checkpoints: Optional[IngestCheckpoints] = None,
+        workers: int = PPI_FILE_WORKERS,
     ) -> int:
         """
-        Stream CSVs and bulk-index in chunks. No Painless, no large in-memory merge.
+        Read the CSVs in columnar batches and bulk-index each batch. With
+        workers > 1, files are parsed in parallel processes.
+        With checkpoints, completed files are skipped and a partially indexed file
+        resumes after its last committed batch.
         Returns number of actions indexed.
         """
         es = self.repo._conn()
@@ -213,87 +415,73 @@ class PPICSVFlow:
             species_list = list(self.species_map.keys())
             if species_list:
                 self.gff_parser.preload_gff_files(species_list)
+                # build the join tables before forking so readers share them
+                for species in species_list:
+                    self.gff_parser.gene_table(species)
                 print(f"[ppi] Pre-loaded GFF files for {len(species_list)} species")
             else:
                 print("[ppi] No species in mapping")
 
-        # Optional: speed up big initial loads
-        old_settings = {}
-        if optimize_indexing:
-            try:
-                # capture current settings to restore later
-                old = es.indices.get_settings(index=self.repo.concrete_index)
-                cur = next(iter(old.values()))["settings"]["index"]
-                old_settings["refresh_interval"] = cur.get("refresh_interval", "1s")
-                old_settings["number_of_replicas"] = cur.get("number_of_replicas", "1")
-
-                es.indices.put_settings(
-                    index=self.repo.concrete_index,
-                    body={"index": {"refresh_interval": "-1", "number_of_replicas": 0}},
-                )
-            except Exception as e:
-                print(f"[ppi] warn: could not apply fast-index settings: {e}")
+        files: List[Tuple[str, int]] = []
+        file_checkpoints = {}
+        for path in sorted(glob.glob(os.path.join(folder, pattern))):
+            ck = checkpoints.file(path) if checkpoints is not None else None
+            if ck is not None and ck.done:
+                continue
+            file_checkpoints[path] = ck
+            files.append((path, ck.rows if ck is not None else 0))
+
+        # Optional: speed up big initial loads (refresh off, replicas 0)
+        session = (
+            ingest_session(self.repo.concrete_index, client=es, drop_replicas=True)
+            if optimize_indexing
+            else nullcontext()
+        )
 
-        buffer: List[Dict] = []
         total = 0
+        rows_read = 0
         rows_since_refresh = 0
         last_refresh_ts = now()
 
-        try:
-            for i, row in enumerate(iter_ppi_rows(folder, pattern, self.gff_parser), 1):
-                act = self._row_to_action(row)
-                if act is None:
+        with session, closing(self._events(files, batch_size, workers)) as events:
+            for kind, path, rows, actions in events:
+                # per-file checkpoint: a batch is committed once bulk-indexed, and
+                # index ops make re-sending an uncommitted batch harmless
+                ck = file_checkpoints.get(path)
+                if kind == "done":
+                    if ck is not None:
+                        ck.finish()
                     continue
-                buffer.append(act)
-                rows_since_refresh += 1
 
-                if len(buffer) >= batch_size:
-                    success, _ = self.repo.bulk_index(
-                        buffer, chunk_size=batch_size, refresh=None
-                    )
-                    total += success
-                    buffer.clear()
-                    if log_every and (i % log_every == 0):
-                        print(f"[ppi] processed rows: {i:,} | indexed: {total:,}")
-
-                    should_refresh = (
-                        refresh_every_rows is not None
-                        and rows_since_refresh >= refresh_every_rows
-                    ) or (
-                        refresh_every_secs is not None
-                        and (now() - last_refresh_ts).total_seconds()
-                        >= refresh_every_secs
-                    )
-                    if should_refresh:
-                        es.indices.refresh(index=self.repo.concrete_index)
-                        rows_since_refresh = 0
-                        last_refresh_ts = now()
-                        print(
-                            f"[ppi] periodic refresh after {i:,} rows; total indexed: {total:,}"
-                        )
-
-            if buffer:
-                success, _ = self.repo.bulk_index(
-                    buffer, chunk_size=batch_size, refresh=refresh
-                )
+                success, failed = self._index_batch(actions)
                 total += success
-        finally:
-            if optimize_indexing and old_settings:
-                try:
-                    es.indices.put_settings(
-                        index=self.repo.concrete_index,
-                        body={
-                            "index": {
-                                "refresh_interval": old_settings["refresh_interval"],
-                                "number_of_replicas": old_settings[
-                                    "number_of_replicas"
-                                ],
-                            }
-                        },
+                if ck is not None:
+                    ck.chunk_done(ck.next_chunk, rows)
+                    ck.commit(success=success, failed=failed)
+
+                if log_every and rows_read // log_every < (rows_read + rows) // log_every:
+                    print(f"[ppi] processed rows: {rows_read + rows:,} | indexed: {total:,}")
+                rows_read += rows
+                rows_since_refresh += len(actions)
+
+                should_refresh = (
+                    refresh_every_rows is not None and rows_since_refresh >= refresh_every_rows
+                ) or (
+                    refresh_every_secs is not None
+                    and (now() - last_refresh_ts).total_seconds() >= refresh_every_secs
+                )
+                if should_refresh:
+                    es.indices.refresh(index=self.repo.concrete_index)
+                    rows_since_refresh = 0
+                    last_refresh_ts = now()
+                    print(
+                        f"[ppi] periodic refresh after {rows_read:,} rows; total indexed: {total:,}"
                     )
-                    if refresh:
-                        es.indices.refresh(index=self.repo.concrete_index)
-                except Exception as e:
-                    print(f"[ppi] warn: restore index settings failed: {e}")
+
+            if self.delta is not None:
+                self.delta.finish()
+
+        if refresh:
+            es.indices.refresh(index=self.repo.concrete_index)
 
         return total
@@ -2,17 +2,23 @@
 GFF parser utility for extracting gene information with caching.
 
 This module provides functionality to parse GFF files and extract gene information
-for protein-protein interactions, with in-memory caching to avoid re-downloading
-the same GFF files.
+for protein-protein interactions. Parsed isolates are compiled once into an
+on-disk AnnotationStore (one per annotation release) that later runs and other
+import commands open read-only instead of re-parsing the GFFs.
 """
 
 import os
-import tempfile
 import ftplib
 import logging
 import time
 from typing import Dict, Optional, Tuple, List
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+
+import numpy as np
+import pandas as pd
+
+from dataportal.ingest.ftp_cache import get_ftp_cache
+from dataportal.ingest.gff.annotation_store import AnnotationStore
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +41,61 @@ class GeneInfo:
     product: Optional[str] = None
 
 
+GENE_INFO_FIELDS = tuple(f.name for f in fields(GeneInfo))
+
+# protein ids that look like locus tags are resolved by locus tag first
+_LOCUS_PREFIXES = ("BU_", "PV_", "IG:")
+
+
+class GeneTable:
+    """
+    One isolate's genes as an object matrix (GENE_INFO_FIELDS columns) for
+    batch lookups: `lookup` resolves a whole column of protein ids at once
+    with the same UniProt/locus-tag precedence as
+    GFFParser._get_gene_info_by_protein_id.
+    """
+
+    def __init__(self, rows: List[tuple]):
+        # trailing all-None row is the target of misses
+        self.values = np.empty((len(rows) + 1, len(GENE_INFO_FIELDS)), dtype=object)
+        if rows:
+            self.values[:-1] = rows
+        self.missing = len(rows)
+        frame = pd.DataFrame(
+            {
+                "locus_tag": self.values[:-1, 0],
+                "uniprot_id": self.values[:-1, 1],
+            }
+        )
+        self._by_locus = pd.Index(frame["locus_tag"])
+        uni = frame.dropna(subset=["uniprot_id"]).drop_duplicates("uniprot_id")
+        self._by_uniprot = pd.Index(uni["uniprot_id"])
+        self._uniprot_rows = uni.index.to_numpy(dtype=np.int64)
+
+    def __len__(self) -> int:
+        return self.missing
+
+    def lookup(self, protein_ids) -> np.ndarray:
+        """Row positions in `values` for each id (misses point at the None row)."""
+        ids = pd.Series(protein_ids, dtype=object).fillna("")
+        by_locus = self._by_locus.get_indexer(ids)
+        # get_indexer gives -1 for a miss, which picks the appended -1
+        by_uniprot = np.append(self._uniprot_rows, -1)[self._by_uniprot.get_indexer(ids)]
+        looks_like_locus = (
+            ids.str.contains("_", regex=False) & ids.str.startswith(_LOCUS_PREFIXES)
+        ).to_numpy()
+        pos = np.where(
+            looks_like_locus,
+            np.where(by_locus >= 0, by_locus, by_uniprot),
+            np.where(by_uniprot >= 0, by_uniprot, by_locus),
+        )
+        return np.where(pos >= 0, pos, self.missing)
+
+    def take(self, protein_ids) -> np.ndarray:
+        """GeneInfo field values (n x GENE_INFO_FIELDS) for each id; None where unresolved."""
+        return self.values[self.lookup(protein_ids)]
+
+
 class GFFParser:
     """GFF parser with caching for gene information extraction."""
 
@@ -42,18 +103,23 @@ class GFFParser:
         self,
         ftp_server: str = "ftp.ebi.ac.uk",
         ftp_directory: str = "/pub/databases/mett/annotations/v1_2024-04-15/",
+        annotation_store: Optional[str] = None,
     ):
         self.ftp_server = ftp_server
         self.ftp_directory = ftp_directory
-        self._gene_cache: Dict[str, Dict[str, GeneInfo]] = (
-            {}
-        )  # isolate -> {locus_tag -> GeneInfo}
-        self._uniprot_cache: Dict[str, Dict[str, GeneInfo]] = (
-            {}
-        )  # isolate -> {uniprot_id -> GeneInfo}
+        self._store = (
+            AnnotationStore(annotation_store)
+            if annotation_store
+            else AnnotationStore.for_release(ftp_server, ftp_directory)
+        )
         self._gff_file_cache: Dict[str, str] = {}  # isolate -> gff_file mapping
         self._species_to_isolate: Dict[str, str] = {}  # species -> isolate mapping
         self._loaded_isolates: set = set()  # Track which isolates have been loaded
+        self._gene_tables: Dict[str, GeneTable] = {}  # isolate -> batch lookup table
+
+    @property
+    def store(self) -> AnnotationStore:
+        return self._store
 
     def _reconnect_ftp(self) -> ftplib.FTP:
         """Handle FTP connection with retry logic and exponential backoff."""
@@ -138,49 +204,21 @@ class GFFParser:
         return dbxref_list, uniprot_id
 
     def _download_gff_file(self, gff_file: str) -> Optional[str]:
-        """Download GFF file to temporary location."""
-        # logger.debug(f"Downloading GFF file: {gff_file}")
-
+        """Return a local copy of the GFF file from the shared FTP artifact cache."""
         try:
-            ftp = self._reconnect_ftp()
-            local_gff_path = os.path.join(
-                tempfile.gettempdir(), os.path.basename(gff_file)
-            )
-            # logger.debug(f"Local GFF path: {local_gff_path}")
-
-            # Check if file exists on FTP
-            try:
-                file_size = ftp.size(gff_file)
-                logger.debug(f"File size on FTP: {file_size} bytes")
-            except ftplib.error_perm as e:
-                logger.warning(f"File not found on FTP: {gff_file}, error: {e}")
-                ftp.quit()
-                return None
-
-            # Download file
-            # logger.debug(f"Starting download of {gff_file}")
-            with open(local_gff_path, "wb") as f:
-                ftp.retrbinary(f"RETR {gff_file}", f.write)
-            ftp.quit()
-
-            # Verify download
-            if os.path.exists(local_gff_path):
-                actual_size = os.path.getsize(local_gff_path)
-                # logger.debug(f"Downloaded file size: {actual_size} bytes")
-                if actual_size == 0:
-                    logger.error(f"Downloaded file is empty: {local_gff_path}")
-                    return None
-                # logger.info(f"Successfully downloaded GFF file: {local_gff_path}")
-            else:
-                logger.error(f"Downloaded file does not exist: {local_gff_path}")
-                return None
-
-            return local_gff_path
-
+            local_gff_path = get_ftp_cache(self.ftp_server).fetch(gff_file)
+        except ftplib.error_perm as e:
+            logger.warning(f"File not found on FTP: {gff_file}, error: {e}")
+            return None
         except Exception as e:
             logger.error(f"Error downloading GFF file {gff_file}: {e}")
             return None
 
+        if os.path.getsize(local_gff_path) == 0:
+            logger.error(f"Downloaded file is empty: {local_gff_path}")
+            return None
+        return local_gff_path
+
     def _parse_gff_file(self, gff_file_path: str) -> Dict[str, GeneInfo]:
         """Parse GFF file and extract gene information."""
         gene_info_map = {}
@@ -284,11 +322,24 @@ class GFFParser:
             logger.debug(f"  {species} -> {isolate}")
 
     def preload_gff_files(self, species_list: List[str]) -> None:
-        """Pre-load GFF files for all species in the list with connection throttling."""
+        """Make sure every species' isolate is compiled into the annotation store."""
         logger.debug(f"Pre-loading GFF files for {len(species_list)} species...")
 
         successful_loads = 0
         failed_loads = 0
+        compiled = self._store.isolates()
+
+        # Download the GFFs of not-yet-compiled isolates up front over a bounded
+        # pool of FTP connections; compiling below then reads the local cache.
+        gff_files = []
+        for species in species_list:
+            isolate = self._species_to_isolate.get(species)
+            if isolate and isolate not in compiled and isolate not in self._loaded_isolates:
+                gff_file = self._get_gff_file_for_isolate(isolate)
+                if gff_file:
+                    gff_files.append(gff_file)
+        if gff_files:
+            get_ftp_cache(self.ftp_server).prefetch(gff_files)
 
         for i, species in enumerate(species_list, 1):
             isolate = self._species_to_isolate.get(species)
@@ -307,96 +358,57 @@ class GFFParser:
                 successful_loads += 1
                 logger.debug(f"Loaded GFF for isolate: {isolate}")
 
-                # Brief delay between downloads to avoid overwhelming the FTP server
-                if i < len(species_list):
-                    time.sleep(0.2)
-
             except Exception as e:
                 failed_loads += 1
                 logger.error(f"Failed to load GFF data for isolate {isolate}: {e}")
 
-                # Add longer delay after failures to give the server time to recover
-                time.sleep(2.0)  # 2 second delay after failures
-
         logger.info(
-            f"GFF preload complete: {successful_loads} successful, {failed_loads} failed"
+            f"GFF preload complete: {successful_loads} successful, {failed_loads} failed "
+            f"(annotation store: {self._store.path})"
         )
 
     def _load_isolate_gff_data(self, isolate: str) -> None:
-        """Load GFF data for a specific isolate."""
-        # logger.debug(f"Loading GFF data for isolate: {isolate}")
+        """Compile an isolate's GFF into the annotation store unless it is already there."""
+        if self._store.has_isolate(isolate):
+            return
 
         gff_file = self._get_gff_file_for_isolate(isolate)
         if not gff_file:
             logger.warning(f"No GFF file found for isolate: {isolate}")
             return
 
-        # logger.debug(f"GFF file found: {gff_file}")
-
         local_gff_path = self._download_gff_file(gff_file)
         if not local_gff_path:
             logger.error(f"Failed to download GFF file for isolate: {isolate}")
             return
 
-        # logger.debug(f"GFF file downloaded to: {local_gff_path}")
-
-        try:
-            gene_info_map = self._parse_gff_file(local_gff_path)
-            self._gene_cache[isolate] = gene_info_map
-
-            # Build UniProt ID cache
-            uniprot_map = {}
-            for locus_tag, gene_info in gene_info_map.items():
-                if gene_info.uniprot_id:
-                    uniprot_map[gene_info.uniprot_id] = gene_info
-            self._uniprot_cache[isolate] = uniprot_map
-
-            # logger.info(f"Loaded {len(gene_info_map)} genes from GFF file for isolate: {isolate}")
-            # logger.info(f"Built UniProt cache with {len(uniprot_map)} entries for isolate: {isolate}")
-
-            # Log sample of loaded genes for debugging
-            if gene_info_map:
-                sample_genes = list(gene_info_map.items())[:3]
-                for locus_tag, gene_info in sample_genes:
-                    logger.debug(f"Sample gene - {locus_tag}: {gene_info}")
-            else:
-                logger.warning(f"No genes loaded for isolate: {isolate}")
-
-        finally:
-            # Clean up temporary file
-            if os.path.exists(local_gff_path):
-                logger.debug(f"Cleaning up temporary file: {local_gff_path}")
-                os.remove(local_gff_path)
+        gene_info_map = self._parse_gff_file(local_gff_path)
+        if not gene_info_map:
+            logger.warning(f"No genes loaded for isolate: {isolate}")
+            return
+        self._store.add_isolate(isolate, gene_info_map.values(), gff_file=gff_file)
 
-    def get_gene_info(self, species: str, locus_tag: str) -> Optional[GeneInfo]:
-        """Get gene information for a specific locus tag from a species.
+    def _resolve_isolate(self, species: str) -> Optional[str]:
+        """Map a species key to its isolate and make sure the isolate is loaded.
 
         Supports both plain species names (e.g., "Bacteroides uniformis") and
         unique species keys we generate to represent an isolate
         (e.g., "Bacteroides uniformis_BU_WH712"). If the mapping for a unique
-        key is missing, this method will attempt to lazily load and map the
-        corresponding isolate on-demand.
+        key is missing, the corresponding isolate is mapped on-demand.
         """
-        # Try direct mapping first
         isolate = self._species_to_isolate.get(species)
 
-        # If not found, attempt to parse a unique key of the form
-        # "<species_name>_<isolate>" and map lazily
         if not isolate:
             # Heuristic: isolate names begin with an acronym like BU_ or PV_
-            # so look for the last occurrence of " BU_" or " PV_" suffixes
             parsed_isolate: Optional[str] = None
             if "_BU_" in species:
-                parsed_isolate = species.split("_BU_", 1)[1]
-                parsed_isolate = f"BU_{parsed_isolate}"
+                parsed_isolate = "BU_" + species.split("_BU_", 1)[1]
             elif "_PV_" in species:
-                parsed_isolate = species.split("_PV_", 1)[1]
-                parsed_isolate = f"PV_{parsed_isolate}"
+                parsed_isolate = "PV_" + species.split("_PV_", 1)[1]
 
             if parsed_isolate:
                 try:
                     if parsed_isolate not in self._loaded_isolates:
-                        # Load this isolate's GFF on-demand
                         self._load_isolate_gff_data(parsed_isolate)
                         self._loaded_isolates.add(parsed_isolate)
                     # Map the unique key to this isolate for subsequent calls
@@ -409,7 +421,6 @@ class GFFParser:
                     logger.warning(
                         f"Unable to dynamically load isolate for species key '{species}': {e}"
                     )
-                    # Fall through to final warning below if still not mapped
 
         if not isolate:
             logger.warning(
@@ -418,92 +429,44 @@ class GFFParser:
             )
             return None
 
-        # Load GFF data if not already loaded
         if isolate not in self._loaded_isolates:
-            logger.info(f"GFF data not loaded for isolate {isolate}, loading now...")
             try:
                 self._load_isolate_gff_data(isolate)
                 self._loaded_isolates.add(isolate)
             except Exception as e:
                 logger.error(f"Failed to load GFF data for isolate {isolate}: {e}")
                 return None
-        # else:
-        #     logger.info(f"GFF data already loaded for isolate: {isolate}")
-
-        # Return gene info from cache
-        if isolate in self._gene_cache:
-            gene_info = self._gene_cache[isolate].get(locus_tag)
-            # if gene_info:
-            #     logger.info(f"Found gene info for {locus_tag}: {gene_info}")
-            # else:
-            #     logger.info(f"No gene info found for locus_tag: {locus_tag} in isolate: {isolate}")
-            #     logger.info(f"Available locus_tags in cache: {list(self._gene_cache[isolate].keys())[:10]}")
-            return gene_info
-        else:
-            logger.warning(f"No gene cache found for isolate: {isolate}")
+        return isolate
+
+    def get_gene_info(self, species: str, locus_tag: str) -> Optional[GeneInfo]:
+        """Get gene information for a specific locus tag from a species."""
+        isolate = self._resolve_isolate(species)
+        if not isolate:
             return None
+        return self._store.get(isolate, locus_tag, GeneInfo)
 
     def get_gene_info_by_uniprot(
         self, species: str, uniprot_id: str
     ) -> Optional[GeneInfo]:
-        """Get gene information for a specific UniProt ID from a species.
-
-        Mirrors get_gene_info's behavior for dynamically mapping unique species keys.
-        """
-        isolate = self._species_to_isolate.get(species)
+        """Get gene information for a specific UniProt ID from a species."""
+        isolate = self._resolve_isolate(species)
         if not isolate:
-            parsed_isolate: Optional[str] = None
-            if "_BU_" in species:
-                parsed_isolate = species.split("_BU_", 1)[1]
-                parsed_isolate = f"BU_{parsed_isolate}"
-            elif "_PV_" in species:
-                parsed_isolate = species.split("_PV_", 1)[1]
-                parsed_isolate = f"PV_{parsed_isolate}"
-            if parsed_isolate:
-                try:
-                    if parsed_isolate not in self._loaded_isolates:
-                        self._load_isolate_gff_data(parsed_isolate)
-                        self._loaded_isolates.add(parsed_isolate)
-                    self._species_to_isolate[species] = parsed_isolate
-                    isolate = parsed_isolate
-                    logger.info(
-                        f"Dynamically mapped '{species}' to isolate '{parsed_isolate}'"
-                    )
-                except Exception as e:
-                    logger.warning(
-                        f"Unable to dynamically load isolate for species key '{species}': {e}"
-                    )
-        if not isolate:
-            logger.warning(
-                f"No isolate mapping found for species key '{species}'. "
-                f"Available species keys: {list(self._species_to_isolate.keys())[:5]}..."
-            )
             return None
+        return self._store.get_by_uniprot(isolate, uniprot_id, GeneInfo)
 
-        # Load GFF data if not already loaded
-        if isolate not in self._loaded_isolates:
-            # logger.info(f"GFF data not loaded for isolate {isolate}, loading now...")
-            try:
-                self._load_isolate_gff_data(isolate)
-                self._loaded_isolates.add(isolate)
-            except Exception as e:
-                logger.error(f"Failed to load GFF data for isolate {isolate}: {e}")
-                return None
-        # else:
-        #     logger.info(f"GFF data already loaded for isolate: {isolate}")
-
-        # Return gene info from UniProt cache
-        if isolate in self._uniprot_cache:
-            gene_info = self._uniprot_cache[isolate].get(uniprot_id)
-            # if gene_info:
-            #     logger.info(f"Found gene info for UniProt ID {uniprot_id}: {gene_info}")
-            # else:
-            #     logger.info(f"No gene info found for UniProt ID: {uniprot_id} in isolate: {isolate}")
-            #     logger.info(f"Available UniProt IDs in cache: {list(self._uniprot_cache[isolate].keys())[:10]}")
-            return gene_info
-        else:
-            logger.warning(f"No UniProt cache found for isolate: {isolate}")
+    def gene_table(self, species: str) -> Optional[GeneTable]:
+        """Batch lookup table of the species' isolate (built once per isolate)."""
+        isolate = self._resolve_isolate(species)
+        if not isolate:
             return None
+        table = self._gene_tables.get(isolate)
+        if table is None:
+            table = self._gene_tables[isolate] = GeneTable(self._store.gene_rows(isolate))
+        return table
+
+    def find_gene_info(self, locus_tag: str) -> Optional[GeneInfo]:
+        """Look a locus tag up in any isolate loaded by this parser."""
+        return self._store.find_locus(locus_tag, GeneInfo, isolates=self._loaded_isolates)
 
     def get_gene_info_for_proteins(
         self, species: str, protein_a: str, protein_b: str
@@ -534,9 +497,9 @@ class GFFParser:
         return gene or self.get_gene_info(species, protein_id)
 
     def clear_cache(self):
-        """Clear the gene information cache."""
-        self._gene_cache.clear()
-        self._uniprot_cache.clear()
+        """Forget in-process state; the compiled annotation store stays on disk."""
         self._gff_file_cache.clear()
         self._loaded_isolates.clear()
+        self._gene_tables.clear()
+        self._store.close()
         logger.info("GFF parser cache cleared")
@@ -1,9 +1,14 @@
 from __future__ import annotations
 import csv
 import glob
+import itertools
 import os
 import logging
 from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
 from .gff_parser import GFFParser, GeneInfo
 
 logger = logging.getLogger(__name__)
@@ -28,6 +33,21 @@ PPI_CSV_COLUMNS = [
 ]
 
 
+# CSV score column -> document field
+PPI_SCORE_FIELDS = {
+    "ds_score": "ds_score",
+    "tt_score": "tt_score",
+    "perturb_score": "perturbation_score",
+    "gp_score": "abundance_score",
+    "melt_score": "melt_score",
+    "sec_score": "secondary_score",
+    "bn_score": "bayesian_score",
+    "string_physical_score": "string_score",
+    "operon_score": "operon_score",
+    "ecocyc_score": "ecocyc_score",
+}
+
+
 def load_string_mapping(path: str) -> Dict[str, str]:
     """
     Load a UniProt → STRING protein id mapping from a TSV/CSV file.
@@ -136,58 +156,126 @@ def iter_ppi_rows(
 ) -> Iterator[Dict]:
     """Yield raw rows from all CSVs in `folder` matching pattern with optional gene information."""
     for path in sorted(glob.glob(os.path.join(folder, pattern))):
-        with open(path, "r", newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            # optional: verify header superset
-            missing = set(["species", "protein_a", "protein_b"]) - set(
-                reader.fieldnames or []
-            )
-            if missing:
-                raise ValueError(f"PPI CSV missing columns {missing} in {path}")
-            for row in reader:
-                base_row = {
-                    "species": row.get("species"),
-                    "csv_id": row.get(
-                        "id"
-                    ),  # may be None; not trusted for canonicalization
-                    "protein_a": row.get("protein_a"),
-                    "protein_b": row.get("protein_b"),
-                    "ds_score": _flt(row.get("ds_score")),
-                    "tt_score": _flt(row.get("tt_score")),
-                    "perturbation_score": _flt(row.get("perturb_score")),
-                    "abundance_score": _flt(row.get("gp_score")),
-                    "melt_score": _flt(row.get("melt_score")),
-                    "secondary_score": _flt(row.get("sec_score")),
-                    "bayesian_score": _flt(row.get("bn_score")),
-                    "string_score": _flt(row.get("string_physical_score")),
-                    "operon_score": _flt(row.get("operon_score")),
-                    "ecocyc_score": _flt(row.get("ecocyc_score")),
-                    "xlms_peptides": (row.get("xlms_peptides") or None),
-                    "xlms_files": _split_list(row.get("xlms_files")),
-                }
-
-                # Add gene information if GFF parser is provided
-                if gff_parser:
-                    species = base_row["species"]
-                    protein_a = base_row["protein_a"]
-                    protein_b = base_row["protein_b"]
-
-                    # logger.info(f"Looking up gene info for species: {species}, protein_a: {protein_a}, protein_b: {protein_b}")
-
-                    if species:
-                        gene_a, gene_b = gff_parser.get_gene_info_for_proteins(
-                            species, protein_a, protein_b
-                        )
-
-                        # logger.info(f"Gene lookup results - gene_a: {gene_a}, gene_b: {gene_b}")
-
-                        base_row.update(_add_gene_info_to_row(gene_a, gene_b))
-                    else:
-                        logger.info("No species found in row, skipping gene lookup")
+        yield from iter_ppi_file_rows(path, gff_parser)
+
+
+def iter_ppi_file_rows(
+    path: str, gff_parser: Optional[GFFParser] = None, skip_rows: int = 0
+) -> Iterator[Dict]:
+    """
+    Yield the raw rows of one PPI CSV with optional gene information.
+
+    skip_rows drops that many data rows before any parsing or gene lookups
+    (used to resume a file from its checkpoint).
+    """
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        # optional: verify header superset
+        missing = set(["species", "protein_a", "protein_b"]) - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"PPI CSV missing columns {missing} in {path}")
+        for row in itertools.islice(reader, skip_rows, None):
+            base_row = {
+                "species": row.get("species"),
+                "csv_id": row.get("id"),  # may be None; not trusted for canonicalization
+                "protein_a": row.get("protein_a"),
+                "protein_b": row.get("protein_b"),
+                "ds_score": _flt(row.get("ds_score")),
+                "tt_score": _flt(row.get("tt_score")),
+                "perturbation_score": _flt(row.get("perturb_score")),
+                "abundance_score": _flt(row.get("gp_score")),
+                "melt_score": _flt(row.get("melt_score")),
+                "secondary_score": _flt(row.get("sec_score")),
+                "bayesian_score": _flt(row.get("bn_score")),
+                "string_score": _flt(row.get("string_physical_score")),
+                "operon_score": _flt(row.get("operon_score")),
+                "ecocyc_score": _flt(row.get("ecocyc_score")),
+                "xlms_peptides": (row.get("xlms_peptides") or None),
+                "xlms_files": _split_list(row.get("xlms_files")),
+            }
+
+            # Add gene information if GFF parser is provided
+            if gff_parser:
+                species = base_row["species"]
+                protein_a = base_row["protein_a"]
+                protein_b = base_row["protein_b"]
+
+                # logger.info(f"Looking up gene info for species: {species}, protein_a: {protein_a}, protein_b: {protein_b}")
+
+                if species:
+                    gene_a, gene_b = gff_parser.get_gene_info_for_proteins(
+                        species, protein_a, protein_b
+                    )
+
+                    # logger.info(f"Gene lookup results - gene_a: {gene_a}, gene_b: {gene_b}")
+
+                    base_row.update(_add_gene_info_to_row(gene_a, gene_b))
                 else:
-                    logger.info("No GFF parser provided, skipping gene lookup")
+                    logger.info("No species found in row, skipping gene lookup")
+            else:
+                logger.info("No GFF parser provided, skipping gene lookup")
+
+            yield base_row
+
+
+def _flt_column(values: pd.Series) -> np.ndarray:
+    """Vectorized _flt: object array of floats, None where blank/NA/unparseable."""
+    num = pd.to_numeric(values.str.strip(), errors="coerce").to_numpy(dtype=float)
+    out = num.astype(object)
+    out[np.isnan(num)] = None
+    return out
 
-                yield base_row
+
+def iter_ppi_file_frames(
+    path: str, chunksize: int = 5000, skip_rows: int = 0
+) -> Iterator[pd.DataFrame]:
+    """
+    Columnar counterpart of iter_ppi_file_rows: yield DataFrames of up to
+    `chunksize` rows with the same normalized fields (species, protein_a,
+    protein_b, scores as float/None, xlms_peptides, xlms_files as lists).
+    Gene information is joined per batch by the flow (GFFParser.gene_table).
+
+    skip_rows drops that many data rows (used to resume a file from its checkpoint).
+    """
+    header = set(pd.read_csv(path, nrows=0).columns)
+    missing = {"species", "protein_a", "protein_b"} - header
+    if missing:
+        raise ValueError(f"PPI CSV missing columns {missing} in {path}")
+
+    reader = pd.read_csv(
+        path,
+        dtype=str,
+        keep_default_na=False,
+        chunksize=chunksize,
+        skiprows=range(1, skip_rows + 1) if skip_rows else None,
+    )
+    for chunk in reader:
+        if chunk.empty:
+            continue
+
+        def col(name: str) -> pd.Series:
+            if name in chunk.columns:
+                return chunk[name]
+            return pd.Series([""] * len(chunk), index=chunk.index, dtype=object)
+
+        frame = pd.DataFrame(
+            {
+                "species": col("species"),
+                "protein_a": col("protein_a"),
+                "protein_b": col("protein_b"),
+            }
+        )
+        for column, field in PPI_SCORE_FIELDS.items():
+            frame[field] = _flt_column(col(column))
+        peptides = col("xlms_peptides").to_numpy(dtype=object)
+        peptides[peptides == ""] = None
+        frame["xlms_peptides"] = pd.Series(peptides, index=frame.index, dtype=object)
+        # filled element-wise: numpy would turn equal-length lists into a 2-D array
+        files = np.empty(len(frame), dtype=object)
+        for i, v in enumerate(col("xlms_files")):
+            files[i] = _split_list(v) if v else None
+        frame["xlms_files"] = files
+        yield frame
 
 
 def _add_gene_info_to_row(
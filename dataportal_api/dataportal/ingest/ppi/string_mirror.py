@@ -0,0 +1,146 @@
+"""
+Builds the local STRING network mirror (see dataportal/utils/string_mirror.py
+for the on-disk format) from the per-species STRING download files:
+
+    {taxid}.protein.links.detailed.v12.0.txt.gz           functional network
+    {taxid}.protein.physical.links.detailed.v12.0.txt.gz  physical network
+    {taxid}.protein.info.v12.0.txt.gz                     preferred names (optional)
+
+Link files are space separated with a header naming the evidence channels;
+channels a file does not have are stored as 0. Links listed in one direction
+only are mirrored, and a link listed twice keeps its first line.
+"""
+
+import glob
+import gzip
+import os
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from dataportal.utils.string_mirror import MIRROR_CHANNELS, write_mirror
+
+# link file column -> STRING API score field
+LINK_COLUMNS = {
+    "neighborhood": "nscore",
+    "fusion": "fscore",
+    "cooccurence": "pscore",  # sic, as in the STRING files
+    "cooccurrence": "pscore",
+    "coexpression": "ascore",
+    "experimental": "escore",
+    "experiments": "escore",
+    "database": "dscore",
+    "textmining": "tscore",
+}
+LINK_FILES = {
+    "functional": "{taxid}.protein.links.detailed.*.txt*",
+    "physical": "{taxid}.protein.physical.links.detailed.*.txt*",
+}
+INFO_FILE = "{taxid}.protein.info.*.txt*"
+
+
+def _open(path: str):
+    return gzip.open(path, "rt") if path.endswith(".gz") else open(path)
+
+
+def find_string_files(directory: str, taxid: int) -> Tuple[Dict[str, str], Optional[str]]:
+    """({network_type: link file}, protein info file) of `taxid` in `directory`."""
+
+    def newest(pattern: str) -> Optional[str]:
+        matches = sorted(glob.glob(os.path.join(directory, pattern.format(taxid=taxid))))
+        return matches[-1] if matches else None
+
+    links = {network_type: newest(pattern) for network_type, pattern in LINK_FILES.items()}
+    return {k: v for k, v in links.items() if v}, newest(INFO_FILE)
+
+
+def read_protein_info(path: str) -> Dict[str, str]:
+    """STRING protein ID -> preferred name."""
+    names = {}
+    with _open(path) as f:
+        for line in f:
+            if line.startswith("#"):
+                continue
+            parts = line.rstrip("\n").split("\t")
+            if len(parts) >= 2 and parts[1]:
+                names[parts[0]] = parts[1]
+    return names
+
+
+def read_links(path: str) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parse a STRING link file into (proteins, CSR arrays): proteins sorted by
+    ID and (indptr, indices, scores), scores being uint16 (links, 1 +
+    channels) with the combined score first.
+    """
+    with _open(path) as f:
+        header = f.readline().split()
+        if header[:2] != ["protein1", "protein2"] or "combined_score" not in header:
+            raise ValueError(
+                f"{path} is not a STRING protein links file (header: {' '.join(header)})"
+            )
+        columns = [header.index("combined_score")] + [
+            next((i for i, name in enumerate(header) if LINK_COLUMNS.get(name) == channel), -1)
+            for channel in MIRROR_CHANNELS
+        ]
+        ids: Dict[str, int] = {}
+        src, dst = array("i"), array("i")
+        values = array("H")
+        for line in f:
+            parts = line.split()
+            if len(parts) != len(header):
+                continue
+            src.append(ids.setdefault(parts[0], len(ids)))
+            dst.append(ids.setdefault(parts[1], len(ids)))
+            values.extend(int(parts[i]) if i >= 0 else 0 for i in columns)
+
+    n = len(ids)
+    proteins = sorted(ids)
+    # renumber in protein ID order
+    rank = np.empty(n, dtype=np.int64)
+    rank[[ids[p] for p in proteins]] = np.arange(n)
+    src = rank[np.frombuffer(src, dtype=np.int32)]
+    dst = rank[np.frombuffer(dst, dtype=np.int32)]
+    scores = np.frombuffer(values, dtype=np.uint16).reshape(-1, len(columns))
+
+    # both directions, each (a, b) once, sorted by a then b
+    a = np.concatenate([src, dst])
+    b = np.concatenate([dst, src])
+    scores = np.concatenate([scores, scores])
+    order = np.lexsort((np.arange(len(a)), b, a))
+    keys = a[order] * n + b[order]
+    first = np.ones(len(keys), dtype=bool)
+    first[1:] = keys[1:] != keys[:-1]
+    order = order[first & (a[order] != b[order])]
+
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(a[order], minlength=n), out=indptr[1:])
+    return proteins, indptr, b[order].astype(np.int32), scores[order]
+
+
+def build_string_mirror(
+    links_path: str,
+    taxid: int,
+    network_type: str,
+    info_path: Optional[str] = None,
+    root: Optional[str] = None,
+    keep: int = 2,
+) -> Tuple[str, int, int]:
+    """Write the mirror build of one link file; returns (build path, proteins, links)."""
+    proteins, indptr, indices, scores = read_links(links_path)
+    names = read_protein_info(info_path) if info_path else {}
+    path = write_mirror(
+        root,
+        taxid,
+        network_type,
+        proteins,
+        indptr,
+        indices,
+        scores[:, 0],
+        scores[:, 1:],
+        preferred_names=[names.get(p) for p in proteins],
+        source=os.path.basename(links_path),
+        keep=keep,
+    )
+    return path, len(proteins), len(indices) // 2
@@ -5,12 +5,12 @@ from typing import Dict, List, Optional
 
 from dataportal.models import StrainDocument
 from dataportal.ingest.es_repo import StrainIndexRepository
+from dataportal.ingest.ftp_cache import get_ftp_cache
 from dataportal.ingest.utils import species_name_for_isolate, strain_prefix
 from dataportal.ingest.strain.resolver import StrainResolver  # ✅ add resolver
 from .parsers import (
     ftp_connect,
     ftp_list_fasta,
-    ftp_download,
     parse_fasta_contigs,
     ftp_list_gff_for_isolate,
     choose_primary_gff,
@@ -78,6 +78,14 @@ class StrainContigImporter(BaseImporter):
 
         fasta_files = ftp_list_fasta(ftp, self.ftp_directory)
 
+        # Fetch every mapped FASTA in parallel through the local artifact cache
+        fasta_remote = {
+            file: f"{self.ftp_directory.rstrip('/')}/{file}"
+            for file in fasta_files
+            if file in self.assembly_to_isolate
+        }
+        fasta_local = get_ftp_cache(self.ftp_server).prefetch(fasta_remote.values())
+
         # Use raw type_strains without normalization
         if self.type_strains is not None:
             # If resolver is available, canonicalize them
@@ -115,18 +123,12 @@ class StrainContigImporter(BaseImporter):
             if not species_name:
                 continue
 
-            # Download FASTA and extract contigs
-            local = f"/tmp/{file}"
-            try:
-                ftp_download(ftp, file, local)
-            except ftplib.all_errors:
+            # Extract contigs from the cached FASTA
+            local = fasta_local.get(fasta_remote[file])
+            if not local:
                 continue
 
             contigs = parse_fasta_contigs(local)
-            try:
-                os.remove(local)
-            except OSError:
-                pass
 
             # ✅ read existing by canonical id
             existing = self.repo.get(canonical_id)
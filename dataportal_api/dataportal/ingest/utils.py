@@ -182,19 +182,70 @@ def pick(d: dict, *keys, default=None):
     return default
 
 
+def read_table_chunks(path: str, chunksize: int = 10_000, **kwargs):
+    """
+    Chunked pd.read_csv on the fast C parser. Lines with too many fields are
+    skipped (on_bad_lines="skip"); if the C parser still gives up on a malformed
+    file, the rest of it is re-read with the forgiving python engine, skipping the
+    rows already yielded.
+    """
+    kwargs = {"on_bad_lines": "skip", "dtype": str, "encoding_errors": "replace", **kwargs}
+    done = 0
+    try:
+        for chunk in pd.read_csv(path, chunksize=chunksize, engine="c", **kwargs):
+            done += len(chunk)
+            yield chunk
+        return
+    except (pd.errors.ParserError, UnicodeDecodeError) as e:
+        print(
+            f"[ingest] fast CSV parser failed on {path} after {done} rows ({e}); using python engine"
+        )
+
+    kwargs.pop("low_memory", None)
+    skip = done
+    for chunk in pd.read_csv(path, chunksize=chunksize, engine="python", **kwargs):
+        if skip:
+            if len(chunk) <= skip:
+                skip -= len(chunk)
+                continue
+            chunk, skip = chunk.iloc[skip:], 0
+        yield chunk
+
+
 def chunks_from_table(path: str, chunksize: int = 10_000):
     suffix = Path(path).suffix.lower()
     sep = "," if suffix == ".csv" else "\t"
+    return read_table_chunks(path, chunksize=chunksize, sep=sep)
+
+
+def resolve_columns(columns, aliases: dict) -> dict:
+    """
+    Resolve {field: (alias, ...)} against a table's columns once per file
+    (case/whitespace-insensitive, first alias wins). Unmatched fields map to None.
+    """
+    km = {str(c).lower().strip(): c for c in columns}
+    resolved = {}
+    for field, names in aliases.items():
+        resolved[field] = next(
+            (km[n.lower().strip()] for n in names if n.lower().strip() in km), None
+        )
+    return resolved
+
+
+def str_column(chunk: pd.DataFrame, column) -> pd.Series:
+    """Stripped string values of `column` ("" for missing cells or a missing column)."""
+    if column is None:
+        return pd.Series("", index=chunk.index, dtype=object)
+    values = chunk[column].fillna("").astype(str).str.strip()
+    return values.mask(values.isin(("nan", "NaN")), "")
+
 
-    defaults = dict(
-        sep=sep,
-        chunksize=chunksize,
-        engine="python",
-        on_bad_lines="skip",
-        dtype=str,
-        encoding_errors="replace"
-    )
-    return pd.read_csv(path, **defaults)
+def canonical_pair_ids(a: pd.Series, b: pd.Series) -> pd.Series:
+    """Vectorized canonical_pair_id() over two aligned series of ids."""
+    a = a.astype(str).str.strip()
+    b = b.astype(str).str.strip()
+    swap = a > b
+    return a.where(~swap, b) + "__" + b.where(~swap, a)
 
 
 def canonical_pair_id(a: str, b: str) -> str:
@@ -0,0 +1,195 @@
+"""
+Ingest throughput benchmark (see dataportal/ingest/benchmark/).
+
+    # synthetic inputs, in-process fake bulk endpoint
+    python manage.py benchmark_ingest --scale 0.5 --json bench.json
+
+    # against a local cluster, compared with a saved run
+    python manage.py benchmark_ingest --sink es --es-url http://localhost:9200 \
+        --compare bench.json --fail-on-regression 15
+"""
+
+import json
+import logging
+import shutil
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dataportal.ingest.benchmark.harness import FLOWS, compare, create_indices, run_benchmark
+from dataportal.ingest.benchmark.sinks import FakeBulkSink, LocalESSink
+from dataportal.ingest.benchmark.synthetic import SyntheticScale, generate
+
+
+class Command(BaseCommand):
+    help = "Benchmark the ingest flows on synthetic data: rows/sec, bulk requests, bytes sent and peak RSS per flow."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--flows",
+            nargs="*",
+            default=list(FLOWS),
+            choices=FLOWS,
+            help="Flows to run (default: all)",
+        )
+        parser.add_argument(
+            "--scale", type=float, default=1.0, help="Row multiplier for the default data set"
+        )
+        parser.add_argument(
+            "--isolates", type=int, default=None, help="Number of synthetic isolates"
+        )
+        parser.add_argument(
+            "--genes", type=int, default=None, help="Genes per isolate (before --scale)"
+        )
+        parser.add_argument(
+            "--ortholog-pairs", type=int, default=None, help="Ortholog pairs (before --scale)"
+        )
+        parser.add_argument(
+            "--ppi-pairs", type=int, default=None, help="PPI pairs (before --scale)"
+        )
+        parser.add_argument(
+            "--inputs-dir",
+            default=None,
+            help="Write/keep the synthetic inputs here (default: temp dir)",
+        )
+        parser.add_argument(
+            "--sink",
+            choices=["fake", "es"],
+            default="fake",
+            help="fake: in-process bulk endpoint; es: real cluster",
+        )
+        parser.add_argument(
+            "--es-url", default="http://localhost:9200", help="Cluster for --sink es"
+        )
+        parser.add_argument(
+            "--latency-ms",
+            type=float,
+            default=0.0,
+            help="fake sink: added latency per bulk request",
+        )
+        parser.add_argument(
+            "--index-prefix", default="bench", help="Prefix of the benchmark index names"
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=None,
+            help="Bulk engine threads (default: engine default)",
+        )
+        parser.add_argument(
+            "--in-process",
+            action="store_true",
+            help="Run flows in this process (peak RSS becomes cumulative)",
+        )
+        parser.add_argument(
+            "--json", dest="json_out", default=None, help="Write the results as JSON"
+        )
+        parser.add_argument(
+            "--compare", default=None, help="Baseline JSON from a previous --json run"
+        )
+        parser.add_argument(
+            "--fail-on-regression",
+            type=float,
+            default=None,
+            metavar="PCT",
+            help="With --compare, fail if any flow's rows/sec dropped by more than PCT percent",
+        )
+
+    def _scale(self, o) -> SyntheticScale:
+        scale = SyntheticScale()
+        for opt, attr in (
+            ("isolates", "isolates"),
+            ("genes", "genes_per_isolate"),
+            ("ortholog_pairs", "ortholog_pairs"),
+            ("ppi_pairs", "ppi_pairs"),
+        ):
+            if o[opt] is not None:
+                setattr(scale, attr, o[opt])
+        if scale.isolates < 1:
+            raise CommandError("--isolates must be at least 1")
+        return scale.scaled(o["scale"])
+
+    def _sink(self, o):
+        if o["sink"] == "es":
+            return LocalESSink(o["es_url"])
+        return FakeBulkSink(latency=o["latency_ms"] / 1000)
+
+    def _row(self, r) -> str:
+        if r.error:
+            return f"{r.flow:<13} FAILED\n{r.error}"
+        return (
+            f"{r.flow:<13} {r.rows:>10,} {r.seconds:>8.2f} {r.rows_per_sec:>11,.0f} "
+            f"{r.bulk_requests:>8,} {r.bulk_actions:>10,} {r.bulk_bytes / 2**20:>9.1f} {r.peak_rss_mb:>9.1f}"
+        )
+
+    def handle(self, *args, **o):
+        baseline = None
+        if o["compare"]:
+            with open(o["compare"]) as f:
+                baseline = {r["flow"]: r for r in json.load(f)["results"]}
+        if o["fail_on_regression"] is not None and baseline is None:
+            raise CommandError("--fail-on-regression needs --compare")
+
+        scale = self._scale(o)
+        sink = self._sink(o)
+        inputs_dir = o["inputs_dir"] or tempfile.mkdtemp(prefix="mett-ingest-bench-")
+
+        # per-request transport and per-row parser logs would dominate the timings
+        logging.disable(logging.INFO)
+        try:
+            inputs = generate(inputs_dir, scale)
+            self.stdout.write(
+                f"[bench] inputs in {inputs_dir}: "
+                + ", ".join(f"{k}={v:,}" for k, v in inputs.rows.items())
+            )
+            if o["sink"] == "es":
+                create_indices(sink.client(), o["index_prefix"])
+
+            self.stdout.write(
+                f"{'flow':<13} {'rows':>10} {'secs':>8} {'rows/s':>11} {'bulk req':>8} {'actions':>10} {'MiB sent':>9} {'peak RSS':>9}"
+            )
+            results = run_benchmark(
+                inputs,
+                sink,
+                flows=o["flows"],
+                threads=o["threads"],
+                isolated=not o["in_process"],
+                prefix=o["index_prefix"],
+                report=lambda r: self.stdout.write(self._row(r)),
+            )
+        finally:
+            logging.disable(logging.NOTSET)
+            if not o["inputs_dir"]:
+                shutil.rmtree(inputs_dir, ignore_errors=True)
+
+        if o["json_out"]:
+            with open(o["json_out"], "w") as f:
+                json.dump(
+                    {
+                        "scale": scale.__dict__,
+                        "sink": o["sink"],
+                        "results": [r.as_dict() for r in results],
+                    },
+                    f,
+                    indent=2,
+                )
+            self.stdout.write(f"[bench] results written to {o['json_out']}")
+
+        failed = [r.flow for r in results if r.error]
+        regressions = []
+        if baseline is not None:
+            for flow, pct in compare(results, baseline).items():
+                line = f"  {flow:<13} {pct:+.1f}% rows/s vs baseline"
+                limit = o["fail_on_regression"]
+                if limit is not None and pct < -limit:
+                    regressions.append(flow)
+                    self.stdout.write(self.style.ERROR(line))
+                else:
+                    self.stdout.write(line)
+
+        if failed:
+            raise CommandError(f"Flow(s) failed: {', '.join(failed)}")
+        if regressions:
+            raise CommandError(
+                f"Throughput regression above {o['fail_on_regression']}%: {', '.join(regressions)}"
+            )
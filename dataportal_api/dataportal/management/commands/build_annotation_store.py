@@ -0,0 +1,104 @@
+"""
+Management command to compile an annotation release into the on-disk gene
+annotation store used by the ortholog, operon, PPI and fitness correlation imports.
+
+Import commands compile missing isolates on demand; running this once per
+annotation release up front makes every later import start with no GFF
+downloads or parsing.
+"""
+
+import ftplib
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dataportal.ingest.ftp_cache import closing_ftp_caches
+from dataportal.ingest.gff.parser import GFFParser
+
+
+class Command(BaseCommand):
+    help = "Compile the GFF annotations of a release into the shared annotation store"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ftp-server",
+            type=str,
+            default="ftp.ebi.ac.uk",
+            help="FTP server for GFF files (default: ftp.ebi.ac.uk)",
+        )
+        parser.add_argument(
+            "--ftp-directory",
+            type=str,
+            default="/pub/databases/mett/annotations/v1_2024-04-15/",
+            help="FTP directory for GFF files",
+        )
+        parser.add_argument(
+            "--isolates",
+            nargs="*",
+            default=None,
+            help="Isolates to compile (default: every BU_/PV_ isolate in the release)",
+        )
+        parser.add_argument(
+            "--annotation-store",
+            type=str,
+            default=None,
+            help="Store file path (default: derived from the release under METT_ANNOTATION_STORE_DIR)",
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Delete the existing store and recompile every isolate",
+        )
+
+    def _list_isolates(self, ftp_server: str, ftp_directory: str) -> list:
+        try:
+            ftp = ftplib.FTP(ftp_server)
+            ftp.login()
+            names = ftp.nlst(ftp_directory)
+            ftp.quit()
+        except ftplib.all_errors as e:
+            raise CommandError(f"Could not list {ftp_directory} on {ftp_server}: {e}")
+        pattern = re.compile(r"^(BU_|PV_)[^/]+$")
+        basenames = {n.rstrip("/").rsplit("/", 1)[-1] for n in names}
+        return sorted(name for name in basenames if pattern.match(name))
+
+    @closing_ftp_caches
+    def handle(self, *args, **options):
+        gff_parser = GFFParser(
+            ftp_server=options["ftp_server"],
+            ftp_directory=options["ftp_directory"],
+            annotation_store=options.get("annotation_store"),
+        )
+        store = gff_parser.store
+        if options["rebuild"]:
+            store.drop()
+
+        isolates = options["isolates"] or self._list_isolates(
+            options["ftp_server"], options["ftp_directory"]
+        )
+        if not isolates:
+            raise CommandError("No isolates to compile")
+
+        already = store.isolates()
+        todo = [iso for iso in isolates if iso not in already]
+        self.stdout.write(
+            f"Annotation store: {store.path} "
+            f"({len(already)} isolate(s) compiled, {len(todo)} to compile)"
+        )
+
+        # Isolates double as species keys here: preload resolves each key to itself
+        gff_parser.set_species_mapping({iso: iso for iso in todo})
+        gff_parser.preload_gff_files(todo)
+
+        counts = store.count_genes()
+        missing = [iso for iso in isolates if iso not in counts]
+        for iso in todo:
+            if iso in counts:
+                self.stdout.write(f"  - {iso}: {counts[iso]} genes")
+        if missing:
+            self.stdout.write(self.style.WARNING(f"Not compiled: {', '.join(missing)}"))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Annotation store ready: {len(counts)} isolate(s), {sum(counts.values())} genes"
+            )
+        )
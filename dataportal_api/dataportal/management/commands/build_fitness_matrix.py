@@ -0,0 +1,72 @@
+"""
+Management command to materialise the gene fitness data as per-isolate
+gene x contrast matrices (LFC, FDR, barcode counts) for the fitness matrix API.
+
+    # from what is already in the feature index
+    python manage.py build_fitness_matrix
+
+    # straight from the LFC CSVs
+    python manage.py build_fitness_matrix --fitness-dir /data/fitness
+"""
+
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dataportal.ingest.feature.fitness_matrix import FitnessMatrixBuilder
+from dataportal.ingest.utils import list_csv_files
+from dataportal.utils.fitness_matrix import matrix_root
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the per-isolate gene x contrast fitness matrices from the feature index or LFC CSVs"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fitness-dir",
+            type=str,
+            default=None,
+            help="Read fitness LFC CSV files from this directory instead of the feature index",
+        )
+        parser.add_argument(
+            "--index",
+            default="feature_index",
+            help="Elasticsearch index to read fitness data from (default: feature_index)",
+        )
+        parser.add_argument("--isolates", nargs="*", default=None, help="Only build these isolates")
+        parser.add_argument(
+            "--out",
+            default=None,
+            help="Matrix directory (default: METT_FITNESS_MATRIX_DIR)",
+        )
+        parser.add_argument(
+            "--keep", type=int, default=2, help="Builds to keep per isolate (default: 2)"
+        )
+
+    def handle(self, *args, **options):
+        builder = FitnessMatrixBuilder()
+        if options["fitness_dir"]:
+            if not Path(options["fitness_dir"]).exists():
+                raise CommandError(f"Directory not found: {options['fitness_dir']}")
+            files = list_csv_files(options["fitness_dir"])
+            if not files:
+                raise CommandError(f"No CSV files found in: {options['fitness_dir']}")
+            for csv_path in files:
+                kept = builder.add_csv(csv_path, options["isolates"])
+                self.stdout.write(f"  - {Path(csv_path).name}: {kept} entries")
+        else:
+            genes = builder.add_index(options["index"], options["isolates"])
+            self.stdout.write(f"  - {options['index']}: {genes} genes with fitness data")
+
+        if not builder.isolates():
+            raise CommandError("No fitness data found")
+        self.write_matrices(builder, options["out"], options["keep"])
+
+    def write_matrices(self, builder: FitnessMatrixBuilder, out=None, keep: int = 2) -> None:
+        root = matrix_root(out)
+        for isolate, path in builder.write(root, keep=keep).items():
+            genes, contrasts = builder.shape(isolate)
+            self.stdout.write(f"  - {isolate}: {genes} genes x {contrasts} contrasts -> {path}")
+        self.stdout.write(self.style.SUCCESS(f"Fitness matrices written to {root}"))
@@ -0,0 +1,38 @@
+"""
+Management command to write the locus_tag <-> STRING ID mapping snapshot that
+the API memory-maps at startup instead of scanning the feature index.
+
+    python manage.py build_string_mapping
+    python manage.py build_string_mapping --index feature_index --out /data/string_mapping
+
+import_dbxref --db-name STRING writes it too; run this after other feature
+ingests so the snapshot matches the current index again.
+"""
+
+from django.core.management.base import BaseCommand
+
+from dataportal.utils.string_mapping import build_string_mapping, mapping_root
+
+
+class Command(BaseCommand):
+    help = "Write the locus_tag <-> STRING ID mapping snapshot from the feature index"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--index",
+            default="feature_index",
+            help="Elasticsearch index to read STRING dbxrefs from (default: feature_index)",
+        )
+        parser.add_argument(
+            "--out",
+            default=None,
+            help="Snapshot directory (default: METT_STRING_MAPPING_DIR)",
+        )
+        parser.add_argument("--keep", type=int, default=2, help="Builds to keep (default: 2)")
+
+    def handle(self, *args, **options):
+        path, genes = build_string_mapping(options["index"], options["out"], keep=options["keep"])
+        self.stdout.write(f"  - {options['index']}: {genes} genes with a STRING ID -> {path}")
+        self.stdout.write(
+            self.style.SUCCESS(f"STRING mapping snapshot written to {mapping_root(options['out'])}")
+        )
@@ -0,0 +1,87 @@
+"""
+Management command to build the local STRING network mirror from the STRING
+per-species download files, so StringNetworkService can answer networks
+without calling string-db.org.
+
+    python manage.py build_string_mirror --dir data-generators/stringdb-mapper/stringdb-protein-files
+    python manage.py build_string_mirror --dir /data/string --taxids 820 --network-types physical
+"""
+
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dataportal.ingest.ppi.string_mirror import LINK_FILES, build_string_mirror, find_string_files
+from dataportal.utils.string_mirror import mirror_root
+
+# Bacteroides uniformis, Phocaeicola vulgatus
+DEFAULT_TAXIDS = [820, 435590]
+
+
+class Command(BaseCommand):
+    help = "Build the local STRING network mirror from STRING protein links files"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dir",
+            required=True,
+            help="Directory with {taxid}.protein[.physical].links.detailed.*.txt.gz (and protein.info) files",
+        )
+        parser.add_argument(
+            "--taxids",
+            nargs="*",
+            type=int,
+            default=DEFAULT_TAXIDS,
+            help="NCBI taxonomy IDs to build (default: 820 435590)",
+        )
+        parser.add_argument(
+            "--network-types",
+            nargs="*",
+            choices=sorted(LINK_FILES),
+            default=sorted(LINK_FILES),
+            help="Networks to build (default: all found)",
+        )
+        parser.add_argument(
+            "--out",
+            default=None,
+            help="Mirror directory (default: METT_STRING_MIRROR_DIR)",
+        )
+        parser.add_argument(
+            "--keep", type=int, default=2, help="Builds to keep per network (default: 2)"
+        )
+
+    def handle(self, *args, **options):
+        if not Path(options["dir"]).is_dir():
+            raise CommandError(f"Directory not found: {options['dir']}")
+
+        built = 0
+        for taxid in options["taxids"]:
+            links, info = find_string_files(options["dir"], taxid)
+            if not info:
+                self.stdout.write(
+                    self.style.WARNING(f"  - {taxid}: no protein.info file, names fall back to IDs")
+                )
+            for network_type in options["network_types"]:
+                if network_type not in links:
+                    self.stdout.write(
+                        self.style.WARNING(f"  - {taxid}/{network_type}: no links file")
+                    )
+                    continue
+                path, proteins, n_links = build_string_mirror(
+                    links[network_type],
+                    taxid,
+                    network_type,
+                    info,
+                    options["out"],
+                    keep=options["keep"],
+                )
+                self.stdout.write(
+                    f"  - {taxid}/{network_type}: {proteins} proteins, {n_links} links -> {path}"
+                )
+                built += 1
+
+        if not built:
+            raise CommandError(f"No STRING links files found in: {options['dir']}")
+        self.stdout.write(
+            self.style.SUCCESS(f"STRING mirror written to {mirror_root(options['out'])}")
+        )
@@ -0,0 +1,150 @@
+"""
+Management command to compute gene-gene fitness correlations from the ingested
+LFC data and index them into the GeneFitnessCorrelationDocument index, as an
+alternative to importing an externally computed correlation CSV.
+
+    # correlations from the fitness matrices (manage.py build_fitness_matrix)
+    python manage.py compute_fitness_correlations --workers 4
+
+    # rebuild the matrices from the feature index first
+    python manage.py compute_fitness_correlations --build-matrix
+"""
+
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dataportal.ingest.bulk import add_bulk_arguments, ingest_session_from_options
+from dataportal.ingest.es_repo import GeneFitnessCorrelationIndexRepository
+from dataportal.ingest.feature.fitness_correlation_pairs import correlation_pairs
+from dataportal.ingest.feature.fitness_matrix import FitnessMatrixBuilder
+from dataportal.ingest.feature.flows.fitness_correlation import FitnessCorrelationFlow
+from dataportal.utils.fitness_matrix import COFITNESS_METHODS, FitnessMatrixStore, matrix_root
+
+
+class Command(BaseCommand):
+    help = "Compute all-pairs gene fitness correlations from the fitness matrices into fitness_correlation_index"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--index",
+            default="fitness_correlation_index",
+            help="Elasticsearch index name (default: fitness_correlation_index)",
+        )
+        parser.add_argument(
+            "--isolates", nargs="*", default=None, help="Only these isolates (default: all)"
+        )
+        parser.add_argument(
+            "--matrix-dir",
+            default=None,
+            help="Fitness matrix directory (default: METT_FITNESS_MATRIX_DIR)",
+        )
+        parser.add_argument(
+            "--build-matrix",
+            action="store_true",
+            help="Rebuild the fitness matrices from the feature index before computing",
+        )
+        parser.add_argument(
+            "--feature-index",
+            default="feature_index",
+            help="Index to rebuild the matrices from with --build-matrix (default: feature_index)",
+        )
+        parser.add_argument(
+            "--contrasts", nargs="*", default=None, help="Only correlate over these contrasts"
+        )
+        parser.add_argument("--method", choices=COFITNESS_METHODS, default="pearson")
+        parser.add_argument(
+            "--min-correlation",
+            type=float,
+            default=0.3,
+            help="Only index pairs with |r| at least this (default: 0.3)",
+        )
+        parser.add_argument(
+            "--min-conditions",
+            type=int,
+            default=3,
+            help="Minimum number of contrasts both genes have values for (default: 3)",
+        )
+        parser.add_argument(
+            "--min-barcodes", type=int, default=None, help="Ignore cells with fewer barcodes"
+        )
+        parser.add_argument(
+            "--block-size",
+            type=int,
+            default=1024,
+            help="Genes per block; memory grows with its square (default: 1024)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=max(1, min(4, (os.cpu_count() or 1) - 1)),
+            help="Processes computing blocks (default: CPUs - 1, at most 4)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of documents to index in each batch (default: 5000)",
+        )
+        add_bulk_arguments(parser)
+
+    def handle(self, *args, **options):
+        root = matrix_root(options["matrix_dir"])
+        if options["build_matrix"]:
+            builder = FitnessMatrixBuilder()
+            genes = builder.add_index(options["feature_index"], options["isolates"])
+            self.stdout.write(f"  - {options['feature_index']}: {genes} genes with fitness data")
+            for isolate, path in builder.write(root).items():
+                self.stdout.write(f"  - {isolate}: matrix {builder.shape(isolate)} -> {path}")
+
+        store = FitnessMatrixStore(root, ttl=0)
+        isolates = options["isolates"] or store.isolates()
+        if not isolates:
+            raise CommandError(
+                f"No fitness matrices in {root}; run build_fitness_matrix or pass --build-matrix"
+            )
+
+        repo = GeneFitnessCorrelationIndexRepository(concrete_index=options["index"])
+        flow = FitnessCorrelationFlow(repo=repo, batch_size=options["batch_size"])
+
+        total_indexed = 0
+        with ingest_session_from_options(options["index"], options):
+            for isolate in isolates:
+                matrix = store.get(isolate)
+                if matrix is None:
+                    raise CommandError(f"No fitness matrix for {isolate} in {root}")
+                cols, missing = matrix.cols(options["contrasts"])
+                if missing:
+                    self.stdout.write(
+                        self.style.WARNING(f"  ⚠ {isolate}: unknown contrasts {', '.join(missing)}")
+                    )
+                if not len(cols):
+                    continue
+
+                started = time.monotonic()
+                self.stdout.write(f"\n  {isolate}: {matrix.shape[0]} genes x {len(cols)} contrasts")
+                pairs = correlation_pairs(
+                    matrix,
+                    cols=cols,
+                    method=options["method"],
+                    min_barcodes=options["min_barcodes"],
+                    min_conditions=options["min_conditions"],
+                    min_correlation=options["min_correlation"],
+                    block_size=options["block_size"],
+                    workers=options["workers"],
+                )
+                processed, indexed = flow.index_frames(pairs)
+                total_indexed += indexed
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"    ✓ {processed} pairs with |r| >= {options['min_correlation']}, "
+                        f"indexed {indexed} in {time.monotonic() - started:.1f}s"
+                    )
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"[compute_fitness_correlations] Indexed {total_indexed} correlations"
+            )
+        )
@@ -12,8 +12,10 @@ Usage:
 
 from django.core.management.base import BaseCommand, CommandError
 
+from dataportal.ingest.bulk import add_bulk_arguments, ingest_session_from_options
 from dataportal.ingest.feature.flows.external_dbxref import ExternalDBXRef
 from dataportal.ingest.utils import list_csv_files
+from dataportal.utils.string_mapping import build_string_mapping
 
 
 class Command(BaseCommand):
@@ -42,6 +44,17 @@ class Command(BaseCommand):
             default="STRING",
             help="Name of the external database (default: STRING). Examples: STRING, UniProt, etc.",
         )
+        parser.add_argument(
+            "--per-row-updates",
+            action="store_true",
+            help="Send one scripted update per row instead of one grouped update per document",
+        )
+        parser.add_argument(
+            "--no-string-snapshot",
+            action="store_true",
+            help="Do not rewrite the locus_tag <-> STRING ID snapshot after a STRING import",
+        )
+        add_bulk_arguments(parser)
 
     def handle(self, *args, **options):
         index_name = options["index"]
@@ -56,26 +69,36 @@ class Command(BaseCommand):
             raise CommandError("Cannot specify both --tsv and --tsv-dir")
 
         # Initialize the flow
-        flow = ExternalDBXRef(index_name=index_name, db_name=db_name)
+        flow = ExternalDBXRef(
+            index_name=index_name, db_name=db_name, grouped=not options["per_row_updates"]
+        )
 
-        # Process single file or directory
-        if tsv_path:
-            self.stdout.write(self.style.SUCCESS(f"Processing single TSV file: {tsv_path}"))
-            flow.run(tsv_path)
-        else:
-            tsv_files = list_csv_files(tsv_dir, exts=(".tsv", ".tab"))
-            if not tsv_files:
-                self.stdout.write(self.style.WARNING(f"No TSV files found in directory: {tsv_dir}"))
-                return
+        with ingest_session_from_options(index_name, options):
+            # Process single file or directory
+            if tsv_path:
+                self.stdout.write(self.style.SUCCESS(f"Processing single TSV file: {tsv_path}"))
+                flow.run(tsv_path)
+            else:
+                tsv_files = list_csv_files(tsv_dir, exts=(".tsv", ".tab"))
+                if not tsv_files:
+                    self.stdout.write(
+                        self.style.WARNING(f"No TSV files found in directory: {tsv_dir}")
+                    )
+                    return
 
-            self.stdout.write(
-                self.style.SUCCESS(
-                    f"Processing {len(tsv_files)} TSV files from directory: {tsv_dir}"
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Processing {len(tsv_files)} TSV files from directory: {tsv_dir}"
+                    )
                 )
-            )
-            for tsv_file in tsv_files:
-                self.stdout.write(f"  - Processing: {tsv_file}")
-                flow.run(tsv_file)
+                for tsv_file in tsv_files:
+                    self.stdout.write(f"  - Processing: {tsv_file}")
+                    flow.run(tsv_file)
+
+        if db_name.upper() == "STRING" and not options["no_string_snapshot"]:
+            # after the session, so the snapshot is taken from the refreshed index
+            path, genes = build_string_mapping(index_name)
+            self.stdout.write(f"Wrote STRING mapping snapshot ({genes} genes): {path}")
 
         self.stdout.write(
             self.style.SUCCESS(
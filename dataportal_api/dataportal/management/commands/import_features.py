@@ -3,7 +3,15 @@ import logging
 
 from django.core.management.base import BaseCommand
 
+from dataportal.ingest.bulk import add_bulk_arguments, ingest_session_from_options
+from dataportal.ingest.checkpoints import (
+    add_checkpoint_arguments,
+    checkpoints_from_options,
+    file_fingerprint,
+)
+from dataportal.ingest.delta import add_delta_arguments, delta_from_options
 from dataportal.ingest.feature.flows.essentiality import Essentiality
+from dataportal.ingest.ftp_cache import closing_ftp_caches
 from dataportal.ingest.feature.flows.external_dbxref import ExternalDBXRef
 from dataportal.ingest.feature.flows.fitness import Fitness
 from dataportal.ingest.feature.flows.gff_features import GFFGenes
@@ -65,9 +73,19 @@ class Command(BaseCommand):
             default="STRING",
             help="Database name for dbxref entries (default: STRING)",
         )
+        p.add_argument(
+            "--per-row-updates",
+            action="store_true",
+            help="Send one scripted update per row for nested arrays instead of one grouped update per document",
+        )
+        add_bulk_arguments(p)
+        add_checkpoint_arguments(p)
+        add_delta_arguments(p)
 
+    @closing_ftp_caches
     def handle(self, *args, **o):
         index_name = o["index"]
+        grouped = not o.get("per_row_updates")
 
         # Mapping file (optional, but available for flows that may need it)
         mapping = {}
@@ -91,75 +109,102 @@ class Command(BaseCommand):
         else:
             raw_isolates = isolates
 
-        # Use raw isolate names directly
-        # 1) core genes (GFF) — can be skipped
-        if not o.get("skip_core_genes"):
-            # Pass raw names only
-            GFFGenes(o["ftp_server"], o["ftp_root"], index_name=index_name, mapping=mapping).run(
-                raw_isolates=raw_isolates, norm_isolates=None
-            )
-        else:
-            print("[import_features] Skipping core gene (GFF) import as requested.")
-
-        # 2) Essentiality (process all CSVs in folder)
-        ess_files = list_csv_files(o.get("essentiality_dir"))
-        # print(f"[import_features] Essentiality CSVs found: {len(ess_files)}")
-        for csv_path in ess_files:
-            print(f"  - {csv_path}")
-            Essentiality(index_name=index_name).run(csv_path)
-
-        # 3) Fitness
-        for csv_path in list_csv_files(o.get("fitness_dir")):
-            Fitness(index_name=index_name).run(csv_path)
-
-        # 4) Proteomics
-        proteomics_files = list_csv_files(o.get("proteomics_dir"))
-        # print(f"[import_features] Proteomics files found: {len(proteomics_files)}")
-        for csv_path in proteomics_files:
-            print(f"  - {csv_path}")
-            Proteomics(index_name=index_name).run(csv_path)
-
-        # 5) Protein–compound
-        for csv_path in list_csv_files(o.get("protein_compound_dir")):
-            ProteinCompound(index_name=index_name).run(csv_path)
-
-        # 6) Pooled TTP
-        for csv_path in list_csv_files(o.get("pooled_ttp_dir")):
-            print(f"  - {csv_path}")
-            PooledTTP(index_name=index_name, pool_metadata_path=o.get("pool_metadata")).run(
-                csv_path
-            )
+        # per-isolate / per-file / per-chunk progress; --resume skips what is committed
+        checkpoints = checkpoints_from_options("import_features", index_name, o)
 
-        # 7) Reactions (cross-product of the three folders)
-        gene_rx_files = list_csv_files(o.get("gene_rx_dir"))
-        met_rx_files = list_csv_files(o.get("met_rx_dir"))
-        rx_gpr_files = list_csv_files(o.get("rx_gpr_dir"))
-        # print(f"[import_features] gene_rx: {len(gene_rx_files)} files")
-        for f in gene_rx_files:
-            print("  -", f)
-        # print(f"[import_features] met_rx:  {len(met_rx_files)} files")
-        for f in met_rx_files:
-            print("  -", f)
-        # print(f"[import_features] rx_gpr:  {len(rx_gpr_files)} files")
-        for f in rx_gpr_files:
-            print("  -", f)
-        # run all combinations so you don't depend on strict naming;
-        # if you prefer pairing by filename stem, we can add that too.
-        for gr in gene_rx_files:
-            for mr in met_rx_files:
-                for gp in rx_gpr_files:
-                    Reactions(index_name=index_name).run(gr, mr, gp)
-
-        # 8) Mutant growth
-        for csv_path in list_csv_files(o.get("mutant_growth_dir")):
-            MutantGrowthFlow(index_name=index_name).run(csv_path)
-
-        # 9) External database cross-references (dbxref)
-        dbxref_dir = o.get("dbxref_dir")
-        db_name = o.get("dbxref_db_name", "STRING")
-        if dbxref_dir:
-            dbxref_files = list_csv_files(dbxref_dir, exts=(".tsv", ".tab"))
-            print(f"[import_features] External DBXRef TSV files found: {len(dbxref_files)}")
-            for tsv_path in dbxref_files:
-                print(f"  - {tsv_path}")
-                ExternalDBXRef(index_name=index_name, db_name=db_name).run(tsv_path)
+        # Use raw isolate names directly
+        with ingest_session_from_options(index_name, o):
+            # 1) core genes (GFF) — can be skipped
+            if not o.get("skip_core_genes"):
+                # Pass raw names only
+                genes = GFFGenes(
+                    o["ftp_server"], o["ftp_root"], index_name=index_name, mapping=mapping
+                )
+                # --delta: unchanged gene docs are skipped and keep their analytics
+                genes.delta = delta_from_options(index_name, o)
+                genes.run(raw_isolates=raw_isolates, norm_isolates=None, checkpoints=checkpoints)
+                if genes.delta is not None:
+                    genes.delta.finish()
+            else:
+                print("[import_features] Skipping core gene (GFF) import as requested.")
+
+            # 2) Essentiality (process all CSVs in folder)
+            ess_files = list_csv_files(o.get("essentiality_dir"))
+            # print(f"[import_features] Essentiality CSVs found: {len(ess_files)}")
+            for csv_path, ck in checkpoints.pending(ess_files):
+                print(f"  - {csv_path}")
+                Essentiality(index_name=index_name, grouped=grouped).run(csv_path, checkpoint=ck)
+                ck.finish()
+
+            # 3) Fitness
+            for csv_path, ck in checkpoints.pending(list_csv_files(o.get("fitness_dir"))):
+                Fitness(index_name=index_name, grouped=grouped).run(csv_path, checkpoint=ck)
+                ck.finish()
+
+            # 4) Proteomics
+            proteomics_files = list_csv_files(o.get("proteomics_dir"))
+            # print(f"[import_features] Proteomics files found: {len(proteomics_files)}")
+            for csv_path, ck in checkpoints.pending(proteomics_files):
+                print(f"  - {csv_path}")
+                Proteomics(index_name=index_name).run(csv_path)
+                ck.finish()
+
+            # 5) Protein–compound
+            for csv_path, ck in checkpoints.pending(list_csv_files(o.get("protein_compound_dir"))):
+                ProteinCompound(index_name=index_name).run(csv_path)
+                ck.finish()
+
+            # 6) Pooled TTP
+            for csv_path, ck in checkpoints.pending(list_csv_files(o.get("pooled_ttp_dir"))):
+                print(f"  - {csv_path}")
+                PooledTTP(
+                    index_name=index_name,
+                    pool_metadata_path=o.get("pool_metadata"),
+                    grouped=grouped,
+                ).run(csv_path)
+                ck.finish()
+
+            # 7) Reactions (cross-product of the three folders)
+            gene_rx_files = list_csv_files(o.get("gene_rx_dir"))
+            met_rx_files = list_csv_files(o.get("met_rx_dir"))
+            rx_gpr_files = list_csv_files(o.get("rx_gpr_dir"))
+            # print(f"[import_features] gene_rx: {len(gene_rx_files)} files")
+            for f in gene_rx_files:
+                print("  -", f)
+            # print(f"[import_features] met_rx:  {len(met_rx_files)} files")
+            for f in met_rx_files:
+                print("  -", f)
+            # print(f"[import_features] rx_gpr:  {len(rx_gpr_files)} files")
+            for f in rx_gpr_files:
+                print("  -", f)
+            # run all combinations so you don't depend on strict naming;
+            # if you prefer pairing by filename stem, we can add that too.
+            for gr in gene_rx_files:
+                for mr in met_rx_files:
+                    for gp in rx_gpr_files:
+                        ck = checkpoints.unit(
+                            f"reactions:{gr}|{mr}|{gp}",
+                            "|".join(file_fingerprint(f) for f in (gr, mr, gp)),
+                        )
+                        if ck.done:
+                            continue
+                        Reactions(index_name=index_name).run(gr, mr, gp)
+                        ck.finish()
+
+            # 8) Mutant growth
+            for csv_path, ck in checkpoints.pending(list_csv_files(o.get("mutant_growth_dir"))):
+                MutantGrowthFlow(index_name=index_name, grouped=grouped).run(csv_path)
+                ck.finish()
+
+            # 9) External database cross-references (dbxref)
+            dbxref_dir = o.get("dbxref_dir")
+            db_name = o.get("dbxref_db_name", "STRING")
+            if dbxref_dir:
+                dbxref_files = list_csv_files(dbxref_dir, exts=(".tsv", ".tab"))
+                print(f"[import_features] External DBXRef TSV files found: {len(dbxref_files)}")
+                for tsv_path, ck in checkpoints.pending(dbxref_files):
+                    print(f"  - {tsv_path}")
+                    ExternalDBXRef(index_name=index_name, db_name=db_name, grouped=grouped).run(
+                        tsv_path
+                    )
+                    ck.finish()
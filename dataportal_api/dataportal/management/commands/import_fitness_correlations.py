@@ -7,7 +7,9 @@ into the GeneFitnessCorrelationDocument Elasticsearch index.
 
 from django.core.management.base import BaseCommand
 from pathlib import Path
+from dataportal.ingest.bulk import add_bulk_arguments, ingest_session_from_options
 from dataportal.ingest.feature.flows.fitness_correlation import FitnessCorrelationFlow
+from dataportal.ingest.ftp_cache import closing_ftp_caches
 from dataportal.ingest.es_repo import GeneFitnessCorrelationIndexRepository
 from dataportal.ingest.gff.parser import GFFParser
 from dataportal.ingest.utils import list_csv_files
@@ -57,57 +59,59 @@ class Command(BaseCommand):
             default=5000,
             help="Number of documents to index in each batch (default: 5000, optimized for large datasets)"
         )
+        add_bulk_arguments(parser)
 
+    @closing_ftp_caches
     def handle(self, *args, **options):
         index = options["index"]
         correlation_dir = options["correlation_dir"]
-        
+
         # Validate directory exists
         if not Path(correlation_dir).exists():
             self.stdout.write(
                 self.style.ERROR(f"✗ Directory not found: {correlation_dir}")
             )
             return
-        
+
         # Get all CSV files from directory
         files = list_csv_files(correlation_dir)
-        
+
         if not files:
             self.stdout.write(
                 self.style.WARNING(f"⚠ No CSV files found in: {correlation_dir}")
             )
             return
-        
+
         self.stdout.write(
             self.style.SUCCESS(
                 f"[import_fitness_correlations] Found {len(files)} CSV file(s) in {correlation_dir}"
             )
         )
-        
+
         # Set up GFF parser if requested
         gff_parser = None
         if options.get("preload_gff"):
             self.stdout.write("\n  Initializing GFF parser...")
             self.stdout.write(f"    FTP Server: {options['ftp_server']}")
             self.stdout.write(f"    FTP Directory: {options['ftp_directory']}")
-            
+
             gff_parser = GFFParser(
                 ftp_server=options["ftp_server"],
                 ftp_directory=options["ftp_directory"],
             )
-            
+
             # Infer species from file names or locus tags
             # For now, manually specify common species
             species_isolate_map = {
                 "Bacteroides uniformis": "BU_ATCC8492",
                 "Prevotella vulgatus": "PV_ATCC8482",
             }
-            
+
             self.stdout.write(f"    Species mapping: {species_isolate_map}")
             gff_parser.set_species_mapping(species_isolate_map)
             gff_parser.preload_gff_files(list(species_isolate_map.keys()))
             self.stdout.write(self.style.SUCCESS("  ✓ GFF files preloaded"))
-        
+
         # Create repository and flow
         repo = GeneFitnessCorrelationIndexRepository(concrete_index=index)
         flow = FitnessCorrelationFlow(
@@ -116,35 +120,35 @@ class Command(BaseCommand):
             chunk_size=options["chunk_size"],
             batch_size=options["batch_size"],
         )
-        
+
         # Process each file
         total_processed = 0
         total_indexed = 0
         success_count = 0
         error_count = 0
-        
-        for csv_path in files:
-            filename = Path(csv_path).name
-            self.stdout.write(f"\n  Processing: {filename}")
-            try:
-                processed, indexed = flow.run(csv_path)
-                total_processed += processed
-                total_indexed += indexed
-                success_count += 1
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f"    ✓ Processed {processed} rows, indexed {indexed} correlations"
+
+        with ingest_session_from_options(index, options):
+            for csv_path in files:
+                filename = Path(csv_path).name
+                self.stdout.write(f"\n  Processing: {filename}")
+                try:
+                    processed, indexed = flow.run(csv_path)
+                    total_processed += processed
+                    total_indexed += indexed
+                    success_count += 1
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f"    ✓ Processed {processed} rows, indexed {indexed} correlations"
+                        )
                     )
-                )
-            except Exception as e:
-                error_count += 1
-                self.stdout.write(
-                    self.style.ERROR(f"    ✗ Error processing {filename}: {e}")
-                )
-                import traceback
-                if options.get('verbosity', 1) >= 2:
-                    self.stdout.write(traceback.format_exc())
-        
+                except Exception as e:
+                    error_count += 1
+                    self.stdout.write(self.style.ERROR(f"    ✗ Error processing {filename}: {e}"))
+                    import traceback
+
+                    if options.get("verbosity", 1) >= 2:
+                        self.stdout.write(traceback.format_exc())
+
         # Summary
         self.stdout.write("\n" + "="*60)
         self.stdout.write(
@@ -158,4 +162,3 @@ class Command(BaseCommand):
             )
         )
         self.stdout.write("="*60)
-
@@ -7,6 +7,8 @@ FeatureDocument Elasticsearch index as nested fitness entries.
 
 from django.core.management.base import BaseCommand
 from pathlib import Path
+from dataportal.ingest.bulk import add_bulk_arguments, ingest_session_from_options
+from dataportal.ingest.feature.fitness_matrix import FitnessMatrixBuilder
 from dataportal.ingest.feature.flows.fitness import Fitness
 from dataportal.ingest.utils import list_csv_files
 
@@ -26,56 +28,76 @@ class Command(BaseCommand):
             default="feature_index",
             help="Elasticsearch index name (default: feature_index)"
         )
+        parser.add_argument(
+            "--per-row-updates",
+            action="store_true",
+            help="Send one scripted update per row instead of one grouped update per document",
+        )
+        parser.add_argument(
+            "--build-matrix",
+            action="store_true",
+            help="Also write the per-isolate fitness matrices (see build_fitness_matrix) from the same files",
+        )
+        add_bulk_arguments(parser)
 
     def handle(self, *args, **options):
         index = options["index"]
         fitness_dir = options["fitness_dir"]
-        
+
         # Validate directory exists
         if not Path(fitness_dir).exists():
             self.stdout.write(
                 self.style.ERROR(f"✗ Directory not found: {fitness_dir}")
             )
             return
-        
+
         # Get all CSV files from directory
         files = list_csv_files(fitness_dir)
-        
+
         if not files:
             self.stdout.write(
                 self.style.WARNING(f"⚠ No CSV files found in: {fitness_dir}")
             )
             return
-        
+
         self.stdout.write(
             self.style.SUCCESS(f"[import_fitness_lfc] Found {len(files)} CSV file(s) in {fitness_dir}")
         )
-        
+
         # Create flow instance
-        flow = Fitness(index_name=index)
-        
+        flow = Fitness(index_name=index, grouped=not options["per_row_updates"])
+
         # Process each file
         success_count = 0
         error_count = 0
-        
-        for csv_path in files:
-            filename = Path(csv_path).name
-            self.stdout.write(f"\n  Processing: {filename}")
-            try:
-                flow.run(csv_path)
-                success_count += 1
-                self.stdout.write(
-                    self.style.SUCCESS(f"    ✓ Successfully imported: {filename}")
-                )
-            except Exception as e:
-                error_count += 1
-                self.stdout.write(
-                    self.style.ERROR(f"    ✗ Error processing {filename}: {e}")
-                )
-                import traceback
-                if options.get('verbosity', 1) >= 2:
-                    self.stdout.write(traceback.format_exc())
-        
+
+        with ingest_session_from_options(index, options):
+            for csv_path in files:
+                filename = Path(csv_path).name
+                self.stdout.write(f"\n  Processing: {filename}")
+                try:
+                    flow.run(csv_path)
+                    success_count += 1
+                    self.stdout.write(
+                        self.style.SUCCESS(f"    ✓ Successfully imported: {filename}")
+                    )
+                except Exception as e:
+                    error_count += 1
+                    self.stdout.write(self.style.ERROR(f"    ✗ Error processing {filename}: {e}"))
+                    import traceback
+
+                    if options.get("verbosity", 1) >= 2:
+                        self.stdout.write(traceback.format_exc())
+
+        if options["build_matrix"]:
+            from dataportal.management.commands.build_fitness_matrix import Command as BuildMatrix
+
+            builder = FitnessMatrixBuilder()
+            for csv_path in files:
+                builder.add_csv(csv_path)
+            self.stdout.write("\n  Building fitness matrices")
+            BuildMatrix(stdout=self.stdout, stderr=self.stderr).write_matrices(builder)
+
         # Summary
         self.stdout.write("\n" + "="*60)
         self.stdout.write(
@@ -87,4 +109,3 @@ class Command(BaseCommand):
             )
         )
         self.stdout.write("="*60)
-
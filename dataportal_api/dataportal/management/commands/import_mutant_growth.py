@@ -9,6 +9,7 @@ nested field.
 from django.core.management.base import BaseCommand
 from pathlib import Path
 
+from dataportal.ingest.bulk import add_bulk_arguments, ingest_session_from_options
 from dataportal.ingest.feature.flows.mutant_growth import MutantGrowthFlow
 from dataportal.ingest.utils import list_csv_files
 
@@ -39,6 +40,12 @@ class Command(BaseCommand):
             default=None,
             help="Experimental condition context (default: {media}_growth)"
         )
+        parser.add_argument(
+            "--per-row-updates",
+            action="store_true",
+            help="Send one scripted update per row instead of one grouped update per document",
+        )
+        add_bulk_arguments(parser)
 
     def handle(self, *args, **options):
         index = options["index"]
@@ -72,30 +79,31 @@ class Command(BaseCommand):
         flow = MutantGrowthFlow(
             index_name=index,
             media=media,
-            experimental_condition=experimental_condition
+            experimental_condition=experimental_condition,
+            grouped=not options["per_row_updates"],
         )
 
         # Process each file
         success_count = 0
         error_count = 0
 
-        for csv_path in files:
-            filename = Path(csv_path).name
-            self.stdout.write(f"\n  Processing: {filename}")
-            try:
-                flow.run(csv_path)
-                success_count += 1
-                self.stdout.write(
-                    self.style.SUCCESS(f"    ✓ Successfully imported: {filename}")
-                )
-            except Exception as e:
-                error_count += 1
-                self.stdout.write(
-                    self.style.ERROR(f"    ✗ Error processing {filename}: {e}")
-                )
-                import traceback
-                if options.get('verbosity', 1) >= 2:
-                    self.stdout.write(traceback.format_exc())
+        with ingest_session_from_options(index, options):
+            for csv_path in files:
+                filename = Path(csv_path).name
+                self.stdout.write(f"\n  Processing: {filename}")
+                try:
+                    flow.run(csv_path)
+                    success_count += 1
+                    self.stdout.write(
+                        self.style.SUCCESS(f"    ✓ Successfully imported: {filename}")
+                    )
+                except Exception as e:
+                    error_count += 1
+                    self.stdout.write(self.style.ERROR(f"    ✗ Error processing {filename}: {e}"))
+                    import traceback
+
+                    if options.get("verbosity", 1) >= 2:
+                        self.stdout.write(traceback.format_exc())
 
         # Summary
         self.stdout.write("\n" + "="*60)
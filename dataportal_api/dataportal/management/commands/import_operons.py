@@ -1,5 +1,7 @@
 from django.core.management.base import BaseCommand
 from pathlib import Path
+from dataportal.ingest.bulk import add_bulk_arguments, ingest_session_from_options
+from dataportal.ingest.ftp_cache import closing_ftp_caches
 from dataportal.ingest.operon.flows.operons import Operons
 from dataportal.ingest.gff.parser import GFFParser
 from dataportal.ingest.utils import list_csv_files
@@ -24,7 +26,9 @@ class Command(BaseCommand):
             default="/pub/databases/mett/annotations/v1_2024-04-15/",
             help="FTP directory for GFF files",
         )
+        add_bulk_arguments(p)
 
+    @closing_ftp_caches
     def handle(self, *args, **o):
         index = o["index"]
         files = list_csv_files(o["operons_dir"])
@@ -55,8 +59,9 @@ class Command(BaseCommand):
                 gff_parser.set_species_mapping(species_isolate_map)
                 gff_parser.preload_gff_files(list(species_isolate_map.keys()))
 
-        flow = Operons(index_name=index, gff_parser=gff_parser)
-        for f in files:
-            print(f"  - {f}")
-            flow.run(f)
-        flow.flush()
+        with ingest_session_from_options(index, o):
+            flow = Operons(index_name=index, gff_parser=gff_parser)
+            for f in files:
+                print(f"  - {f}")
+                flow.run(f)
+            flow.flush()
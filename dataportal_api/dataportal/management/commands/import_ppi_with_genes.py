@@ -8,6 +8,11 @@ extracted from GFF files, with in-memory caching to avoid re-downloading the sam
 import os
 import logging
 from django.core.management.base import BaseCommand, CommandError
+from dataportal.ingest.bulk import add_bulk_arguments, configure_bulk_engine_from_options
+from dataportal.ingest.checkpoints import add_checkpoint_arguments, checkpoints_from_options
+from dataportal.ingest.constants import PPI_FILE_WORKERS
+from dataportal.ingest.delta import add_delta_arguments, delta_from_options
+from dataportal.ingest.ftp_cache import closing_ftp_caches
 from dataportal.ingest.ppi.gff_parser import GFFParser
 from dataportal.ingest.ppi.flows.ppi_csv import PPICSVFlow
 from dataportal.ingest.ppi.parsing import load_string_mapping
@@ -110,7 +115,17 @@ class Command(BaseCommand):
                 "Use path relative to cwd, e.g. ../data-generators/stringdb-mapper/output"
             ),
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=PPI_FILE_WORKERS,
+            help=f"CSV files parsed in parallel reader processes (default: {PPI_FILE_WORKERS}; 1 = in-process)",
+        )
+        add_bulk_arguments(parser)
+        add_checkpoint_arguments(parser)
+        add_delta_arguments(parser)
 
+    @closing_ftp_caches
     def handle(self, *args, **options):
         csv_folder = options["csv_folder"]
         pattern = options["pattern"]
@@ -124,7 +139,10 @@ class Command(BaseCommand):
         refresh = options.get("refresh", "wait_for")
         refresh_every_rows = options.get("refresh_every_rows")
         refresh_every_secs = options.get("refresh_every_secs")
-        optimize_indexing = not options.get("no_optimize_indexing", False)
+        # --no-ingest-session is accepted as an alias of --no-optimize-indexing
+        optimize_indexing = not (
+            options.get("no_optimize_indexing") or options.get("no_ingest_session")
+        )
         string_mapping_tsv = options.get("string_mapping_tsv")
         string_mapping_dir = options.get("string_mapping_dir")
 
@@ -209,12 +227,14 @@ class Command(BaseCommand):
             species_map=species_map,
             gff_parser=gff_parser,
             string_map=string_map,
+            delta=delta_from_options(index_name, options, client=repo.client),
         )
 
         # Run the import process
         self.stdout.write(f"Starting PPI import from: {csv_folder}")
         self.stdout.write(f"Pattern: {pattern}")
         self.stdout.write(f"Batch size: {batch_size}")
+        self.stdout.write(f"Reader processes: {options['workers']}")
         self.stdout.write(f"Refresh policy: {refresh}")
         self.stdout.write(
             f"Gene information: {'Enabled' if gff_parser else 'Disabled'}"
@@ -231,6 +251,7 @@ class Command(BaseCommand):
         if refresh_every_secs:
             self.stdout.write(f"Refresh every {refresh_every_secs} seconds")
 
+        configure_bulk_engine_from_options(options)
         try:
             total_indexed = flow.run(
                 folder=csv_folder,
@@ -241,6 +262,8 @@ class Command(BaseCommand):
                 optimize_indexing=optimize_indexing,
                 refresh_every_rows=refresh_every_rows,
                 refresh_every_secs=refresh_every_secs,
+                checkpoints=checkpoints_from_options("import_ppi_with_genes", index_name, options),
+                workers=options["workers"],
             )
 
             self.stdout.write(
@@ -2,6 +2,7 @@ from __future__ import annotations
 from django.core.management.base import BaseCommand
 
 from dataportal.ingest.es_repo import StrainIndexRepository
+from dataportal.ingest.ftp_cache import closing_ftp_caches
 from dataportal.ingest.strain.parsers import read_mapping_tsv
 from dataportal.ingest.strain.importers import StrainContigImporter
 from dataportal.ingest.strain.drug_importers import DrugMICUpserter, DrugMetabolismUpserter
@@ -34,11 +35,11 @@ class Command(BaseCommand):
         parser.add_argument("--gff-server", type=str, help="FTP server for GFFs (optional)")
         parser.add_argument("--gff-base", type=str, help="Base directory for GFFs on the GFF server (optional)")
 
+    @closing_ftp_caches
     def handle(self, *args, **opts):
         es_index = opts["es_index"]
         repo = StrainIndexRepository(concrete_index=es_index)
 
-
         # A) Strains/Contigs (FTP) — only if not skipped
         if not opts["skip_strains"]:
             self.stdout.write(self.style.SUCCESS("Importing strains/contigs from FTP..."))
@@ -58,7 +59,6 @@ class Command(BaseCommand):
         else:
             self.stdout.write(self.style.WARNING("Skipped strains/contigs (--skip-strains)."))
 
-
         # 0) Load resolver once per run
         resolver = StrainResolver(index=es_index)
         resolver.load()
@@ -1,5 +1,6 @@
 import logging
 from django.core.management.base import BaseCommand
+from dataportal.ingest.bulk import add_bulk_arguments, ingest_session_from_options
 from dataportal.ingest.feature.flows.pooled_ttp import PooledTTP
 
 log = logging.getLogger(__name__)
@@ -24,31 +25,42 @@ class Command(BaseCommand):
             default="feature_index",
             help="Target Elasticsearch index name (default: feature_index)"
         )
+        parser.add_argument(
+            "--per-row-updates",
+            action="store_true",
+            help="Send one scripted update per row instead of one grouped update per document",
+        )
+        add_bulk_arguments(parser)
 
     def handle(self, *args, **options):
         csv_file = options["csv_file"]
         pool_metadata = options.get("pool_metadata")
         index_name = options["index"]
-        
+
         self.stdout.write(f"Starting pooled TTP ingestion...")
         self.stdout.write(f"CSV file: {csv_file}")
         if pool_metadata:
             self.stdout.write(f"Pool metadata: {pool_metadata}")
         self.stdout.write(f"Target index: {index_name}")
-        
+
         try:
             # Initialize the PooledTTP flow
-            ttp_flow = PooledTTP(index_name=index_name, pool_metadata_path=pool_metadata)
-            
-            # Run the ingestion
-            processed_count = ttp_flow.run(csv_file)
-            
+            ttp_flow = PooledTTP(
+                index_name=index_name,
+                pool_metadata_path=pool_metadata,
+                grouped=not options["per_row_updates"],
+            )
+
+            with ingest_session_from_options(index_name, options):
+                # Run the ingestion
+                processed_count = ttp_flow.run(csv_file)
+
             self.stdout.write(
                 self.style.SUCCESS(
                     f"Successfully ingested {processed_count} pooled TTP records into {index_name}"
                 )
             )
-            
+
         except Exception as e:
             self.stdout.write(
                 self.style.ERROR(f"Error during ingestion: {str(e)}")
@@ -0,0 +1,179 @@
+"""
+Blue/green rebuild of the Elasticsearch indices (see dataportal/elasticsearch/rebuild.py).
+
+    # one shot: new versions -> ingest -> warm-up -> atomic alias swap -> retire
+    python manage.py rebuild_indices run --model FeatureDocument \
+        --ingest "import_features --index {feature_index} --drop-replicas --force-merge \
+                  --fitness-dir /data/fitness"
+
+    # or step by step
+    python manage.py rebuild_indices prepare
+    python manage.py import_features --index feature_index-2025.09.03 --drop-replicas --force-merge ...
+    python manage.py rebuild_indices promote
+    python manage.py rebuild_indices retire --keep 2
+"""
+
+import shlex
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from dataportal.elasticsearch.indexing import ProjectIndexManager
+from dataportal.elasticsearch.rebuild import IndexRebuild
+from dataportal.management.commands.create_es_index import AVAILABLE_MODELS
+
+
+class Command(BaseCommand):
+    help = "Blue/green index rebuilds: create next versions, warm up, swap aliases atomically, retire old ones."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "action",
+            choices=["status", "prepare", "promote", "retire", "run"],
+            help="status | prepare (create next versions) | promote (check, warm up, swap aliases) "
+            "| retire (delete old versions) | run (prepare + --ingest steps + promote + retire)",
+        )
+        parser.add_argument(
+            "--model",
+            nargs="*",
+            default=None,
+            help=f"Index families to rebuild (default: all). Available: {', '.join(AVAILABLE_MODELS)}",
+        )
+        parser.add_argument(
+            "--es-version",
+            dest="es_version",
+            default=None,
+            help="Version suffix for new indices (default: today's UTC date, plus .N if taken)",
+        )
+        parser.add_argument(
+            "--targets",
+            nargs="*",
+            default=None,
+            help="promote: base=concrete pairs (default: newest version of each family)",
+        )
+        parser.add_argument(
+            "--ingest",
+            action="append",
+            default=[],
+            help="run: a management command line to execute before promoting; "
+            "{<base>} placeholders (e.g. {feature_index}) expand to the new concrete index",
+        )
+        parser.add_argument(
+            "--keep", type=int, default=2, help="retire: versions to keep per family"
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="retire: only list what would be deleted"
+        )
+        parser.add_argument(
+            "--no-warmup", action="store_true", help="promote: skip the warm-up query set"
+        )
+        parser.add_argument(
+            "--wait-for-status",
+            choices=["yellow", "green"],
+            default="yellow",
+            help="promote: cluster health each new index must reach (default: yellow)",
+        )
+        parser.add_argument(
+            "--allow-empty", action="store_true", help="promote: allow swapping to empty indices"
+        )
+        parser.add_argument(
+            "--replace-concrete",
+            action="store_true",
+            help="promote: if a base name is still a plain index, delete it in the same atomic swap",
+        )
+
+    def _models(self, names):
+        if not names:
+            return list(AVAILABLE_MODELS.values())
+        unknown = [n for n in names if n not in AVAILABLE_MODELS]
+        if unknown:
+            raise CommandError(
+                f"Unknown model(s): {', '.join(unknown)}. Available models: {', '.join(AVAILABLE_MODELS)}"
+            )
+        return [AVAILABLE_MODELS[n] for n in names]
+
+    def _parse_targets(self, rebuild, pairs):
+        if not pairs:
+            targets = rebuild.latest()
+        else:
+            targets = {}
+            for pair in pairs:
+                base, sep, concrete = pair.partition("=")
+                if not sep or not concrete:
+                    raise CommandError(f"Bad --targets entry {pair!r}; expected base=concrete")
+                targets[base] = concrete
+        unknown = set(targets) - set(rebuild.manager.managers)
+        if unknown:
+            raise CommandError(f"Unknown index families: {', '.join(sorted(unknown))}")
+        if not targets:
+            raise CommandError("No concrete versions to promote; run 'prepare' first")
+        return targets
+
+    def _promote(self, rebuild, targets, o):
+        try:
+            previous = rebuild.promote(
+                targets,
+                warm_up=not o["no_warmup"],
+                wait_for_status=o["wait_for_status"],
+                allow_empty=o["allow_empty"],
+                replace_concrete=o["replace_concrete"],
+            )
+        except RuntimeError as e:
+            raise CommandError(f"Promote aborted, aliases unchanged: {e}")
+        for base, concrete in targets.items():
+            old = ", ".join(previous.get(base) or []) or "-"
+            self.stdout.write(self.style.SUCCESS(f"  ✓ {base}: {old} -> {concrete}"))
+
+    def _retire(self, rebuild, o):
+        retired = rebuild.retire(keep=o["keep"], dry_run=o["dry_run"])
+        verb = "Would delete" if o["dry_run"] else "Deleted"
+        for name in retired:
+            self.stdout.write(f"  - {verb} {name}")
+        if not retired:
+            self.stdout.write("  nothing to retire")
+
+    def handle(self, *args, **o):
+        rebuild = IndexRebuild(ProjectIndexManager(self._models(o["model"])))
+        action = o["action"]
+
+        if action == "status":
+            for base, info in rebuild.status().items():
+                alias = ", ".join(info["alias"]) or (
+                    "(plain index)" if info["concrete_base"] else "-"
+                )
+                self.stdout.write(f"{base} -> {alias}")
+                for name in info["versions"]:
+                    self.stdout.write(f"    {name}{'  *' if name in info['alias'] else ''}")
+            return
+
+        if action == "prepare":
+            for base, concrete in rebuild.prepare(o["es_version"]).items():
+                self.stdout.write(self.style.SUCCESS(f"  ✓ {base} -> {concrete}"))
+            return
+
+        if action == "promote":
+            self._promote(rebuild, self._parse_targets(rebuild, o["targets"]), o)
+            return
+
+        if action == "retire":
+            self._retire(rebuild, o)
+            return
+
+        # run: prepare -> ingest -> promote -> retire
+        targets = rebuild.prepare(o["es_version"])
+        for base, concrete in targets.items():
+            self.stdout.write(f"  + {base} -> {concrete}")
+        for step in o["ingest"]:
+            try:
+                argv = shlex.split(step.format_map(targets))
+            except KeyError as e:
+                raise CommandError(f"Unknown placeholder {e} in --ingest {step!r}")
+            self.stdout.write(f"[rebuild] ingest: {' '.join(argv)}")
+            try:
+                call_command(*argv)
+            except Exception as e:
+                raise CommandError(
+                    f"Ingest step failed ({e}); new indices left in place for inspection, aliases unchanged"
+                )
+        self._promote(rebuild, targets, o)
+        self._retire(rebuild, o)
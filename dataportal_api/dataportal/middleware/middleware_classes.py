@@ -1,6 +1,15 @@
+import hashlib
+import json
 import logging
+import threading
+import time
 from datetime import datetime
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.http import HttpResponseNotModified
 from django.middleware.common import MiddlewareMixin
+from django.utils.cache import patch_cache_control, patch_vary_headers
 
 from dataportal.middleware.swagger_templates import (
     HEADER_HTML,
@@ -11,6 +20,34 @@ from dataportal.middleware.swagger_templates import (
 
 logger = logging.getLogger(__name__)
 
+# API path prefix -> index families whose concrete versions key the ETag (None = all families).
+# Order matters: first segment-aligned match wins.
+ETAG_PATH_INDICES: Dict[str, Optional[List[str]]] = {
+    "/api/species": ["species_index", "strain_index"],
+    "/api/genomes": ["strain_index", "feature_index"],
+    "/api/genes": ["feature_index", "strain_index"],
+    "/api/metadata": None,
+    "/api/drugs": ["strain_index"],
+    "/api/ppi": ["ppi_index", "feature_index"],
+    "/api/ttp": ["feature_index"],
+    "/api/fitness-correlations": ["fitness_correlation_index", "feature_index"],
+    "/api/orthologs": ["ortholog_index", "feature_index"],
+    "/api/operons": ["operon_index", "feature_index"],
+    "/api/proteomics": ["feature_index"],
+    "/api/essentiality": ["feature_index"],
+    "/api/fitness": ["feature_index"],
+    "/api/mutant-growth": ["feature_index"],
+    "/api/reactions": ["feature_index"],
+}
+
+# Paths whose responses depend on something other than our indices (external APIs,
+# on-disk fitness matrices).
+ETAG_EXCLUDED_PATHS = (
+    "/api/ppi/string-network",
+    "/api/fitness/matrix",
+    "/api/fitness-correlations/cofitness",
+)
+
 
 class LocusStringMappingMiddleware(MiddlewareMixin):
     """
@@ -108,3 +145,128 @@ class SwaggerHeaderFooterMiddleware(MiddlewareMixin):
                 pass
 
         return response
+
+
+class IndexVersionETagMiddleware(MiddlewareMixin):
+    """
+    Conditional GET for the read-only API.
+
+    Data only changes when an ingest writes to, swaps or rebuilds an index, so the
+    ETag is derived from the request (path + canonical query string) and the
+    concrete index versions (UUID plus doc / indexing counters) behind the
+    aliases the endpoint reads. A matching
+    If-None-Match is answered with 304 before the view runs.
+    Index versions are resolved via ProjectIndexManager and cached for
+    INDEX_VERSION_TTL seconds.
+    """
+
+    _versions: Optional[Dict[str, List[str]]] = None
+    _versions_expires_at: float = 0.0
+    _versions_lock = threading.Lock()
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.enabled = getattr(settings, "API_ETAG_ENABLED", True)
+        self.max_age = getattr(settings, "API_CACHE_MAX_AGE", 300)
+        self.version_ttl = getattr(settings, "INDEX_VERSION_TTL", 60)
+
+    @classmethod
+    def _index_versions(cls, ttl: int) -> Optional[Dict[str, List[str]]]:
+        now = time.monotonic()
+        if cls._versions is not None and now < cls._versions_expires_at:
+            return cls._versions
+        with cls._versions_lock:
+            if cls._versions is not None and now < cls._versions_expires_at:
+                return cls._versions
+            try:
+                from dataportal import models
+                from dataportal.elasticsearch.indexing import ProjectIndexManager
+
+                manager = ProjectIndexManager(
+                    [
+                        models.SpeciesDocument,
+                        models.StrainDocument,
+                        models.FeatureDocument,
+                        models.ProteinProteinDocument,
+                        models.OperonDocument,
+                        models.OrthologDocument,
+                        models.GeneFitnessCorrelationDocument,
+                    ]
+                )
+                cls._versions = manager.current_versions()
+            except Exception as e:
+                logger.warning(f"Could not resolve index versions for ETag: {e}")
+                cls._versions = None
+            cls._versions_expires_at = time.monotonic() + ttl
+            return cls._versions
+
+    @classmethod
+    def reset_index_versions(cls) -> None:
+        """Drop cached index versions (e.g. right after an alias swap)."""
+        with cls._versions_lock:
+            cls._versions = None
+            cls._versions_expires_at = 0.0
+
+    @staticmethod
+    def _indices_for_path(path: str):
+        if path.startswith(ETAG_EXCLUDED_PATHS):
+            return False
+        for prefix, indices in ETAG_PATH_INDICES.items():
+            if path == prefix or path.startswith(prefix + "/"):
+                return indices
+        return False
+
+    def _compute_etag(self, request) -> Optional[str]:
+        if not self.enabled or request.method not in ("GET", "HEAD"):
+            return None
+        indices = self._indices_for_path(request.path)
+        if indices is False:
+            return None
+        versions = self._index_versions(self.version_ttl)
+        if not versions:
+            return None
+        if indices is not None:
+            versions = {name: versions.get(name, []) for name in indices}
+
+        # Canonical query: sorted keys, values kept in request order
+        query = sorted((key, request.GET.getlist(key)) for key in request.GET.keys())
+        auth = request.META.get("HTTP_AUTHORIZATION", "")
+        payload = json.dumps(
+            {
+                "path": request.path,
+                "query": query,
+                "versions": versions,
+                "auth": hashlib.sha256(auth.encode()).hexdigest() if auth else "",
+            },
+            sort_keys=True,
+        )
+        return '"' + hashlib.sha1(payload.encode()).hexdigest() + '"'
+
+    def _patch_cache_headers(self, request, response) -> None:
+        if request.META.get("HTTP_AUTHORIZATION"):
+            patch_cache_control(response, private=True, max_age=self.max_age, must_revalidate=True)
+        else:
+            patch_cache_control(response, public=True, max_age=self.max_age, must_revalidate=True)
+        patch_vary_headers(response, ["Authorization"])
+
+    def process_request(self, request):
+        etag = self._compute_etag(request)
+        request._index_etag = etag
+        if etag is None:
+            return None
+
+        if_none_match = request.META.get("HTTP_IF_NONE_MATCH", "")
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            response = HttpResponseNotModified()
+            response["ETag"] = etag
+            self._patch_cache_headers(request, response)
+            return response
+        return None
+
+    def process_response(self, request, response):
+        etag = getattr(request, "_index_etag", None)
+        if etag and response.status_code == 200 and not response.has_header("ETag"):
+            response["ETag"] = etag
+            self._patch_cache_headers(request, response)
+        return response
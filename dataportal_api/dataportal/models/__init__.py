@@ -9,6 +9,7 @@ from .base import (
     edge_ngram_tokenizer,
     autocomplete_analyzer,
     lowercase_normalizer,
+    folded_name_normalizer,
     canonical_pair,
     build_pair_id,
 )
@@ -25,13 +26,14 @@ from .api_token import APIToken
 __all__ = [
     # Base utilities
     "edge_ngram_tokenizer",
-    "autocomplete_analyzer", 
+    "autocomplete_analyzer",
     "lowercase_normalizer",
+    "folded_name_normalizer",
     "canonical_pair",
     "build_pair_id",
     # Document models
     "SpeciesDocument",
-    "StrainDocument", 
+    "StrainDocument",
     "FeatureDocument",
     "ProteinProteinDocument",
     "OperonDocument",
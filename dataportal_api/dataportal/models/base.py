@@ -5,7 +5,7 @@ This module contains analyzers, normalizers, and helper functions that are
 shared across multiple document types.
 """
 
-from elasticsearch_dsl import analyzer, tokenizer, normalizer
+from elasticsearch_dsl import analyzer, char_filter, tokenizer, normalizer
 
 
 # ---- Tokenizers ----
@@ -17,6 +17,12 @@ edge_ngram_tokenizer = tokenizer(
     token_chars=["letter", "digit", "connector_punctuation"],
 )
 
+# ---- Char filters ----
+# Drops spaces, hyphens, slashes, ... so "Amoxicillin-Clavulanate" == "amoxicillin clavulanate"
+name_separator_filter = char_filter(
+    "name_separator_filter", type="pattern_replace", pattern="[^\\p{L}\\p{Nd}]+", replacement=""
+)
+
 # ---- Analyzers ----
 autocomplete_analyzer = analyzer(
     "autocomplete_analyzer", tokenizer=edge_ngram_tokenizer, filter=["lowercase"]
@@ -27,6 +33,14 @@ lowercase_normalizer = normalizer(
     "lowercase_normalizer", type="custom", filter=["lowercase"]
 )
 
+# Lowercased, accent-folded and separator-free; for exact matching of compound/drug names
+folded_name_normalizer = normalizer(
+    "folded_name_normalizer",
+    type="custom",
+    char_filter=[name_separator_filter],
+    filter=["lowercase", "asciifolding"],
+)
+
 
 # ---- Helper Functions ----
 def canonical_pair(a: str, b: str) -> tuple[str, str]:
@@ -39,4 +53,3 @@ def build_pair_id(species_acronym: str, a: str, b: str) -> str:
     aa, bb = canonical_pair(a, b)
     # Use double-underscore to match your CSV pattern
     return f"{species_acronym}:{aa}__{bb}"
-
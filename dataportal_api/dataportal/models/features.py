@@ -21,7 +21,7 @@ from .base import autocomplete_analyzer, lowercase_normalizer
 
 class FeatureDocument(Document):
     """Elasticsearch document for genomic features (genes, intergenic regions, etc.)."""
-    
+
     # ---- Identity ----
     feature_id = Keyword()                                 # gene: locus_tag; IG: "IG-between-...-and-..."
     feature_type = Keyword(normalizer=lowercase_normalizer) # 'gene' | 'IG' | others
@@ -200,6 +200,9 @@ class FeatureDocument(Document):
     # ---- Sequences (existing) ----
     protein_sequence = Text(fields={"keyword": Keyword()})  # only for 'gene'
 
+    # ---- Delta ingest ----
+    content_fingerprint = Keyword()  # hash of the GFF-built gene doc (see ingest/delta.py)
+
     class Index:
         name = "feature_index"
         settings = {
@@ -115,6 +115,9 @@ class ProteinProteinDocument(Document):
     # Optional rollups for UI
     evidence_count = Integer()  # how many sources contributed (non-null scores)
 
+    # Delta ingest: hash of the generated doc (see ingest/delta.py)
+    content_fingerprint = Keyword()
+
     class Index:
         name = "ppi_index"
         settings = {
@@ -11,18 +11,17 @@ from dataportal.models.base import lowercase_normalizer, autocomplete_analyzer
 
 class OrthologDocument(Document):
     """Elasticsearch document for ortholog relationships with gene information."""
-    
+
     # ---- Identity / keys ----
     pair_id = Keyword()                                    # "{locus_a}__{locus_b}" – set as _id
     doc_type = Keyword()                                   # "ortholog" for filtering
-    
+
     # ---- Ortholog-specific fields ----
     orthology_type = Keyword()                             # "1:1", "many:1", "1:many", "many:many"
     oma_group_id = Integer()                               # OMA group ID (if available)
     members = Keyword(multi=True)                          # [gene_a, gene_b] for queries
     is_one_to_one = Boolean()                             # True if orthology_type is "1:1"
 
-    
     # ---- Gene A Information ----
     gene_a = Keyword()                                     # locus tag (e.g., "BU_ATCC8492_00001")
     gene_a_locus_tag = Keyword()                           # same as gene_a for consistency
@@ -37,7 +36,7 @@ class OrthologDocument(Document):
     gene_a_phase = Keyword()                               # phase
     gene_a_product = Text()                                # product description
     gene_a_desc = Text()                                   # additional description
-    
+
     # ---- Gene B Information ----
     gene_b = Keyword()                                     # locus tag (e.g., "PV_ATCC8482_00001")
     gene_b_locus_tag = Keyword()                           # same as gene_b for consistency
@@ -52,19 +51,19 @@ class OrthologDocument(Document):
     gene_b_phase = Keyword()                               # phase
     gene_b_product = Text()                                # product description
     gene_b_desc = Text()                                   # additional description
-    
+
     # ---- Species Information ----
     species_a_acronym = Keyword(normalizer=lowercase_normalizer)  # species acronym for gene A
     species_b_acronym = Keyword(normalizer=lowercase_normalizer)  # species acronym for gene B
     isolate_a = Keyword()                                  # isolate for gene A
     isolate_b = Keyword()                                  # isolate for gene B
-    
 
-    
     # ---- Cross-species analysis fields ----
     same_species = Boolean()                               # whether both genes are from the same species
     same_isolate = Boolean()                               # whether both genes are from the same isolate
 
+    # ---- Delta ingest ----
+    content_fingerprint = Keyword()  # hash of the generated doc (see ingest/delta.py)
 
     class Index:
         name = "ortholog_index"
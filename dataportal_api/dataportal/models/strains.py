@@ -16,12 +16,46 @@ from elasticsearch_dsl import (
     ScaledFloat,
 )
 
-from .base import autocomplete_analyzer, lowercase_normalizer
+from .base import (
+    autocomplete_analyzer,
+    folded_name_normalizer,
+    lowercase_normalizer,
+    name_separator_filter,
+)
+
+
+def _drug_name_field():
+    """
+    Drug name: analyzed text plus
+      .keyword     lowercased exact value
+      .raw         value as ingested (display, terms aggregations)
+      .normalized  lowercased, accent-folded, separators removed (exact matching)
+      .ngram       edge n-grams (prefix / as-you-type matching)
+    """
+    return Text(
+        fields={
+            "keyword": Keyword(normalizer=lowercase_normalizer),
+            "raw": Keyword(),
+            "normalized": Keyword(normalizer=folded_name_normalizer),
+            "ngram": Text(analyzer=autocomplete_analyzer, search_analyzer="standard"),
+        }
+    )
+
+
+def _drug_class_field():
+    """Drug class keyword (lowercased) with .normalized and .ngram subfields."""
+    return Keyword(
+        normalizer=lowercase_normalizer,
+        fields={
+            "normalized": Keyword(normalizer=folded_name_normalizer),
+            "ngram": Text(analyzer=autocomplete_analyzer, search_analyzer="standard"),
+        },
+    )
 
 
 class StrainDocument(Document):
     """Elasticsearch document for strain information."""
-    
+
     strain_id = Keyword()
 
     species_scientific_name = Text(fields={"keyword": Keyword(normalizer=lowercase_normalizer)})
@@ -56,46 +90,45 @@ class StrainDocument(Document):
     })
 
     # ---- Drug MIC (growth inhibition / MIC-like) ----
-    drug_mic = Nested(properties={
-        # drug metadata (all optional)
-        "drug_name": Text(fields={"keyword": Keyword(normalizer=lowercase_normalizer)}),
-        "drug_class": Keyword(normalizer=lowercase_normalizer),
-        "drug_subclass": Keyword(normalizer=lowercase_normalizer),
-        "compound_name": Text(fields={"keyword": Keyword(normalizer=lowercase_normalizer)}),
-        "pubchem_id": Keyword(),
-
-        # measurements
-        "relation": Keyword(),  # '=', '>', '<=', etc.
-        "mic_value": ScaledFloat(scaling_factor=1000),  # 0.001 precision (e.g., µM or mg/L)
-        "unit": Keyword(),  # 'uM', 'mg/L'
-
-        # experimental context (if/when available)
-        "experimental_condition_id": Integer(),
-        "experimental_condition_name": Keyword(normalizer=lowercase_normalizer)
-    })
+    drug_mic = Nested(
+        properties={
+            # drug metadata (all optional)
+            "drug_name": _drug_name_field(),
+            "drug_class": _drug_class_field(),
+            "drug_subclass": Keyword(normalizer=lowercase_normalizer),
+            "compound_name": Text(fields={"keyword": Keyword(normalizer=lowercase_normalizer)}),
+            "pubchem_id": Keyword(),
+            # measurements
+            "relation": Keyword(),  # '=', '>', '<=', etc.
+            "mic_value": ScaledFloat(scaling_factor=1000),  # 0.001 precision (e.g., µM or mg/L)
+            "unit": Keyword(),  # 'uM', 'mg/L'
+            # experimental context (if/when available)
+            "experimental_condition_id": Integer(),
+            "experimental_condition_name": Keyword(normalizer=lowercase_normalizer),
+        }
+    )
 
     # ---- Drug Metabolism ----
-    drug_metabolism = Nested(properties={
-        # drug metadata (all optional)
-        "drug_name": Text(fields={"keyword": Keyword(normalizer=lowercase_normalizer)}),
-        "drug_class": Keyword(normalizer=lowercase_normalizer),
-        "drug_subclass": Keyword(normalizer=lowercase_normalizer),
-        "compound_name": Text(fields={"keyword": Keyword(normalizer=lowercase_normalizer)}),
-        "pubchem_id": Keyword(),
-
-        # measurements
-        "degr_percent": ScaledFloat(scaling_factor=10000),  # 0.0001 precision
-        "pval": ScaledFloat(scaling_factor=1000000),
-        "fdr": ScaledFloat(scaling_factor=1000000),
-        "metabolizer_classification": Keyword(normalizer=lowercase_normalizer),
-
-        # convenience flags for filtering
-        "is_significant": Boolean(),  # e.g., fdr < 0.05
-
-        # experimental context (optional)
-        "experimental_condition_id": Integer(),
-        "experimental_condition_name": Keyword(normalizer=lowercase_normalizer)
-    })
+    drug_metabolism = Nested(
+        properties={
+            # drug metadata (all optional)
+            "drug_name": _drug_name_field(),
+            "drug_class": _drug_class_field(),
+            "drug_subclass": Keyword(normalizer=lowercase_normalizer),
+            "compound_name": Text(fields={"keyword": Keyword(normalizer=lowercase_normalizer)}),
+            "pubchem_id": Keyword(),
+            # measurements
+            "degr_percent": ScaledFloat(scaling_factor=10000),  # 0.0001 precision
+            "pval": ScaledFloat(scaling_factor=1000000),
+            "fdr": ScaledFloat(scaling_factor=1000000),
+            "metabolizer_classification": Keyword(normalizer=lowercase_normalizer),
+            # convenience flags for filtering
+            "is_significant": Boolean(),  # e.g., fdr < 0.05
+            # experimental context (optional)
+            "experimental_condition_id": Integer(),
+            "experimental_condition_name": Keyword(normalizer=lowercase_normalizer),
+        }
+    )
 
     class Index:
         name = "strain_index"
@@ -103,7 +136,11 @@ class StrainDocument(Document):
             "analysis": {
                 "analyzer": {"autocomplete_analyzer": autocomplete_analyzer},
                 "tokenizer": {"edge_ngram_tokenizer": autocomplete_analyzer.tokenizer},
-                "normalizer": {"lowercase_normalizer": lowercase_normalizer},
+                "normalizer": {
+                    "lowercase_normalizer": lowercase_normalizer,
+                    "folded_name_normalizer": folded_name_normalizer,
+                },
+                "char_filter": {"name_separator_filter": name_separator_filter},
             }
         }
 
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel, ConfigDict
 
 
@@ -7,5 +9,6 @@ class BasePaginationSchema(BaseModel):
     has_previous: bool
     has_next: bool
     total_results: int
+    next_cursor: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
@@ -64,6 +64,11 @@ class GeneSearchQuerySchema(BaseModel):
     sort_order: Optional[str] = Field(
         DEFAULT_SORT_DIRECTION, description="Sort order: 'asc' or 'desc'."
     )
+    cursor: Optional[str] = Field(
+        None,
+        description="Opaque cursor for deep pagination. Pass '*' for the first page, then the "
+        "returned next_cursor; 'page' is ignored when a cursor is given.",
+    )
 
     model_config = ConfigDict(
         json_schema_extra={"example": GENE_SEARCH_QUERY_EXAMPLE},
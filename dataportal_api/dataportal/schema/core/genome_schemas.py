@@ -53,6 +53,11 @@ class GenomeSearchQuerySchema(BaseModel):
     species_acronym: Optional[str] = Field(
         None, description="Optional species acronym filter (BU, PV)."
     )
+    cursor: Optional[str] = Field(
+        None,
+        description="Opaque cursor for deep pagination. Pass '*' for the first page, then the "
+        "returned next_cursor; 'page' is ignored when a cursor is given.",
+    )
 
     model_config = ConfigDict(
         json_schema_extra={"example": GENOME_SEARCH_QUERY_EXAMPLE},
@@ -81,6 +86,11 @@ class GetAllGenomesQuerySchema(BaseModel):
     sortOrder: Optional[str] = Field(
         DEFAULT_SORT_DIRECTION, description="Sort order: 'asc' or 'desc'."
     )
+    cursor: Optional[str] = Field(
+        None,
+        description="Opaque cursor for deep pagination. Pass '*' for the first page, then the "
+        "returned next_cursor; 'page' is ignored when a cursor is given.",
+    )
 
     model_config = ConfigDict(
         json_schema_extra={"example": GET_ALL_GENOMES_QUERY_EXAMPLE},
@@ -104,6 +114,11 @@ class GenesByGenomeQuerySchema(BaseModel):
     sort_order: Optional[str] = Field(
         DEFAULT_SORT_DIRECTION, description="Sort order: 'asc' or 'desc'."
     )
+    cursor: Optional[str] = Field(
+        None,
+        description="Opaque cursor for deep pagination. Pass '*' for the first page, then the "
+        "returned next_cursor; 'page' is ignored when a cursor is given.",
+    )
 
     model_config = ConfigDict(
         json_schema_extra={"example": GENES_BY_GENOME_QUERY_EXAMPLE},
@@ -164,7 +164,7 @@ class DrugSuggestionSchema(BaseModel):
     """Schema for drug name suggestions."""
     drug_name: str = Field(..., description="Drug name")
     drug_class: Optional[str] = Field(None, description="Drug class")
-    count: int = Field(..., description="Number of strains with this drug")
+    count: int = Field(..., description="Number of records (strain measurements) with this drug")
 
 
 class DrugAutocompleteQuerySchema(BaseModel):
@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Literal, Optional, List
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -45,7 +45,7 @@ class FitnessWithGeneSchema(BaseModel):
 
 class FitnessSearchQuerySchema(BaseModel):
     """Schema for fitness search endpoint query parameters."""
-    
+
     locus_tags: Optional[str] = Field(
         None,
         description="Comma-separated list of locus tags to search for"
@@ -77,13 +77,63 @@ class FitnessSearchQuerySchema(BaseModel):
         description="Minimum number of barcodes",
         ge=0
     )
-    
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class FitnessMatrixQuerySchema(BaseModel):
+    """Schema for the gene x contrast fitness matrix endpoint."""
+
+    isolate: Optional[str] = Field(
+        None, description="Isolate name (default: derived from the first locus tag)"
+    )
+    locus_tags: Optional[str] = Field(
+        None,
+        description="Comma-separated locus tags or UniProt IDs (default: all genes of the isolate)",
+    )
+    contrasts: Optional[str] = Field(
+        None, description="Comma-separated contrasts (default: all contrasts)"
+    )
+    values: str = Field("lfc", description="Comma-separated matrices to return: lfc, fdr, barcodes")
+    cluster: Optional[Literal["genes", "contrasts", "both"]] = Field(
+        None,
+        description="Reorder genes and/or contrasts by hierarchical clustering of their LFC profiles",
+    )
+    format: Literal["json", "npz"] = Field(
+        "json", description="json: nested arrays (null = no value); npz: compressed NumPy archive"
+    )
+
     model_config = ConfigDict(from_attributes=True)
 
 
+class FitnessMatrixGeneSchema(BaseModel):
+    """Row header of the fitness matrix."""
+
+    locus_tag: str
+    uniprot_id: Optional[str] = None
+    gene_name: Optional[str] = None
+
+
+class FitnessMatrixSchema(BaseModel):
+    """Gene x contrast block of the fitness matrices (rows follow `genes`, columns `contrasts`)."""
+
+    isolate: str
+    built_at: Optional[str] = None
+    genes: List[FitnessMatrixGeneSchema]
+    contrasts: List[str]
+    conditions: List[Optional[str]]
+    lfc: Optional[List[List[Optional[float]]]] = None
+    fdr: Optional[List[List[Optional[float]]]] = None
+    barcodes: Optional[List[List[Optional[int]]]] = None
+    missing_genes: List[str] = Field(default_factory=list)
+    missing_contrasts: List[str] = Field(default_factory=list)
+
+
 __all__ = [
     "FitnessDataSchema",
     "FitnessWithGeneSchema",
     "FitnessSearchQuerySchema",
+    "FitnessMatrixQuerySchema",
+    "FitnessMatrixGeneSchema",
+    "FitnessMatrixSchema",
 ]
-
@@ -109,6 +109,9 @@ class PaginationMetadataSchema(BaseModel):
     has_next: bool = Field(..., description="Whether there is a next page")
     total_results: int = Field(..., description="Total number of results")
     per_page: int = Field(..., description="Number of items per page")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page (cursor pagination only)"
+    )
 
     model_config = ConfigDict(
         from_attributes=True,
@@ -1,6 +1,11 @@
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional, TypeVar, Generic
+import asyncio
+import concurrent.futures
+import hashlib
+import json
 import logging
+import threading
 from elasticsearch_dsl import Search
 from asgiref.sync import sync_to_async
 
@@ -11,9 +16,17 @@ logger = logging.getLogger(__name__)
 T = TypeVar("T")
 U = TypeVar("U")
 
+# Single-flight registry: searches currently executing, keyed by hash of index + body.
+# concurrent.futures (not asyncio) futures so waiters on other event loops/threads can join.
+_inflight_searches: Dict[str, concurrent.futures.Future] = {}
+_inflight_lock = threading.Lock()
+
 
 class BaseService(ABC, Generic[T, U]):
 
+    # Coalesce identical concurrent searches into one ES request (see _execute_search).
+    single_flight = True
+
     def __init__(self, index_name: str):
         self.index_name = index_name
         self.logger = logging.getLogger(self.__class__.__name__)
@@ -49,10 +62,65 @@ class BaseService(ABC, Generic[T, U]):
         """Create a base Elasticsearch search object."""
         return Search(index=self.index_name)
 
+    @staticmethod
+    def _search_key(search: Search) -> Optional[str]:
+        """Hash of the target index and serialized query body; None if not serializable."""
+        try:
+            payload = json.dumps(
+                {
+                    "index": search._index,
+                    "using": str(search._using),
+                    "params": search._params,
+                    "body": search.to_dict(),
+                },
+                sort_keys=True,
+                default=str,
+            )
+        except Exception:
+            return None
+        return hashlib.sha256(payload.encode()).hexdigest()
+
     async def _execute_search(self, search: Search) -> Any:
-        """Execute an Elasticsearch search asynchronously."""
+        """
+        Execute an Elasticsearch search asynchronously.
+
+        Identical searches already in flight are not re-sent: the first caller
+        executes and concurrent callers await the same result. Nothing is cached
+        once the search completes. The response object is shared, so callers must
+        treat it as read-only.
+        """
+        key = self._search_key(search) if self.single_flight else None
+        if key is None:
+            try:
+                return await sync_to_async(search.execute)()
+            except Exception as e:
+                self.logger.error(f"Error executing search: {e}")
+                raise ServiceError(f"Search execution failed: {str(e)}")
+
+        with _inflight_lock:
+            future = _inflight_searches.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = concurrent.futures.Future()
+                _inflight_searches[key] = future
+
+        if is_leader:
+            try:
+                future.set_result(await sync_to_async(search.execute)())
+            except Exception as e:
+                future.set_exception(e)
+            except BaseException:
+                # Leader cancelled: fail the waiters instead of leaving them hanging
+                future.set_exception(ServiceError("Coalesced search was cancelled"))
+                raise
+            finally:
+                with _inflight_lock:
+                    _inflight_searches.pop(key, None)
+        else:
+            self.logger.debug(f"Joining in-flight search on {self.index_name}")
+
         try:
-            return await sync_to_async(search.execute)()
+            return await asyncio.wrap_future(future)
         except Exception as e:
             self.logger.error(f"Error executing search: {e}")
             raise ServiceError(f"Search execution failed: {str(e)}")
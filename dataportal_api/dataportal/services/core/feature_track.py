@@ -0,0 +1,362 @@
+"""
+Genome browser feature track served from the feature index.
+
+The static GFF tabix files only carry what was in the GFF when they were
+generated; this track is built from the feature index, so the portal's own
+annotations (the has_* flags, essentiality calls) show up as soon as they
+are ingested.
+
+Each isolate is loaded on first use into per-contig SortedIntervals with
+parallel arrays: feature type / essentiality as codes into per-isolate
+vocabularies, strand as int8 and the has_* flags as one bitmask byte.
+Region queries bisect the arrays; wide windows get binned density instead
+of individual features. FeatureTrackStore drops every loaded isolate when the
+feature index changes (checked at most every INDEX_VERSION_TTL seconds) and
+keeps at most `max_isolates` of them.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+from elasticsearch_dsl import Search
+
+from dataportal.elasticsearch.indexing import index_signature
+from dataportal.utils.intervals import SortedIntervals, normalize_contig
+
+logger = logging.getLogger(__name__)
+
+TRACK_FLAGS = (
+    "has_essentiality",
+    "has_fitness",
+    "has_proteomics",
+    "has_mutant_growth",
+    "has_reactions",
+    "has_amr_info",
+)
+TRACK_FIELDS = (
+    "seq_id",
+    "feature_id",
+    "locus_tag",
+    "feature_type",
+    "gene_name",
+    "product",
+    "strand",
+    "start",
+    "end",
+    "essentiality",
+    "essentiality_data.essentiality_call",
+) + TRACK_FLAGS
+
+# More features than this in a window are returned as density bins
+MAX_TRACK_FEATURES = 2000
+# Bins per window when the binning is automatic
+DEFAULT_TRACK_BINS = 500
+# Most bins per window; a smaller bin_size is raised to fit
+MAX_TRACK_BINS = 2000
+
+_STRANDS = {"+": 1, "-": -1}
+
+
+def _essentiality_call(doc: Dict[str, Any]) -> Optional[str]:
+    """First structured essentiality call, falling back to the legacy field."""
+    entries = doc.get("essentiality_data") or []
+    if entries and entries[0].get("essentiality_call"):
+        return entries[0]["essentiality_call"]
+    return doc.get("essentiality")
+
+
+def _code(vocab: Dict[Any, int], value: Any) -> int:
+    if value not in vocab:
+        vocab[value] = len(vocab)
+    return vocab[value]
+
+
+class ContigFeatures:
+    """Features of one contig, sorted by start."""
+
+    __slots__ = (
+        "intervals",
+        "ids",
+        "locus_tags",
+        "gene_names",
+        "products",
+        "types",
+        "strands",
+        "flags",
+        "calls",
+    )
+
+    def __init__(self, columns: Dict[str, list]):
+        self.intervals = SortedIntervals(columns["start"], columns["end"])
+        order = self.intervals.order.tolist()
+        self.ids = [columns["feature_id"][i] for i in order]
+        self.locus_tags = [columns["locus_tag"][i] for i in order]
+        self.gene_names = [columns["gene_name"][i] for i in order]
+        self.products = [columns["product"][i] for i in order]
+        self.types = np.array(columns["type"], dtype=np.uint8)[order]
+        self.strands = np.array(columns["strand"], dtype=np.int8)[order]
+        self.flags = np.array(columns["flags"], dtype=np.uint8)[order]
+        self.calls = np.array(columns["call"], dtype=np.uint8)[order]
+
+    def __len__(self) -> int:
+        return len(self.intervals)
+
+    def flag(self, name: str) -> np.ndarray:
+        return (self.flags >> TRACK_FLAGS.index(name)) & 1
+
+
+class IsolateFeatures:
+    """seq_id -> ContigFeatures of one isolate, plus normalized contig names."""
+
+    def __init__(self, isolate: str, docs: Iterable[Dict[str, Any]]):
+        self.isolate = isolate
+        types: Dict[Optional[str], int] = {}
+        calls: Dict[Optional[str], int] = {None: 0}
+        columns: Dict[str, Dict[str, list]] = {}
+        for doc in docs:
+            seq_id, start, end = doc.get("seq_id"), doc.get("start"), doc.get("end")
+            if not seq_id or start is None or end is None:
+                continue
+            contig = columns.setdefault(
+                seq_id,
+                {
+                    k: []
+                    for k in (
+                        "feature_id",
+                        "locus_tag",
+                        "gene_name",
+                        "product",
+                        "start",
+                        "end",
+                        "type",
+                        "strand",
+                        "flags",
+                        "call",
+                    )
+                },
+            )
+            contig["feature_id"].append(doc.get("feature_id") or doc.get("locus_tag"))
+            contig["locus_tag"].append(doc.get("locus_tag"))
+            contig["gene_name"].append(doc.get("gene_name"))
+            contig["product"].append(doc.get("product"))
+            contig["start"].append(start)
+            contig["end"].append(end)
+            contig["type"].append(_code(types, doc.get("feature_type")))
+            contig["strand"].append(_STRANDS.get(doc.get("strand"), 0))
+            contig["flags"].append(
+                sum(1 << bit for bit, name in enumerate(TRACK_FLAGS) if doc.get(name))
+            )
+            contig["call"].append(_code(calls, _essentiality_call(doc)))
+
+        self.types: List[Optional[str]] = list(types)
+        self.calls: List[Optional[str]] = list(calls)
+        self.contigs: Dict[str, ContigFeatures] = {
+            seq_id: ContigFeatures(c) for seq_id, c in columns.items()
+        }
+        self._contig_names = {normalize_contig(seq_id): seq_id for seq_id in self.contigs}
+
+    @property
+    def feature_count(self) -> int:
+        return sum(len(contig) for contig in self.contigs.values())
+
+    def contig(self, ref_name: str) -> Optional[str]:
+        """seq_id of `ref_name`, matched exactly or normalized."""
+        if ref_name in self.contigs:
+            return ref_name
+        return self._contig_names.get(normalize_contig(ref_name))
+
+    def _features(self, contig: ContigFeatures, positions: np.ndarray) -> List[Dict[str, Any]]:
+        flags = {name: contig.flag(name)[positions].astype(bool).tolist() for name in TRACK_FLAGS}
+        strands = {1: "+", -1: "-", 0: None}
+        features = []
+        for n, (i, start, end, ftype, strand, call) in enumerate(
+            zip(
+                positions.tolist(),
+                contig.intervals.starts[positions].tolist(),
+                contig.intervals.ends[positions].tolist(),
+                contig.types[positions].tolist(),
+                contig.strands[positions].tolist(),
+                contig.calls[positions].tolist(),
+            )
+        ):
+            feature = {
+                "feature_id": contig.ids[i],
+                "locus_tag": contig.locus_tags[i],
+                "feature_type": self.types[ftype],
+                "gene_name": contig.gene_names[i],
+                "product": contig.products[i],
+                "strand": strands[strand],
+                "start": start,
+                "end": end,
+                "essentiality": self.calls[call],
+            }
+            feature.update({name: values[n] for name, values in flags.items()})
+            features.append(feature)
+        return features
+
+    def region(
+        self,
+        ref_name: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        bin_size: Optional[int] = None,
+        feature_types: Optional[List[str]] = None,
+        max_features: int = MAX_TRACK_FEATURES,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Features overlapping [start, end] of one contig (None if unknown).
+
+        With `bin_size`, or when more than `max_features` overlap the window,
+        per-bin feature and has_* flag counts are returned instead. `end` is
+        clamped to the last feature end, and `bin_size` raised so there are
+        at most MAX_TRACK_BINS bins.
+        """
+        seq_id = self.contig(ref_name)
+        if seq_id is None:
+            return None
+        contig = self.contigs[seq_id]
+        # nothing lies past the last feature end; clamping keeps the bins bounded
+        contig_end = int(contig.intervals.max_ends[-1]) if len(contig) else 1
+        if start is None:
+            start = 1
+        end = contig_end if end is None else min(end, contig_end)
+
+        positions = contig.intervals.overlapping(start, end)
+        if feature_types:
+            names = {t.lower() for t in feature_types}
+            wanted = [code for code, t in enumerate(self.types) if t and t.lower() in names]
+            positions = positions[np.isin(contig.types[positions], wanted)]
+
+        result = {
+            "isolate_name": self.isolate,
+            "seq_id": seq_id,
+            "start": start,
+            "end": end,
+            "total": len(positions),
+            "bin_size": None,
+            "features": [],
+            "bins": [],
+        }
+        if end < start:
+            return result
+        if bin_size is None and len(positions) <= max_features:
+            result["features"] = self._features(contig, positions)
+            return result
+
+        window = end - start + 1
+        bin_size = max(
+            bin_size or math.ceil(window / DEFAULT_TRACK_BINS),
+            math.ceil(window / MAX_TRACK_BINS),
+            1,
+        )
+        weights = {name: contig.flag(name) for name in TRACK_FLAGS}
+        if feature_types:
+            wanted = np.zeros(len(contig), dtype=np.uint8)
+            wanted[positions] = 1
+            weights = {name: flag * wanted for name, flag in weights.items()}
+            weights["count"] = wanted
+        edges, counts, sums = contig.intervals.density(start, end, bin_size, weights)
+        counts = sums.pop("count", counts)
+
+        columns = {
+            "start": edges.tolist(),
+            "end": np.minimum(edges + bin_size - 1, end).tolist(),
+            "count": counts.tolist(),
+            **{name: values.tolist() for name, values in sums.items()},
+        }
+        result["bin_size"] = bin_size
+        result["bins"] = [dict(zip(columns, values)) for values in zip(*columns.values())]
+        return result
+
+
+class FeatureTrackStore:
+    """
+    Loads and caches IsolateFeatures per isolate from the feature index.
+
+    The index signature is re-read at most every `ttl` seconds; when it
+    changed every loaded isolate is dropped and reloaded on its next access.
+    At most `max_isolates` isolates are kept, least recently used first out.
+    """
+
+    def __init__(self, index_name: str, ttl: Optional[int] = None, max_isolates: int = 32):
+        self.index_name = index_name
+        self._ttl = ttl
+        self.max_isolates = max_isolates
+        self._lock = threading.Lock()
+        self._isolates: "OrderedDict[str, IsolateFeatures]" = OrderedDict()
+        self._signature: Optional[tuple] = None
+        self._checked_at = 0.0
+
+    @property
+    def ttl(self) -> int:
+        if self._ttl is None:
+            from django.conf import settings
+
+            return getattr(settings, "INDEX_VERSION_TTL", 60)
+        return self._ttl
+
+    def _load_docs(self, isolate: str) -> List[Dict[str, Any]]:
+        search = (
+            Search(index=self.index_name)
+            .filter("term", isolate_name=isolate)
+            .source(list(TRACK_FIELDS))
+            .params(size=2000)
+        )
+        return [hit.to_dict() for hit in search.scan()]
+
+    def load(
+        self, isolate: str, docs: Optional[Iterable[Dict[str, Any]]] = None
+    ) -> IsolateFeatures:
+        """Build the track of `isolate` from `docs` (default: scan the feature index)."""
+        started = time.perf_counter()
+        features = IsolateFeatures(isolate, self._load_docs(isolate) if docs is None else docs)
+        if not features.contigs:
+            # unknown isolate: do not let it evict loaded ones
+            return features
+        with self._lock:
+            self._isolates[isolate] = features
+            self._isolates.move_to_end(isolate)
+            while len(self._isolates) > self.max_isolates:
+                self._isolates.popitem(last=False)
+        logger.info(
+            f"Loaded feature track of {isolate} in {(time.perf_counter() - started) * 1000:.0f} ms: "
+            f"{len(features.contigs)} contigs, {features.feature_count} features"
+        )
+        return features
+
+    def _check_signature(self) -> None:
+        if time.monotonic() - self._checked_at < self.ttl:
+            return
+        try:
+            signature = index_signature(self.index_name)
+        except Exception as e:
+            # keep serving the loaded data; try again after the next TTL
+            logger.warning(f"Could not check {self.index_name} for changes: {e}")
+            signature = self._signature
+        with self._lock:
+            if signature != self._signature:
+                self._isolates.clear()
+                self._signature = signature
+            self._checked_at = time.monotonic()
+
+    def get(self, isolate: str) -> IsolateFeatures:
+        """The track of `isolate`, (re)loading it first if missing or stale."""
+        self._check_signature()
+        with self._lock:
+            features = self._isolates.get(isolate)
+            if features is not None:
+                self._isolates.move_to_end(isolate)
+                return features
+        return self.load(isolate)
+
+    def reset(self) -> None:
+        """Drop the loaded tracks; the next access reloads them."""
+        with self._lock:
+            self._isolates.clear()
+            self._signature = None
+            self._checked_at = 0.0
@@ -1,10 +1,17 @@
 import json
 import logging
-from typing import Optional, List, Tuple, Dict, Any
+import time
+from typing import Optional, List, Tuple, Dict, Any, Mapping
 
 from asgiref.sync import sync_to_async
-from elasticsearch_dsl import Search, Q, connections
+from elasticsearch_dsl import Search
 
+from dataportal.elasticsearch.indexing import index_generation
+from dataportal.elasticsearch.pagination import (
+    aiter_pit_batches,
+    fetch_cursor_page,
+    iter_pit_batches,
+)
 from dataportal.schema.core.gene_schemas import (
     GenePaginationSchema,
     GeneResponseSchema,
@@ -15,6 +22,7 @@ from dataportal.schema.core.gene_schemas import (
     GeneAutocompleteQuerySchema,
 )
 from dataportal.services.base_service import BaseService
+from dataportal.services.core.feature_track import FeatureTrackStore
 from dataportal.services.core.gene_faceted_search import GeneFacetedSearch
 from dataportal.utils.constants import (
     GENE_DEFAULT_SORT_FIELD,
@@ -40,16 +48,22 @@ from dataportal.utils.constants import (
     INDEX_FEATURES,
     FACET_FIELDS,
     GENE_FIELD_COG_FUNCATS,
-    SCROLL_BATCH_SIZE,
+    CURSOR_START,
+    PIT_BATCH_SIZE,
     SCROLL_MAX_RESULTS,
-    SCROLL_TIMEOUT,
     GENE_FIELD_GO_TERM,
+    GENE_FIELD_AMR,
+    GENE_FIELD_AMR_DRUG_CLASS,
+    GENE_FIELD_AMR_DRUG_SUBCLASS,
+    GENE_FIELD_FEATURE_TYPE,
 )
 from dataportal.utils.exceptions import (
     GeneNotFoundError,
     ServiceError,
     InvalidGenomeIdError,
+    ValidationError,
 )
+from dataportal.utils.string_mapping import StringMappingSnapshot, scan_string_refs
 from dataportal.utils.utils import split_comma_param
 
 logger = logging.getLogger(__name__)
@@ -59,70 +73,108 @@ logger = logging.getLogger(__name__)
 _LOCUS_STRING_CACHE_KEY_ALL = "__all__"
 
 
+# Per-contig feature arrays for the genome browser feature track
+feature_tracks = FeatureTrackStore(INDEX_FEATURES)
+
+
 class GeneService(BaseService[GeneResponseSchema, Dict[str, Any]]):
     """Service for managing gene data operations in the read-only data portal."""
 
-    def __init__(self):
+    def __init__(self, tracks: Optional[FeatureTrackStore] = None):
         super().__init__(INDEX_FEATURES)
+        self.feature_tracks = tracks or feature_tracks
         # Locus tag ↔ STRING protein ID from feature index (dbxref.db=STRING). Loaded at startup.
-        # Key: species_acronym (lower) or _LOCUS_STRING_CACHE_KEY_ALL. Value: (locus_to_string, string_to_locus).
-        self._locus_string_cache: Dict[str, Tuple[Dict[str, str], Dict[str, str]]] = {}
+        # Key: species_acronym (lower) or _LOCUS_STRING_CACHE_KEY_ALL. Value: (locus_to_string, string_to_locus),
+        # plain dicts after an index scan or views of the memory-mapped snapshot.
+        self._locus_string_cache: Dict[str, Tuple[Mapping[str, str], Mapping[str, str]]] = {}
+        self._string_snapshot: Optional[StringMappingSnapshot] = None
+
+    async def get_feature_track(
+        self,
+        isolate_name: str,
+        ref_name: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        bin_size: Optional[int] = None,
+        feature_types: Optional[List[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Features (with has_* flags) overlapping start-end of one contig, or
+        per-bin counts for wide windows; None when the contig is unknown.
+        """
+        if start is not None and end is not None and start > end:
+            raise ValidationError(f"start ({start}) must not be greater than end ({end})")
+        try:
+            track = await sync_to_async(self.feature_tracks.get)(isolate_name)
+            return track.region(
+                ref_name, start, end, bin_size=bin_size, feature_types=feature_types
+            )
+        except Exception as e:
+            logger.error(f"Error reading feature track for {isolate_name}/{ref_name}: {e}")
+            raise ServiceError(f"Failed to read feature track: {str(e)}")
+
+    def _open_string_snapshot(self) -> Optional[StringMappingSnapshot]:
+        """The live locus↔STRING snapshot, or None if missing or taken from an older index generation."""
+        try:
+            snapshot = StringMappingSnapshot.open_current()
+        except Exception as e:
+            logger.warning("Could not open locus↔STRING mapping snapshot: %s", e)
+            return None
+        if snapshot is None:
+            return None
+        try:
+            generation = index_generation(self.index_name)
+        except Exception as e:
+            # the index cannot be checked (or scanned); the snapshot is the best we have
+            logger.warning(
+                "Could not check %s for changes, using snapshot %s: %s",
+                self.index_name,
+                snapshot.path,
+                e,
+            )
+            return snapshot
+        if not snapshot.is_current(generation):
+            logger.info(
+                "Locus↔STRING mapping snapshot %s is stale, rebuild it with manage.py build_string_mapping",
+                snapshot.path,
+            )
+            return None
+        return snapshot
 
     def load_locus_string_mapping_sync(self, species_acronym: Optional[str] = None) -> None:
         """
-        Load locus_tag ↔ STRING protein ID mapping from the feature index (dbxref.db=STRING).
-        Call at startup for quick processing. One scan; populates both global and per-species cache.
+        Load locus_tag ↔ STRING protein ID mapping (dbxref.db=STRING). Call at startup.
+        Memory-maps the snapshot written at ingest time (dataportal/utils/string_mapping.py);
+        only when it is missing or stale the feature index is scanned. The snapshot is left
+        to the ingest to rewrite (manage.py build_string_mapping).
         """
-        s = (
-            Search(index=self.index_name)
-            .filter("term", feature_type="gene")
-            .filter(
-                "nested",
-                path="dbxref",
-                query=Q("term", dbxref__db="STRING"),
+        started = time.perf_counter()
+        snapshot = self._open_string_snapshot()
+        if snapshot is not None:
+            self._string_snapshot = snapshot
+            self._locus_string_cache.clear()
+            logger.info(
+                "Loaded locus↔STRING mapping from snapshot %s in %.1f ms: %s locus tags",
+                snapshot.path,
+                (time.perf_counter() - started) * 1000,
+                len(self.get_locus_string_mapping()[0]),
             )
-            .source(["locus_tag", "dbxref", "species_acronym"])
-        )
-        if species_acronym:
-            s = s.filter("term", species_acronym=species_acronym.strip().lower())
+            return
+
         locus_to_string_all: Dict[str, str] = {}
         string_to_locus_all: Dict[str, str] = {}
         per_species: Dict[str, Tuple[Dict[str, str], Dict[str, str]]] = {}
         try:
-            for hit in s.scan():
-                locus = (
-                    getattr(hit, "locus_tag", None)
-                    or getattr(hit, "feature_id", None)
-                    or (getattr(hit.meta, "id", None) if hasattr(hit, "meta") else None)
-                )
-                if locus is None or locus == "":
-                    locus = getattr(hit.meta, "id", "") if hasattr(hit, "meta") else ""
-                if isinstance(locus, list):
-                    locus = locus[0] if locus else ""
-                if not locus:
-                    continue
-                locus = str(locus)
-                dbxref = getattr(hit, "dbxref", None) or []
-                string_ref = None
-                for entry in dbxref:
-                    if isinstance(entry, dict) and entry.get("db") == "STRING":
-                        string_ref = entry.get("ref")
-                        if string_ref:
-                            string_ref = str(string_ref)
-                        break
-                if not string_ref:
-                    continue
-                species = getattr(hit, "species_acronym", None) or ""
-                if isinstance(species, list):
-                    species = species[0] if species else ""
-                species = str(species).strip().lower() if species else _LOCUS_STRING_CACHE_KEY_ALL
+            refs = list(scan_string_refs(self.index_name, species_acronym))
+            for species, locus, string_ref in refs:
                 locus_to_string_all[locus] = string_ref
                 string_to_locus_all[string_ref] = locus
-                if species and species != _LOCUS_STRING_CACHE_KEY_ALL:
+                if species:
                     if species not in per_species:
                         per_species[species] = ({}, {})
                     per_species[species][0][locus] = string_ref
                     per_species[species][1][string_ref] = locus
+            self._string_snapshot = None
             self._locus_string_cache[_LOCUS_STRING_CACHE_KEY_ALL] = (
                 locus_to_string_all,
                 string_to_locus_all,
@@ -130,7 +182,8 @@ class GeneService(BaseService[GeneResponseSchema, Dict[str, Any]]):
             for sp, pair in per_species.items():
                 self._locus_string_cache[sp] = pair
             logger.info(
-                "Loaded locus↔STRING mapping from feature index: %s locus tags (species=%s)",
+                "Loaded locus↔STRING mapping from feature index in %.1f ms: %s locus tags (species=%s)",
+                (time.perf_counter() - started) * 1000,
                 len(locus_to_string_all),
                 species_acronym or "all",
             )
@@ -139,7 +192,7 @@ class GeneService(BaseService[GeneResponseSchema, Dict[str, Any]]):
 
     def get_locus_string_mapping(
         self, species_acronym: Optional[str] = None
-    ) -> Tuple[Dict[str, str], Dict[str, str]]:
+    ) -> Tuple[Mapping[str, str], Mapping[str, str]]:
         """
         Return (locus_tag → STRING ID, STRING ID → locus_tag) from cache.
         Use after load_locus_string_mapping_sync() has been called at startup.
@@ -147,6 +200,15 @@ class GeneService(BaseService[GeneResponseSchema, Dict[str, Any]]):
         key = (species_acronym or "").strip().lower() or _LOCUS_STRING_CACHE_KEY_ALL
         if key in self._locus_string_cache:
             return self._locus_string_cache[key]
+        snapshot = self._string_snapshot
+        if snapshot is not None:
+            if key not in snapshot.species:
+                key = _LOCUS_STRING_CACHE_KEY_ALL
+            pair = self._locus_string_cache.get(key)
+            if pair is None:
+                pair = snapshot.mapping(None if key == _LOCUS_STRING_CACHE_KEY_ALL else key)
+                self._locus_string_cache[key] = pair
+            return pair
         # Fallback to full mapping if no per-species entry
         return self._locus_string_cache.get(_LOCUS_STRING_CACHE_KEY_ALL, ({}, {}))
 
@@ -201,8 +263,10 @@ class GeneService(BaseService[GeneResponseSchema, Dict[str, Any]]):
 
     def _convert_hit_to_gene_schema(self, hit) -> GeneResponseSchema:
         """Convert Elasticsearch hit directly to GeneResponseSchema (Pydantic)."""
-        hit_dict = hit.to_dict()
+        return self._convert_source_to_gene_schema(hit.to_dict())
 
+    def _convert_source_to_gene_schema(self, hit_dict: Dict[str, Any]) -> GeneResponseSchema:
+        """Convert a raw `_source` dict to GeneResponseSchema."""
         return GeneResponseSchema(
             locus_tag=hit_dict.get("locus_tag"),
             gene_name=hit_dict.get("gene_name"),
@@ -365,14 +429,14 @@ class GeneService(BaseService[GeneResponseSchema, Dict[str, Any]]):
     ) -> GenePaginationSchema:
         try:
             es_query = {"match_all": {}}
-            genes, total_results = await self._fetch_paginated_genes(
+            genes, total_results, next_cursor = await self._fetch_paginated_genes(
                 es_query,
                 page=page,
                 per_page=per_page,
                 sort_field=sort_field,
                 sort_order=sort_order,
             )
-            return self._create_pagination_schema(genes, page, per_page, total_results)
+            return self._create_pagination_schema(genes, page, per_page, total_results, next_cursor)
         except Exception as e:
             logger.error(f"Error in get_all_genes: {e}")
             raise ServiceError(e)
@@ -386,18 +450,21 @@ class GeneService(BaseService[GeneResponseSchema, Dict[str, Any]]):
             es_query = self._build_es_query(None, params.query, None, None)
 
             # Call the common function
-            genes, total_results = await self._fetch_paginated_genes(
+            genes, total_results, next_cursor = await self._fetch_paginated_genes(
                 es_query,
                 params.page,
                 params.per_page,
                 params.sort_field,
                 params.sort_order,
+                cursor=params.cursor,
             )
 
             return self._create_pagination_schema(
-                genes, params.page, params.per_page, total_results
+                genes, params.page, params.per_page, total_results, next_cursor, params.cursor
             )
 
+        except ValidationError:
+            raise
         except Exception as e:
             logger.error(f"Error searching genes: {e}")
             raise ServiceError(e)
@@ -411,6 +478,7 @@ class GeneService(BaseService[GeneResponseSchema, Dict[str, Any]]):
         per_page: int = DEFAULT_PAGE_SIZE,
         sort_field: Optional[str] = None,
         sort_order: Optional[str] = SORT_DIRECTION_ASC,
+        cursor: Optional[str] = None,
     ) -> GenePaginationSchema:
         try:
             filter_criteria = {"isolate_name": isolate_name}
@@ -427,16 +495,21 @@ class GeneService(BaseService[GeneResponseSchema, Dict[str, Any]]):
                 filter_criteria=filter_criteria,
             )
 
-            genes, total_results = await self._fetch_paginated_genes(
+            genes, total_results, next_cursor = await self._fetch_paginated_genes(
                 query=es_query,
                 page=page,
                 per_page=per_page,
                 sort_field=sort_field,
                 sort_order=sort_order,
+                cursor=cursor,
             )
 
-            return self._create_pagination_schema(genes, page, per_page, total_results)
+            return self._create_pagination_schema(
+                genes, page, per_page, total_results, next_cursor, cursor
+            )
 
+        except ValidationError:
+            raise
         except Exception as e:
             logger.error(f"Error fetching genes for genome {isolate_name}: {e}")
             raise ServiceError(e)
@@ -491,15 +564,15 @@ class GeneService(BaseService[GeneResponseSchema, Dict[str, Any]]):
             )
 
             if use_scroll:
-                # Use scroll API for large downloads
-                genes, total_results = await self._fetch_all_genes_with_scroll(
+                # Walk a point-in-time for large downloads
+                genes, total_results = await self._fetch_all_genes(
                     query=es_query,
                     sort_field=params.sort_field,
                     sort_order=params.sort_order,
                 )
             else:
                 # Use regular pagination for normal requests
-                genes, total_results = await self._fetch_paginated_genes(
+                genes, total_results, _ = await self._fetch_paginated_genes(
                     query=es_query,
                     page=params.page,
                     per_page=params.per_page,
@@ -518,100 +591,31 @@ class GeneService(BaseService[GeneResponseSchema, Dict[str, Any]]):
             logger.error(f"Error in get_genes_by_multiple_genomes_and_string: {e}")
             raise ServiceError(e)
 
-    async def _fetch_all_genes_with_scroll(
+    async def _fetch_all_genes(
         self,
         query: dict,
         sort_field: Optional[str] = None,
         sort_order: Optional[str] = DEFAULT_SORT_DIRECTION,
     ) -> Tuple[List[GeneResponseSchema], int]:
-        """Fetch all genes using Elasticsearch scroll API for large downloads."""
-        order_prefix = "desc" if sort_order == SORT_DIRECTION_DESC else "asc"
-
-        if sort_field == GENE_SORT_FIELD_STRAIN:
-            sort_field = GENOME_FIELD_ISOLATE_NAME
-
-        sort_by = sort_field or GENE_DEFAULT_SORT_FIELD
-        # Map frontend field names to Elasticsearch field names
-        if sort_by == "start_position":
-            sort_by = "start"
-        elif sort_by == "end_position":
-            sort_by = "end"
-
-        sort_by = (
-            f"{sort_by}.keyword"
-            if sort_by
-            in [
-                GENE_FIELD_NAME,
-                GENE_FIELD_ALIAS,
-                FIELD_SEQ_ID,
-                GENE_FIELD_LOCUS_TAG,
-                GENE_FIELD_PRODUCT,
-            ]
-            else sort_by
-        )
-
+        """Fetch all genes for large downloads by walking a point-in-time with search_after."""
         try:
-            es_client = connections.get_connection()
-            search_body = {
-                "query": query,
-                "sort": [{sort_by: {"order": order_prefix}}],
-                "size": SCROLL_BATCH_SIZE,
-            }
-
-            logger.info(f"Starting scroll search with query: {json.dumps(search_body, indent=2)}")
-
-            # Execute initial search
-            response = await sync_to_async(
-                lambda: es_client.search(
-                    index=self.index_name, body=search_body, scroll=SCROLL_TIMEOUT
-                )
-            )()
-
+            logger.info(f"Starting PIT search with query: {json.dumps(query, indent=2)}")
             results = []
-            total_results = 0
-            max_results = SCROLL_MAX_RESULTS
-            batch_count = 0
-            scroll_id = response["_scroll_id"]
-
-            # Process all batches
-            while len(response["hits"]["hits"]) > 0 and total_results < max_results:
-                batch_count += 1
-                for hit_data in response["hits"]["hits"]:
-                    # Create a mock hit object that has to_dict() method
-                    class MockHit:
-                        def __init__(self, source):
-                            self._source = source
-
-                        def to_dict(self):
-                            return self._source
-
-                    mock_hit = MockHit(hit_data["_source"])
-                    validated = self._convert_hit_to_gene_schema(mock_hit)
-                    results.append(validated)
-
-                total_results += len(response["hits"]["hits"])
-                logger.info(f"Fetched {total_results} genes in {batch_count} batches...")
-
-                # Get next batch using scroll
-                try:
-                    response = await sync_to_async(
-                        lambda: es_client.scroll(scroll_id=scroll_id, scroll=SCROLL_TIMEOUT)
-                    )()
-                    scroll_id = response["_scroll_id"]
-                except Exception as scroll_error:
-                    logger.error(f"Error in scroll batch {batch_count}: {scroll_error}")
-                    break
-
-            if total_results >= max_results:
-                logger.warning(
-                    f"Reached maximum result limit of {max_results}. Some results may be truncated."
-                )
+            async for batch in aiter_pit_batches(
+                index=self.index_name,
+                query=query,
+                sort=self._resolve_sort(sort_field, sort_order),
+                batch_size=PIT_BATCH_SIZE,
+                max_results=SCROLL_MAX_RESULTS,
+            ):
+                results.extend(self._convert_source_to_gene_schema(h["_source"]) for h in batch)
+                logger.info(f"Fetched {len(results)} genes...")
 
-            logger.info(f"Scroll search completed. Total genes fetched: {total_results}")
-            return results, total_results
+            logger.info(f"PIT search completed. Total genes fetched: {len(results)}")
+            return results, len(results)
 
         except Exception as e:
-            logger.error(f"Error fetching genes with scroll API: {str(e)}")
+            logger.error(f"Error fetching genes with PIT search: {str(e)}")
             raise ServiceError(e)
 
     # helper methods
@@ -697,26 +701,35 @@ class GeneService(BaseService[GeneResponseSchema, Dict[str, Any]]):
         return bool_query
 
     def _create_pagination_schema(
-        self, serialized_genes, page, per_page, total_results
+        self,
+        serialized_genes,
+        page,
+        per_page,
+        total_results,
+        next_cursor: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> GenePaginationSchema:
+        if cursor:
+            # Cursor mode: position is defined by the cursor, not the page number
+            has_previous = cursor != CURSOR_START
+            has_next = next_cursor is not None
+        else:
+            has_previous = page > 1
+            has_next = (page * per_page) < total_results
         return GenePaginationSchema(
             results=serialized_genes,
             page_number=page,
             num_pages=(total_results + per_page - 1) // per_page,
-            has_previous=page > 1,
-            has_next=(page * per_page) < total_results,
+            has_previous=has_previous,
+            has_next=has_next,
             total_results=total_results,
+            next_cursor=next_cursor,
         )
 
-    async def _fetch_paginated_genes(
-        self,
-        query: dict,
-        page: int = 1,
-        per_page: int = DEFAULT_PAGE_SIZE,
-        sort_field: Optional[str] = None,
-        sort_order: Optional[str] = DEFAULT_SORT_DIRECTION,
-    ) -> Tuple[List[GeneResponseSchema], int]:
-        start = (page - 1) * per_page
+    def _resolve_sort(
+        self, sort_field: Optional[str], sort_order: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """Map an API sort field/order to an Elasticsearch sort clause."""
         order_prefix = "desc" if sort_order == SORT_DIRECTION_DESC else "asc"
 
         if sort_field == GENE_SORT_FIELD_STRAIN:
@@ -741,33 +754,51 @@ class GeneService(BaseService[GeneResponseSchema, Dict[str, Any]]):
             ]
             else sort_by
         )
+        return [{sort_by: {"order": order_prefix}}]
 
+    async def _fetch_paginated_genes(
+        self,
+        query: dict,
+        page: int = 1,
+        per_page: int = DEFAULT_PAGE_SIZE,
+        sort_field: Optional[str] = None,
+        sort_order: Optional[str] = DEFAULT_SORT_DIRECTION,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[GeneResponseSchema], int, Optional[str]]:
+        """
+        Fetch one page of genes. With a cursor, the page is read through a
+        point-in-time with search_after (constant cost at any depth) and the
+        cursor for the following page is returned; otherwise from/size is used.
+        """
         try:
             s = (
                 Search(index=self.index_name)
                 .filter("term", feature_type="gene")
                 .query(query)
-                .sort({sort_by: {"order": order_prefix}})[start : start + per_page]
-                .extra(track_total_hits=True)
+                .sort(*self._resolve_sort(sort_field, sort_order))
             )
 
-            logger.info(f"Final Elasticsearch Query: {json.dumps(s.to_dict(), indent=2)}")
-
-            response = await sync_to_async(s.execute)()
-
-            results = []
-            for hit in response.hits:
-                validated = self._convert_hit_to_gene_schema(hit)
-                results.append(validated)
-
-            total_results = (
-                response.hits.total.value
-                if hasattr(response.hits.total, "value")
-                else response.hits.total
-            )
+            if cursor:
+                response, total_results, next_cursor = await sync_to_async(
+                    fetch_cursor_page, thread_sensitive=False
+                )(self.index_name, s, per_page, cursor)
+            else:
+                start = (page - 1) * per_page
+                s = s[start : start + per_page].extra(track_total_hits=True)
+                logger.info(f"Final Elasticsearch Query: {json.dumps(s.to_dict(), indent=2)}")
+                response = await sync_to_async(s.execute)()
+                total_results = (
+                    response.hits.total.value
+                    if hasattr(response.hits.total, "value")
+                    else response.hits.total
+                )
+                next_cursor = None
 
-            return results, total_results
+            results = [self._convert_hit_to_gene_schema(hit) for hit in response.hits]
+            return results, total_results, next_cursor
 
+        except ValidationError:
+            raise
         except Exception as e:
             logger.error(f"Error fetching paginated genes from Elasticsearch: {str(e)}")
             raise ServiceError(e)
@@ -1150,7 +1181,70 @@ class GeneService(BaseService[GeneResponseSchema, Dict[str, Any]]):
 
         return header + "\n" + "\n".join(rows)
 
-    async def stream_genes_with_scroll(
+    # Columns of the gene TSV export, in output order
+    TSV_EXPORT_COLUMNS = [
+        GENOME_FIELD_ISOLATE_NAME,
+        GENE_FIELD_NAME,
+        GENE_FIELD_ALIAS,
+        FIELD_SEQ_ID,
+        GENE_FIELD_LOCUS_TAG,
+        GENE_FIELD_PRODUCT,
+        GENE_FIELD_UNIPROT_ID,
+        GENE_FIELD_ESSENTIALITY,
+        GENE_FIELD_PFAM,
+        GENE_FIELD_INTERPRO,
+        GENE_FIELD_KEGG,
+        GENE_FIELD_COG_FUNCATS,
+        GENE_FIELD_COG_ID,
+        GENE_FIELD_AMR,
+        GENE_FIELD_FEATURE_TYPE,
+    ]
+    # Defaults GeneResponseSchema applies to missing fields; kept so the export is unchanged
+    _TSV_DEFAULTS = {
+        GENE_FIELD_ALIAS: [],
+        GENE_FIELD_ESSENTIALITY: "Unknown",
+        GENE_FIELD_COG_FUNCATS: [],
+        GENE_FIELD_COG_ID: [],
+        GENE_FIELD_KEGG: [],
+        GENE_FIELD_PFAM: [],
+        GENE_FIELD_INTERPRO: [],
+        GENE_FIELD_AMR: [],
+        GENE_FIELD_FEATURE_TYPE: "gene",
+    }
+    _TSV_JOINED_COLUMNS = {
+        GENE_FIELD_ALIAS,
+        GENE_FIELD_PFAM,
+        GENE_FIELD_INTERPRO,
+        GENE_FIELD_KEGG,
+        GENE_FIELD_COG_ID,
+    }
+
+    @classmethod
+    def format_tsv_row(cls, source: Dict[str, Any]) -> str:
+        """Format one raw `_source` dict as a TSV line (with trailing newline)."""
+        row_data = []
+        for col in cls.TSV_EXPORT_COLUMNS:
+            value = source.get(col, cls._TSV_DEFAULTS.get(col))
+
+            if col in cls._TSV_JOINED_COLUMNS and value:
+                value = "; ".join(value) if isinstance(value, list) else str(value)
+            elif col == GENE_FIELD_AMR and value:
+                # a missing subclass renders as the schema default, "Class(None)"
+                amr_parts = [
+                    f"{item[GENE_FIELD_AMR_DRUG_CLASS]}({item.get(GENE_FIELD_AMR_DRUG_SUBCLASS)})"
+                    for item in value
+                    if isinstance(item, dict) and item.get(GENE_FIELD_AMR_DRUG_CLASS)
+                ]
+                value = "; ".join(amr_parts)
+            else:
+                value = str(value) if value is not None else ""
+
+            # Escape tabs and newlines in the value
+            row_data.append(value.replace("\t", " ").replace("\n", " ").replace("\r", " "))
+
+        return "\t".join(row_data) + "\n"
+
+    async def export_search(
         self,
         isolates: str = None,
         species_acronym: Optional[int] = None,
@@ -1159,8 +1253,8 @@ class GeneService(BaseService[GeneResponseSchema, Dict[str, Any]]):
         filter_operators: Optional[str] = None,
         sort_field: Optional[str] = None,
         sort_order: Optional[str] = SORT_DIRECTION_ASC,
-    ):
-        """Stream genes directly from Elasticsearch scroll API without loading all into memory."""
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """(ES query, sort) of a gene export, for iter_gene_sources / stream_gene_sources."""
         isolate_names_list = [id.strip() for id in isolates.split(",")] if isolates else []
         filter_criteria = {"bool": {"must": []}}
 
@@ -1190,93 +1284,60 @@ class GeneService(BaseService[GeneResponseSchema, Dict[str, Any]]):
             isolate_name=filter_criteria.get("isolate_name"),
             filter_criteria=filter_criteria,
         )
+        return es_query, self._resolve_sort(sort_field, sort_order)
 
-        # Sort configuration
-        order_prefix = "desc" if sort_order == SORT_DIRECTION_DESC else "asc"
-        if sort_field == GENE_SORT_FIELD_STRAIN:
-            sort_field = GENOME_FIELD_ISOLATE_NAME
-
-        sort_by = sort_field or GENE_DEFAULT_SORT_FIELD
-        # Map frontend field names to Elasticsearch field names
-        if sort_by == "start_position":
-            sort_by = "start"
-        elif sort_by == "end_position":
-            sort_by = "end"
-
-        sort_by = (
-            f"{sort_by}.keyword"
-            if sort_by
-            in [
-                GENE_FIELD_NAME,
-                GENE_FIELD_ALIAS,
-                FIELD_SEQ_ID,
-                GENE_FIELD_LOCUS_TAG,
-                GENE_FIELD_PRODUCT,
-            ]
-            else sort_by
-        )
-
+    def iter_gene_sources(
+        self,
+        es_query: Dict[str, Any],
+        sort: List[Dict[str, Any]],
+        source: Optional[List[str]] = None,
+    ):
+        """
+        Matching genes as batches of raw `_source` dicts, read from a
+        point-in-time with search_after (blocking; for WSGI responses). Pass
+        `source` to fetch only the fields the caller needs.
+        """
+        logger.info(f"Starting streaming PIT search with query: {json.dumps(es_query, indent=2)}")
+        total_results = 0
         try:
-            es_client = connections.get_connection()
-            search_body = {
-                "query": es_query,
-                "sort": [{sort_by: {"order": order_prefix}}],
-                "size": SCROLL_BATCH_SIZE,
-            }
-
-            logger.info(
-                f"Starting streaming scroll search with query: {json.dumps(search_body, indent=2)}"
-            )
-
-            # Execute initial search
-            response = await sync_to_async(
-                lambda: es_client.search(
-                    index=self.index_name, body=search_body, scroll=SCROLL_TIMEOUT
-                )
-            )()
-
-            total_results = 0
-            max_results = SCROLL_MAX_RESULTS
-            batch_count = 0
-            scroll_id = response["_scroll_id"]
-
-            # Process all batches
-            while len(response["hits"]["hits"]) > 0 and total_results < max_results:
-                batch_count += 1
-                for hit_data in response["hits"]["hits"]:
-                    # Create a mock hit object that has to_dict() method
-                    class MockHit:
-                        def __init__(self, source):
-                            self._source = source
-
-                        def to_dict(self):
-                            return self._source
-
-                    mock_hit = MockHit(hit_data["_source"])
-                    validated = self._convert_hit_to_gene_schema(mock_hit)
-
-                    total_results += 1
-                    yield validated
-
-                logger.info(f"Streamed {total_results} genes in {batch_count} batches...")
-
-                # Get next batch using scroll
-                try:
-                    response = await sync_to_async(
-                        lambda: es_client.scroll(scroll_id=scroll_id, scroll=SCROLL_TIMEOUT)
-                    )()
-                    scroll_id = response["_scroll_id"]
-                except Exception as scroll_error:
-                    logger.error(f"Error in scroll batch {batch_count}: {scroll_error}")
-                    break
-
-            if total_results >= max_results:
-                logger.warning(
-                    f"Reached maximum result limit of {max_results}. Some results may be truncated."
-                )
-
-            logger.info(f"Streaming completed. Total genes streamed: {total_results}")
+            for batch in iter_pit_batches(
+                index=self.index_name,
+                query=es_query,
+                sort=sort,
+                source=source,
+                batch_size=PIT_BATCH_SIZE,
+                max_results=SCROLL_MAX_RESULTS,
+            ):
+                total_results += len(batch)
+                yield [hit.get("_source", {}) for hit in batch]
+                logger.info(f"Streamed {total_results} genes...")
+        except Exception as e:
+            logger.error(f"Error streaming genes with PIT search: {str(e)}")
+            raise ServiceError(e)
+        logger.info(f"Streaming completed. Total genes streamed: {total_results}")
 
+    async def stream_gene_sources(
+        self,
+        es_query: Dict[str, Any],
+        sort: List[Dict[str, Any]],
+        source: Optional[List[str]] = None,
+    ):
+        """Async counterpart of iter_gene_sources (for ASGI responses)."""
+        logger.info(f"Starting streaming PIT search with query: {json.dumps(es_query, indent=2)}")
+        total_results = 0
+        try:
+            async for batch in aiter_pit_batches(
+                index=self.index_name,
+                query=es_query,
+                sort=sort,
+                source=source,
+                batch_size=PIT_BATCH_SIZE,
+                max_results=SCROLL_MAX_RESULTS,
+            ):
+                total_results += len(batch)
+                yield [hit.get("_source", {}) for hit in batch]
+                logger.info(f"Streamed {total_results} genes...")
         except Exception as e:
-            logger.error(f"Error streaming genes with scroll API: {str(e)}")
+            logger.error(f"Error streaming genes with PIT search: {str(e)}")
             raise ServiceError(e)
+        logger.info(f"Streaming completed. Total genes streamed: {total_results}")
@@ -4,8 +4,9 @@ from typing import List, Optional, Dict, Any
 
 from asgiref.sync import sync_to_async
 from django.db.models import Q
-from elasticsearch_dsl import Search, connections
+from elasticsearch_dsl import Search
 
+from dataportal.elasticsearch.pagination import aiter_pit_batches, fetch_cursor_page
 from dataportal.models import StrainDocument
 from dataportal.schema.core.genome_schemas import (
     GenomePaginationSchema,
@@ -25,11 +26,11 @@ from dataportal.utils.constants import (
     SORT_DIRECTION_ASC,
     SPECIES_FIELD_ACRONYM_SHORT,
     INDEX_STRAINS,
-    SCROLL_BATCH_SIZE,
+    CURSOR_START,
+    PIT_BATCH_SIZE,
     SCROLL_MAX_RESULTS,
-    SCROLL_TIMEOUT,
 )
-from dataportal.utils.exceptions import ServiceError
+from dataportal.utils.exceptions import ServiceError, ValidationError
 from dataportal.utils.species_registry import get_enabled_species_acronyms
 
 logger = logging.getLogger(__name__)
@@ -61,7 +62,10 @@ class GenomeService(BaseService[GenomeResponseSchema, Dict[str, Any]]):
 
     def _convert_hit_to_genome_schema(self, hit) -> GenomeResponseSchema:
         """Convert Elasticsearch hit directly to GenomeResponseSchema (Pydantic)."""
-        hit_dict = hit.to_dict()
+        return self._convert_source_to_genome_schema(hit.to_dict())
+
+    def _convert_source_to_genome_schema(self, hit_dict: Dict[str, Any]) -> GenomeResponseSchema:
+        """Convert a raw `_source` dict to GenomeResponseSchema."""
 
         # Extract contigs with proper structure
         contigs_raw = hit_dict.get("contigs", [])
@@ -202,8 +206,8 @@ class GenomeService(BaseService[GenomeResponseSchema, Dict[str, Any]]):
             return await self._create_pagination_schema([], 0, params.page, params.per_page)
 
         if use_scroll:
-            # Use scroll API for large downloads
-            strains, total_results = await self._fetch_all_strains_with_scroll(
+            # Walk a point-in-time for large downloads
+            strains, total_results = await self._fetch_all_strains(
                 filter_criteria=filter_criteria,
                 sortField=params.sortField,
                 sortOrder=params.sortOrder,
@@ -219,6 +223,7 @@ class GenomeService(BaseService[GenomeResponseSchema, Dict[str, Any]]):
                 sortField=params.sortField,
                 sortOrder=params.sortOrder,
                 error_message="Error searching genomes by string",
+                cursor=params.cursor,
             )
 
     async def search_strains(
@@ -276,6 +281,7 @@ class GenomeService(BaseService[GenomeResponseSchema, Dict[str, Any]]):
             sortField=params.sortField,
             sortOrder=params.sortOrder,
             error_message="Error fetching all genomes",
+            cursor=params.cursor,
         )
 
     async def get_genome_by_strain_name(self, isolate_name: str):
@@ -323,19 +329,24 @@ class GenomeService(BaseService[GenomeResponseSchema, Dict[str, Any]]):
             raise ServiceError(f"{error_message}: {str(e)}")
 
     async def _search_paginated_strains(
-        self, filter_criteria, page, per_page, sortField, sortOrder, error_message
+        self, filter_criteria, page, per_page, sortField, sortOrder, error_message, cursor=None
     ):
         """Search and paginate strains in Elasticsearch."""
         try:
-            strains, total_results = await self._fetch_paginated_strains(
+            strains, total_results, next_cursor = await self._fetch_paginated_strains(
                 filter_criteria,
                 page,
                 per_page,
                 sortField,
                 sortOrder,
                 schema=GenomeResponseSchema,
+                cursor=cursor,
             )
-            return await self._create_pagination_schema(strains, total_results, page, per_page)
+            return await self._create_pagination_schema(
+                strains, total_results, page, per_page, next_cursor, cursor
+            )
+        except ValidationError:
+            raise
         except Exception as e:
             logger.error(f"{error_message}: {e}")
             raise ServiceError(e)
@@ -359,68 +370,93 @@ class GenomeService(BaseService[GenomeResponseSchema, Dict[str, Any]]):
             logger.error(f"{error_message}: {e}", exc_info=True)
             raise ServiceError(e)
 
+    def _build_strain_search(self, filter_criteria, sortField, sortOrder) -> Search:
+        """Build the strain search (filters + sort) shared by paging and exports."""
+        search = Search(index=INDEX_STRAINS)
+
+        # Dynamically apply filters
+        for field, value in filter_criteria.items():
+            if isinstance(value, str):
+                if field == GENOME_FIELD_ISOLATE_NAME:
+                    search = search.query(
+                        "bool",
+                        should=[
+                            {"wildcard": {f"{field}.keyword": f"*{value.lower()}*"}},
+                            {"term": {f"{field}.keyword": value}},
+                        ],
+                        minimum_should_match=1,
+                    )
+                else:
+                    search = search.query("wildcard", **{field: f"*{value}*"})
+            elif isinstance(value, list):
+                search = search.filter("terms", **{field: value})
+            else:
+                search = search.filter("term", **{field: value})
+
+        # Map "species" to its actual field
+        sortField = self._resolve_sort_field(sortField)
+        sort_order = "asc" if sortOrder == SORT_DIRECTION_ASC else "desc"
+        return search.sort({sortField: {"order": sort_order}})
+
     async def _fetch_paginated_strains(
-        self, filter_criteria, page, per_page, sortField, sortOrder, schema
+        self, filter_criteria, page, per_page, sortField, sortOrder, schema, cursor=None
     ):
-        """Fetch paginated strains from Elasticsearch with optimized searching."""
+        """
+        Fetch paginated strains from Elasticsearch. With a cursor the page is read
+        through a point-in-time with search_after; otherwise from/size is used.
+        """
         try:
-            search = Search(index=INDEX_STRAINS)
-
-            # Dynamically apply filters
-            for field, value in filter_criteria.items():
-                if isinstance(value, str):
-                    if field == GENOME_FIELD_ISOLATE_NAME:
-                        search = search.query(
-                            "bool",
-                            should=[
-                                {"wildcard": {f"{field}.keyword": f"*{value.lower()}*"}},
-                                {"term": {f"{field}.keyword": value}},
-                            ],
-                            minimum_should_match=1,
-                        )
-                    else:
-                        search = search.query("wildcard", **{field: f"*{value}*"})
-                elif isinstance(value, list):
-                    search = search.filter("terms", **{field: value})
-                else:
-                    search = search.filter("term", **{field: value})
-
-            # Map "species" to its actual field
-            sortField = self._resolve_sort_field(sortField)
-            sort_order = "asc" if sortOrder == SORT_DIRECTION_ASC else "desc"
-            search = search.sort({sortField: {"order": sort_order}})
+            search = self._build_strain_search(filter_criteria, sortField, sortOrder)
 
-            # Apply pagination
-            search = search[(page - 1) * per_page : page * per_page]
+            if cursor:
+                response, total_results, next_cursor = await sync_to_async(
+                    fetch_cursor_page, thread_sensitive=False
+                )(INDEX_STRAINS, search, per_page, cursor)
+            else:
+                # Apply pagination
+                search = search[(page - 1) * per_page : page * per_page]
 
-            # logger.info(f"Final Elasticsearch Query: {json.dumps(search.to_dict(), indent=2)}")
+                # logger.info(f"Final Elasticsearch Query: {json.dumps(search.to_dict(), indent=2)}")
 
-            response = await sync_to_async(search.execute)()
-            total_results = (
-                response.hits.total.value
-                if hasattr(response.hits.total, "value")
-                else len(response)
-            )
+                response = await sync_to_async(search.execute)()
+                total_results = (
+                    response.hits.total.value
+                    if hasattr(response.hits.total, "value")
+                    else len(response)
+                )
+                next_cursor = None
 
             results = []
             for hit in response:
                 results.append(self._convert_hit_to_genome_schema(hit))
 
-            return results, total_results
+            return results, total_results, next_cursor
 
+        except ValidationError:
+            raise
         except Exception as e:
             logger.error(f"Error fetching paginated strains: {e}", exc_info=True)
             raise ServiceError(f"Error fetching paginated strains: {str(e)}")
 
-    async def _create_pagination_schema(self, strains, total_results, page, per_page):
+    async def _create_pagination_schema(
+        self, strains, total_results, page, per_page, next_cursor=None, cursor=None
+    ):
         """Create pagination schema for search results."""
+        if cursor:
+            # Cursor mode: position is defined by the cursor, not the page number
+            has_previous = cursor != CURSOR_START
+            has_next = next_cursor is not None
+        else:
+            has_previous = page > 1
+            has_next = (page * per_page) < total_results
         return GenomePaginationSchema(
             results=strains,
             page_number=page,
-            num_pages=(total_results + per_page - 1) // per_page,
-            has_previous=page > 1,
-            has_next=(page * per_page) < total_results,
+            num_pages=(total_results + per_page - 1) // per_page if per_page else 0,
+            has_previous=has_previous,
+            has_next=has_next,
             total_results=total_results,
+            next_cursor=next_cursor,
         )
 
     def _resolve_sort_field(self, field: str) -> str:
@@ -470,92 +506,30 @@ class GenomeService(BaseService[GenomeResponseSchema, Dict[str, Any]]):
 
         return header + "\n" + "\n".join(rows)
 
-    async def _fetch_all_strains_with_scroll(self, filter_criteria, sortField, sortOrder, schema):
-        """Fetch all strains using Elasticsearch scroll API for large downloads."""
+    async def _fetch_all_strains(self, filter_criteria, sortField, sortOrder, schema):
+        """Fetch all strains for large downloads by walking a point-in-time with search_after."""
         try:
-            es_client = connections.get_connection()
-            search_body = {"query": {"bool": {"must": []}}, "size": SCROLL_BATCH_SIZE}
+            body = self._build_strain_search(filter_criteria, sortField, sortOrder).to_dict()
+            query = body.get("query", {"match_all": {}})
 
-            # Dynamically apply filters
-            for field, value in filter_criteria.items():
-                if isinstance(value, str):
-                    if field == GENOME_FIELD_ISOLATE_NAME:
-                        search_body["query"]["bool"]["must"].append(
-                            {
-                                "bool": {
-                                    "should": [
-                                        {"wildcard": {f"{field}.keyword": f"*{value.lower()}*"}},
-                                        {"term": {f"{field}.keyword": value}},
-                                    ],
-                                    "minimum_should_match": 1,
-                                }
-                            }
-                        )
-                    else:
-                        search_body["query"]["bool"]["must"].append(
-                            {"wildcard": {field: f"*{value}*"}}
-                        )
-                elif isinstance(value, list):
-                    search_body["query"]["bool"]["must"].append({"terms": {field: value}})
-                else:
-                    search_body["query"]["bool"]["must"].append({"term": {field: value}})
-
-            # Map "species" to its actual field
-            sortField = self._resolve_sort_field(sortField)
-            sort_order = "asc" if sortOrder == SORT_DIRECTION_ASC else "desc"
-            search_body["sort"] = [{sortField: {"order": sort_order}}]
-
-            logger.info(f"Starting scroll search with query: {json.dumps(search_body, indent=2)}")
-
-            # Execute initial search
-            response = await sync_to_async(
-                lambda: es_client.search(
-                    index=INDEX_STRAINS, body=search_body, scroll=SCROLL_TIMEOUT
-                )
-            )()
+            logger.info(f"Starting PIT search with query: {json.dumps(body, indent=2)}")
 
             results = []
-            total_results = 0
-            max_results = SCROLL_MAX_RESULTS
-            batch_count = 0
-            scroll_id = response["_scroll_id"]
-
-            # Process all batches
-            while len(response["hits"]["hits"]) > 0 and total_results < max_results:
-                batch_count += 1
-                for hit_data in response["hits"]["hits"]:
-                    # Create a mock hit object that has to_dict() method
-                    class MockHit:
-                        def __init__(self, source):
-                            self._source = source
-
-                        def to_dict(self):
-                            return self._source
-
-                    mock_hit = MockHit(hit_data["_source"])
-                    results.append(self._convert_hit_to_genome_schema(mock_hit))
-
-                total_results += len(response["hits"]["hits"])
-                logger.info(f"Fetched {total_results} strains in {batch_count} batches...")
-
-                # Get next batch using scroll
-                try:
-                    response = await sync_to_async(
-                        lambda: es_client.scroll(scroll_id=scroll_id, scroll=SCROLL_TIMEOUT)
-                    )()
-                    scroll_id = response["_scroll_id"]
-                except Exception as scroll_error:
-                    logger.error(f"Error in scroll batch {batch_count}: {scroll_error}")
-                    break
-
-            if total_results >= max_results:
-                logger.warning(
-                    f"Reached maximum result limit of {max_results}. Some results may be truncated."
+            async for batch in aiter_pit_batches(
+                index=INDEX_STRAINS,
+                query=query,
+                sort=body["sort"],
+                batch_size=PIT_BATCH_SIZE,
+                max_results=SCROLL_MAX_RESULTS,
+            ):
+                results.extend(
+                    self._convert_source_to_genome_schema(hit["_source"]) for hit in batch
                 )
+                logger.info(f"Fetched {len(results)} strains...")
 
-            logger.info(f"Scroll search completed. Total strains fetched: {total_results}")
-            return results, total_results
+            logger.info(f"PIT search completed. Total strains fetched: {len(results)}")
+            return results, len(results)
 
         except Exception as e:
-            logger.error(f"Error fetching strains with scroll API: {e}", exc_info=True)
-            raise ServiceError(f"Error fetching strains with scroll API: {str(e)}")
+            logger.error(f"Error fetching strains with PIT search: {e}", exc_info=True)
+            raise ServiceError(f"Error fetching strains: {str(e)}")
@@ -0,0 +1,399 @@
+"""
+In-memory strain x drug matrices for the drug MIC and metabolism endpoints.
+
+The whole drug data set is a few hundred strains x a few dozen drugs, so it is
+loaded once from the strain index and kept as dense NumPy arrays of shape
+(strains, drugs, K), K being the largest number of measurements any strain has
+for one drug (several experimental conditions). Unused slots are masked out by
+`present`. Numeric measurements are float arrays (NaN when missing), the
+categorical fields are int codes into a per-field vocabulary (code 0 = None).
+
+Queries build a boolean mask by broadcasting per-strain, per-drug and
+per-record masks and only turn the requested page into dicts. Drug names (and
+classes) are compared after normalize_name, the same folding as the
+`.normalized` subfields of the strain mapping.
+
+DrugMatrixStore reloads the matrices when the strain index changes (checked at
+most every INDEX_VERSION_TTL seconds).
+"""
+
+import logging
+import re
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from elasticsearch_dsl import Search
+
+from dataportal.elasticsearch.indexing import index_signature
+
+logger = logging.getLogger(__name__)
+
+STRAIN_FIELDS = ("isolate_name", "species_acronym", "species_scientific_name")
+SORT_FIELDS = STRAIN_FIELDS
+
+COMMON_CATEGORICAL = (
+    "drug_class",
+    "drug_subclass",
+    "compound_name",
+    "pubchem_id",
+    "experimental_condition_id",
+    "experimental_condition_name",
+)
+
+# categorical fields matched like their `.normalized` subfield (see normalize_name)
+NORMALIZED_FIELDS = ("drug_class",)
+
+KINDS = {
+    "mic": {
+        "path": "drug_mic",
+        "numeric": ("mic_value",),
+        "categorical": COMMON_CATEGORICAL + ("relation", "unit"),
+    },
+    "metabolism": {
+        "path": "drug_metabolism",
+        "numeric": ("degr_percent", "pval", "fdr"),
+        "categorical": COMMON_CATEGORICAL + ("metabolizer_classification", "is_significant"),
+    },
+}
+
+
+_SEPARATORS = re.compile(r"[\W_]+")
+
+
+def _lower(value: Any) -> Any:
+    return value.lower() if isinstance(value, str) else value
+
+
+def normalize_name(value: str) -> str:
+    """Same folding as the `.normalized` drug name subfield: lowercase, no accents, no separators."""
+    folded = unicodedata.normalize("NFKD", value)
+    folded = "".join(c for c in folded if not unicodedata.combining(c))
+    return _SEPARATORS.sub("", folded.lower())
+
+
+class DrugMatrix:
+    """Dense (strain, drug, K) store for one kind of drug data ("mic" or "metabolism")."""
+
+    def __init__(self, kind: str, strains: Iterable[Dict[str, Any]]):
+        spec = KINDS[kind]
+        self.kind = kind
+        self.numeric_fields: Tuple[str, ...] = spec["numeric"]
+        self.categorical_fields: Tuple[str, ...] = spec["categorical"]
+
+        strains = sorted(
+            (s for s in strains if s.get(spec["path"])),
+            key=lambda s: (s.get("isolate_name") or "").lower(),
+        )
+        self.strains = {
+            f: np.array([s.get(f) for s in strains], dtype=object) for f in STRAIN_FIELDS
+        }
+        self._species_lc = np.array(
+            [_lower(s.get("species_acronym")) for s in strains], dtype=object
+        )
+
+        names = sorted(
+            {r["drug_name"] for s in strains for r in s[spec["path"]] if r.get("drug_name")}
+        )
+        self.drug_names = np.array(names, dtype=object)
+        self._drug_names_norm = [normalize_name(n) for n in names]
+        self._drug_words = [[normalize_name(w) for w in n.lower().split()] for n in names]
+        drug_index = {n: i for i, n in enumerate(names)}
+
+        # group records per (strain, drug) to size the K axis
+        cells: Dict[Tuple[int, int], List[Dict[str, Any]]] = {}
+        for s, strain in enumerate(strains):
+            for record in strain[spec["path"]]:
+                d = drug_index.get(record.get("drug_name"))
+                if d is not None:
+                    cells.setdefault((s, d), []).append(record)
+        depth = max((len(v) for v in cells.values()), default=1)
+        shape = (len(strains), len(names), depth)
+
+        self.present = np.zeros(shape, dtype=bool)
+        self.numeric = {f: np.full(shape, np.nan) for f in self.numeric_fields}
+        self.codes = {f: np.zeros(shape, dtype=np.int32) for f in self.categorical_fields}
+        self.vocab: Dict[str, List[Any]] = {f: [None] for f in self.categorical_fields}
+        lookup: Dict[str, Dict[Any, int]] = {f: {} for f in self.categorical_fields}
+
+        for (s, d), records in cells.items():
+            for k, record in enumerate(records):
+                self.present[s, d, k] = True
+                for f in self.numeric_fields:
+                    value = record.get(f)
+                    if value is not None:
+                        self.numeric[f][s, d, k] = value
+                for f in self.categorical_fields:
+                    value = record.get(f)
+                    if value is None:
+                        continue
+                    code = lookup[f].get(value)
+                    if code is None:
+                        code = lookup[f][value] = len(self.vocab[f])
+                        self.vocab[f].append(value)
+                    self.codes[f][s, d, k] = code
+
+        # first drug class seen per drug, for suggestions
+        self.drug_classes: List[Optional[str]] = [None] * len(names)
+        for (s, d), records in cells.items():
+            if self.drug_classes[d] is None:
+                self.drug_classes[d] = next(
+                    (r["drug_class"] for r in records if r.get("drug_class")), None
+                )
+        # strains with at least one record per drug
+        self._records = self.present.sum(axis=2)
+
+        # rank of every strain per sortable field, for ordering selections
+        self._ranks = {}
+        for f in SORT_FIELDS:
+            keys = np.array([_lower(v) or "" for v in self.strains[f]], dtype=object)
+            self._ranks[f] = np.argsort(np.argsort(keys, kind="stable"), kind="stable")
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self.present.shape
+
+    # ---------- Masks ----------
+
+    def drug_mask(self, name: str, partial: bool = False) -> np.ndarray:
+        """(D,) mask of drugs equal to `name`, or overlapping it when `partial` (compared via normalize_name)."""
+        q = normalize_name(name)
+        if partial:
+            return np.array(
+                [bool(n) and (q in n or n in q) for n in self._drug_names_norm], dtype=bool
+            )
+        return np.array([n == q for n in self._drug_names_norm], dtype=bool)
+
+    def species_mask(self, species_acronym: str) -> np.ndarray:
+        """(S,) mask of strains of one species (case-insensitive, like the keyword normalizer)."""
+        return self._species_lc == species_acronym.lower()
+
+    def category_mask(self, field: str, value: Any) -> np.ndarray:
+        """(S, D, K) mask of records whose categorical `field` equals `value` (strings
+        case-insensitive, or via normalize_name for NORMALIZED_FIELDS, as in ES)."""
+        fold = normalize_name if field in NORMALIZED_FIELDS else _lower
+        wanted = fold(value) if isinstance(value, str) else value
+        hits = np.array(
+            [
+                v is not None and (fold(v) if isinstance(v, str) else v) == wanted
+                for v in self.vocab[field]
+            ],
+            dtype=bool,
+        )
+        return hits[self.codes[field]]
+
+    def range_mask(
+        self,
+        field: str,
+        gte: Optional[float] = None,
+        lte: Optional[float] = None,
+        missing_low: float = np.nan,
+        missing_high: float = np.nan,
+    ) -> np.ndarray:
+        """(S, D, K) mask of records within [gte, lte]. A missing value fails the
+        bound (as in an ES range query) unless `missing_low` / `missing_high`
+        give it a value to compare against `gte` / `lte`."""
+        values = self.numeric[field]
+        mask = np.ones(values.shape, dtype=bool)
+        missing = np.isnan(values)
+        if gte is not None:
+            mask &= np.where(missing, missing_low, values) >= gte
+        if lte is not None:
+            mask &= np.where(missing, missing_high, values) <= lte
+        return mask
+
+    def select(
+        self,
+        drug_mask: Optional[np.ndarray] = None,
+        strain_mask: Optional[np.ndarray] = None,
+        record_masks: Iterable[np.ndarray] = (),
+    ) -> np.ndarray:
+        """Combine (D,), (S,) and (S, D, K) masks into the (S, D, K) selection."""
+        mask = self.present.copy()
+        if drug_mask is not None:
+            mask &= drug_mask[None, :, None]
+        if strain_mask is not None:
+            mask &= strain_mask[:, None, None]
+        for m in record_masks:
+            mask &= m
+        return mask
+
+    # ---------- Results ----------
+
+    def suggest(
+        self, text: str, species_acronym: Optional[str] = None, limit: int = 10
+    ) -> List[Tuple[str, Optional[str], int]]:
+        """
+        (drug_name, drug_class, record count) of drugs matching `text`: names
+        starting with it first, then names with a word starting with it, then
+        names containing it; most records first within each group.
+        """
+        q = normalize_name(text)
+        records = self._records
+        if species_acronym:
+            records = records[self.species_mask(species_acronym)]
+        counts = records.sum(axis=0)
+        matches = []
+        for d, name in enumerate(self._drug_names_norm):
+            if not counts[d]:
+                continue
+            if name.startswith(q):
+                group = 0
+            elif any(w.startswith(q) for w in self._drug_words[d]):
+                group = 1
+            elif q in name:
+                group = 2
+            else:
+                continue
+            matches.append((group, -int(counts[d]), self.drug_names[d], d))
+        matches.sort()
+        return [(name, self.drug_classes[d], -neg) for _, neg, name, d in matches[:limit]]
+
+    def ordered(
+        self, mask: np.ndarray, sort_by: Optional[str] = None, sort_order: str = "asc"
+    ) -> Tuple[np.ndarray, ...]:
+        """
+        (strain, drug, slot) index arrays of the selected records, ordered by
+        `sort_by` (a strain field; default isolate_name), then drug name, then slot.
+        """
+        s, d, k = np.nonzero(mask)
+        if sort_by in SORT_FIELDS and (sort_by != "isolate_name" or sort_order == "desc"):
+            key = self._ranks[sort_by][s]
+            if sort_order == "desc":
+                key = -key
+            order = np.lexsort((np.arange(len(s)), key))
+            s, d, k = s[order], d[order], k[order]
+        return s, d, k
+
+    def records(self, s: np.ndarray, d: np.ndarray, k: np.ndarray) -> List[Dict[str, Any]]:
+        """Materialise the given records as flat dicts (strain fields + drug_name + measurement fields)."""
+        out = []
+        numeric = {f: self.numeric[f][s, d, k] for f in self.numeric_fields}
+        codes = {f: self.codes[f][s, d, k] for f in self.categorical_fields}
+        for i in range(len(s)):
+            row = {f: self.strains[f][s[i]] for f in STRAIN_FIELDS}
+            row["drug_name"] = self.drug_names[d[i]]
+            for f, values in numeric.items():
+                value = values[i]
+                row[f] = None if np.isnan(value) else float(value)
+            for f, values in codes.items():
+                row[f] = self.vocab[f][values[i]]
+            out.append(row)
+        return out
+
+    def page(
+        self,
+        mask: np.ndarray,
+        page: int = 1,
+        per_page: Optional[int] = None,
+        sort_by: Optional[str] = None,
+        sort_order: str = "asc",
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """One page of the selection as dicts, plus the total number of selected records."""
+        s, d, k = self.ordered(mask, sort_by, sort_order)
+        total = len(s)
+        if per_page is not None:
+            start = (max(page, 1) - 1) * per_page
+            s, d, k = (
+                s[start : start + per_page],
+                d[start : start + per_page],
+                k[start : start + per_page],
+            )
+        return self.records(s, d, k), total
+
+
+class DrugMatrixStore:
+    """
+    Loads and caches the DrugMatrix of each kind from the strain index.
+
+    The index signature (concrete index, uuid, doc and indexing counters) is
+    re-read at most every `ttl` seconds; when it differs from the one the
+    matrices were built from they are rebuilt on the next access.
+    """
+
+    def __init__(self, index_name: str, ttl: Optional[int] = None):
+        self.index_name = index_name
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._matrices: Dict[str, DrugMatrix] = {}
+        self._signature: Optional[tuple] = None
+        self._checked_at = 0.0
+
+    @property
+    def ttl(self) -> int:
+        if self._ttl is None:
+            from django.conf import settings
+
+            return getattr(settings, "INDEX_VERSION_TTL", 60)
+        return self._ttl
+
+    def _index_signature(self) -> tuple:
+        return index_signature(self.index_name)
+
+    def _load_strains(self) -> List[Dict[str, Any]]:
+        fields = list(STRAIN_FIELDS) + [spec["path"] for spec in KINDS.values()]
+        search = Search(index=self.index_name).source(fields).params(size=500)
+        return [hit.to_dict() for hit in search.scan()]
+
+    def load(
+        self, strains: Optional[Iterable[Dict[str, Any]]] = None, signature: Optional[tuple] = None
+    ) -> None:
+        """Build the matrices from `strains` (default: scan the strain index)."""
+        started = time.perf_counter()
+        if strains is None:
+            signature = self._index_signature()
+            strains = self._load_strains()
+        strains = list(strains)
+        matrices = {kind: DrugMatrix(kind, strains) for kind in KINDS}
+        self._matrices = matrices
+        self._signature = signature
+        self._checked_at = time.monotonic()
+        logger.info(
+            f"Loaded drug matrices from {self.index_name} in {(time.perf_counter() - started) * 1000:.0f} ms: "
+            + ", ".join(f"{kind}={m.shape}" for kind, m in matrices.items())
+        )
+
+    def get(self, kind: str) -> DrugMatrix:
+        """The matrix of `kind`, (re)loading it first if missing or stale."""
+        now = time.monotonic()
+        if self._matrices and now - self._checked_at < self.ttl:
+            return self._matrices[kind]
+        with self._lock:
+            if self._matrices and time.monotonic() - self._checked_at < self.ttl:
+                return self._matrices[kind]
+            if not self._matrices:
+                self.load()
+            else:
+                try:
+                    signature = self._index_signature()
+                except Exception as e:
+                    # keep serving the loaded data; try again after the next TTL
+                    logger.warning(f"Could not check {self.index_name} for changes: {e}")
+                    signature = self._signature
+                if signature != self._signature:
+                    self.load()
+                else:
+                    self._checked_at = time.monotonic()
+            return self._matrices[kind]
+
+    def reset(self) -> None:
+        """Drop the loaded matrices; the next access reloads them."""
+        with self._lock:
+            self._matrices = {}
+            self._signature = None
+            self._checked_at = 0.0
+
+    def preload(self) -> threading.Thread:
+        """Load in a background thread (e.g. at startup) so the first request does not pay for it."""
+
+        def _run():
+            try:
+                self.get("mic")
+            except Exception as e:
+                logger.warning(f"Drug matrix preload failed: {e}")
+
+        thread = threading.Thread(target=_run, name="drug-matrix-preload", daemon=True)
+        thread.start()
+        return thread
@@ -5,6 +5,7 @@ Service for handling drug MIC and metabolism data operations.
 import logging
 from typing import List, Optional, Dict, Any
 
+from asgiref.sync import sync_to_async
 from elasticsearch_dsl import Q
 
 from dataportal.schema.experimental.drug_schemas import (
@@ -26,18 +27,43 @@ from dataportal.schema.experimental.drug_schemas import (
     PaginatedStrainDrugDataResponseSchema,
 )
 from dataportal.services.base_service import BaseService
+from dataportal.services.experimental.drug_matrix import DrugMatrix, DrugMatrixStore, normalize_name
 from dataportal.utils.decorators import log_execution_time
 from dataportal.utils.constants import INDEX_STRAINS
 from dataportal.utils.exceptions import ServiceError
 
 logger = logging.getLogger(__name__)
 
+# strain x drug matrices shared by all DrugService instances (see drug_matrix.py)
+drug_matrices = DrugMatrixStore(INDEX_STRAINS)
+
+
+def _paginate(schema, results, total_results: int, page: int, per_page: int):
+    total_pages = (total_results + per_page - 1) // per_page if total_results > 0 else 1
+    return schema(
+        results=results,
+        page_number=page,
+        num_pages=total_pages,
+        has_previous=page > 1,
+        has_next=page < total_pages,
+        total_results=total_results,
+    )
+
 
 class DrugService(BaseService[StrainDrugMICResponseSchema, Dict[str, Any]]):
     """Service for managing drug data operations."""
 
-    def __init__(self):
+    def __init__(self, matrices: Optional[DrugMatrixStore] = None):
         super().__init__(INDEX_STRAINS)
+        self.matrices = matrices or drug_matrices
+
+    async def _matrix(self, kind: str) -> DrugMatrix:
+        """The in-memory strain x drug matrix of `kind` ("mic" or "metabolism")."""
+        try:
+            return await sync_to_async(self.matrices.get)(kind)
+        except Exception as e:
+            logger.error(f"Error loading drug {kind} matrix: {e}")
+            raise ServiceError(f"Failed to load drug {kind} data: {str(e)}")
 
     async def get_by_id(self, id: str) -> Optional[StrainDrugMICResponseSchema]:
         """Retrieve drug data for a specific strain by isolate name."""
@@ -323,7 +349,13 @@ class DrugService(BaseService[StrainDrugMICResponseSchema, Dict[str, Any]]):
 
     @log_execution_time
     async def search_drug_mic(self, query: DrugMICSearchQuerySchema) -> Dict[str, Any]:
-        """Search drug MIC data across strains."""
+        """Search drug MIC data across strains.
+
+        Structured filters are served from the in-memory matrix; free-text
+        `query` searches still go to Elasticsearch.
+        """
+        if not query.query:
+            return await self._search_drug_mic_matrix(query)
         try:
             search = self._create_search()
 
@@ -334,25 +366,24 @@ class DrugService(BaseService[StrainDrugMICResponseSchema, Dict[str, Any]]):
             nested_queries = []
 
             if query.drug_name:
-                # Use fuzzy search for drug names
+                # Exact (normalized) or prefix (edge n-gram) drug name matches
                 drug_query = Q(
                     "bool",
                     should=[
-                        Q("term", drug_mic__drug_name__keyword=query.drug_name.lower()),
+                        Q("term", drug_mic__drug_name__normalized=query.drug_name),
                         Q(
-                            "fuzzy",
-                            drug_mic__drug_name__keyword={
-                                "value": query.drug_name.lower(),
-                                "fuzziness": "AUTO",
+                            "match",
+                            drug_mic__drug_name__ngram={
+                                "query": query.drug_name,
+                                "operator": "and",
                             },
                         ),
-                        Q("wildcard", drug_mic__drug_name__keyword=f"*{query.drug_name.lower()}*"),
                     ],
                 )
                 nested_queries.append(drug_query)
 
             if query.drug_class:
-                nested_queries.append(Q("term", drug_mic__drug_class__keyword=query.drug_class))
+                nested_queries.append(Q("term", drug_mic__drug_class__normalized=query.drug_class))
 
             if query.unit:
                 nested_queries.append(Q("term", drug_mic__unit__keyword=query.unit))
@@ -403,7 +434,12 @@ class DrugService(BaseService[StrainDrugMICResponseSchema, Dict[str, Any]]):
                     query=Q(
                         "multi_match",
                         query=query.query,
-                        fields=["drug_mic.drug_name^2", "drug_mic.drug_class"],
+                        fields=[
+                            "drug_mic.drug_name^2",
+                            "drug_mic.drug_name.ngram",
+                            "drug_mic.drug_class",
+                            "drug_mic.drug_class.ngram",
+                        ],
                     ),
                 )
                 main_queries.append(text_nested_query)
@@ -452,9 +488,13 @@ class DrugService(BaseService[StrainDrugMICResponseSchema, Dict[str, Any]]):
                 # Extract drug MIC data for each strain
                 for mic_data in source.get("drug_mic", []):
                     # Apply additional filters to individual MIC records
-                    if query.drug_name and mic_data.get("drug_name") != query.drug_name:
+                    if query.drug_name and normalize_name(
+                        mic_data.get("drug_name") or ""
+                    ) != normalize_name(query.drug_name):
                         continue
-                    if query.drug_class and mic_data.get("drug_class") != query.drug_class:
+                    if query.drug_class and normalize_name(
+                        mic_data.get("drug_class") or ""
+                    ) != normalize_name(query.drug_class):
                         continue
                     if query.unit and mic_data.get("unit") != query.unit:
                         continue
@@ -509,7 +549,13 @@ class DrugService(BaseService[StrainDrugMICResponseSchema, Dict[str, Any]]):
     async def search_drug_metabolism(
         self, query: DrugMetabolismSearchQuerySchema
     ) -> Dict[str, Any]:
-        """Search drug metabolism data across strains."""
+        """Search drug metabolism data across strains.
+
+        Structured filters are served from the in-memory matrix; free-text
+        `query` searches still go to Elasticsearch.
+        """
+        if not query.query:
+            return await self._search_drug_metabolism_matrix(query)
         try:
             search = self._create_search()
 
@@ -520,29 +566,25 @@ class DrugService(BaseService[StrainDrugMICResponseSchema, Dict[str, Any]]):
             nested_queries = []
 
             if query.drug_name:
-                # Use fuzzy search for drug names
+                # Exact (normalized) or prefix (edge n-gram) drug name matches
                 drug_query = Q(
                     "bool",
                     should=[
-                        Q("term", drug_metabolism__drug_name__keyword=query.drug_name.lower()),
+                        Q("term", drug_metabolism__drug_name__normalized=query.drug_name),
                         Q(
-                            "fuzzy",
-                            drug_metabolism__drug_name__keyword={
-                                "value": query.drug_name.lower(),
-                                "fuzziness": "AUTO",
+                            "match",
+                            drug_metabolism__drug_name__ngram={
+                                "query": query.drug_name,
+                                "operator": "and",
                             },
                         ),
-                        Q(
-                            "wildcard",
-                            drug_metabolism__drug_name__keyword=f"*{query.drug_name.lower()}*",
-                        ),
                     ],
                 )
                 nested_queries.append(drug_query)
 
             if query.drug_class:
                 nested_queries.append(
-                    Q("term", drug_metabolism__drug_class__keyword=query.drug_class)
+                    Q("term", drug_metabolism__drug_class__normalized=query.drug_class)
                 )
 
             if query.metabolizer_classification:
@@ -593,7 +635,12 @@ class DrugService(BaseService[StrainDrugMICResponseSchema, Dict[str, Any]]):
                     query=Q(
                         "multi_match",
                         query=query.query,
-                        fields=["drug_metabolism.drug_name^2", "drug_metabolism.drug_class"],
+                        fields=[
+                            "drug_metabolism.drug_name^2",
+                            "drug_metabolism.drug_name.ngram",
+                            "drug_metabolism.drug_class",
+                            "drug_metabolism.drug_class.ngram",
+                        ],
                     ),
                 )
                 main_queries.append(text_nested_query)
@@ -642,9 +689,13 @@ class DrugService(BaseService[StrainDrugMICResponseSchema, Dict[str, Any]]):
                 # Extract drug metabolism data for each strain
                 for metab_data in source.get("drug_metabolism", []):
                     # Apply additional filters to individual metabolism records
-                    if query.drug_name and metab_data.get("drug_name") != query.drug_name:
+                    if query.drug_name and normalize_name(
+                        metab_data.get("drug_name") or ""
+                    ) != normalize_name(query.drug_name):
                         continue
-                    if query.drug_class and metab_data.get("drug_class") != query.drug_class:
+                    if query.drug_class and normalize_name(
+                        metab_data.get("drug_class") or ""
+                    ) != normalize_name(query.drug_class):
                         continue
                     if (
                         query.metabolizer_classification
@@ -705,73 +756,153 @@ class DrugService(BaseService[StrainDrugMICResponseSchema, Dict[str, Any]]):
             logger.error(f"Error searching drug metabolism data: {e}")
             raise ServiceError(f"Failed to search drug metabolism data: {str(e)}")
 
-    @log_execution_time
-    async def get_drug_mic_by_drug(
-        self, drug_name: str, species_acronym: Optional[str] = None
-    ) -> List[DrugMICSearchResultSchema]:
-        """Get all MIC data for a specific drug."""
+    async def _search_drug_mic_matrix(
+        self, query: DrugMICSearchQuerySchema
+    ) -> DrugMICPaginationSchema:
         try:
-            search = self._create_search()
-
-            # Build the main query
-            main_queries = []
-
-            # Use fuzzy search for drug names to handle partial matches and typos
-            drug_query = Q(
-                "bool",
-                should=[
-                    Q("term", drug_mic__drug_name__keyword=drug_name.lower()),
-                    Q(
-                        "fuzzy",
-                        drug_mic__drug_name__keyword={
-                            "value": drug_name.lower(),
-                            "fuzziness": "AUTO",
-                        },
-                    ),
-                    Q("wildcard", drug_mic__drug_name__keyword=f"*{drug_name.lower()}*"),
-                ],
+            matrix = await self._matrix("mic")
+            record_masks = []
+            if query.drug_class:
+                record_masks.append(matrix.category_mask("drug_class", query.drug_class))
+            for field, value in (
+                ("unit", query.unit),
+                ("experimental_condition_name", query.experimental_condition),
+            ):
+                if value:
+                    record_masks.append(matrix.category_mask(field, value))
+            if query.min_mic_value is not None or query.max_mic_value is not None:
+                record_masks.append(
+                    matrix.range_mask("mic_value", gte=query.min_mic_value, lte=query.max_mic_value)
+                )
+            mask = matrix.select(
+                drug_mask=matrix.drug_mask(query.drug_name) if query.drug_name else None,
+                strain_mask=(
+                    matrix.species_mask(query.species_acronym) if query.species_acronym else None
+                ),
+                record_masks=record_masks,
             )
-            main_queries.append(Q("nested", path="drug_mic", query=drug_query))
-
-            if species_acronym:
-                main_queries.append(Q("term", species_acronym=species_acronym.lower()))
-
-            search = search.query(Q("bool", must=main_queries))
+            rows, total = matrix.page(
+                mask, query.page, query.per_page, query.sort_by, query.sort_order
+            )
+            return _paginate(
+                DrugMICPaginationSchema,
+                [self._mic_result(row) for row in rows],
+                total,
+                query.page,
+                query.per_page,
+            )
+        except ServiceError:
+            raise
+        except Exception as e:
+            logger.error(f"Error searching drug MIC data: {e}")
+            raise ServiceError(f"Failed to search drug MIC data: {str(e)}")
 
-            # Debug: Log the actual Elasticsearch query
-            logger.info(
-                f"Elasticsearch query for drug MIC by drug '{drug_name}' with species '{species_acronym}': {search.to_dict()}"
+    async def _search_drug_metabolism_matrix(
+        self, query: DrugMetabolismSearchQuerySchema
+    ) -> DrugMetabolismPaginationSchema:
+        try:
+            matrix = await self._matrix("metabolism")
+            record_masks = []
+            if query.drug_class:
+                record_masks.append(matrix.category_mask("drug_class", query.drug_class))
+            for field, value in (
+                ("metabolizer_classification", query.metabolizer_classification),
+                ("experimental_condition_name", query.experimental_condition),
+            ):
+                if value:
+                    record_masks.append(matrix.category_mask(field, value))
+            if query.is_significant is not None:
+                record_masks.append(matrix.category_mask("is_significant", query.is_significant))
+            if query.min_fdr is not None:
+                # min_fdr is an upper bound; records without an FDR count as 1.0
+                record_masks.append(matrix.range_mask("fdr", lte=query.min_fdr, missing_high=1.0))
+            if query.min_degr_percent is not None:
+                record_masks.append(
+                    matrix.range_mask("degr_percent", gte=query.min_degr_percent, missing_low=0.0)
+                )
+            mask = matrix.select(
+                drug_mask=matrix.drug_mask(query.drug_name) if query.drug_name else None,
+                strain_mask=(
+                    matrix.species_mask(query.species_acronym) if query.species_acronym else None
+                ),
+                record_masks=record_masks,
+            )
+            rows, total = matrix.page(
+                mask, query.page, query.per_page, query.sort_by, query.sort_order
             )
+            return _paginate(
+                DrugMetabolismPaginationSchema,
+                [self._metabolism_result(row) for row in rows],
+                total,
+                query.page,
+                query.per_page,
+            )
+        except ServiceError:
+            raise
+        except Exception as e:
+            logger.error(f"Error searching drug metabolism data: {e}")
+            raise ServiceError(f"Failed to search drug metabolism data: {str(e)}")
 
-            # Scan all matching documents to avoid default size limits
-            response_hits = await self._scan_search(search)
+    @staticmethod
+    def _mic_result(row: Dict[str, Any]) -> DrugMICSearchResultSchema:
+        return DrugMICSearchResultSchema(**{**row, "isolate_name": row.get("isolate_name") or ""})
 
-            results = []
-            for hit in response_hits:
-                source = hit.to_dict()
-                for mic_data in source.get("drug_mic", []):
-                    # Check if the drug name matches (case-insensitive partial match)
-                    drug_name_lower = drug_name.lower()
-                    actual_drug_name = mic_data.get("drug_name", "").lower()
-                    if drug_name_lower in actual_drug_name or actual_drug_name in drug_name_lower:
-                        results.append(
-                            DrugMICSearchResultSchema(
-                                isolate_name=source.get("isolate_name", ""),
-                                species_acronym=source.get("species_acronym"),
-                                species_scientific_name=source.get("species_scientific_name"),
-                                drug_name=mic_data.get("drug_name"),
-                                drug_class=mic_data.get("drug_class"),
-                                mic_value=mic_data.get("mic_value"),
-                                unit=mic_data.get("unit"),
-                                relation=mic_data.get("relation"),
-                                experimental_condition_name=mic_data.get(
-                                    "experimental_condition_name"
-                                ),
-                            )
-                        )
+    @staticmethod
+    def _metabolism_result(row: Dict[str, Any]) -> DrugMetabolismSearchResultSchema:
+        return DrugMetabolismSearchResultSchema(
+            **{**row, "isolate_name": row.get("isolate_name") or ""}
+        )
 
-            return results
+    async def _by_drug(
+        self,
+        kind: str,
+        drug_name: str,
+        species_acronym: Optional[str],
+        page: int = 1,
+        per_page: Optional[int] = None,
+    ):
+        """Records of every drug whose name contains, or is contained in, `drug_name`."""
+        matrix = await self._matrix(kind)
+        mask = matrix.select(
+            drug_mask=matrix.drug_mask(drug_name, partial=True),
+            strain_mask=matrix.species_mask(species_acronym) if species_acronym else None,
+        )
+        return matrix.page(mask, page, per_page)
 
+    @log_execution_time
+    async def get_drug_mic_by_drug(
+        self, drug_name: str, species_acronym: Optional[str] = None
+    ) -> List[DrugMICSearchResultSchema]:
+        """Get all MIC data for a specific drug."""
+        try:
+            rows, _ = await self._by_drug("mic", drug_name, species_acronym)
+            return [self._mic_result(row) for row in rows]
+        except ServiceError:
+            raise
+        except Exception as e:
+            logger.error(f"Error getting MIC data for drug {drug_name}: {e}")
+            raise ServiceError(f"Failed to retrieve MIC data for drug: {str(e)}")
+
+    @log_execution_time
+    async def get_drug_mic_by_drug_paginated(
+        self,
+        drug_name: str,
+        species_acronym: Optional[str] = None,
+        page: int = 1,
+        per_page: int = 20,
+    ) -> DrugMICPaginationSchema:
+        """Get one page of MIC data for a specific drug."""
+        try:
+            rows, total = await self._by_drug("mic", drug_name, species_acronym, page, per_page)
+            return _paginate(
+                DrugMICPaginationSchema,
+                [self._mic_result(row) for row in rows],
+                total,
+                page,
+                per_page,
+            )
+        except ServiceError:
+            raise
         except Exception as e:
             logger.error(f"Error getting MIC data for drug {drug_name}: {e}")
             raise ServiceError(f"Failed to retrieve MIC data for drug: {str(e)}")
@@ -782,66 +913,36 @@ class DrugService(BaseService[StrainDrugMICResponseSchema, Dict[str, Any]]):
     ) -> List[DrugMetabolismSearchResultSchema]:
         """Get all metabolism data for a specific drug."""
         try:
-            search = self._create_search()
-
-            # Build the main query
-            main_queries = []
+            rows, _ = await self._by_drug("metabolism", drug_name, species_acronym)
+            return [self._metabolism_result(row) for row in rows]
+        except ServiceError:
+            raise
+        except Exception as e:
+            logger.error(f"Error getting metabolism data for drug {drug_name}: {e}")
+            raise ServiceError(f"Failed to retrieve metabolism data for drug: {str(e)}")
 
-            # Use fuzzy search for drug names to handle partial matches and typos
-            drug_query = Q(
-                "bool",
-                should=[
-                    Q("term", drug_metabolism__drug_name__keyword=drug_name.lower()),
-                    Q(
-                        "fuzzy",
-                        drug_metabolism__drug_name__keyword={
-                            "value": drug_name.lower(),
-                            "fuzziness": "AUTO",
-                        },
-                    ),
-                    Q("wildcard", drug_metabolism__drug_name__keyword=f"*{drug_name.lower()}*"),
-                ],
+    @log_execution_time
+    async def get_drug_metabolism_by_drug_paginated(
+        self,
+        drug_name: str,
+        species_acronym: Optional[str] = None,
+        page: int = 1,
+        per_page: int = 20,
+    ) -> DrugMetabolismPaginationSchema:
+        """Get one page of metabolism data for a specific drug."""
+        try:
+            rows, total = await self._by_drug(
+                "metabolism", drug_name, species_acronym, page, per_page
             )
-            main_queries.append(Q("nested", path="drug_metabolism", query=drug_query))
-
-            if species_acronym:
-                main_queries.append(Q("term", species_acronym=species_acronym.lower()))
-
-            search = search.query(Q("bool", must=main_queries))
-
-            # Scan all matching documents to avoid default size limits
-            response_hits = await self._scan_search(search)
-
-            results = []
-            for hit in response_hits:
-                source = hit.to_dict()
-                for metab_data in source.get("drug_metabolism", []):
-                    # Check if the drug name matches (case-insensitive partial match)
-                    drug_name_lower = drug_name.lower()
-                    actual_drug_name = metab_data.get("drug_name", "").lower()
-                    if drug_name_lower in actual_drug_name or actual_drug_name in drug_name_lower:
-                        results.append(
-                            DrugMetabolismSearchResultSchema(
-                                isolate_name=source.get("isolate_name", ""),
-                                species_acronym=source.get("species_acronym"),
-                                species_scientific_name=source.get("species_scientific_name"),
-                                drug_name=metab_data.get("drug_name"),
-                                drug_class=metab_data.get("drug_class"),
-                                degr_percent=metab_data.get("degr_percent"),
-                                pval=metab_data.get("pval"),
-                                fdr=metab_data.get("fdr"),
-                                metabolizer_classification=metab_data.get(
-                                    "metabolizer_classification"
-                                ),
-                                is_significant=metab_data.get("is_significant"),
-                                experimental_condition_name=metab_data.get(
-                                    "experimental_condition_name"
-                                ),
-                            )
-                        )
-
-            return results
-
+            return _paginate(
+                DrugMetabolismPaginationSchema,
+                [self._metabolism_result(row) for row in rows],
+                total,
+                page,
+                per_page,
+            )
+        except ServiceError:
+            raise
         except Exception as e:
             logger.error(f"Error getting metabolism data for drug {drug_name}: {e}")
             raise ServiceError(f"Failed to retrieve metabolism data for drug: {str(e)}")
@@ -850,62 +951,17 @@ class DrugService(BaseService[StrainDrugMICResponseSchema, Dict[str, Any]]):
     async def get_drug_suggestions(
         self, query: DrugAutocompleteQuerySchema
     ) -> List[DrugSuggestionSchema]:
-        """Get drug name suggestions for autocomplete."""
+        """Get drug name suggestions for autocomplete, from the in-memory drug vocabulary."""
         try:
-            # For now, let's use a simpler approach - get all drug names and filter them
-            search = self._create_search()
-
-            # Build query filters
-            filters = []
-
-            if query.species_acronym:
-                filters.append(Q("term", species_acronym=query.species_acronym.lower()))
-
-            # Determine which nested field to search based on data_type
-            nested_path = "drug_mic" if query.data_type == "mic" else "drug_metabolism"
-
-            # Use wildcard search for drug names
-            drug_query = Q(
-                "wildcard", **{f"{nested_path}__drug_name__keyword": f"*{query.query.lower()}*"}
-            )
-            filters.append(Q("nested", path=nested_path, query=drug_query))
-
-            # Apply filters
-            if filters:
-                search = search.query(Q("bool", must=filters))
-
-            # Get all matching documents
-            search = search[:1000]  # Limit to reasonable number for processing
-
-            response = await self._execute_search(search)
-
-            # Collect unique drug names with counts
-            drug_counts = {}
-            drug_classes = {}
-
-            for hit in response.hits:
-                source = hit.to_dict()
-                nested_data = source.get(nested_path, [])
-
-                for item in nested_data:
-                    drug_name = item.get("drug_name")
-                    if drug_name and query.query.lower() in drug_name.lower():
-                        if drug_name not in drug_counts:
-                            drug_counts[drug_name] = 0
-                            drug_classes[drug_name] = item.get("drug_class")
-                        drug_counts[drug_name] += 1
-
-            # Convert to suggestions
-            suggestions = []
-            for drug_name, count in sorted(drug_counts.items(), key=lambda x: x[1], reverse=True):
-                suggestions.append(
-                    DrugSuggestionSchema(
-                        drug_name=drug_name, drug_class=drug_classes[drug_name], count=count
-                    )
+            matrix = await self._matrix("mic" if query.data_type == "mic" else "metabolism")
+            return [
+                DrugSuggestionSchema(drug_name=name, drug_class=drug_class, count=count)
+                for name, drug_class, count in matrix.suggest(
+                    query.query, query.species_acronym, query.limit
                 )
-
-            return suggestions[: query.limit]
-
+            ]
+        except ServiceError:
+            raise
         except Exception as e:
             logger.error(f"Error getting drug suggestions: {e}")
             raise ServiceError(f"Failed to retrieve drug suggestions: {str(e)}")
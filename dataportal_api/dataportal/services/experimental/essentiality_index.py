@@ -0,0 +1,131 @@
+"""
+Compact per-contig interval index of gene essentiality calls for the genome
+browser track.
+
+Each contig keeps its genes as SortedIntervals (dataportal/utils/intervals.py)
+with parallel essentiality codes and locus tags; calls are stored as small
+integer codes into one vocabulary shared by all contigs. Region queries
+bisect the sorted arrays instead of walking every gene.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from dataportal.utils.intervals import SortedIntervals, normalize_contig
+
+
+class ContigEssentiality:
+    """Genes of one contig, sorted by start."""
+
+    __slots__ = ("locus_tags", "intervals", "codes")
+
+    def __init__(
+        self, locus_tags: List[str], starts: np.ndarray, ends: np.ndarray, codes: np.ndarray
+    ):
+        self.intervals = SortedIntervals(starts, ends)
+        order = self.intervals.order
+        self.locus_tags = [locus_tags[i] for i in order]
+        self.codes = codes[order]
+
+    def __len__(self) -> int:
+        return len(self.intervals)
+
+    @property
+    def starts(self) -> np.ndarray:
+        return self.intervals.starts
+
+    @property
+    def ends(self) -> np.ndarray:
+        return self.intervals.ends
+
+    def overlapping(self, start: Optional[int] = None, end: Optional[int] = None) -> np.ndarray:
+        """Positions of the genes overlapping [start, end] (whole contig when both are None)."""
+        return self.intervals.overlapping(start, end)
+
+
+class EssentialityIndex:
+    """isolate -> contig -> ContigEssentiality, plus normalized contig names."""
+
+    def __init__(self):
+        self.calls: List[Optional[str]] = [None]  # code 0 = no call
+        self.contigs: Dict[str, Dict[str, ContigEssentiality]] = {}
+        self._contig_names: Dict[str, Dict[str, str]] = {}
+
+    @classmethod
+    def from_records(
+        cls, records: Iterable[Tuple[str, str, str, Optional[int], Optional[int], Optional[str]]]
+    ) -> "EssentialityIndex":
+        """Build from (isolate, seq_id, locus_tag, start, end, essentiality_call) tuples."""
+        index = cls()
+        codes: Dict[Optional[str], int] = {None: 0}
+        # isolate -> seq_id -> (locus_tags, starts, ends, codes)
+        columns: Dict[str, Dict[str, Tuple[list, list, list, list]]] = {}
+        for isolate, seq_id, locus_tag, start, end, call in records:
+            if call not in codes:
+                codes[call] = len(index.calls)
+                index.calls.append(call)
+            tags, starts, ends, calls = columns.setdefault(isolate, {}).setdefault(
+                seq_id, ([], [], [], [])
+            )
+            tags.append(locus_tag)
+            # genes without coordinates sort first and never overlap a region
+            starts.append(start if start is not None else -1)
+            ends.append(end if end is not None else -1)
+            calls.append(codes[call])
+
+        code_dtype = np.uint8 if len(index.calls) <= 256 else np.uint16
+        for isolate, contigs in columns.items():
+            for seq_id, (tags, starts, ends, calls) in contigs.items():
+                index.contigs.setdefault(isolate, {})[seq_id] = ContigEssentiality(
+                    tags,
+                    np.array(starts, dtype=np.int64),
+                    np.array(ends, dtype=np.int64),
+                    np.array(calls, dtype=code_dtype),
+                )
+                index._contig_names.setdefault(isolate, {}).setdefault(
+                    normalize_contig(seq_id), seq_id
+                )
+        return index
+
+    def __bool__(self) -> bool:
+        return bool(self.contigs)
+
+    @property
+    def gene_count(self) -> int:
+        return sum(len(contig) for contigs in self.contigs.values() for contig in contigs.values())
+
+    def contig(self, isolate: str, ref_name: str) -> Optional[ContigEssentiality]:
+        contigs = self.contigs.get(isolate)
+        if not contigs:
+            return None
+        if ref_name in contigs:
+            return contigs[ref_name]
+        seq_id = self._contig_names[isolate].get(normalize_contig(ref_name))
+        return contigs.get(seq_id) if seq_id is not None else None
+
+    def region(
+        self, isolate: str, ref_name: str, start: Optional[int] = None, end: Optional[int] = None
+    ) -> Optional[Dict[str, Dict]]:
+        """
+        {locus_tag: {locus_tag, start, end, essentiality}} of the genes
+        overlapping [start, end], in start order; None for an unknown contig.
+        """
+        contig = self.contig(isolate, ref_name)
+        if contig is None:
+            return None
+        positions = contig.overlapping(start, end)
+        return {
+            contig.locus_tags[i]: {
+                "locus_tag": contig.locus_tags[i],
+                "start": s if s >= 0 else None,
+                "end": e if e >= 0 else None,
+                "essentiality": self.calls[c],
+            }
+            for i, s, e, c in zip(
+                positions.tolist(),
+                contig.starts[positions].tolist(),
+                contig.ends[positions].tolist(),
+                contig.codes[positions].tolist(),
+            )
+        }
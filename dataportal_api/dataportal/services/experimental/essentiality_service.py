@@ -2,7 +2,6 @@ import logging
 from typing import Optional, List, Dict
 
 from asgiref.sync import sync_to_async
-from cachetools import LRUCache
 from elasticsearch_dsl import Search
 
 from dataportal.schema.experimental.essentiality_schemas import (
@@ -10,6 +9,7 @@ from dataportal.schema.experimental.essentiality_schemas import (
     EssentialityDataSchema,
 )
 from dataportal.services.base_service import BaseService
+from dataportal.services.experimental.essentiality_index import EssentialityIndex
 from dataportal.utils.constants import (
     INDEX_FEATURES,
     GENE_FIELD_ESSENTIALITY,
@@ -30,13 +30,14 @@ class EssentialityService(BaseService[EssentialityWithGeneSchema, str]):
 
     Supports both:
     1. Gene-centric API methods (get_by_id, search_with_filters)
-    2. Genome browser methods (get_essentiality_data_by_strain_and_ref) with caching
+    2. Genome browser methods (get_essentiality_data_by_strain_and_ref) served from
+       an in-memory interval index of every gene's essentiality call
     """
 
-    def __init__(self, limit: int = 10, cache_size: int = 10000):
+    def __init__(self, limit: int = 10):
         super().__init__(INDEX_FEATURES)
         self.limit = limit
-        self.essentiality_cache = LRUCache(maxsize=cache_size)
+        self.essentiality_index: Optional[EssentialityIndex] = None
 
     async def get_by_id(self, locus_tag: str) -> Optional[EssentialityWithGeneSchema]:
         """Retrieve essentiality data for a gene by locus tag."""
@@ -260,13 +261,42 @@ class EssentialityService(BaseService[EssentialityWithGeneSchema, str]):
         return EssentialityWithGeneSchema(**gene_data, essentiality_data=essentiality_data)
 
     # ============================================================================
-    # Genome Browser Methods (with caching)
+    # Genome Browser Methods (interval index)
     # ============================================================================
 
-    async def load_essentiality_data_by_strain(self) -> Dict[str, Dict[str, Dict[str, Dict]]]:
-        """Load essentiality data into cache from Elasticsearch for genome browser."""
-        if self.essentiality_cache:
-            return self.essentiality_cache
+    def _scan_essentiality_records(self, search, stats: Dict):
+        """(isolate, seq_id, locus_tag, start, end, call) per scanned gene; hits are not kept."""
+        for hit in search.scan():
+            stats["hits"] += 1
+            isolate_name = getattr(hit, "isolate_name", None)
+            seq_id = getattr(hit, "seq_id", None)
+            locus_tag = getattr(hit, "locus_tag", None)
+
+            if not isolate_name or not seq_id:
+                stats["missing_seq_ids"].append(locus_tag or "unknown_locus")
+                continue
+
+            # Get essentiality from essentiality_data or fallback to legacy field
+            essentiality_call = None
+            essentiality_data = getattr(hit, "essentiality_data", [])
+            if essentiality_data and len(essentiality_data) > 0:
+                essentiality_call = getattr(essentiality_data[0], "essentiality_call", None)
+            if not essentiality_call:
+                essentiality_call = getattr(hit, GENE_FIELD_ESSENTIALITY, None)
+
+            yield (
+                isolate_name,
+                seq_id,
+                locus_tag,
+                getattr(hit, "start", None),
+                getattr(hit, "end", None),
+                essentiality_call,
+            )
+
+    async def load_essentiality_data_by_strain(self) -> EssentialityIndex:
+        """Load essentiality data into the interval index from Elasticsearch for genome browser."""
+        if self.essentiality_index:
+            return self.essentiality_index
 
         self.logger.info("Loading essentiality data into cache from Elasticsearch...")
 
@@ -290,75 +320,28 @@ class EssentialityService(BaseService[EssentialityWithGeneSchema, str]):
                         GENE_FIELD_START,
                         GENE_FIELD_END,
                         GENE_FIELD_ESSENTIALITY,
-                        "essentiality_data",
-                        "has_essentiality",
+                        "essentiality_data.essentiality_call",
                     ]
                 )
                 .params(size=1000)
             )
 
-            response = await self._scan_search(s)
-            cache_data: Dict[str, Dict[str, Dict[str, Dict]]] = {}
-            missing_seq_ids: List[str] = []
-            total_hits = len(response)
-            total_reported = None
-            try:
-                hits_total = getattr(response.hits, "total", None)
-                if hits_total is not None:
-                    total_reported = getattr(hits_total, "value", hits_total)
-            except AttributeError:
-                total_reported = None
-
-            for hit in response:
-                isolate_name = getattr(hit, "isolate_name", None)
-                seq_id = getattr(hit, "seq_id", None)
-                locus_tag = getattr(hit, "locus_tag", None)
-                start = getattr(hit, "start", None)
-                end = getattr(hit, "end", None)
-                essentiality_data = getattr(hit, "essentiality_data", [])
-
-                if not isolate_name or not seq_id:
-                    missing_seq_ids.append(locus_tag or "unknown_locus")
-                    continue
-
-                # Get essentiality from essentiality_data or fallback to legacy field
-                essentiality_call = None
-                if essentiality_data and len(essentiality_data) > 0:
-                    first_essentiality = essentiality_data[0]
-                    essentiality_call = getattr(first_essentiality, "essentiality_call", None)
-                if not essentiality_call:
-                    essentiality_call = getattr(hit, GENE_FIELD_ESSENTIALITY, None)
-
-                if isolate_name not in cache_data:
-                    cache_data[isolate_name] = {}
-
-                if seq_id not in cache_data[isolate_name]:
-                    cache_data[isolate_name][seq_id] = {}
-
-                cache_data[isolate_name][seq_id][locus_tag] = {
-                    "locus_tag": locus_tag,
-                    "start": start,
-                    "end": end,
-                    "essentiality": essentiality_call,
-                }
-
-            self.essentiality_cache.update(cache_data)
-
-            contig_total = sum(len(contigs) for contigs in cache_data.values())
-            gene_total = sum(
-                len(genes) for contigs in cache_data.values() for genes in contigs.values()
-            )
+            stats = {"hits": 0, "missing_seq_ids": []}
+            index = await sync_to_async(
+                lambda: EssentialityIndex.from_records(self._scan_essentiality_records(s, stats))
+            )()
+            self.essentiality_index = index
 
             self.logger.info(
-                "Loaded %s essentiality records into cache "
-                "(isolates=%s, contigs=%s, genes=%s, reported_hits=%s).",
-                total_hits,
-                len(cache_data),
-                contig_total,
-                gene_total,
-                total_reported,
+                "Loaded %s essentiality records into cache (isolates=%s, contigs=%s, genes=%s, calls=%s).",
+                stats["hits"],
+                len(index.contigs),
+                sum(len(contigs) for contigs in index.contigs.values()),
+                index.gene_count,
+                index.calls[1:],
             )
 
+            missing_seq_ids = stats["missing_seq_ids"]
             if missing_seq_ids:
                 self.logger.warning(
                     "Skipped %s genes without isolate/seq_id while caching essentiality data. "
@@ -367,93 +350,58 @@ class EssentialityService(BaseService[EssentialityWithGeneSchema, str]):
                     missing_seq_ids[:5],
                 )
 
-            if total_reported is not None and total_reported > total_hits:
-                self.logger.warning(
-                    "Essentiality cache only loaded %s/%s hits. "
-                    "Consider increasing the query size or using scroll for full coverage.",
-                    total_hits,
-                    total_reported,
-                )
-
-            # Emit a per-isolate summary at debug level for deeper inspection
-            for isolate, contigs in cache_data.items():
-                contig_count = len(contigs)
-                gene_count = sum(len(genes) for genes in contigs.values())
-                sample_contigs = list(contigs.keys())[:5]
+            for isolate, contigs in index.contigs.items():
                 self.logger.info(
                     "Essentiality cache summary for isolate %s -> contigs=%s genes=%s sample_contigs=%s",
                     isolate,
-                    contig_count,
-                    gene_count,
-                    sample_contigs,
+                    len(contigs),
+                    sum(len(contig) for contig in contigs.values()),
+                    list(contigs)[:5],
                 )
 
-            return cache_data
+            return index
 
         except Exception as e:
             self._handle_elasticsearch_error(e, "load_essentiality_data_by_strain")
 
     async def get_essentiality_data_by_strain_and_ref(
-        self, isolate_name: str, ref_name: str
+        self,
+        isolate_name: str,
+        ref_name: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
     ) -> Dict[str, Dict]:
         """
         Retrieve essentiality data for a given isolate and reference name.
 
         Used by genome browser to display essentiality tracks on contigs.
-        Returns data in format optimized for visualization.
+        With `start`/`end` (1-based, inclusive) only genes overlapping that
+        region are returned, ordered by start.
         """
-        if not self.essentiality_cache:
+        if not self.essentiality_index:
             await self.load_essentiality_data_by_strain()
 
         self.logger.info(
-            f"Fetching essentiality for isolate: {isolate_name}, reference: {ref_name}"
+            f"Fetching essentiality for isolate: {isolate_name}, reference: {ref_name}, "
+            f"region: {start}-{end}"
         )
-        isolate_data = self.essentiality_cache.get(isolate_name)
-        if not isolate_data:
-            available_isolates = list(self.essentiality_cache.keys())[:5]
+        if isolate_name not in self.essentiality_index.contigs:
             self.logger.warning(
                 "No essentiality cache entry for isolate '%s'. Available isolates sample=%s",
                 isolate_name,
-                available_isolates,
+                list(self.essentiality_index.contigs)[:5],
             )
             return {}
 
-        contig_data = isolate_data.get(ref_name)
-
-        if not contig_data:
-            # Attempt a case-insensitive match for contig names
-            normalized_ref = ref_name.lower()
-            # matched_key = None
-            for contig_key, contig_values in isolate_data.items():
-                if contig_key.lower() == normalized_ref:
-                    contig_data = contig_values
-                    # matched_key = contig_key
-                    self.logger.debug(
-                        "Matched contig '%s' case-insensitively to cache entry '%s'",
-                        ref_name,
-                        contig_key,
-                    )
-                    break
-
-        available_contigs_sample = list(isolate_data.keys())[:10]
-
-        if not contig_data:
+        response = self.essentiality_index.region(isolate_name, ref_name, start, end)
+        if response is None:
             self.logger.warning(
                 "No essentiality data found for isolate '%s' and reference '%s'. "
                 "Available contigs sample=%s",
                 isolate_name,
                 ref_name,
-                available_contigs_sample,
+                list(self.essentiality_index.contigs[isolate_name])[:10],
             )
             return {}
 
-        response = {}
-        for locus_tag, gene_data in contig_data.items():
-            response[locus_tag] = {
-                "locus_tag": gene_data["locus_tag"],
-                "start": gene_data["start"],
-                "end": gene_data["end"],
-                "essentiality": gene_data["essentiality"],
-            }
-
         return response
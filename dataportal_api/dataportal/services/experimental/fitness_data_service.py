@@ -1,5 +1,8 @@
+import io
 import logging
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple
+
+import numpy as np
 
 from asgiref.sync import sync_to_async
 from elasticsearch_dsl import Search
@@ -7,19 +10,51 @@ from elasticsearch_dsl import Search
 from dataportal.schema.experimental.fitness_schemas import (
     FitnessWithGeneSchema,
     FitnessDataSchema,
+    FitnessMatrixGeneSchema,
+    FitnessMatrixSchema,
 )
 from dataportal.services.base_service import BaseService
 from dataportal.utils.constants import INDEX_FEATURES
-from dataportal.utils.exceptions import ServiceError, GeneNotFoundError
+from dataportal.utils.exceptions import (
+    ServiceError,
+    GeneNotFoundError,
+    GenomeNotFoundError,
+    ValidationError,
+)
+from dataportal.utils.fitness_matrix import (
+    MATRIX_FIELDS,
+    FitnessMatrix,
+    FitnessMatrixStore,
+    cluster_order,
+)
 
 logger = logging.getLogger(__name__)
 
+# Per-isolate gene x contrast matrices built by `manage.py build_fitness_matrix`
+fitness_matrices = FitnessMatrixStore()
+
+# Largest block (genes x contrasts) the matrix endpoint returns
+MAX_MATRIX_CELLS = 2_000_000
+
+
+def _json_values(block: np.ndarray) -> List[List[Optional[float]]]:
+    """float32/int32 block as nested lists; NaN (or -1 barcodes) become None."""
+    if block.dtype.kind == "i":
+        out = block.astype(object)
+        out[block < 0] = None
+        return out.tolist()
+    # shortest float32 repr, so 0.3 comes out as 0.3 and not 0.30000001192092896
+    out = block.astype(str).astype(np.float64).astype(object)
+    out[np.isnan(block)] = None
+    return out.tolist()
+
 
 class FitnessDataService(BaseService[FitnessWithGeneSchema, str]):
     """Service for retrieving fitness data."""
 
-    def __init__(self):
+    def __init__(self, matrices: Optional[FitnessMatrixStore] = None):
         super().__init__(INDEX_FEATURES)
+        self.matrices = matrices or fitness_matrices
 
     async def get_by_id(self, locus_tag: str) -> Optional[FitnessWithGeneSchema]:
         """Retrieve fitness data for a gene by locus tag."""
@@ -64,6 +99,111 @@ class FitnessDataService(BaseService[FitnessWithGeneSchema, str]):
             logger.error(f"Error searching fitness data with filters: {e}")
             raise ServiceError(f"Failed to search fitness data: {str(e)}")
 
+    async def get_matrix(
+        self,
+        isolate: Optional[str] = None,
+        identifiers: Optional[List[str]] = None,
+        contrasts: Optional[List[str]] = None,
+        values: Tuple[str, ...] = ("lfc",),
+        cluster: Optional[str] = None,
+    ) -> Tuple[FitnessMatrix, Dict]:
+        """
+        Slice the gene x contrast fitness matrices of one isolate.
+
+        Returns the matrix and a dict with the selected row/column numbers
+        (in output order), the requested blocks and the unknown identifiers.
+        """
+        try:
+            return await sync_to_async(self._slice_matrix)(
+                isolate, identifiers, contrasts, values, cluster
+            )
+        except (ServiceError, ValidationError):
+            raise
+        except Exception as e:
+            logger.error(f"Error slicing fitness matrix for {isolate}: {e}")
+            raise ServiceError(f"Failed to read fitness matrix: {str(e)}")
+
+    def _slice_matrix(
+        self, isolate, identifiers, contrasts, values, cluster
+    ) -> Tuple[FitnessMatrix, Dict]:
+        unknown = [v for v in values if v not in MATRIX_FIELDS]
+        if unknown:
+            raise ValidationError(
+                f"Unknown matrix value(s): {', '.join(unknown)}; use {', '.join(MATRIX_FIELDS)}"
+            )
+        if not isolate:
+            isolate = next(
+                (iso for iso in map(self.matrices.isolate_for, identifiers or []) if iso), None
+            )
+            if not isolate:
+                raise ValidationError(
+                    "isolate is required unless it can be derived from a locus tag"
+                )
+
+        matrix = self.matrices.get(isolate)
+        if matrix is None:
+            raise GenomeNotFoundError(isolate, "No fitness matrix for isolate")
+
+        rows, missing_genes = matrix.rows(identifiers or None)
+        # the same gene asked for by locus tag and UniProt id is returned once
+        _, first = np.unique(rows, return_index=True)
+        rows = rows[np.sort(first)]
+        cols, missing_contrasts = matrix.cols(contrasts or None)
+        if len(rows) * len(cols) > MAX_MATRIX_CELLS:
+            raise ValidationError(
+                f"Requested {len(rows)} genes x {len(cols)} contrasts; "
+                f"select at most {MAX_MATRIX_CELLS:,} cells"
+            )
+
+        if cluster and len(rows) and len(cols):
+            lfc = matrix.take("lfc", rows, cols)
+            if cluster in ("genes", "both"):
+                order = cluster_order(lfc)
+                rows, lfc = rows[order], lfc[order]
+            if cluster in ("contrasts", "both"):
+                cols = cols[cluster_order(lfc.T)]
+
+        return matrix, {
+            "rows": rows,
+            "cols": cols,
+            "blocks": {v: matrix.take(v, rows, cols) for v in values},
+            "missing_genes": missing_genes,
+            "missing_contrasts": missing_contrasts,
+        }
+
+    @staticmethod
+    def matrix_to_schema(matrix: FitnessMatrix, sliced: Dict) -> FitnessMatrixSchema:
+        rows, cols = sliced["rows"], sliced["cols"]
+        return FitnessMatrixSchema(
+            isolate=matrix.isolate,
+            built_at=matrix.built_at,
+            genes=[
+                FitnessMatrixGeneSchema(
+                    locus_tag=matrix.locus_tags[r],
+                    uniprot_id=matrix.uniprot_ids[r],
+                    gene_name=matrix.gene_names[r],
+                )
+                for r in rows
+            ],
+            contrasts=[matrix.contrasts[c] for c in cols],
+            conditions=[matrix.conditions[c] for c in cols],
+            missing_genes=sliced["missing_genes"],
+            missing_contrasts=sliced["missing_contrasts"],
+            **{field: _json_values(block) for field, block in sliced["blocks"].items()},
+        )
+
+    @staticmethod
+    def matrix_to_npz(matrix: FitnessMatrix, sliced: Dict) -> bytes:
+        rows, cols = sliced["rows"], sliced["cols"]
+        buf = io.BytesIO()
+        np.savez_compressed(
+            buf,
+            locus_tags=np.array([matrix.locus_tags[r] for r in rows], dtype=str),
+            contrasts=np.array([matrix.contrasts[c] for c in cols], dtype=str),
+            **sliced["blocks"],
+        )
+        return buf.getvalue()
+
     def _fetch_fitness_by_identifier(self, identifier: str) -> FitnessWithGeneSchema:
         """Fetch fitness data for a single identifier."""
         s = (
@@ -76,12 +216,12 @@ class FitnessDataService(BaseService[FitnessWithGeneSchema, str]):
             ])
             .extra(size=1)
         )
-        
+
         response = s.execute()
-        
+
         if not response.hits:
             raise GeneNotFoundError(f"Gene with identifier '{identifier}' not found or has no fitness data")
-        
+
         hit = response.hits[0]
         return self._convert_hit_to_fitness_schema(hit)
 
@@ -97,21 +237,21 @@ class FitnessDataService(BaseService[FitnessWithGeneSchema, str]):
         """Fetch fitness data for multiple identifiers."""
         locus_tags = locus_tags or []
         uniprot_ids = uniprot_ids or []
-        
+
         s = (
             Search(index=self.index_name)
             .filter("term", has_fitness=True)  # Fast boolean filter
         )
-        
+
         should_conditions = []
         if locus_tags:
             should_conditions.append({"terms": {"locus_tag.keyword": locus_tags}})
         if uniprot_ids:
             should_conditions.append({"terms": {"uniprot_id": uniprot_ids}})
-        
+
         if should_conditions:
             s = s.query("bool", should=should_conditions, minimum_should_match=1)
-        
+
         # Apply nested filters for fitness
         if any([contrast, min_lfc is not None, max_fdr is not None, min_barcodes is not None]):
             nested_conditions = []
@@ -125,12 +265,12 @@ class FitnessDataService(BaseService[FitnessWithGeneSchema, str]):
                 nested_conditions.append({"range": {"fitness.fdr": {"lte": max_fdr}}})
             if min_barcodes is not None:
                 nested_conditions.append({"range": {"fitness.number_of_barcodes": {"gte": min_barcodes}}})
-            
+
             if nested_conditions:
                 s = s.filter("nested", path="fitness", query={
                     "bool": {"must": nested_conditions}
                 })
-        
+
         total_identifiers = len(locus_tags) + len(uniprot_ids)
         if total_identifiers > 0:
             s = s.extra(size=min(total_identifiers, 1000))
@@ -140,12 +280,12 @@ class FitnessDataService(BaseService[FitnessWithGeneSchema, str]):
         logger.info(f'Final Query: {s.to_dict()}')
 
         response = s.execute()
-        
+
         results = []
         for hit in response.hits:
             try:
                 schema = self._convert_hit_to_fitness_schema(hit)
-                
+
                 # Post-filter the fitness array to only include entries matching the search criteria
                 if schema.fitness and len(schema.fitness) > 0:
                     filtered_fitness = []
@@ -159,9 +299,9 @@ class FitnessDataService(BaseService[FitnessWithGeneSchema, str]):
                             continue
                         if min_barcodes is not None and (entry.number_of_barcodes is None or entry.number_of_barcodes < min_barcodes):
                             continue
-                        
+
                         filtered_fitness.append(entry)
-                    
+
                     # Only include genes that have at least one matching fitness entry after filtering
                     if filtered_fitness:
                         schema.fitness = filtered_fitness
@@ -171,13 +311,13 @@ class FitnessDataService(BaseService[FitnessWithGeneSchema, str]):
             except Exception as e:
                 logger.warning(f"Error converting hit to schema: {e}")
                 continue
-        
+
         return results
 
     def _convert_hit_to_fitness_schema(self, hit) -> FitnessWithGeneSchema:
         """Convert Elasticsearch hit to FitnessWithGeneSchema."""
         hit_dict = hit.to_dict()
-        
+
         gene_data = {
             "feature_id": hit.meta.id if hasattr(hit, 'meta') else None,
             "feature_type": hit_dict.get("feature_type"),
@@ -189,10 +329,10 @@ class FitnessDataService(BaseService[FitnessWithGeneSchema, str]):
             "species_scientific_name": hit_dict.get("species_scientific_name"),
             "species_acronym": hit_dict.get("species_acronym"),
         }
-        
+
         fitness_raw = hit_dict.get("fitness", [])
         fitness_data = []
-        
+
         if fitness_raw:
             for entry in fitness_raw:
                 fitness_data.append(FitnessDataSchema(
@@ -202,9 +342,8 @@ class FitnessDataService(BaseService[FitnessWithGeneSchema, str]):
                     fdr=entry.get("fdr"),
                     number_of_barcodes=entry.get("number_of_barcodes"),
                 ))
-        
+
         return FitnessWithGeneSchema(
             **gene_data,
             fitness=fitness_data
         )
-
@@ -1,7 +1,11 @@
 import logging
+import os
 from typing import Any, Dict, List, Optional
 
-from dataportal.utils.string_client import fetch_string_network
+from asgiref.sync import sync_to_async
+
+from dataportal.utils.string_client import build_string_network_url, fetch_string_network
+from dataportal.utils.string_mirror import StringMirrorStore
 
 # --- STRING Network Unmapped Filter (reference for debugging) ---
 # Edges where either protein (A or B) lacks a locus tag mapping are REMOVED from the
@@ -26,14 +30,91 @@ from dataportal.schema.interactions.ppi_schemas import (
 
 logger = logging.getLogger(__name__)
 
+# Where networks come from: "remote" (the STRING API), "local" (the mirror built by
+# build_string_mirror) or "auto" (the mirror when it has the species and network
+# type, else the API).
+STRING_NETWORK_SOURCES = ("auto", "local", "remote")
+STRING_NETWORK_SOURCE = os.environ.get("STRING_DB_SOURCE", "auto").strip().lower()
+
+# Local STRING networks, memory-mapped once per process
+string_mirror = StringMirrorStore()
+
 
 class StringNetworkService:
     name = "stringdb"
 
-    def __init__(self):
+    def __init__(self, mirror: Optional[StringMirrorStore] = None, source: Optional[str] = None):
         self._gene_service = ServiceFactory.get_gene_service()
         self._ppi_service = ServiceFactory.get_ppi_service()
         self._species_service = ServiceFactory.get_species_service()
+        self._mirror = mirror or string_mirror
+        self.source = source or STRING_NETWORK_SOURCE
+        if self.source not in STRING_NETWORK_SOURCES:
+            logger.warning("Unknown STRING network source %r, using 'auto'", self.source)
+            self.source = "auto"
+
+    def _local_network(
+        self,
+        identifiers: List[str],
+        species_taxid: int,
+        required_score: Optional[float],
+        network_type: str,
+        add_nodes: Optional[int],
+    ) -> Optional[Dict[str, Any]]:
+        """Network from the local mirror, or None if it has no such species network."""
+        network = self._mirror.get(species_taxid, network_type)
+        if network is None:
+            return None
+        return {
+            "network": network.network(
+                identifiers, required_score=required_score, add_nodes=add_nodes
+            ),
+            "network_url": build_string_network_url(
+                identifiers, species_taxid=species_taxid, network_type=network_type
+            ),
+            "raw_text": None,
+            "identifiers": identifiers,
+            "species_taxid": species_taxid,
+        }
+
+    async def _fetch_network(
+        self,
+        identifiers: List[str],
+        species_taxid: Optional[int],
+        required_score: Optional[float] = None,
+        network_type: str = "physical",
+        add_nodes: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """STRING network of `identifiers`, from the local mirror or the STRING API (see STRING_NETWORK_SOURCE)."""
+        if self.source != "remote" and identifiers and species_taxid is not None:
+            try:
+                result = await sync_to_async(self._local_network)(
+                    identifiers, species_taxid, required_score, network_type, add_nodes
+                )
+            except Exception as e:
+                logger.warning(
+                    "Local STRING %s network for taxid %s failed: %s",
+                    network_type,
+                    species_taxid,
+                    e,
+                )
+                result = None
+            if result is not None:
+                return result
+            if self.source == "local":
+                return {
+                    "network": [],
+                    "network_url": None,
+                    "raw_text": None,
+                    "error": f"No local STRING {network_type} network for taxid {species_taxid}",
+                }
+        return await fetch_string_network(
+            identifiers=identifiers,
+            species_taxid=species_taxid,
+            required_score=required_score,
+            network_type=network_type,
+            add_nodes=add_nodes,
+        )
 
     def _filter_network_by_evidence(
         self, network: List[Dict[str, Any]], evidence_channels: Optional[List[str]]
@@ -197,7 +278,7 @@ class StringNetworkService:
             }
 
         species_taxid = await self._species_service.get_taxonomy_id(resolved_species)
-        result = await fetch_string_network(
+        result = await self._fetch_network(
             identifiers=identifiers,
             species_taxid=species_taxid,
             required_score=float(required_score) if required_score is not None else None,
@@ -296,13 +377,15 @@ class StringNetworkService:
         required_score: Optional[float] = None,
         network_type: str = "physical",
         interaction: Optional[Dict[str, Any]] = None,
+        add_nodes: Optional[int] = None,
     ) -> StringNetworkResponseSchema:
         species_taxid = await self._species_service.get_taxonomy_id(species_acronym)
-        result = await fetch_string_network(
+        result = await self._fetch_network(
             identifiers=identifiers,
             species_taxid=species_taxid,
             required_score=required_score,
             network_type=network_type,
+            add_nodes=add_nodes,
         )
 
         rows_raw = result.get("network", []) or []
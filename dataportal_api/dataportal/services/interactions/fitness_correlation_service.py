@@ -2,12 +2,15 @@
 Service for gene fitness correlation operations.
 
 This service provides methods for querying gene-gene fitness correlations,
-finding correlated genes, and building correlation networks.
+finding correlated genes, and building correlation networks. Besides the
+precomputed pairs in the correlation index, co-fitness can be computed on
+demand from the per-isolate fitness matrices for any subset of contrasts.
 """
 
 import logging
 from typing import List, Dict, Any, Optional
 
+import numpy as np
 from asgiref.sync import sync_to_async
 from elasticsearch_dsl import Search
 
@@ -16,7 +19,20 @@ from dataportal.schema.interactions.fitness_correlation_schemas import (
     FitnessCorrelationSearchPaginationSchema,
 )
 from dataportal.services.base_service import BaseService
-from dataportal.utils.exceptions import ServiceError
+from dataportal.services.experimental.fitness_data_service import fitness_matrices
+from dataportal.utils.exceptions import (
+    GeneNotFoundError,
+    GenomeNotFoundError,
+    ServiceError,
+    ValidationError,
+)
+from dataportal.utils.fitness_matrix import (
+    COFITNESS_METHODS,
+    FitnessMatrixStore,
+    cofitness,
+    correlation_strength,
+    top_partners,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -27,9 +43,10 @@ INDEX_FITNESS_CORRELATION = "fitness_correlation_index"
 class FitnessCorrelationService(BaseService):
     """Service for gene fitness correlation data operations."""
 
-    def __init__(self):
+    def __init__(self, matrices: Optional[FitnessMatrixStore] = None):
         super().__init__(INDEX_FITNESS_CORRELATION)
         self.document_class = GeneFitnessCorrelationDocument
+        self.matrices = matrices or fitness_matrices
 
     def _build_base_search(
         self,
@@ -126,6 +143,134 @@ class FitnessCorrelationService(BaseService):
             logger.error(f"Error getting correlations for gene {locus_tag}: {e}")
             raise ServiceError(f"Failed to get correlations: {str(e)}")
 
+    async def compute_cofitness(
+        self,
+        locus_tags: List[str],
+        isolate_name: Optional[str] = None,
+        contrasts: Optional[List[str]] = None,
+        method: str = "pearson",
+        min_barcodes: Optional[int] = None,
+        min_conditions: int = 3,
+        min_correlation: Optional[float] = None,
+        max_results: int = 100,
+    ) -> Dict[str, Any]:
+        """
+        Compute co-fitness partners of genes from the fitness matrices.
+
+        Unlike get_correlations_for_gene this is not limited to the ingested
+        pairs: every gene of the isolate is correlated with each query gene
+        over the selected contrasts, counting only cells with at least
+        `min_barcodes` barcodes.
+
+        Args:
+            locus_tags: Query genes (locus tags or UniProt ids)
+            isolate_name: Isolate; derived from the locus tags when omitted
+            contrasts: Contrasts to correlate over (all when omitted)
+            method: "pearson" or "spearman"
+            min_barcodes: Minimum barcode count for a cell to count
+            min_conditions: Minimum number of shared contrasts per pair
+            min_correlation: Minimum absolute correlation value
+            max_results: Maximum number of partners per query gene
+
+        Returns:
+            Dictionary with the correlations (shaped like
+            get_correlations_for_gene, plus n_conditions) and the unknown
+            genes / contrasts
+        """
+        try:
+            return await sync_to_async(self._compute_cofitness)(
+                locus_tags,
+                isolate_name,
+                contrasts,
+                method,
+                min_barcodes,
+                min_conditions,
+                min_correlation,
+                max_results,
+            )
+        except (ServiceError, ValidationError):
+            raise
+        except Exception as e:
+            logger.error(f"Error computing co-fitness for {locus_tags}: {e}")
+            raise ServiceError(f"Failed to compute co-fitness: {str(e)}")
+
+    def _compute_cofitness(
+        self,
+        locus_tags,
+        isolate_name,
+        contrasts,
+        method,
+        min_barcodes,
+        min_conditions,
+        min_correlation,
+        max_results,
+    ) -> Dict[str, Any]:
+        if not locus_tags:
+            raise ValidationError("At least one locus tag is required")
+        if method not in COFITNESS_METHODS:
+            raise ValidationError(f"Unknown method: {method}; use {', '.join(COFITNESS_METHODS)}")
+        if not isolate_name:
+            isolate_name = next(
+                (iso for iso in map(self.matrices.isolate_for, locus_tags) if iso), None
+            )
+            if not isolate_name:
+                raise ValidationError(
+                    "isolate_name is required unless it can be derived from a locus tag"
+                )
+
+        matrix = self.matrices.get(isolate_name)
+        if matrix is None:
+            raise GenomeNotFoundError(isolate_name, "No fitness matrix for isolate")
+
+        rows, missing_genes = matrix.rows(locus_tags)
+        if not len(rows):
+            raise GeneNotFoundError(", ".join(locus_tags), "No fitness data for gene")
+        cols, missing_contrasts = matrix.cols(contrasts or None)
+        if not len(cols):
+            raise ValidationError(
+                f"None of the contrasts exist for {isolate_name}: {', '.join(contrasts)}"
+            )
+
+        r, n = cofitness(matrix, rows, cols, method=method, min_barcodes=min_barcodes)
+        r[n < max(min_conditions, 2)] = np.nan
+        if min_correlation is not None:
+            r[np.abs(r) < abs(min_correlation)] = np.nan
+
+        correlations = []
+        for q, row in enumerate(rows.tolist()):
+            partners = top_partners(r[:, q], exclude=row, k=max_results)
+            values = r[partners, q]
+            for partner, value, label, shared in zip(
+                partners.tolist(),
+                values.tolist(),
+                correlation_strength(values).tolist(),
+                n[partners, q].tolist(),
+            ):
+                correlations.append(
+                    {
+                        "locus_tag": matrix.locus_tags[row],
+                        "partner_gene": matrix.locus_tags[partner],
+                        "partner_locus_tag": matrix.locus_tags[partner],
+                        "partner_name": matrix.gene_names[partner],
+                        "partner_uniprot_id": matrix.uniprot_ids[partner],
+                        "correlation_value": round(value, 6),
+                        "abs_correlation": round(abs(value), 6),
+                        "correlation_strength": label,
+                        "n_conditions": shared,
+                        "species_acronym": isolate_name.split("_")[0],
+                        "isolate_name": isolate_name,
+                    }
+                )
+
+        return {
+            "correlations": correlations,
+            "isolate_name": isolate_name,
+            "method": method,
+            "contrasts": len(cols),
+            "missing_genes": missing_genes,
+            "missing_contrasts": missing_contrasts,
+        }
+
     async def get_correlation_between_genes(
         self,
         locus_tag_a: str,
@@ -32,6 +32,14 @@ ENABLE_NATURAL_QUERY = os.environ.get("ENABLE_NATURAL_QUERY", "false").lower() =
 STRING_DB_API_BASE = os.environ.get("STRING_DB_API_BASE", "https://string-db.org/api")
 STRING_DB_WEB_BASE = os.environ.get("STRING_DB_WEB_BASE", "https://string-db.org")
 
+# Conditional GET (ETag / 304) for read-only API endpoints
+API_ETAG_ENABLED = os.environ.get("API_ETAG_ENABLED", "true").lower() == "true"
+API_CACHE_MAX_AGE = int(os.getenv("API_CACHE_MAX_AGE", 300))
+INDEX_VERSION_TTL = int(os.getenv("INDEX_VERSION_TTL", 60))
+
+# Load the in-memory strain x drug matrices at startup instead of on the first drug query
+DRUG_MATRIX_PRELOAD = os.environ.get("DRUG_MATRIX_PRELOAD", "false").lower() == "true"
+
 
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://redis:6379/0")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://redis:6379/1")
@@ -127,6 +135,7 @@ MIDDLEWARE += [
     "dataportal.middleware.LocusStringMappingMiddleware",
     "dataportal.middleware.SwaggerHeaderFooterMiddleware",
     "dataportal.middleware.RemoveCOOPHeaderMiddleware",
+    "dataportal.middleware.IndexVersionETagMiddleware",
 ]
 
 if DEBUG:
@@ -230,6 +239,11 @@ JWT_ALGORITHM = "HS256"
 JWT_EXPIRY_DAYS = None  # None = tokens never expire (suitable for stakeholder testing)
 # To enable expiration, set JWT_EXPIRY_DAYS to a number like 365 for 1 year
 
+# Validated API tokens are cached per process; last_used_at is written in batches.
+# A revoked token stays valid in other workers for up to API_TOKEN_CACHE_TTL seconds.
+API_TOKEN_CACHE_TTL = int(os.getenv("API_TOKEN_CACHE_TTL", 60))
+API_TOKEN_LAST_USED_FLUSH_INTERVAL = int(os.getenv("API_TOKEN_LAST_USED_FLUSH_INTERVAL", 60))
+
 if DEBUG:
     INTERNAL_IPS = [
         "127.0.0.1",
@@ -97,6 +97,35 @@ class TestBaseService:
         with pytest.raises(ServiceError):
             await service._execute_search(mock_search)
 
+    @pytest.mark.asyncio
+    async def test_execute_search_coalesces_identical_searches(self):
+        """Identical concurrent searches hit Elasticsearch once."""
+        import asyncio
+        import time
+
+        service = MockService()
+        calls = []
+
+        def slow_execute():
+            calls.append(1)
+            time.sleep(0.05)
+            return {"hits": []}
+
+        searches = []
+        for _ in range(5):
+            search = Search(index="test_index").query("match", gene_name="dnaA")
+            search.execute = slow_execute
+            searches.append(search)
+        other = Search(index="test_index").query("match", gene_name="dnaB")
+        other.execute = slow_execute
+
+        results = await asyncio.gather(
+            *(service._execute_search(s) for s in searches), service._execute_search(other)
+        )
+
+        assert len(calls) == 2
+        assert all(r == {"hits": []} for r in results)
+
     def test_handle_elasticsearch_error(self):
         """Test _handle_elasticsearch_error method."""
         service = MockService()
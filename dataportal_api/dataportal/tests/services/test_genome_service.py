@@ -13,6 +13,7 @@ from dataportal.schema.genome_schemas import (
 )
 from dataportal.services.genome_service import GenomeService
 from dataportal.services.essentiality_service import EssentialityService
+from dataportal.services.experimental.essentiality_index import EssentialityIndex
 from dataportal.utils.exceptions import ServiceError
 
 
@@ -316,7 +317,12 @@ async def test_get_essentiality_data(mock_load_cache):
 
     service = EssentialityService()
     # Set the cache directly
-    service.essentiality_cache = mock_cache_data
+    service.essentiality_index = EssentialityIndex.from_records(
+        (isolate, contig, gene["locus_tag"], gene["start"], gene["end"], gene["essentiality"])
+        for isolate, contigs in mock_cache_data.items()
+        for contig, genes in contigs.items()
+        for gene in genes.values()
+    )
     # The cache will be populated by our mock
     result = await service.get_essentiality_data_by_strain_and_ref(
         "BU_ATCC8492", "contig_1"
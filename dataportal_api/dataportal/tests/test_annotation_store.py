@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+from dataportal.ingest.gff.parser import GFFParser
+
+GFF = (
+    "##gff-version 3\n"
+    "contig_1\tProkka\tgene\t10\t200\t.\t+\t.\t"
+    "ID=g1;locus_tag=BU_ATCC8492_00001;Name=dnaA;product=Chromosomal replication initiator;"
+    "Dbxref=UniProt:A7V2E8\n"
+    "contig_1\tProkka\tgene\t300\t450\t.\t-\t.\tID=g2;locus_tag=BU_ATCC8492_00002\n"
+    "contig_1\tProkka\tCDS\t10\t200\t.\t+\t0\tID=c1;locus_tag=BU_ATCC8492_00001\n"
+)
+
+
+def _parser(tmp_path, gff_path):
+    parser = GFFParser(annotation_store=str(tmp_path / "store.sqlite"))
+    parser._get_gff_file_for_isolate = lambda isolate: f"/{isolate}_annotations.gff"
+    parser._download_gff_file = lambda remote: str(gff_path)
+    return parser
+
+
+def test_isolate_is_compiled_once_and_served_from_store(tmp_path):
+    gff_path = tmp_path / "BU_ATCC8492_annotations.gff"
+    gff_path.write_text(GFF)
+
+    first = _parser(tmp_path, gff_path)
+    gene = first.get_gene_info("Bacteroides uniformis_BU_ATCC8492", "BU_ATCC8492_00001")
+    assert (gene.name, gene.uniprot_id, gene.start, gene.strand) == ("dnaA", "A7V2E8", 10, "+")
+
+    # a second importer opens the compiled store and never parses the GFF
+    second = _parser(tmp_path, gff_path)
+    with patch.object(GFFParser, "_parse_gff_file") as parse:
+        by_uniprot = second.get_gene_info_by_uniprot("Bacteroides uniformis_BU_ATCC8492", "A7V2E8")
+        other = second.get_gene_info("Bacteroides uniformis_BU_ATCC8492", "BU_ATCC8492_00002")
+    parse.assert_not_called()
+    assert by_uniprot.locus_tag == "BU_ATCC8492_00001"
+    assert (other.strand, other.uniprot_id) == ("-", None)
+    assert second.find_gene_info("BU_ATCC8492_00002").end == 450
+    assert second.get_gene_info("Bacteroides uniformis_BU_ATCC8492", "BU_ATCC8492_99999") is None
+
+
+def test_shared_uniprot_resolves_to_first_locus_tag(tmp_path):
+    gff_path = tmp_path / "BU_ATCC8492_annotations.gff"
+    gff_path.write_text(
+        "##gff-version 3\n"
+        "contig_1\tProkka\tgene\t300\t450\t.\t-\t.\t"
+        "ID=g2;locus_tag=BU_ATCC8492_00002;Dbxref=UniProt:A7V2E8\n"
+        "contig_1\tProkka\tgene\t10\t200\t.\t+\t.\t"
+        "ID=g1;locus_tag=BU_ATCC8492_00001;Dbxref=UniProt:A7V2E8\n"
+    )
+
+    gene = _parser(tmp_path, gff_path).get_gene_info_by_uniprot(
+        "Bacteroides uniformis_BU_ATCC8492", "A7V2E8"
+    )
+    assert gene.locus_tag == "BU_ATCC8492_00001"
@@ -0,0 +1,97 @@
+from unittest.mock import MagicMock, patch
+
+from dataportal.ingest import bulk
+from dataportal.ingest.bulk import BulkEngine, ingest_session
+
+
+def fake_streaming_bulk(client, actions, **kwargs):
+    for a in actions:
+        if a["_id"].startswith("bad"):
+            yield False, {"update": {"_id": a["_id"], "status": 400}}
+        else:
+            yield True, {"index": {"_id": a["_id"], "status": 201}}
+
+
+def test_engine_accounts_for_failures_across_threads():
+    actions = [{"_op_type": "update", "_id": f"g{i}"} for i in range(25)] + [
+        {"_op_type": "index", "_id": "bad1"}
+    ]
+    engine = BulkEngine(client=MagicMock(), threads=3, chunk_size=4)
+
+    with patch("dataportal.ingest.bulk.streaming_bulk", side_effect=fake_streaming_bulk) as sb:
+        result = engine.run(actions)
+
+    assert (result.success, result.failed) == (25, 1)
+    assert result.errors[0]["update"]["_id"] == "bad1"
+    assert sb.call_count == 7
+    assert actions[0]["retry_on_conflict"] == bulk.BULK_RETRY_ON_CONFLICT
+    assert engine.totals.success == 25
+
+
+def test_single_thread_path_sets_retry_on_conflict_and_caps_errors():
+    actions = [{"_op_type": "update", "_id": "g1"}] + [
+        {"_op_type": "index", "_id": f"bad{i}"} for i in range(5)
+    ]
+    engine = BulkEngine(client=MagicMock(), threads=1)
+
+    with (
+        patch.object(bulk, "BULK_MAX_KEPT_ERRORS", 2),
+        patch("dataportal.ingest.bulk.streaming_bulk", side_effect=fake_streaming_bulk),
+    ):
+        result = engine.run(actions)
+
+    assert actions[0]["retry_on_conflict"] == bulk.BULK_RETRY_ON_CONFLICT
+    assert (result.success, result.failed, len(result.errors)) == (1, 5, 2)
+
+
+def _session_client():
+    es = MagicMock()
+    es.indices.get_settings.return_value = {
+        "feature_index-2025.09.03": {
+            "settings": {"index": {"refresh_interval": "5s", "number_of_replicas": "1"}}
+        }
+    }
+    return es
+
+
+def test_ingest_session_only_turns_refresh_off_by_default():
+    es = _session_client()
+    engine = BulkEngine(client=es, threads=1)
+
+    with (
+        patch.object(bulk, "_engine", engine),
+        patch("dataportal.ingest.bulk.streaming_bulk", side_effect=fake_streaming_bulk),
+    ):
+        with ingest_session("feature_index", client=es):
+            with ingest_session("feature_index", client=es):  # nested: no-op
+                engine.run([{"_op_type": "index", "_id": "g1"}])
+
+    put_calls = [c.kwargs for c in es.indices.put_settings.call_args_list]
+    assert put_calls == [
+        {"index": "feature_index-2025.09.03", "body": {"index": {"refresh_interval": "-1"}}},
+        {"index": "feature_index-2025.09.03", "body": {"index": {"refresh_interval": "5s"}}},
+    ]
+    es.options.assert_not_called()
+
+
+def test_ingest_session_drops_replicas_and_force_merges_on_request():
+    es = _session_client()
+    engine = BulkEngine(client=es, threads=1)
+
+    with (
+        patch.object(bulk, "_engine", engine),
+        patch("dataportal.ingest.bulk.streaming_bulk", side_effect=fake_streaming_bulk),
+    ):
+        with ingest_session("feature_index", client=es, drop_replicas=True, force_merge=True):
+            engine.run([{"_op_type": "index", "_id": "g1"}])
+
+    put_calls = [c.kwargs for c in es.indices.put_settings.call_args_list]
+    assert put_calls[0]["body"] == {"index": {"refresh_interval": "-1", "number_of_replicas": 0}}
+    assert put_calls[-1] == {
+        "index": "feature_index-2025.09.03",
+        "body": {"index": {"refresh_interval": "5s", "number_of_replicas": "1"}},
+    }
+    es.options.assert_called_once_with(request_timeout=3600)
+    forcemerge = es.options.return_value.indices.forcemerge
+    assert "request_timeout" not in forcemerge.call_args.kwargs
+    forcemerge.assert_called_once()
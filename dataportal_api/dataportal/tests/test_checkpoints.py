@@ -0,0 +1,80 @@
+from unittest.mock import patch
+
+import pytest
+
+from dataportal.ingest.checkpoints import CheckpointStore, IngestCheckpoints
+from dataportal.ingest.ortholog.flows.orthologs import Orthologs
+
+JOB = "import_orthologs_with_genes:ortholog_index"
+
+
+def _ortholog_file(tmp_path, n=8):
+    path = tmp_path / "orthologs.tsv"
+    path.write_text(
+        "".join(f"{i}\t{i}\tBU_61_{i:05d}\tBU_909_{i:05d}\t1:1\t{i}\n" for i in range(1, n + 1))
+    )
+    return str(path)
+
+
+def _run(path, checkpoints, fail_from_call=None, reject_call=None):
+    sent, calls = [], []
+
+    def bulk(actions):
+        calls.append(1)
+        if fail_from_call and len(calls) >= fail_from_call:
+            raise ConnectionError("ES timeout")
+        if len(calls) == reject_call:
+            return 0, [{"index": {"_id": a["_id"], "status": 400}} for a in actions]
+        sent.extend(a["_id"].split("__")[0] for a in actions)
+        return len(actions), []
+
+    ck = checkpoints.file(path)
+    with patch("dataportal.ingest.ortholog.flows.orthologs.bulk_exec", side_effect=bulk):
+        Orthologs(index_name="ortholog_index").run(path, chunksize=2, flush_every=2, checkpoint=ck)
+    ck.finish()
+    return sent
+
+
+def test_resume_continues_after_last_committed_chunk(tmp_path):
+    path = _ortholog_file(tmp_path)
+    store = CheckpointStore(str(tmp_path / "state.sqlite"))
+
+    with pytest.raises(ConnectionError):
+        _run(path, IngestCheckpoints(JOB, store=store), fail_from_call=3)
+    state = store.load(JOB, path)
+    # chunk 1 was flushed but only chunk 0 was complete before that flush
+    assert (state["chunk"], state["rows"], state["done"]) == (0, 2, 0)
+
+    sent = _run(path, IngestCheckpoints(JOB, resume=True, store=store))
+    assert sent == [f"BU_61_{i:05d}" for i in range(3, 9)]
+    assert store.load(JOB, path)["done"] == 1
+
+    # completed files are skipped on resume; a fresh run starts over
+    assert IngestCheckpoints(JOB, resume=True, store=store).file(path).done
+    assert not IngestCheckpoints(JOB, store=store).file(path).done
+
+
+def test_changed_file_restarts_from_the_top(tmp_path):
+    path = _ortholog_file(tmp_path)
+    store = CheckpointStore(str(tmp_path / "state.sqlite"))
+    _run(path, IngestCheckpoints(JOB, store=store))
+
+    _ortholog_file(tmp_path, n=10)
+    ck = IngestCheckpoints(JOB, resume=True, store=store).file(path)
+    assert (ck.done, ck.next_chunk) == (False, 0)
+
+
+def test_resume_resends_chunks_with_rejected_writes(tmp_path):
+    path = _ortholog_file(tmp_path)
+    store = CheckpointStore(str(tmp_path / "state.sqlite"))
+
+    # ES rejects the flush that would commit chunk 1; later flushes succeed
+    sent = _run(path, IngestCheckpoints(JOB, store=store), reject_call=3)
+    assert "BU_61_00008" in sent
+    state = store.load(JOB, path)
+    assert (state["chunk"], state["rows"], state["done"]) == (0, 2, 0)
+    assert state["failed"] > 0
+
+    sent = _run(path, IngestCheckpoints(JOB, resume=True, store=store))
+    assert sent == [f"BU_61_{i:05d}" for i in range(3, 9)]
+    assert store.load(JOB, path)["done"] == 1
@@ -0,0 +1,133 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataportal.ingest.feature.fitness_correlation_pairs import correlation_pairs
+from dataportal.ingest.feature.fitness_matrix import FitnessMatrixBuilder
+from dataportal.ingest.feature.flows.fitness_correlation import FitnessCorrelationFlow
+from dataportal.services.interactions.fitness_correlation_service import FitnessCorrelationService
+from dataportal.utils.exceptions import GeneNotFoundError, ValidationError
+from dataportal.utils.fitness_matrix import FitnessMatrixStore, cofitness, rank_rows
+
+ISOLATE = "BU_ATCC8492"
+
+
+def _store(tmp_path, lfc, barcodes):
+    builder = FitnessMatrixBuilder()
+    for i, (values, counts) in enumerate(zip(lfc, barcodes)):
+        builder.add_gene(
+            ISOLATE, f"{ISOLATE}_{i:05d}", uniprot_id=f"A0A{i:05d}", gene_name=f"gen{i}"
+        )
+        for j, (value, count) in enumerate(zip(values, counts)):
+            if not np.isnan(value):
+                builder.add(ISOLATE, f"{ISOLATE}_{i:05d}", f"c{j}", lfc=value, barcodes=count)
+    builder.write(str(tmp_path))
+    return FitnessMatrixStore(str(tmp_path), ttl=3600)
+
+
+def test_cofitness_matches_pairwise_complete_correlation(tmp_path):
+    rng = np.random.default_rng(7)
+    lfc = rng.normal(size=(30, 12)).round(3)
+    lfc[rng.random(lfc.shape) < 0.15] = np.nan
+    barcodes = rng.integers(1, 20, size=lfc.shape)
+    matrix = _store(tmp_path, lfc, barcodes).get(ISOLATE)
+
+    for method in ("pearson", "spearman"):
+        r, n = cofitness(matrix, np.array([0, 5]), method=method, min_barcodes=5)
+        masked = np.where(barcodes >= 5, lfc, np.nan)
+        frame = pd.DataFrame(rank_rows(masked) if method == "spearman" else masked).T
+        expected = frame.corr(min_periods=2)[[0, 5]].to_numpy()
+        assert np.allclose(r, expected, equal_nan=True, atol=1e-6)
+        assert (
+            n[:, 0].tolist()
+            == frame.notna().T.astype(int).dot(frame[0].notna().astype(int)).tolist()
+        )
+
+    assert rank_rows(np.array([[3.0, np.nan, 1.0, 3.0]]))[0, [0, 2, 3]].tolist() == [2.5, 1.0, 2.5]
+
+
+def test_compute_cofitness_top_partners(tmp_path):
+    base = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+    lfc = np.array(
+        [base, base * 2 + [0, 0.5, 0, 0, 0], -base, [5, 1, 4, 2, 3], [1, 2, 4, 9, 9]], dtype=float
+    )
+    barcodes = np.full(lfc.shape, 10)
+    barcodes[4, 3:] = 1
+    service = FitnessCorrelationService(matrices=_store(tmp_path, lfc, barcodes))
+
+    result = asyncio.run(
+        service.compute_cofitness([f"{ISOLATE}_00000", "BU_X"], max_results=3, min_barcodes=5)
+    )
+    rows = [
+        (c["partner_locus_tag"][-1], round(c["correlation_value"], 3), c["correlation_strength"])
+        for c in result["correlations"]
+    ]
+    # gene 4 only counts over the three cells with enough barcodes
+    assert rows == [
+        ("2", -1.0, "strong_negative"),
+        ("1", 0.998, "strong_positive"),
+        ("4", 0.982, "strong_positive"),
+    ]
+    assert result["missing_genes"] == ["BU_X"] and result["isolate_name"] == ISOLATE
+
+    # three contrasts cannot satisfy min_conditions=4
+    result = asyncio.run(
+        service.compute_cofitness(
+            [f"{ISOLATE}_00003"], contrasts=["c0", "c1", "c2"], min_conditions=4
+        )
+    )
+    assert result["correlations"] == []
+
+    with pytest.raises(GeneNotFoundError):
+        asyncio.run(service.compute_cofitness([f"{ISOLATE}_99999"]))
+    with pytest.raises(ValidationError):
+        asyncio.run(service.compute_cofitness([f"{ISOLATE}_00000"], method="kendall"))
+
+
+class _Repo:
+    def __init__(self):
+        self.actions = []
+
+    def bulk_index(self, actions):
+        self.actions.extend(actions)
+        return len(actions), []
+
+
+def test_blocked_pairs_match_cofitness_and_index(tmp_path):
+    rng = np.random.default_rng(3)
+    lfc = rng.normal(size=(23, 10))
+    lfc[:8] += np.linspace(-3, 3, 10)  # a co-fit module
+    lfc[rng.random(lfc.shape) < 0.1] = np.nan
+    matrix = _store(tmp_path, lfc, np.full(lfc.shape, 10)).get(ISOLATE)
+
+    r, n = cofitness(matrix, np.arange(23))
+    expected = {
+        (matrix.locus_tags[i], matrix.locus_tags[j]): r[i, j]
+        for i in range(23)
+        for j in range(i + 1, 23)
+        if n[i, j] >= 3 and abs(r[i, j]) >= 0.5
+    }
+    for workers in (1, 2):
+        frames = list(correlation_pairs(matrix, min_correlation=0.5, block_size=5, workers=workers))
+        assert len(frames) == 15  # 5 row blocks, upper triangle
+        pairs = pd.concat(frames)
+        got = dict(zip(zip(pairs["gene_a"], pairs["gene_b"]), pairs["value"]))
+        assert got.keys() == expected.keys()
+        assert np.allclose([got[k] for k in expected], list(expected.values()), atol=1e-4)
+
+    repo = _Repo()
+    flow = FitnessCorrelationFlow(repo=repo, batch_size=10)
+    processed, indexed = flow.index_frames(
+        correlation_pairs(matrix, min_correlation=0.5, block_size=8)
+    )
+    assert processed == indexed == len(repo.actions) == len(expected)
+    doc = repo.actions[0]["_source"]
+    assert doc["pair_id"].startswith("BU:") and doc["isolate_name"] == ISOLATE
+    # no GFF parser: names and UniProt IDs come from the matrix
+    a, b = (int(doc[f"gene_{side}"].rsplit("_", 1)[1]) for side in ("a", "b"))
+    assert (doc["gene_a_name"], doc["gene_b_name"]) == (f"gen{a}", f"gen{b}")
+    assert (doc["gene_a_uniprot_id"], doc["gene_b_uniprot_id"]) == (f"A0A{a:05d}", f"A0A{b:05d}")
+    assert "gene_a_product" not in doc
+    assert doc["correlation_strength"].endswith(("_positive", "_negative"))
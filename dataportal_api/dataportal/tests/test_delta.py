@@ -0,0 +1,81 @@
+from unittest.mock import patch
+
+from dataportal.ingest.delta import FINGERPRINT_FIELD, DeltaFilter, doc_fingerprint
+
+
+class FakeES:
+    """Index of id -> _source answering the calls DeltaFilter makes."""
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    class _Indices:
+        @staticmethod
+        def exists(index):
+            return True
+
+    indices = _Indices()
+
+    def mget(self, index, ids, _source):
+        return {
+            "docs": [
+                (
+                    {
+                        "_id": i,
+                        "found": True,
+                        "_source": {FINGERPRINT_FIELD: self.docs[i].get(FINGERPRINT_FIELD)},
+                    }
+                    if i in self.docs
+                    else {"_id": i, "found": False}
+                )
+                for i in ids
+            ]
+        }
+
+    def hits(self):
+        return [
+            {"_id": i, "_source": {FINGERPRINT_FIELD: d.get(FINGERPRINT_FIELD)}}
+            for i, d in self.docs.items()
+        ]
+
+
+def _action(doc_id, **source):
+    return {"_op_type": "index", "_index": "ortholog_index", "_id": doc_id, "_source": source}
+
+
+def test_only_new_and_changed_docs_are_written_and_missing_ones_deleted():
+    same = {"gene_a": "BU_61_00001", "orthology_type": "1:1"}
+    es = FakeES(
+        {
+            "same": {**same, FINGERPRINT_FIELD: doc_fingerprint(same)},
+            "changed": {"gene_a": "BU_61_00002", FINGERPRINT_FIELD: "stale"},
+            "legacy": {"gene_a": "BU_61_00003"},  # indexed before fingerprints existed
+            "gone": {"gene_a": "BU_61_00004", FINGERPRINT_FIELD: "x"},
+        }
+    )
+    batch = [
+        _action("same", orthology_type="1:1", gene_a="BU_61_00001"),  # key order does not matter
+        _action("changed", gene_a="BU_61_00002"),
+        _action("legacy", gene_a="BU_61_00003"),
+        _action("new", gene_a="BU_61_00005"),
+        {"_op_type": "delete", "_index": "ortholog_index", "_id": "other"},
+    ]
+
+    for mode in ("scan", "mget"):
+        deleted = []
+        delta = DeltaFilter("ortholog_index", client=es, mode=mode, delete_missing=True)
+        with (
+            patch("dataportal.ingest.delta.scan", side_effect=lambda *a, **k: es.hits()),
+            patch(
+                "dataportal.ingest.delta.bulk_exec", side_effect=lambda acts: deleted.extend(acts)
+            ),
+        ):
+            kept = delta.filter(
+                [{**a, "_source": dict(a["_source"])} if "_source" in a else a for a in batch]
+            )
+            stats = delta.finish()
+
+        assert [a["_id"] for a in kept] == ["other", "changed", "legacy", "new"]
+        assert all(FINGERPRINT_FIELD in a["_source"] for a in kept if "_source" in a)
+        assert [a["_id"] for a in deleted] == ["gone"]
+        assert (stats.new, stats.changed, stats.unchanged, stats.deleted) == (1, 2, 1, 1)
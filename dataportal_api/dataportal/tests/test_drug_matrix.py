@@ -0,0 +1,160 @@
+import asyncio
+
+from dataportal.models import StrainDocument
+from dataportal.schema.experimental.drug_schemas import (
+    DrugAutocompleteQuerySchema,
+    DrugMetabolismSearchQuerySchema,
+    DrugMICSearchQuerySchema,
+)
+from dataportal.services.experimental.drug_matrix import DrugMatrixStore, normalize_name
+from dataportal.services.experimental.drug_service import DrugService
+
+
+def _mic(drug, value, drug_class="beta_lactam", condition="anaerobic", unit="uM"):
+    return {
+        "drug_name": drug,
+        "drug_class": drug_class,
+        "mic_value": value,
+        "unit": unit,
+        "relation": "=",
+        "experimental_condition_name": condition,
+    }
+
+
+STRAINS = [
+    {
+        "isolate_name": "PV_H4-2",
+        "species_acronym": "PV",
+        "species_scientific_name": "Phocaeicola vulgatus",
+        "drug_mic": [
+            _mic("Amoxicillin", 8.0),
+            _mic("Amoxicillin", 16.0, condition="aerobic"),
+            _mic("Tetracycline", None, "tetracycline"),
+        ],
+        "drug_metabolism": [
+            {"drug_name": "Amoxicillin", "degr_percent": 40.0, "fdr": 0.01, "is_significant": True}
+        ],
+    },
+    {
+        "isolate_name": "BU_ATCC8492",
+        "species_acronym": "BU",
+        "species_scientific_name": "Bacteroides uniformis",
+        "drug_mic": [_mic("Amoxicillin", 2.0), _mic("Ciprofloxacin", 0.5, "fluoroquinolone")],
+        "drug_metabolism": [
+            {"drug_name": "Amoxicillin", "degr_percent": 5.0, "is_significant": False},
+            {
+                "drug_name": "Ciprofloxacin",
+                "degr_percent": 60.0,
+                "fdr": 0.2,
+                "is_significant": False,
+            },
+        ],
+    },
+    {
+        "isolate_name": "BU_NODRUG",
+        "species_acronym": "BU",
+        "species_scientific_name": "Bacteroides uniformis",
+    },
+]
+
+
+def _service():
+    store = DrugMatrixStore("strain_index", ttl=3600)
+    store.load(STRAINS)
+    return DrugService(matrices=store)
+
+
+def test_by_drug_and_structured_filters():
+    service = _service()
+    assert service.matrices.get("mic").shape == (2, 3, 2)
+
+    by_drug = asyncio.run(service.get_drug_mic_by_drug("amoxi"))
+    assert [(r.isolate_name, r.mic_value) for r in by_drug] == [
+        ("BU_ATCC8492", 2.0),
+        ("PV_H4-2", 8.0),
+        ("PV_H4-2", 16.0),
+    ]
+    assert (
+        asyncio.run(service.get_drug_mic_by_drug("amoxicillin", "pv"))[
+            0
+        ].experimental_condition_name
+        == "anaerobic"
+    )
+
+    page = asyncio.run(service.get_drug_mic_by_drug_paginated("Amoxicillin", page=2, per_page=2))
+    assert (page.total_results, page.num_pages, page.has_next, len(page.results)) == (
+        3,
+        2,
+        False,
+        1,
+    )
+
+    def mic(**kw):
+        return asyncio.run(service.search_drug_mic(DrugMICSearchQuerySchema(**kw)))
+
+    assert mic(drug_class="BETA_LACTAM", min_mic_value=4).total_results == 2
+    # a record without an MIC value fails any range bound
+    assert [r.drug_name for r in mic(max_mic_value=1).results] == ["Ciprofloxacin"]
+    assert [
+        r.isolate_name
+        for r in mic(drug_name="amoxicillin", sort_by="isolate_name", sort_order="desc").results
+    ] == [
+        "PV_H4-2",
+        "PV_H4-2",
+        "BU_ATCC8492",
+    ]
+
+    metab = asyncio.run(
+        service.search_drug_metabolism(DrugMetabolismSearchQuerySchema(min_fdr=0.05))
+    )
+    # records without an FDR count as 1.0
+    assert [(r.isolate_name, r.fdr) for r in metab.results] == [("PV_H4-2", 0.01)]
+    metab = asyncio.run(
+        service.search_drug_metabolism(
+            DrugMetabolismSearchQuerySchema(is_significant=False, min_degr_percent=10)
+        )
+    )
+    assert [r.drug_name for r in metab.results] == ["Ciprofloxacin"]
+
+
+def test_normalized_drug_names_and_suggestions():
+    store = DrugMatrixStore("strain_index", ttl=3600)
+    store.load(
+        STRAINS
+        + [
+            {
+                "isolate_name": "BU_OTHER",
+                "species_acronym": "BU",
+                "drug_mic": [
+                    _mic("Amoxicillin-Clavulanate", 4.0, "Beta-Lactam"),
+                    _mic("Amoxicillin", 1.0),
+                ],
+            },
+        ]
+    )
+    service = DrugService(matrices=store)
+    matrix = store.get("mic")
+
+    assert normalize_name(" Amoxicillin / Clavulánate ") == "amoxicillinclavulanate"
+    assert matrix.drug_names[matrix.drug_mask("amoxicillin clavulanate")].tolist() == [
+        "Amoxicillin-Clavulanate"
+    ]
+    # "beta_lactam" and "Beta-Lactam" are the same class once normalized
+    assert matrix.category_mask("drug_class", "beta lactam").sum() == 5
+
+    def suggest(text, **kw):
+        query = DrugAutocompleteQuerySchema(query=text, **kw)
+        return [(s.drug_name, s.count) for s in asyncio.run(service.get_drug_suggestions(query))]
+
+    # counts are records, as before the matrix: PV_H4-2 has two Amoxicillin MICs
+    assert suggest("amox") == [("Amoxicillin", 4), ("Amoxicillin-Clavulanate", 1)]
+    assert suggest("clav") == [("Amoxicillin-Clavulanate", 1)]
+    assert suggest("cillin", species_acronym="pv") == [("Amoxicillin", 2)]
+    assert suggest("a", limit=1) == [("Amoxicillin", 4)]
+    assert suggest("cipro", data_type="metabolism") == [("Ciprofloxacin", 1)]
+
+
+def test_strain_mapping_has_drug_name_subfields():
+    mapping = StrainDocument._doc_type.mapping.to_dict()["properties"]["drug_mic"]["properties"]
+    assert set(mapping["drug_name"]["fields"]) == {"keyword", "raw", "normalized", "ngram"}
+    assert mapping["drug_class"]["fields"]["normalized"]["normalizer"] == "folded_name_normalizer"
@@ -0,0 +1,60 @@
+import asyncio
+
+from dataportal.services.experimental.essentiality_index import EssentialityIndex
+from dataportal.services.experimental.essentiality_service import EssentialityService
+
+RECORDS = [
+    ("BU_ATCC8492", "contig_1", "BU_00003", 900, 1200, "not_essential"),
+    (
+        "BU_ATCC8492",
+        "contig_1",
+        "BU_00001",
+        100,
+        5000,
+        "essential",
+    ),  # long gene spanning the others
+    ("BU_ATCC8492", "contig_1", "BU_00002", 300, 600, "essential_liquid"),
+    ("BU_ATCC8492", "contig_1", "BU_00004", 6000, 6500, None),
+    ("BU_ATCC8492", "Contig_2", "BU_00005", 10, 20, "essential"),
+    ("PV_H4-2", "contig_1", "PV_00001", 1, 50, "essential"),
+]
+
+
+def test_region_queries_bisect_sorted_intervals():
+    index = EssentialityIndex.from_records(RECORDS)
+    assert index.calls == [None, "not_essential", "essential", "essential_liquid"]
+    assert index.contigs["BU_ATCC8492"]["contig_1"].codes.dtype.itemsize == 1
+
+    def tags(start=None, end=None, ref="contig_1"):
+        return list(index.region("BU_ATCC8492", ref, start, end) or {})
+
+    assert tags() == ["BU_00001", "BU_00002", "BU_00003", "BU_00004"]
+    assert tags(700, 800) == ["BU_00001"]
+    assert tags(600, 900) == ["BU_00001", "BU_00002", "BU_00003"]  # inclusive at both ends
+    assert tags(5001, 5999) == []
+    assert tags(6500, 9000) == ["BU_00004"]
+    assert tags(ref=" CONTIG_2 ") == ["BU_00005"]
+    assert index.region("BU_ATCC8492", "contig_9") is None
+
+    assert index.region("BU_ATCC8492", "contig_1", 6000, 6000)["BU_00004"] == {
+        "locus_tag": "BU_00004",
+        "start": 6000,
+        "end": 6500,
+        "essentiality": None,
+    }
+
+
+def test_service_serves_track_from_index():
+    service = EssentialityService()
+    service.essentiality_index = EssentialityIndex.from_records(RECORDS)
+
+    region = asyncio.run(
+        service.get_essentiality_data_by_strain_and_ref("BU_ATCC8492", "contig_1", 250, 350)
+    )
+    assert {tag: gene["essentiality"] for tag, gene in region.items()} == {
+        "BU_00001": "essential",
+        "BU_00002": "essential_liquid",
+    }
+    assert (
+        asyncio.run(service.get_essentiality_data_by_strain_and_ref("BU_UNKNOWN", "contig_1")) == {}
+    )
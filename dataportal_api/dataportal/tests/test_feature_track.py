@@ -0,0 +1,121 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from dataportal.services.core.feature_track import MAX_TRACK_BINS, FeatureTrackStore
+from dataportal.services.core.gene_service import GeneService
+from dataportal.utils.exceptions import ValidationError
+from dataportal.utils.intervals import SortedIntervals
+
+
+def _gene(n, start, end, strand="+", **flags):
+    return {
+        "feature_id": f"BU_ATCC8492_{n:05d}",
+        "locus_tag": f"BU_ATCC8492_{n:05d}",
+        "feature_type": "gene",
+        "seq_id": "contig_1",
+        "start": start,
+        "end": end,
+        "strand": strand,
+        **flags,
+    }
+
+
+DOCS = [
+    _gene(3, 2000, 2600, "-", has_fitness=True),
+    _gene(1, 1, 900, has_essentiality=True, essentiality_data=[{"essentiality_call": "essential"}]),
+    _gene(2, 950, 1800, has_essentiality=True, has_proteomics=True, essentiality="not_essential"),
+    {
+        "feature_id": "IG-between-BU_ATCC8492_00002-and-BU_ATCC8492_00003",
+        "feature_type": "IG",
+        "seq_id": "contig_1",
+        "start": 1801,
+        "end": 1999,
+    },
+    {**_gene(4, 10, 40), "seq_id": "contig_2"},
+]
+
+
+def _service():
+    store = FeatureTrackStore("feature_index", ttl=float("inf"))  # never checks the index
+    store.load("BU_ATCC8492", DOCS)
+    return GeneService(tracks=store)
+
+
+def test_region_features_with_portal_flags():
+    service = _service()
+
+    track = asyncio.run(service.get_feature_track("BU_ATCC8492", "CONTIG_1", 850, 1000))
+    assert (track["seq_id"], track["total"], track["bin_size"]) == ("contig_1", 2, None)
+    first, second = track["features"]
+    assert (
+        first["locus_tag"],
+        first["essentiality"],
+        first["has_essentiality"],
+        first["has_fitness"],
+    ) == (
+        "BU_ATCC8492_00001",
+        "essential",
+        True,
+        False,
+    )
+    assert (second["essentiality"], second["has_proteomics"], second["strand"]) == (
+        "not_essential",
+        True,
+        "+",
+    )
+
+    genes = asyncio.run(
+        service.get_feature_track("BU_ATCC8492", "contig_1", 1700, 2100, feature_types=["GENE"])
+    )
+    assert [f["locus_tag"] for f in genes["features"]] == ["BU_ATCC8492_00002", "BU_ATCC8492_00003"]
+    assert asyncio.run(service.get_feature_track("BU_ATCC8492", "contig_9")) is None
+    with pytest.raises(ValidationError):
+        asyncio.run(service.get_feature_track("BU_ATCC8492", "contig_1", 10, 5))
+
+
+def test_binned_density_at_low_zoom():
+    service = _service()
+    track = asyncio.run(
+        service.get_feature_track("BU_ATCC8492", "contig_1", 1, 2600, bin_size=1000)
+    )
+    assert track["features"] == []
+    assert [
+        (b["start"], b["end"], b["count"], b["has_essentiality"], b["has_fitness"])
+        for b in track["bins"]
+    ] == [
+        (1, 1000, 2, 2, 0),
+        (1001, 2000, 3, 1, 1),
+        (2001, 2600, 1, 0, 1),
+    ]
+
+    # same counts straight from the interval arrays, against a brute-force overlap count
+    rng = np.random.default_rng(0)
+    starts = rng.integers(1, 10_000, 300)
+    ends = starts + rng.integers(0, 800, 300)
+    edges, counts, _ = SortedIntervals(starts, ends).density(500, 9_000, 250)
+    expected = [int(((starts <= min(e + 249, 9_000)) & (ends >= e)).sum()) for e in edges]
+    assert counts.tolist() == expected
+
+
+def test_window_clamped_and_bins_capped():
+    service = _service()
+    track = asyncio.run(
+        service.get_feature_track("BU_ATCC8492", "contig_1", 1, 2_000_000_000, bin_size=1)
+    )
+    assert track["end"] == 2600  # last feature end
+    assert track["bin_size"] == 2 and len(track["bins"]) == 1300
+    assert len(track["bins"]) <= MAX_TRACK_BINS
+
+    past = asyncio.run(
+        service.get_feature_track("BU_ATCC8492", "contig_1", 5000, 9000, bin_size=10)
+    )
+    assert (past["total"], past["features"], past["bins"]) == (0, [], [])
+
+
+def test_unknown_isolate_is_not_cached():
+    store = FeatureTrackStore("feature_index", ttl=float("inf"), max_isolates=1)
+    store.load("BU_ATCC8492", DOCS)
+    assert store.load("NO_SUCH_ISOLATE", []).feature_count == 0
+    assert list(store._isolates) == ["BU_ATCC8492"]
@@ -0,0 +1,89 @@
+import asyncio
+import io
+
+import numpy as np
+import pytest
+
+from dataportal.ingest.feature.fitness_matrix import FitnessMatrixBuilder
+from dataportal.services.experimental.fitness_data_service import FitnessDataService
+from dataportal.utils.exceptions import ValidationError
+from dataportal.utils.fitness_matrix import FitnessMatrixStore, cluster_order, current_build
+
+CSV = (
+    "locus_tag,experimental_condition,contrast,lfc,fdr,number_of_barcodes\n"
+    "BU_ATCC8492_00001,Bile,bile_vs_t0,1.5,0.01,12\n"
+    "BU_ATCC8492_00001,Iron,iron_vs_t0,-0.3,0.5,\n"
+    "BU_ATCC8492_00002,Bile,bile_vs_t0,1.4,0.02,9\n"
+    "BU_ATCC8492_00002,Iron,iron_vs_t0,-0.2,,7\n"
+    "BU_ATCC8492_00003,Bile,bile_vs_t0,-2.0,0.001,4\n"
+    "BU_ATCC8492_00003,Iron,iron_vs_t0,0.9,0.04,4\n"
+    "BU_ATCC8492_00004,Iron,iron_vs_t0,0.8,0.2,3\n"
+    "IG-between-BU_ATCC8492_00001-and-BU_ATCC8492_00002,Bile,bile_vs_t0,0.1,0.9,2\n"
+)
+
+
+def _build(tmp_path):
+    path = tmp_path / "fitness.csv"
+    path.write_text(CSV)
+    builder = FitnessMatrixBuilder()
+    assert builder.add_csv(str(path)) == 7
+    builder.write(str(tmp_path / "matrix"))
+    return builder, FitnessMatrixStore(str(tmp_path / "matrix"), ttl=0)
+
+
+def test_matrix_slices_genes_and_contrasts(tmp_path):
+    _, store = _build(tmp_path)
+    service = FitnessDataService(matrices=store)
+
+    matrix, sliced = asyncio.run(
+        service.get_matrix(
+            identifiers=["BU_ATCC8492_00003", "BU_ATCC8492_00001", "BU_X_1"],
+            contrasts=["iron_vs_t0", "nope"],
+            values=("lfc", "fdr", "barcodes"),
+        )
+    )
+    assert matrix.shape == (4, 2)
+    data = service.matrix_to_schema(matrix, sliced)
+    assert [g.locus_tag for g in data.genes] == ["BU_ATCC8492_00003", "BU_ATCC8492_00001"]
+    assert (data.contrasts, data.conditions) == (["iron_vs_t0"], ["Iron"])
+    assert (data.lfc, data.fdr, data.barcodes) == ([[0.9], [-0.3]], [[0.04], [0.5]], [[4], [None]])
+    assert (data.missing_genes, data.missing_contrasts) == (["BU_X_1"], ["nope"])
+
+    # every gene, both contrasts; 00004 has no bile value
+    matrix, sliced = asyncio.run(service.get_matrix(isolate="BU_ATCC8492"))
+    assert service.matrix_to_schema(matrix, sliced).lfc[3] == [None, 0.8]
+
+    with np.load(io.BytesIO(service.matrix_to_npz(matrix, sliced))) as npz:
+        assert npz["locus_tags"].tolist()[0] == "BU_ATCC8492_00001"
+        assert npz["lfc"].dtype == np.float32 and npz["lfc"].shape == (4, 2)
+
+    with pytest.raises(ValidationError):
+        asyncio.run(service.get_matrix(identifiers=["unknown_tag"]))
+
+
+def test_cluster_order_groups_similar_profiles_and_rebuild_switches(tmp_path):
+    profiles = np.array(
+        [[1, 2, 3, 4], [-1, -2, -3, -4], [1.1, 2, 3.2, 4], [-1, -2.1, -3, -4.2]], dtype=np.float32
+    )
+    order = cluster_order(profiles).tolist()
+    assert sorted(order) == [0, 1, 2, 3]
+    assert abs(order.index(0) - order.index(2)) == 1 and abs(order.index(1) - order.index(3)) == 1
+
+    builder, store = _build(tmp_path)
+    first = store.get("BU_ATCC8492")
+    builder.add("BU_ATCC8492", "BU_ATCC8492_00005", "bile_vs_t0", lfc=0.1)
+    builder.write(str(tmp_path / "matrix"))
+    assert current_build(str(tmp_path / "matrix"), "BU_ATCC8492") != first.path
+    assert store.get("BU_ATCC8492").shape == (5, 2)
+
+
+def test_store_rejects_path_names_and_does_not_cache_misses(tmp_path):
+    _, store = _build(tmp_path)
+    (tmp_path / "outside").mkdir()
+    (tmp_path / "outside" / "CURRENT").write_text("x")
+    for name in ("../outside", "..", "BU_ATCC8492/../../outside", "/tmp"):
+        assert current_build(str(tmp_path / "matrix"), name) is None
+        assert store.get(name) is None
+    assert store.get("NO_SUCH_ISOLATE") is None
+    assert store.get("BU_ATCC8492") is not None
+    assert list(store._matrices) == ["BU_ATCC8492"]
@@ -0,0 +1,101 @@
+import ftplib
+from unittest.mock import patch
+
+import pytest
+
+from dataportal.ingest.ftp_cache import FTPArtifactCache, closing_ftp_caches, get_ftp_cache
+
+
+class FakeFTP:
+    def __init__(self, files):
+        self.files = files  # remote -> (bytes, mdtm)
+        self.downloads = []
+        self.closed = False
+
+    def voidcmd(self, cmd):
+        if cmd.startswith("MDTM "):
+            remote = cmd[5:]
+            if remote not in self.files:
+                raise ftplib.error_perm("550 not found")
+            return f"213 {self.files[remote][1]}"
+        return "200 OK"
+
+    def size(self, remote):
+        if remote not in self.files:
+            raise ftplib.error_perm("550 not found")
+        return len(self.files[remote][0])
+
+    def retrbinary(self, cmd, callback):
+        remote = cmd[5:]
+        if remote not in self.files:
+            raise ftplib.error_perm("550 not found")
+        self.downloads.append(remote)
+        callback(self.files[remote][0])
+
+    def quit(self):
+        self.closed = True
+
+
+def test_fetch_reuses_cached_copy_until_remote_changes(tmp_path):
+    ftp = FakeFTP({"/a/x.gff": (b"##gff-version 3\n", "20240415000000")})
+    cache = FTPArtifactCache("ftp.example.org", cache_dir=str(tmp_path))
+
+    first = cache.fetch("/a/x.gff", ftp=ftp)
+    second = cache.fetch("/a/x.gff", ftp=ftp)
+    assert first == second
+    assert open(first, "rb").read() == b"##gff-version 3\n"
+    assert ftp.downloads == ["/a/x.gff"]
+
+    ftp.files["/a/x.gff"] = (b"##gff-version 3\n#changed\n", "20250101000000")
+    third = cache.fetch("/a/x.gff", ftp=ftp)
+    assert third != first
+    assert ftp.downloads == ["/a/x.gff", "/a/x.gff"]
+
+
+def test_prefetch_downloads_in_parallel_and_reports_missing(tmp_path):
+    files = {f"/a/{i}.faa": (f">p{i}\nMK\n".encode(), "20240415000000") for i in range(6)}
+    cache = FTPArtifactCache("ftp.example.org", cache_dir=str(tmp_path), max_connections=3)
+
+    with patch.object(FTPArtifactCache, "_connect", side_effect=lambda: FakeFTP(files)) as connect:
+        paths = cache.prefetch([*files, "/a/missing.faa"])
+
+    assert paths["/a/missing.faa"] is None
+    assert all(paths[r] and open(paths[r], "rb").read() == files[r][0] for r in files)
+    assert connect.call_count <= 3
+
+
+def test_prefetch_reuses_connections_until_closed(tmp_path):
+    files = {f"/a/{i}.faa": (f">p{i}\nMK\n".encode(), "20240415000000") for i in range(6)}
+    connections = []
+
+    def connect():
+        connections.append(FakeFTP(files))
+        return connections[-1]
+
+    with patch.object(FTPArtifactCache, "_connect", side_effect=connect):
+        with FTPArtifactCache(
+            "ftp.example.org", cache_dir=str(tmp_path), max_connections=2
+        ) as cache:
+            cache.prefetch(list(files)[:3])
+            cache.prefetch(list(files)[3:])
+            cache.prefetch(files)
+            assert len(connections) <= 2
+            assert not any(ftp.closed for ftp in connections)
+            assert (cache.hits, cache.misses) == (6, 6)
+
+    assert connections and all(ftp.closed for ftp in connections)
+
+
+def test_commands_close_the_shared_caches(tmp_path):
+    cache = get_ftp_cache("ftp.closing.example.org")
+    ftp = FakeFTP({})
+
+    @closing_ftp_caches
+    def handle():
+        cache._local.ftp = ftp
+        cache._connections.append(ftp)
+        raise RuntimeError("import failed")
+
+    with pytest.raises(RuntimeError):
+        handle()
+    assert ftp.closed and cache._connections == []
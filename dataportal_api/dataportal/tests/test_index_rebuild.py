@@ -0,0 +1,91 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from dataportal.elasticsearch.indexing import ProjectIndexManager
+from dataportal.models import FeatureDocument, ProteinProteinDocument
+
+
+@pytest.fixture
+def es():
+    client = MagicMock()
+    aliases = {"feature_index": ["feature_index-2025.01.01"]}
+    client.indices.exists_alias.side_effect = lambda name: name in aliases
+    client.indices.get_alias.side_effect = lambda name: {n: {} for n in aliases[name]}
+    client.indices.exists.side_effect = lambda index: index == "ppi_index"
+    client.indices.get_settings.side_effect = lambda index, **kw: {
+        name: {"settings": {"index": {"creation_date": str(created)}}}
+        for name, created in {
+            "feature_index-2024.12.01": 1,
+            "feature_index-2025.01.01": 2,
+            "feature_index-2025.02.01.1": 4,
+            "feature_index-2025.02.01": 3,
+        }.items()
+        if index == "feature_index-*"
+    }
+    with patch("dataportal.elasticsearch.indexing.connections.get_connection", return_value=client):
+        yield client
+
+
+def test_aliases_swap_in_one_atomic_call(es):
+    pim = ProjectIndexManager([FeatureDocument, ProteinProteinDocument])
+    targets = {"feature_index": "feature_index-2025.02.01", "ppi_index": "ppi_index-2025.02.01"}
+
+    with pytest.raises(RuntimeError, match="concrete index"):
+        pim.swap_aliases(targets)
+    es.indices.update_aliases.assert_not_called()
+
+    previous = pim.swap_aliases(targets, replace_concrete=True)
+    assert previous == {"feature_index": ["feature_index-2025.01.01"], "ppi_index": ["ppi_index"]}
+    es.indices.update_aliases.assert_called_once_with(
+        actions=[
+            {"remove": {"index": "feature_index-2025.01.01", "alias": "feature_index"}},
+            {"remove_index": {"index": "ppi_index"}},
+            {"add": {"index": "feature_index-2025.02.01", "alias": "feature_index"}},
+            {"add": {"index": "ppi_index-2025.02.01", "alias": "ppi_index"}},
+        ]
+    )
+
+
+def test_retire_keeps_newest_and_live_versions(es):
+    pim = ProjectIndexManager([FeatureDocument])
+    # newest by creation date is the .1 rebuild, even though it sorts first by name
+    assert pim.retire(keep=1, dry_run=True) == [
+        "feature_index-2024.12.01",
+        "feature_index-2025.02.01",
+    ]
+
+
+def test_current_versions_follow_aliases_and_writes(es):
+    es.indices.get_alias.side_effect = lambda **kw: {
+        "feature_index_v1": {"aliases": {"feature_index": {}}},
+        "ppi_index": {"aliases": {}},
+    }
+    counts = {"docs": 10}
+    es.indices.stats.side_effect = lambda index, metric: {
+        "indices": {
+            "feature_index_v1": {
+                "uuid": "u1",
+                "primaries": {
+                    "docs": {"count": counts["docs"], "deleted": 0},
+                    "indexing": {"index_total": 10, "delete_total": 0},
+                },
+            },
+            "ppi_index": {
+                "uuid": "u2",
+                "primaries": {
+                    "docs": {"count": 5, "deleted": 0},
+                    "indexing": {"index_total": 5, "delete_total": 0},
+                },
+            },
+        }
+    }
+    pim = ProjectIndexManager([FeatureDocument, ProteinProteinDocument])
+
+    before = pim.current_versions()
+    assert before == {
+        "feature_index": ["feature_index_v1@u1:10:0:10:0"],
+        "ppi_index": ["ppi_index@u2:5:0:5:0"],
+    }
+    counts["docs"] = 11  # in-place re-ingest into the same index
+    assert pim.current_versions()["feature_index"] != before["feature_index"]
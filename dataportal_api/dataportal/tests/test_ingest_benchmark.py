@@ -0,0 +1,31 @@
+from dataportal.ingest.benchmark.harness import compare, run_benchmark
+from dataportal.ingest.benchmark.sinks import FakeBulkSink
+from dataportal.ingest.benchmark.synthetic import SyntheticScale, generate
+
+TINY = SyntheticScale(
+    isolates=2, genes_per_isolate=20, fitness_conditions=2, ortholog_pairs=30, ppi_pairs=40
+)
+
+
+def test_flows_run_against_fake_sink(tmp_path):
+    inputs = generate(str(tmp_path), TINY)
+    results = {
+        r.flow: r
+        for r in run_benchmark(
+            inputs, FakeBulkSink(), flows=["gff_genes", "fitness", "ppi"], isolated=False
+        )
+    }
+
+    assert not any(r.error for r in results.values())
+    assert all(r.bulk_requests > 0 and r.bulk_bytes > 0 for r in results.values())
+    # one gene doc per GFF gene, one grouped update per gene, one doc per (distinct) pair
+    assert results["gff_genes"].bulk_actions == 40
+    assert results["fitness"].rows == 80 and results["fitness"].bulk_actions == 40
+    assert 0 < results["ppi"].bulk_actions <= 40
+
+
+def test_compare_reports_rows_per_sec_change(tmp_path):
+    inputs = generate(str(tmp_path), TINY)
+    [result] = run_benchmark(inputs, FakeBulkSink(), flows=["orthologs"], isolated=False)
+    baseline = {"orthologs": {"rows_per_sec": result.rows_per_sec * 2}}
+    assert round(compare([result], baseline)["orthologs"]) == -50
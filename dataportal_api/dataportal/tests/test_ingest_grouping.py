@@ -0,0 +1,65 @@
+from unittest.mock import patch
+
+from dataportal.ingest.feature.flows.base import NestedGroupWriter
+from dataportal.ingest.feature.flows.fitness import Fitness
+
+
+def _collect(sent):
+    """bulk_exec stand-in: records the actions, reports them all indexed."""
+
+    def bulk(actions):
+        sent.extend(actions)
+        return len(actions), []
+
+    return bulk
+
+
+def test_writer_groups_and_dedups_per_document():
+    sent = []
+    with patch("dataportal.ingest.feature.flows.base.bulk_exec", side_effect=_collect(sent)):
+        writer = NestedGroupWriter("feature_index", "dbxref", keys=["db", "ref"])
+        writer.add("g1", {"db": "STRING", "ref": "a"}, {"feature_id": "g1"})
+        writer.add("g1", {"db": "STRING", "ref": "a"})
+        writer.add("g1", {"db": "STRING", "ref": "b"})
+        writer.add("g2", {"db": "STRING", "ref": "a"}, {"feature_id": "g2"})
+        assert writer.flush() == 2
+
+    by_id = {a["_id"]: a for a in sent}
+    assert [e["ref"] for e in by_id["g1"]["script"]["params"]["entries"]] == ["a", "b"]
+    assert by_id["g1"]["script"]["params"]["base"] == {"feature_id": "g1"}
+    assert by_id["g1"]["scripted_upsert"] is True
+
+
+def test_writer_dedups_whole_entries_with_nested_values():
+    sent = []
+    with patch("dataportal.ingest.feature.flows.base.bulk_exec", side_effect=_collect(sent)):
+        writer = NestedGroupWriter("feature_index", "proteomics")
+        entry = {"evidence": True, "peptides": ["MKV", "LLA"], "source": {"study": "PXD1"}}
+        writer.add("g1", entry)
+        writer.add(
+            "g1", {"source": {"study": "PXD1"}, "peptides": ["MKV", "LLA"], "evidence": True}
+        )
+        writer.add("g1", {**entry, "peptides": ["MKV"]})
+        assert writer.flush() == 1
+
+    assert len(sent[0]["script"]["params"]["entries"]) == 2
+
+
+def test_fitness_writes_one_update_per_gene(tmp_path):
+    csv = tmp_path / "fitness.csv"
+    csv.write_text(
+        "locus_tag,contrast,lfc,fdr\n"
+        "BU_ATCC8492_00001,c1,1.5,0.01\n"
+        "BU_ATCC8492_00001,c2,-0.5,0.2\n"
+        "BU_ATCC8492_00002,c1,0.1,0.9\n"
+    )
+    sent = []
+    with patch("dataportal.ingest.feature.flows.base.bulk_exec", side_effect=_collect(sent)):
+        Fitness().run(str(csv))
+
+    assert len(sent) == 2
+    first = next(a for a in sent if a["_id"] == "BU_ATCC8492_00001")
+    params = first["script"]["params"]
+    assert [e["contrast"] for e in params["entries"]] == ["c1", "c2"]
+    assert params["flag_field"] == "has_fitness"
+    assert params["base"]["feature_type"] == "gene"
@@ -0,0 +1,73 @@
+from unittest.mock import patch
+
+import pandas as pd
+
+from dataportal.ingest.ortholog.flows.orthologs import Orthologs
+from dataportal.ingest.utils import read_table_chunks
+
+
+def _collect(sent):
+    """bulk_exec stand-in: records the actions, reports them all indexed."""
+
+    def bulk(actions):
+        sent.extend(actions)
+        return len(actions), []
+
+    return bulk
+
+
+def test_read_table_chunks_falls_back_without_repeating_rows(tmp_path):
+    path = tmp_path / "t.tsv"
+    path.write_text("a\tb\n" + "".join(f"x{i}\t{i}\n" for i in range(10)))
+    real_read_csv = pd.read_csv
+
+    def flaky_c_engine(*args, **kwargs):
+        reader = real_read_csv(*args, **kwargs)
+        if kwargs["engine"] != "c":
+            return reader
+
+        def chunks():
+            yield next(iter(reader))
+            raise pd.errors.ParserError("Error tokenizing data")
+
+        return chunks()
+
+    with patch("dataportal.ingest.utils.pd.read_csv", side_effect=flaky_c_engine):
+        chunks = list(read_table_chunks(str(path), chunksize=4, sep="\t"))
+
+    assert [len(c) for c in chunks] == [4, 4, 2]
+    assert pd.concat(chunks)["a"].tolist() == [f"x{i}" for i in range(10)]
+
+
+def test_orthologs_build_one_doc_per_canonical_pair(tmp_path):
+    path = tmp_path / "orthologs.tsv"
+    path.write_text(
+        "# OMA pairs\n"
+        "1\t2\tBU_909_00001 Chromosomal replication initiator protein DnaA\tBU_61_00001\t1:1\t42\n"
+        "3\t4\tBU_61_00001\tBU_909_00001\t\t\n"
+        "5\t6\tPV_ATCC8482_00007\tBU_61_00002 Kinase\tmany:1\tnot-a-number\n"
+        "7\t8\t\tBU_61_00003\t1:1\t1\n"
+    )
+    sent = []
+    with patch("dataportal.ingest.ortholog.flows.orthologs.bulk_exec", side_effect=_collect(sent)):
+        Orthologs(index_name="ortholog_index").run(str(path))
+
+    docs = {a["_id"]: a["_source"] for a in sent}
+    assert set(docs) == {"BU_61_00001__BU_909_00001", "BU_61_00002__PV_ATCC8482_00007"}
+    dnaa = docs["BU_61_00001__BU_909_00001"]
+    assert (dnaa["gene_a"], dnaa["gene_a_desc"]) == (
+        "BU_909_00001",
+        "Chromosomal replication initiator protein DnaA",
+    )
+    assert (dnaa["orthology_type"], dnaa["is_one_to_one"], dnaa["oma_group_id"]) == (
+        "1:1",
+        True,
+        42,
+    )
+    assert (dnaa["isolate_a"], dnaa["isolate_b"], dnaa["same_species"]) == ("BU_909", "BU_61", True)
+    cross = docs["BU_61_00002__PV_ATCC8482_00007"]
+    assert (cross["species_a_acronym"], cross["same_species"], cross["oma_group_id"]) == (
+        "PV",
+        False,
+        None,
+    )
@@ -0,0 +1,67 @@
+from unittest.mock import patch
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from dataportal.middleware import IndexVersionETagMiddleware
+
+VERSIONS = {
+    "feature_index": ["feature_index-2025.09.03@abc"],
+    "strain_index": ["strain_index-2025.09.03@def"],
+}
+
+
+@pytest.fixture
+def middleware():
+    mw = IndexVersionETagMiddleware(lambda request: HttpResponse("ok"))
+    mw.enabled = True
+    mw.max_age = 300
+    mw.version_ttl = 60
+    return mw
+
+
+@pytest.fixture(autouse=True)
+def index_versions():
+    with patch.object(IndexVersionETagMiddleware, "_index_versions", return_value=VERSIONS) as m:
+        yield m
+
+
+class TestIndexVersionETagMiddleware:
+    def test_sets_etag_and_cache_control(self, middleware):
+        request = RequestFactory().get("/api/genes/search", {"query": "dnaA"})
+        response = middleware(request)
+
+        assert response.status_code == 200
+        assert response["ETag"].startswith('"')
+        assert "max-age=300" in response["Cache-Control"]
+        assert "public" in response["Cache-Control"]
+
+    def test_returns_304_on_matching_if_none_match(self, middleware):
+        first = middleware(RequestFactory().get("/api/genes/search", {"query": "dnaA"}))
+        request = RequestFactory().get(
+            "/api/genes/search", {"query": "dnaA"}, HTTP_IF_NONE_MATCH=first["ETag"]
+        )
+        response = middleware(request)
+
+        assert response.status_code == 304
+        assert response["ETag"] == first["ETag"]
+
+    def test_query_parameter_order_does_not_change_etag(self, middleware):
+        a = middleware(RequestFactory().get("/api/genes/search?a=1&b=2"))
+        b = middleware(RequestFactory().get("/api/genes/search?b=2&a=1"))
+        assert a["ETag"] == b["ETag"]
+
+    def test_index_version_change_changes_etag(self, middleware, index_versions):
+        first = middleware(RequestFactory().get("/api/genes/search"))
+        index_versions.return_value = {
+            **VERSIONS,
+            "feature_index": ["feature_index-2025.10.01@xyz"],
+        }
+        second = middleware(RequestFactory().get("/api/genes/search"))
+        assert first["ETag"] != second["ETag"]
+
+    def test_untracked_paths_are_left_alone(self, middleware):
+        for path in ("/api/health", "/api/ppi/string-network", "/api/docs"):
+            response = middleware(RequestFactory().get(path))
+            assert not response.has_header("ETag")
@@ -0,0 +1,88 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from elasticsearch import NotFoundError
+from ninja.errors import HttpError
+
+from dataportal.api.core import genome_endpoints
+from dataportal.elasticsearch.pagination import (
+    decode_cursor,
+    encode_cursor,
+    fetch_cursor_page,
+    iter_pit_batches,
+)
+from dataportal.schema.core.genome_schemas import GetAllGenomesQuerySchema
+from dataportal.utils.constants import CURSOR_START
+from dataportal.utils.exceptions import ValidationError
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(["BU_ATCC8492_00001", 42], pit_id="pit-abc")
+    assert decode_cursor(cursor) == (["BU_ATCC8492_00001", 42], "pit-abc")
+
+
+def test_cursor_start_has_no_position():
+    assert decode_cursor(CURSOR_START) == (None, None)
+
+
+def test_invalid_cursor_raises_validation_error():
+    with pytest.raises(ValidationError):
+        decode_cursor("not-a-cursor")
+
+
+def test_iter_pit_batches_walks_search_after_and_closes_pit():
+    docs = [{"_source": {"locus_tag": f"g{i}"}, "sort": [f"g{i}", i]} for i in range(5)]
+    client = MagicMock()
+    client.open_point_in_time.return_value = {"id": "pit-1"}
+
+    def search(**kwargs):
+        start = 0
+        if "search_after" in kwargs:
+            start = kwargs["search_after"][1] + 1
+        return {"pit_id": "pit-1", "hits": {"hits": docs[start : start + kwargs["size"]]}}
+
+    client.search.side_effect = search
+
+    with patch(
+        "dataportal.elasticsearch.pagination.connections.get_connection", return_value=client
+    ):
+        batches = list(
+            iter_pit_batches(
+                "feature_index", {"match_all": {}}, [{"locus_tag": "asc"}], batch_size=2
+            )
+        )
+
+    assert [len(b) for b in batches] == [2, 2, 1]
+    assert [h["_source"]["locus_tag"] for b in batches for h in b] == [f"g{i}" for i in range(5)]
+    client.close_point_in_time.assert_called_once_with(id="pit-1")
+
+
+def test_expired_pit_raises_validation_error():
+    search = MagicMock()
+    page = search.index.return_value.extra.return_value
+    page.extra.return_value = page
+    page.execute.side_effect = NotFoundError(
+        "search_context_missing_exception", meta=MagicMock(status=404), body={}
+    )
+
+    with pytest.raises(ValidationError, match="expired"):
+        fetch_cursor_page(
+            "strain_index", search, 10, encode_cursor(["BU_ATCC8492"], pit_id="pit-gone")
+        )
+
+    # without a PIT from the cursor the error is not the client's
+    with patch("dataportal.elasticsearch.pagination.open_pit", return_value="pit-new"):
+        with pytest.raises(NotFoundError):
+            fetch_cursor_page("strain_index", search, 10, CURSOR_START)
+
+
+def test_bad_cursor_is_a_400():
+    error = ValidationError("Invalid pagination cursor: 'x'")
+    with patch.object(genome_endpoints.genome_service, "get_genomes", AsyncMock(side_effect=error)):
+        with pytest.raises(HttpError) as raised:
+            asyncio.run(
+                genome_endpoints.get_all_genomes(None, GetAllGenomesQuerySchema(cursor="x"))
+            )
+    assert raised.value.status_code == 400
@@ -0,0 +1,77 @@
+from dataportal.ingest.delta import doc_fingerprint
+from dataportal.ingest.es_repo import PPIIndexRepository
+from dataportal.ingest.ppi.flows.ppi_csv import PPICSVFlow
+from dataportal.ingest.ppi.gff_parser import GeneInfo, GFFParser
+from dataportal.ingest.ppi.parsing import iter_ppi_file_frames, iter_ppi_file_rows
+
+SPECIES_MAP = {"Bacteroides uniformis": "BU_ATCC8492"}
+
+CSV = (
+    "species,id,protein_a,protein_b,ds_score,tt_score,perturb_score,gp_score,melt_score,"
+    "sec_score,bn_score,string_physical_score,operon_score,ecocyc_score,xlms_peptides,xlms_files\n"
+    'Bacteroides uniformis,1,Q1,A7V2E8,0.5,NA,,1e-3, 0.2 ,nan,x,0.9,,1,PEP,"f1, f2"\n'
+    "Bacteroides uniformis,2,BU_ATCC8492_00003,ZZZ,,,,,,,,,,,,\n"
+    "Bacteroides uniformis,3,,ZZZ,,,,,,,,,,,,\n"
+    "Phocaeicola vulgatus,4,A,A,1,,,,,,,,,,,\n"
+    ",5,B,A,1,,,,,,,,,,,\n"
+)
+
+
+def _setup(tmp_path):
+    parser = GFFParser(annotation_store=str(tmp_path / "genes.sqlite"))
+    parser.store.add_isolate(
+        "BU_ATCC8492",
+        [
+            GeneInfo(
+                locus_tag="BU_ATCC8492_00001",
+                uniprot_id="A7V2E8",
+                name="dnaA",
+                start=1,
+                end=900,
+                strand="+",
+            ),
+            GeneInfo(
+                locus_tag="BU_ATCC8492_00002", uniprot_id="Q1", start=950, end=1900, product="x"
+            ),
+            GeneInfo(locus_tag="BU_ATCC8492_00003"),
+        ],
+    )
+    parser.set_species_mapping(SPECIES_MAP)
+    path = tmp_path / "bu.csv"
+    path.write_text(CSV)
+    return parser, str(path)
+
+
+def test_columnar_actions_match_row_path(tmp_path):
+    parser, path = _setup(tmp_path)
+    for gff_parser in (None, parser):
+        flow = PPICSVFlow(
+            repo=PPIIndexRepository("ppi_index"),
+            species_map=SPECIES_MAP,
+            gff_parser=gff_parser,
+            string_map={"A7V2E8": "string_a", "BU_ATCC8492_00003": "string_b"},
+        )
+        rows = [a for a in map(flow._row_to_action, iter_ppi_file_rows(path, gff_parser)) if a]
+        cols = [
+            a for f in iter_ppi_file_frames(path, chunksize=2) for a in flow._frame_to_actions(f)
+        ]
+
+        assert cols == rows
+        assert [doc_fingerprint(a["_source"]) for a in cols] == [
+            doc_fingerprint(a["_source"]) for a in rows
+        ]
+
+    src = cols[0]["_source"]
+    assert src["participants_locus_tag_sorted"] == ["BU_ATCC8492_00001", "BU_ATCC8492_00002"]
+    assert (src["tt_score"], src["abundance_score"], src["xlms_files"]) == (
+        None,
+        0.001,
+        ["f1", "f2"],
+    )
+
+
+def test_frames_resume_after_skipped_rows(tmp_path):
+    _, path = _setup(tmp_path)
+    frames = list(iter_ppi_file_frames(path, chunksize=2, skip_rows=3))
+    assert [len(f) for f in frames] == [2]
+    assert frames[0]["protein_a"].tolist() == ["A", "B"]
@@ -1,6 +1,13 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
 from django.http import HttpResponse
+from django.test import RequestFactory
 
+from dataportal.api.core import gene_endpoints
+from dataportal.schema.core.gene_schemas import GeneDownloadTSVQuerySchema
 from dataportal.schema.response_schemas import SuccessResponseSchema
+from dataportal.services.core.gene_service import GeneService
 from dataportal.utils.response_wrappers import wrap_success_response
 from dataportal.utils.serialization import serialize_to_tsv
 
@@ -123,3 +130,55 @@ def test_serialize_to_tsv_handles_records_without_arrays():
     assert lines[0] == "gene\tvalue"
     assert "A" in lines[1]
     assert "B" in lines[2]
+
+
+def test_gene_tsv_export_row():
+    # pinned to the output of the schema-based export: empty lists print as [],
+    # a missing AMR subclass as (None)
+    row = GeneService.format_tsv_row(
+        {
+            "isolate_name": "BU_ATCC8492",
+            "gene_name": "susC",
+            "seq_id": "contig_1",
+            "locus_tag": "BU_ATCC8492_00001",
+            "product": "TonB-dependent\treceptor",
+            "pfam": ["PF00593", "PF07715"],
+            "amr": [
+                {"drug_class": "BETA-LACTAM", "drug_subclass": "CEPHALOSPORIN"},
+                {"drug_class": "TETRACYCLINE"},
+                {"drug_subclass": "ignored without a class"},
+            ],
+        }
+    )
+    assert row == (
+        "BU_ATCC8492\tsusC\t[]\tcontig_1\tBU_ATCC8492_00001\tTonB-dependent receptor\t\tUnknown\t"
+        "PF00593; PF07715\t[]\t[]\t[]\t[]\tBETA-LACTAM(CEPHALOSPORIN); TETRACYCLINE(None)\tgene\n"
+    )
+
+
+def test_gene_tsv_export_streams_synchronously_under_wsgi():
+    batches = [
+        [{"_source": {"locus_tag": f"BU_ATCC8492_{i:05d}"}} for i in range(start, start + 2)]
+        for start in (1, 3)
+    ]
+    request = RequestFactory().get("/api/genes/download/tsv")
+    with (
+        patch.object(
+            gene_endpoints.gene_service, "export_search", AsyncMock(return_value=({}, []))
+        ),
+        patch(
+            "dataportal.services.core.gene_service.iter_pit_batches", return_value=iter(batches)
+        ) as pit,
+    ):
+        response = asyncio.run(
+            gene_endpoints.download_genes_tsv(request, GeneDownloadTSVQuerySchema())
+        )
+        # a sync iterator: WSGI sends it chunk by chunk instead of collecting it first
+        assert not response.is_async
+        chunks = [c.decode() for c in response.streaming_content]
+
+    assert pit.call_count == 1
+    assert len(chunks) == 3 and chunks[0].startswith("isolate_name\t")
+    assert [line.split("\t")[4] for line in "".join(chunks[1:]).splitlines()] == [
+        f"BU_ATCC8492_{i:05d}" for i in range(1, 5)
+    ]
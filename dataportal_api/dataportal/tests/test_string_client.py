@@ -0,0 +1,143 @@
+import asyncio
+import concurrent.futures
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import pytest
+
+from dataportal.utils.string_client import StringClient, fetch_string_network
+
+HEADER = "stringId_A\tstringId_B\tpreferredName_A\tpreferredName_B\tscore"
+
+
+class FakeString(ThreadingHTTPServer):
+    """Local stand-in for the STRING /api/tsv/network endpoint."""
+
+    daemon_threads = True
+
+    def __init__(self, delay=0.05):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.delay = delay
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/api"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        with server.lock:
+            server.requests.append(params)
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        time.sleep(server.delay)
+        with server.lock:
+            server.active -= 1
+        if url.path != "/api/tsv/network" or params.get("species") == "0":
+            self.send_response(400)
+            self.end_headers()
+            return
+        ids = params["identifiers"].split("\r")
+        body = "\n".join([HEADER] + [f"{a}\t{b}\tA\tB\t0.9" for a, b in zip(ids, ids[1:])]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/tab-separated-values")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_string():
+    server = FakeString()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_cached_and_coalesced(fake_string):
+    client = StringClient(base_url=fake_string.base_url, max_concurrency=2)
+
+    async def fetch(ids, score=None, taxid=820):
+        return await fetch_string_network(
+            ids, species_taxid=taxid, required_score=score, client=client
+        )
+
+    async def scenario():
+        same = await asyncio.gather(*(fetch(["820.B", "820.A"]) for _ in range(5)))
+        cached = await fetch(["820.A", "820.B"])
+        rescored = await fetch(["820.A", "820.B"], score=700)
+        failed = await fetch(["820.A"], taxid=0)
+        await asyncio.gather(*(fetch([f"820.{i}", "820.Z"]) for i in range(6)))
+        return same, cached, rescored, failed
+
+    try:
+        same, cached, rescored, failed = asyncio.run(scenario())
+        # five concurrent callers, one reordered repeat: a single upstream request
+        assert [r["network"] for r in same + [cached]] == [
+            [
+                {
+                    "stringId_A": "820.A",
+                    "stringId_B": "820.B",
+                    "preferredName_A": "A",
+                    "preferredName_B": "B",
+                    "score": "0.9",
+                }
+            ]
+        ] * 6
+        assert same[0]["identifiers"] == ["820.B", "820.A"] and cached["identifiers"] == [
+            "820.A",
+            "820.B",
+        ]
+        assert same[0]["network"] is not cached["network"]  # callers may modify their rows
+        assert rescored["network"] and fake_string.requests[1]["required_score"] == "700"
+        assert failed["network"] == [] and "400" in failed["error"]
+        assert len(fake_string.requests) == 3 + 6
+        assert fake_string.max_active <= 2
+
+        # a new event loop (as for every async view under WSGI) reuses the client and its cache
+        asyncio.run(fetch(["820.A", "820.B"]))
+        assert len(fake_string.requests) == 9
+    finally:
+        client.close()
+
+
+def test_request_that_fails_at_once_does_not_deadlock(monkeypatch):
+    client = StringClient(base_url="unsupported://string-db.invalid/api")
+
+    def finished(coro, loop):
+        # the request failed before the caller registered its callback
+        coro.close()
+        future = concurrent.futures.Future()
+        future.set_exception(httpx.ConnectError("refused"))
+        return future
+
+    monkeypatch.setattr("dataportal.utils.string_client.asyncio.run_coroutine_threadsafe", finished)
+    result = []
+    caller = threading.Thread(
+        target=lambda: result.append(
+            asyncio.run(fetch_string_network(["820.A"], 820, client=client))
+        ),
+        daemon=True,
+    )
+    try:
+        caller.start()
+        caller.join(timeout=5)
+        assert not caller.is_alive(), "fetch deadlocked"
+        assert result[0]["network"] == [] and "refused" in result[0]["error"]
+        assert client._inflight == {}
+    finally:
+        client.close()
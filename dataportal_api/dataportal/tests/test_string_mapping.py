@@ -0,0 +1,92 @@
+from unittest.mock import MagicMock, patch
+
+from dataportal.elasticsearch.indexing import index_generation
+from dataportal.services.core import gene_service as gene_service_module
+from dataportal.services.core.gene_service import GeneService
+from dataportal.utils import string_mapping
+from dataportal.utils.string_mapping import StringMappingSnapshot, write_string_mapping
+
+REFS = [
+    ("bu", "BU_ATCC8492_00002", "820.ERS852554_00002"),
+    ("bu", "BU_ATCC8492_00001", "820.ERS852554_00001"),
+    ("pv", "PV_ATCC8482_00001", "435590.BVU_0001"),
+    ("", "UNKNOWN_00001", "1.X_ü"),  # no species: only in the global mapping
+]
+GENERATION = (("feature_index-2026.10.01", "uuid-1", 4),)
+
+
+def test_snapshot_lookups(tmp_path):
+    write_string_mapping(str(tmp_path), REFS, "feature_index", GENERATION)
+    snapshot = StringMappingSnapshot.open_current(str(tmp_path))
+    assert snapshot.is_current(GENERATION)
+    assert not snapshot.is_current((("feature_index-2026.10.02", "uuid-2", 4),))
+    assert snapshot.species == ["bu", "pv"]
+
+    locus_to_string, string_to_locus = snapshot.mapping("BU")
+    assert dict(locus_to_string) == {
+        "BU_ATCC8492_00001": "820.ERS852554_00001",
+        "BU_ATCC8492_00002": "820.ERS852554_00002",
+    }
+    assert string_to_locus["820.ERS852554_00002"] == "BU_ATCC8492_00002"
+    assert (
+        "PV_ATCC8482_00001" not in locus_to_string
+        and locus_to_string.get("BU_ATCC8492_00009") is None
+    )
+
+    locus_to_string, string_to_locus = snapshot.mapping()
+    assert len(locus_to_string) == 4
+    assert locus_to_string["PV_ATCC8482_00001"] == "435590.BVU_0001"
+    assert string_to_locus["1.X_ü"] == "UNKNOWN_00001"
+
+
+def test_service_uses_snapshot_unless_stale(tmp_path, monkeypatch):
+    monkeypatch.setattr(string_mapping, "STRING_MAPPING_DIR", str(tmp_path))
+    write_string_mapping(None, REFS, "feature_index", GENERATION)
+    scans = []
+
+    def scan(index_name, species_acronym=None):
+        scans.append(index_name)
+        return iter(REFS[:1])
+
+    monkeypatch.setattr(gene_service_module, "scan_string_refs", scan)
+    monkeypatch.setattr(gene_service_module, "index_generation", lambda index_name: GENERATION)
+
+    service = GeneService()
+    service.load_locus_string_mapping_sync()
+    assert scans == []
+    assert service.get_locus_string_mapping("pv")[1]["435590.BVU_0001"] == "PV_ATCC8482_00001"
+    assert (
+        service.get_locus_string_mapping("other")[0]["BU_ATCC8492_00001"] == "820.ERS852554_00001"
+    )
+
+    # the index moved on: scan it, but leave rewriting the snapshot to the ingest
+    changed = (("feature_index-2026.10.02", "uuid-2", 1),)
+    monkeypatch.setattr(gene_service_module, "index_generation", lambda index_name: changed)
+    service.load_locus_string_mapping_sync()
+    assert len(scans) == 1
+    assert dict(service.get_locus_string_mapping()[0]) == {
+        "BU_ATCC8492_00002": "820.ERS852554_00002"
+    }
+    assert StringMappingSnapshot.open_current().is_current(GENERATION)
+
+
+def test_generation_ignores_merges_and_restarts():
+    def stats(deleted, index_total):
+        return {
+            "indices": {
+                "feature_index-2026.10.01": {
+                    "uuid": "uuid-1",
+                    "primaries": {
+                        "docs": {"count": 4, "deleted": deleted},
+                        "indexing": {"index_total": index_total, "delete_total": 0},
+                    },
+                }
+            }
+        }
+
+    client = MagicMock()
+    with patch("dataportal.elasticsearch.indexing.connections.get_connection", return_value=client):
+        client.indices.stats.return_value = stats(deleted=3, index_total=7)
+        before = index_generation("feature_index")
+        client.indices.stats.return_value = stats(deleted=0, index_total=0)
+        assert index_generation("feature_index") == before == GENERATION
@@ -0,0 +1,98 @@
+import asyncio
+import gzip
+
+from dataportal.ingest.ppi.string_mirror import build_string_mirror, find_string_files
+from dataportal.services.external.string_network_service import StringNetworkService
+from dataportal.utils.string_mirror import StringMirrorStore
+
+HEADER = "protein1 protein2 neighborhood fusion cooccurence coexpression experimental database textmining combined_score"
+LINKS = [
+    "820.A 820.B 0 0 0 62 900 0 300 950",
+    "820.B 820.A 0 0 0 62 900 0 300 950",
+    "820.A 820.C 0 0 0 0 0 800 0 800",  # one direction only
+    "820.A 820.D 0 0 0 0 0 0 450 450",
+    "820.B 820.C 0 0 0 0 0 0 500 500",
+    "820.C 820.E 0 0 0 0 0 0 990 990",
+    "820.A 820.F 0 0 0 0 0 0 200 200",  # below the default threshold
+]
+
+
+def _mirror(tmp_path):
+    with gzip.open(tmp_path / "820.protein.links.detailed.v12.0.txt.gz", "wt") as f:
+        f.write("\n".join([HEADER] + LINKS) + "\n")
+    with gzip.open(tmp_path / "820.protein.info.v12.0.txt.gz", "wt") as f:
+        f.write(
+            "#string_protein_id\tpreferred_name\tprotein_size\tannotation\n820.A\tsusC\t1000\tSusC\n"
+        )
+    links, info = find_string_files(str(tmp_path), 820)
+    assert list(links) == ["functional"]
+    _, proteins, n_links = build_string_mirror(
+        links["functional"], 820, "functional", info, str(tmp_path / "mirror")
+    )
+    assert (proteins, n_links) == (6, 6)
+    return StringMirrorStore(str(tmp_path / "mirror"), ttl=60)
+
+
+def pairs(rows):
+    return [(r["stringId_A"], r["stringId_B"]) for r in rows]
+
+
+def test_networks_from_csr_mirror(tmp_path):
+    network = _mirror(tmp_path).get(820, "functional")
+    assert network.indptr.tolist() == [0, 4, 6, 9, 10, 11, 12]  # A: B C D F, B: A C, C: A B E, ...
+
+    rows = network.network(["820.A", "820.B"])
+    assert pairs(rows) == [("820.A", "820.B")]
+    assert rows[0] == {
+        "stringId_A": "820.A",
+        "stringId_B": "820.B",
+        "preferredName_A": "susC",
+        "preferredName_B": "B",
+        "ncbiTaxonId": 820,
+        "score": 0.95,
+        "nscore": 0.0,
+        "fscore": 0.0,
+        "pscore": 0.0,
+        "ascore": 0.062,
+        "escore": 0.9,
+        "dscore": 0.0,
+        "tscore": 0.3,
+    }
+
+    # a single protein gets its partners added, strongest first
+    assert pairs(network.network(["820.A"])) == [
+        ("820.A", "820.B"),
+        ("820.A", "820.C"),
+        ("820.B", "820.C"),
+        ("820.A", "820.D"),
+    ]
+    assert pairs(network.network(["820.A"], add_nodes=1)) == [("820.A", "820.B")]
+    assert pairs(network.network(["820.A"], required_score=150, add_nodes=0)) == []
+    assert "820.F" in {r["stringId_B"] for r in network.network(["820.A"], required_score=150)}
+    assert network.network(["820.UNKNOWN"]) == []
+
+
+def test_service_answers_locally(tmp_path):
+    service = StringNetworkService(mirror=_mirror(tmp_path), source="local")
+
+    async def taxid(species_acronym=None):
+        return 820
+
+    async def resolve(string_ids, species_acronym):
+        return {sid: sid.replace("820.", "BU_") for sid in string_ids}
+
+    service._species_service.get_taxonomy_id = taxid
+    service._resolve_ids_to_locus_with_ppi_fallback = resolve
+
+    response = asyncio.run(
+        service.get_network_for_identifiers(["820.C"], "BU", network_type="functional", add_nodes=1)
+    )
+    assert [(r.locus_tag_A, r.locus_tag_B, r.score) for r in response.rows] == [
+        ("BU_C", "BU_E", 0.99)
+    ]
+    assert response.metadata.raw_text is None and "820.C" in response.metadata.network_url
+
+    missing = asyncio.run(
+        service.get_string_network_for_pair(protein_ids=["820.A"], species_acronym="BU")
+    )
+    assert missing["network"] == [] and "No local STRING physical network" in missing["error"]
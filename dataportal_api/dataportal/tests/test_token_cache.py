@@ -0,0 +1,73 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils import timezone
+
+from dataportal.authentication.token_cache import CachedToken, TokenCache
+from dataportal.models import APIToken, Role
+
+
+@pytest.fixture
+def cache():
+    cache = TokenCache(ttl=60, flush_interval=60)
+    with patch("dataportal.authentication.token_cache.token_cache", cache):
+        yield cache
+
+
+def test_flush_writes_each_tokens_own_last_use(cache):
+    earlier = timezone.now() - timedelta(minutes=5)
+    later = timezone.now()
+    cache._pending_last_used.update({1: earlier, 2: later})
+
+    with patch.object(APIToken, "objects") as objects:
+        objects.bulk_update.return_value = 2
+        assert cache.flush_last_used() == 2
+
+    tokens, fields = objects.bulk_update.call_args.args
+    assert {t.pk: t.last_used_at for t in tokens} == {1: earlier, 2: later}
+    assert fields == ["last_used_at"]
+    assert not cache.flush_due()
+
+
+def test_failed_flush_keeps_pending_uses(cache):
+    used_at = timezone.now()
+    cache._pending_last_used[1] = used_at
+
+    with patch.object(APIToken, "objects") as objects:
+        objects.bulk_update.side_effect = RuntimeError("database is down")
+        assert cache.flush_last_used() == 0
+    assert cache._pending_last_used == {1: used_at}
+
+
+def test_token_and_role_changes_invalidate(cache):
+    def cached():
+        cache.set("jwt-1", CachedToken(1, ("viewer",), None))
+        cache.set("jwt-2", CachedToken(2, ("viewer",), None))
+
+    cached()
+    post_save.send(sender=APIToken, instance=APIToken(pk=1), created=False)
+    assert cache.get("jwt-1") is None
+    assert cache.get("jwt-2") is not None
+
+    cached()
+    post_delete.send(sender=APIToken, instance=APIToken(pk=2))
+    assert cache.get("jwt-1") is not None
+    assert cache.get("jwt-2") is None
+
+    cached()
+    m2m_changed.send(
+        sender=APIToken.roles.through,
+        instance=APIToken(pk=1),
+        action="post_add",
+        reverse=False,
+        model=Role,
+        pk_set={1},
+    )
+    assert cache.get("jwt-1") is None
+    assert cache.get("jwt-2") is not None
+
+    cached()
+    post_save.send(sender=Role, instance=Role(pk=1), created=False)
+    assert cache.get("jwt-1") is None and cache.get("jwt-2") is None
@@ -0,0 +1,48 @@
+"""
+Versioned on-disk builds switched in atomically.
+
+    <parent>/CURRENT     name of the live build directory
+    <parent>/<build>/    one build (names sort by creation time)
+
+A build is written next to the live one and switched in by replacing CURRENT,
+so readers never see a half-written build; old builds are pruned after the
+switch (readers that still map their files keep them until they close).
+"""
+
+import os
+import shutil
+import time
+import uuid
+from typing import Optional, Tuple
+
+CURRENT_FILE = "CURRENT"
+
+
+def new_build(parent: str) -> Tuple[str, str]:
+    """Create an empty build directory under `parent`; returns (build, path)."""
+    build = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    build_dir = os.path.join(parent, build)
+    os.makedirs(build_dir)
+    return build, build_dir
+
+
+def publish_build(parent: str, build: str, keep: int = 2) -> None:
+    """Switch CURRENT of `parent` to `build` and keep only the `keep` newest builds."""
+    tmp = os.path.join(parent, f".{CURRENT_FILE}.{build}")
+    with open(tmp, "w") as f:
+        f.write(build)
+    os.replace(tmp, os.path.join(parent, CURRENT_FILE))
+
+    builds = sorted(d for d in os.listdir(parent) if os.path.isdir(os.path.join(parent, d)))
+    for old in builds[: max(len(builds) - max(keep, 1), 0)]:
+        if old != build:
+            shutil.rmtree(os.path.join(parent, old), ignore_errors=True)
+
+
+def current_build_dir(parent: str) -> Optional[str]:
+    """Path of the live build under `parent`, or None if none was published."""
+    try:
+        with open(os.path.join(parent, CURRENT_FILE)) as f:
+            return os.path.join(parent, f.read().strip())
+    except FileNotFoundError:
+        return None
@@ -37,6 +37,11 @@ SCROLL_BATCH_SIZE = 10000
 SCROLL_MAX_RESULTS = 1000000
 SCROLL_TIMEOUT = "5m"
 
+# --- Point-in-time (PIT) + search_after ---
+PIT_KEEP_ALIVE = "2m"
+PIT_BATCH_SIZE = 10000
+CURSOR_START = "*"  # pass as `cursor` to open a cursor session on the first page
+
 # ============================================================================
 # 2. ELASTICSEARCH INDEXES
 # ============================================================================
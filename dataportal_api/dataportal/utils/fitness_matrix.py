@@ -0,0 +1,383 @@
+"""
+On-disk gene x contrast fitness matrices, one per isolate.
+
+Layout under FITNESS_MATRIX_DIR:
+
+    <isolate>/CURRENT                 name of the live build directory
+    <isolate>/<build>/index.json      row (gene) and column (contrast) indexes
+    <isolate>/<build>/lfc.npy         float32 (genes, contrasts), NaN = no value
+    <isolate>/<build>/fdr.npy         float32 (genes, contrasts), NaN = no value
+    <isolate>/<build>/barcodes.npy    int32 (genes, contrasts), -1 = no value
+
+Builds are written by the ingest (dataportal/ingest/feature/fitness_matrix.py)
+next to the live one and switched by replacing CURRENT, so readers never see a
+half-written matrix. Readers memory-map the arrays; FitnessMatrixStore picks
+up a new build at most INDEX_VERSION_TTL seconds after it was switched in.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+import warnings
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from dataportal.utils.builds import CURRENT_FILE, current_build_dir, new_build, publish_build
+
+logger = logging.getLogger(__name__)
+
+FITNESS_MATRIX_DIR = os.getenv(
+    "METT_FITNESS_MATRIX_DIR", os.path.join("~", ".cache", "mett-dataportal", "fitness_matrix")
+)
+MATRIX_FORMAT_VERSION = 1
+MATRIX_FIELDS = ("lfc", "fdr", "barcodes")
+
+# Above this many rows the average-linkage clustering gets slow; order by the
+# first principal component instead.
+MAX_LINKAGE_ROWS = 500
+
+COFITNESS_METHODS = ("pearson", "spearman")
+
+# Isolate names double as directory names; nothing that could leave the matrix root
+ISOLATE_NAME_RE = re.compile(r"^[A-Za-z0-9_][A-Za-z0-9_.-]*$")
+
+
+def matrix_root(root: Optional[str] = None) -> str:
+    return os.path.expanduser(root or FITNESS_MATRIX_DIR)
+
+
+def valid_isolate_name(isolate: str) -> bool:
+    return bool(isolate) and ISOLATE_NAME_RE.match(isolate) is not None
+
+
+def write_matrix(
+    root: str,
+    isolate: str,
+    locus_tags: Sequence[str],
+    contrasts: Sequence[str],
+    arrays: Dict[str, np.ndarray],
+    uniprot_ids: Optional[Sequence[Optional[str]]] = None,
+    gene_names: Optional[Sequence[Optional[str]]] = None,
+    conditions: Optional[Sequence[Optional[str]]] = None,
+    source: Optional[str] = None,
+    keep: int = 2,
+) -> str:
+    """Write one isolate's matrix as a new build, switch CURRENT to it and prune old builds."""
+    if not valid_isolate_name(isolate):
+        raise ValueError(f"Invalid isolate name: {isolate!r}")
+    isolate_dir = os.path.join(matrix_root(root), isolate)
+    build, build_dir = new_build(isolate_dir)
+
+    shape = (len(locus_tags), len(contrasts))
+    for field in MATRIX_FIELDS:
+        data = arrays[field]
+        if data.shape != shape:
+            raise ValueError(f"{field} has shape {data.shape}, expected {shape}")
+        np.save(os.path.join(build_dir, f"{field}.npy"), data)
+
+    index = {
+        "format": MATRIX_FORMAT_VERSION,
+        "isolate": isolate,
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "source": source,
+        "locus_tags": list(locus_tags),
+        "uniprot_ids": list(uniprot_ids) if uniprot_ids is not None else [None] * len(locus_tags),
+        "gene_names": list(gene_names) if gene_names is not None else [None] * len(locus_tags),
+        "contrasts": list(contrasts),
+        "conditions": list(conditions) if conditions is not None else list(contrasts),
+    }
+    with open(os.path.join(build_dir, "index.json"), "w") as f:
+        json.dump(index, f)
+
+    publish_build(isolate_dir, build, keep)
+    return build_dir
+
+
+def current_build(root: str, isolate: str) -> Optional[str]:
+    """Path of the live build of `isolate`, or None if none was written."""
+    if not valid_isolate_name(isolate):
+        return None
+    return current_build_dir(os.path.join(matrix_root(root), isolate))
+
+
+class FitnessMatrix:
+    """A memory-mapped build of one isolate's gene x contrast matrices."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "index.json")) as f:
+            index = json.load(f)
+        self.isolate: str = index["isolate"]
+        self.built_at: Optional[str] = index.get("built_at")
+        self.locus_tags: List[str] = index["locus_tags"]
+        self.uniprot_ids: List[Optional[str]] = index["uniprot_ids"]
+        self.gene_names: List[Optional[str]] = index["gene_names"]
+        self.contrasts: List[str] = index["contrasts"]
+        self.conditions: List[Optional[str]] = index["conditions"]
+        self.arrays = {
+            f: np.load(os.path.join(path, f"{f}.npy"), mmap_mode="r") for f in MATRIX_FIELDS
+        }
+
+        self._rows: Dict[str, int] = {}
+        for i, uniprot in enumerate(self.uniprot_ids):
+            if uniprot:
+                self._rows.setdefault(uniprot, i)
+        # locus tags win over UniProt ids
+        self._rows.update({t: i for i, t in enumerate(self.locus_tags)})
+        self._cols = {c: j for j, c in enumerate(self.contrasts)}
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.arrays["lfc"].shape
+
+    def rows(self, identifiers: Optional[Iterable[str]] = None) -> Tuple[np.ndarray, List[str]]:
+        """Row numbers of locus tags / UniProt ids (all genes when None), plus the unknown ones."""
+        if identifiers is None:
+            return np.arange(self.shape[0]), []
+        rows, missing = [], []
+        for ident in identifiers:
+            row = self._rows.get(ident)
+            if row is None:
+                missing.append(ident)
+            else:
+                rows.append(row)
+        return np.array(rows, dtype=np.intp), missing
+
+    def cols(self, contrasts: Optional[Iterable[str]] = None) -> Tuple[np.ndarray, List[str]]:
+        """Column numbers of contrasts (all when None), plus the unknown ones."""
+        if contrasts is None:
+            return np.arange(self.shape[1]), []
+        cols, missing = [], []
+        for contrast in contrasts:
+            col = self._cols.get(contrast)
+            if col is None:
+                missing.append(contrast)
+            else:
+                cols.append(col)
+        return np.array(cols, dtype=np.intp), missing
+
+    def take(self, field: str, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """In-memory (rows, cols) block of one field."""
+        return np.asarray(self.arrays[field][np.ix_(rows, cols)])
+
+
+def cluster_order(values: np.ndarray) -> np.ndarray:
+    """
+    Leaf order of an average-linkage clustering of the rows of `values`
+    (correlation distance; NaN counts as 0, i.e. no fitness effect).
+    Large inputs are ordered by their first principal component instead.
+    """
+    n = values.shape[0]
+    if n < 3 or values.shape[1] < 2:
+        return np.arange(n)
+    x = np.nan_to_num(np.asarray(values, dtype=np.float64))
+    x = x - x.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    z = np.divide(x, norms, out=np.zeros_like(x), where=norms > 0)
+
+    if n > MAX_LINKAGE_ROWS:
+        u, _, _ = np.linalg.svd(z, full_matrices=False)
+        return np.argsort(u[:, 0], kind="stable")
+
+    dist = 1.0 - z @ z.T
+    np.fill_diagonal(dist, np.inf)
+    sizes = np.ones(n)
+    members: List[List[int]] = [[i] for i in range(n)]
+    for _ in range(n - 1):
+        i, j = divmod(int(np.argmin(dist)), n)
+        if i > j:
+            i, j = j, i
+        # Lance-Williams update for average linkage
+        merged = (sizes[i] * dist[i] + sizes[j] * dist[j]) / (sizes[i] + sizes[j])
+        dist[i, :] = merged
+        dist[:, i] = merged
+        dist[i, i] = np.inf
+        dist[j, :] = np.inf
+        dist[:, j] = np.inf
+        members[i] = members[i] + members[j]
+        sizes[i] += sizes[j]
+        members[j] = []
+    return np.array(next(m for m in members if m), dtype=np.intp)
+
+
+def correlation_strength(values: np.ndarray) -> np.ndarray:
+    """Strength labels of correlation values, as stored in the fitness correlation index."""
+    values = np.asarray(values, dtype=np.float64)
+    abs_values = np.abs(values)
+    strength = np.select([abs_values >= 0.7, abs_values >= 0.4], ["strong", "moderate"], "weak")
+    direction = np.where(values >= 0, "positive", "negative")
+    return np.where(abs_values > 0.1, np.char.add(np.char.add(strength, "_"), direction), "weak")
+
+
+def rank_rows(values: np.ndarray) -> np.ndarray:
+    """Average (1-based) ranks of the values of each row; NaN stays NaN."""
+    x = np.asarray(values, dtype=np.float64)
+    n, m = x.shape
+    if not x.size:
+        return x.copy()
+    order = np.argsort(x, axis=1, kind="stable")  # NaN sorts last
+    s = np.take_along_axis(x, order, axis=1)
+    # number the runs of equal values across all rows, then average the ordinal ranks per run
+    starts = np.ones((n, m), dtype=bool)
+    starts[:, 1:] = s[:, 1:] != s[:, :-1]
+    run = np.cumsum(starts.ravel()) - 1
+    ordinal = np.tile(np.arange(1, m + 1, dtype=np.float64), n)
+    mean_rank = np.bincount(run, weights=ordinal) / np.bincount(run)
+    ranks = np.empty_like(x)
+    np.put_along_axis(ranks, order, mean_rank[run].reshape(n, m), axis=1)
+    ranks[np.isnan(x)] = np.nan
+    return ranks
+
+
+def fitness_profiles(
+    matrix: "FitnessMatrix",
+    cols: Optional[np.ndarray] = None,
+    method: str = "pearson",
+    min_barcodes: Optional[int] = None,
+    dtype=np.float64,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    LFC profiles of every gene over the contrasts `cols` (all when None),
+    ready for correlate(): (values, mask), missing cells 0 in both.
+
+    A cell counts only if it has an LFC value and, when `min_barcodes` is
+    given, at least that many barcodes. Spearman ranks each gene's profile
+    over its own counted cells. Rows are centred and scaled, which leaves
+    the correlations unchanged but keeps float32 sums accurate.
+    """
+    if method not in COFITNESS_METHODS:
+        raise ValueError(
+            f"Unknown correlation method {method!r}; use {', '.join(COFITNESS_METHODS)}"
+        )
+    if cols is None:
+        cols = np.arange(matrix.shape[1])
+    x = np.asarray(matrix.arrays["lfc"][:, cols], dtype=np.float64)
+    if min_barcodes:
+        x[np.asarray(matrix.arrays["barcodes"][:, cols]) < min_barcodes] = np.nan
+    if method == "spearman":
+        x = rank_rows(x)
+
+    present = ~np.isnan(x)
+    with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+        warnings.simplefilter("ignore", RuntimeWarning)  # genes without any counted cell
+        x = x - np.nanmean(x, axis=1, keepdims=True)
+        scale = np.nanstd(x, axis=1, keepdims=True)
+        x = x / np.where(scale > 0, scale, 1.0)
+    return np.where(present, x, 0.0).astype(dtype), present.astype(dtype)
+
+
+def correlate(
+    xa: np.ndarray, ma: np.ndarray, xb: np.ndarray, mb: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pairwise complete Pearson correlation of every row of `xa` with every row
+    of `xb` (profiles and masks from fitness_profiles), each pair over the
+    contrasts both rows have. Six matrix products, whatever the dtype.
+
+    Returns (r, n), both (len(xa), len(xb)): the correlation (NaN when either
+    profile is constant over the shared contrasts) and the shared contrast count.
+    """
+    n = ma @ mb.T
+    sx, sy = xa @ mb.T, ma @ xb.T
+    sxx, syy = (xa * xa) @ mb.T, ma @ (xb * xb).T
+    cov = n * (xa @ xb.T) - sx * sy
+    var = (n * sxx - sx * sx) * (n * syy - sy * sy)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = cov / np.sqrt(var)
+    # constant (or single shared) profiles leave only rounding noise in var
+    r[~(var > 1e-6 * n * n * n * n)] = np.nan
+    return np.clip(r, -1.0, 1.0), np.rint(n).astype(np.int64)
+
+
+def cofitness(
+    matrix: "FitnessMatrix",
+    query_rows: np.ndarray,
+    cols: Optional[np.ndarray] = None,
+    method: str = "pearson",
+    min_barcodes: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Correlation of the LFC profiles of `query_rows` with every gene of
+    `matrix`, see fitness_profiles() and correlate().
+
+    Returns (r, n), both (genes, queries).
+    """
+    x, mask = fitness_profiles(matrix, cols, method, min_barcodes)
+    return correlate(x, mask, x[query_rows], mask[query_rows])
+
+
+def top_partners(r: np.ndarray, exclude: Optional[int] = None, k: int = 100) -> np.ndarray:
+    """Rows of the `k` largest |r| (NaN never ranks), strongest first."""
+    score = np.abs(r)
+    score[np.isnan(score)] = -1.0
+    if exclude is not None:
+        score[exclude] = -1.0
+    k = min(k, int((score >= 0).sum()))
+    if k <= 0:
+        return np.array([], dtype=np.intp)
+    top = np.argpartition(-score, k - 1)[:k]
+    return top[np.lexsort((top, -score[top]))]
+
+
+class FitnessMatrixStore:
+    """
+    Opens and caches the live FitnessMatrix of each isolate.
+
+    CURRENT is re-read at most every `ttl` seconds per isolate; a different
+    build is opened on the next access.
+    """
+
+    def __init__(self, root: Optional[str] = None, ttl: Optional[int] = None):
+        self.root = root
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._matrices: Dict[str, Tuple[Optional[FitnessMatrix], float]] = {}
+
+    @property
+    def ttl(self) -> int:
+        if self._ttl is None:
+            from django.conf import settings
+
+            return getattr(settings, "INDEX_VERSION_TTL", 60)
+        return self._ttl
+
+    def isolates(self) -> List[str]:
+        root = matrix_root(self.root)
+        if not os.path.isdir(root):
+            return []
+        return sorted(
+            d for d in os.listdir(root) if os.path.exists(os.path.join(root, d, CURRENT_FILE))
+        )
+
+    def isolate_for(self, locus_tag: str) -> Optional[str]:
+        """The isolate whose locus tag prefix `locus_tag` carries (e.g. BU_ATCC8492_00001)."""
+        matches = [iso for iso in self.isolates() if locus_tag.startswith(f"{iso}_")]
+        return max(matches, key=len) if matches else None
+
+    def get(self, isolate: str) -> Optional[FitnessMatrix]:
+        cached = self._matrices.get(isolate)
+        if cached is not None and time.monotonic() - cached[1] < self.ttl:
+            return cached[0]
+        with self._lock:
+            cached = self._matrices.get(isolate)
+            if cached is not None and time.monotonic() - cached[1] < self.ttl:
+                return cached[0]
+            path = current_build(self.root, isolate)
+            if path is None:
+                # misses are not cached, so unknown names cannot grow the cache
+                self._matrices.pop(isolate, None)
+                return None
+            matrix = cached[0] if cached is not None else None
+            if matrix is None or matrix.path != path:
+                matrix = FitnessMatrix(path)
+                logger.info(f"Opened fitness matrix {path} {matrix.shape}")
+            self._matrices[isolate] = (matrix, time.monotonic())
+            return matrix
+
+    def reset(self) -> None:
+        with self._lock:
+            self._matrices.clear()
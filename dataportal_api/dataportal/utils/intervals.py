@@ -0,0 +1,77 @@
+"""
+Sorted interval arrays for genome browser region queries.
+
+Coordinates are 1-based and inclusive, as in the feature index. Intervals
+are sorted by start; a running maximum of the ends lets a bisection find
+long intervals that start left of the queried window.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+def normalize_contig(name: str) -> str:
+    """Contig lookup key: case and surrounding whitespace do not matter."""
+    return name.strip().lower()
+
+
+class SortedIntervals:
+    """Start/end arrays sorted by start; `order` maps back to the input positions."""
+
+    __slots__ = ("order", "starts", "ends", "max_ends")
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray):
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        self.order = np.lexsort((ends, starts))
+        self.starts = starts[self.order]
+        self.ends = ends[self.order]
+        self.max_ends = np.maximum.accumulate(self.ends) if len(self.ends) else self.ends
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def overlapping(self, start: Optional[int] = None, end: Optional[int] = None) -> np.ndarray:
+        """Sorted positions of the intervals overlapping [start, end] (everything when both are None)."""
+        lo = 0 if start is None else int(np.searchsorted(self.max_ends, start, side="left"))
+        hi = len(self) if end is None else int(np.searchsorted(self.starts, end, side="right"))
+        if lo >= hi:
+            return np.array([], dtype=np.intp)
+        positions = np.arange(lo, hi)
+        if start is not None:
+            positions = positions[self.ends[lo:hi] >= start]
+        return positions
+
+    def density(
+        self,
+        start: int,
+        end: int,
+        bin_size: int,
+        weights: Optional[Dict[str, np.ndarray]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Number of intervals overlapping each `bin_size` bin of [start, end].
+
+        `weights` are per-interval arrays in sorted order (e.g. 0/1 flags);
+        each is summed per bin the same way. Returns (bin starts, counts,
+        {name: weighted counts}).
+        """
+        edges = np.arange(start, end + 1, bin_size, dtype=np.int64)
+        positions = self.overlapping(start, end)
+        first = (np.maximum(self.starts[positions], start) - start) // bin_size
+        last = (np.minimum(self.ends[positions], end) - start) // bin_size
+
+        def per_bin(values: np.ndarray) -> np.ndarray:
+            # +w where an interval enters a bin, -w after the last bin it touches
+            delta = np.zeros(len(edges) + 1, dtype=np.int64)
+            np.add.at(delta, first, values)
+            np.add.at(delta, last + 1, -values)
+            return np.cumsum(delta[:-1])
+
+        counts = per_bin(np.ones(len(positions), dtype=np.int64))
+        weighted = {
+            name: per_bin(np.asarray(w)[positions].astype(np.int64))
+            for name, w in (weights or {}).items()
+        }
+        return edges, counts, weighted
@@ -91,6 +91,7 @@ def wrap_success_response(func):
                         has_next=result.has_next,
                         total_results=result.total_results,
                         per_page=getattr(result, "per_page", len(result.results)),
+                        next_cursor=getattr(result, "next_cursor", None),
                     ),
                 ),
                 response_format,
@@ -126,6 +127,7 @@ def wrap_success_response(func):
                         has_next=result.has_next,
                         total_results=result.total_results,
                         per_page=getattr(result, "per_page", len(result.results)),
+                        next_cursor=getattr(result, "next_cursor", None),
                     ),
                 ),
                 response_format,
@@ -169,6 +171,7 @@ def wrap_paginated_response(func):
                         has_next=result.has_next,
                         total_results=result.total_results,
                         per_page=getattr(result, "per_page", len(result.results)),
+                        next_cursor=getattr(result, "next_cursor", None),
                     ),
                 ),
                 response_format,
@@ -218,6 +221,7 @@ def wrap_paginated_response(func):
                         has_next=result.has_next,
                         total_results=result.total_results,
                         per_page=getattr(result, "per_page", len(result.results)),
+                        next_cursor=getattr(result, "next_cursor", None),
                     ),
                 ),
                 response_format,
@@ -6,13 +6,37 @@ https://string-db.org/cgi/help?subpage=api
 Base URLs are configurable via environment variables:
   STRING_DB_API_BASE  - API root (default: https://string-db.org/api)
   STRING_DB_WEB_BASE  - Web UI root for network links (default: https://string-db.org)
+
+Requests go through one process-wide StringClient: a pooled keep-alive
+httpx.AsyncClient (HTTP/2 when the h2 package is installed) running on its
+own event loop thread, so connections outlive the per-request event loops of
+async views under WSGI. Responses are cached per (identifiers, taxid,
+network_type, required_score, add_nodes) and identical requests in flight
+are coalesced into one call. Tuned with:
+  STRING_DB_CACHE_TTL        - seconds to keep a response (default: 300, 0 disables the cache)
+  STRING_DB_CACHE_SIZE       - responses kept (default: 512)
+  STRING_DB_MAX_CONCURRENCY  - concurrent requests to STRING per process (default: 8)
+  STRING_DB_TIMEOUT          - request timeout in seconds (default: 30)
 """
 
+import asyncio
+import concurrent.futures
 import logging
 import os
-from typing import Any, Dict, List, Optional
+import threading
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urlencode
+
 import httpx
+from cachetools import TTLCache
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +44,123 @@ STRING_API_BASE = os.environ.get("STRING_DB_API_BASE", "https://string-db.org/ap
 STRING_WEB_BASE = os.environ.get("STRING_DB_WEB_BASE", "https://string-db.org").rstrip("/")
 CALLER_IDENTITY = "mett-dataportal"
 
+STRING_CACHE_TTL = int(os.environ.get("STRING_DB_CACHE_TTL", 300))
+STRING_CACHE_SIZE = int(os.environ.get("STRING_DB_CACHE_SIZE", 512))
+STRING_MAX_CONCURRENCY = int(os.environ.get("STRING_DB_MAX_CONCURRENCY", 8))
+STRING_TIMEOUT = float(os.environ.get("STRING_DB_TIMEOUT", 30))
+
+# (sorted identifiers, taxid, network_type, required_score, add_nodes)
+NetworkKey = Tuple[Tuple[str, ...], int, str, Optional[int], Optional[int]]
+
+
+class StringClient:
+    """
+    Pooled, cached and coalesced client for the STRING network endpoint.
+
+    The httpx client, its connection pool and the concurrency semaphore live
+    on a daemon thread running an event loop; callers on any loop await the
+    result through a concurrent future. The thread is started on first use
+    and again in a forked child.
+    """
+
+    def __init__(
+        self,
+        base_url: str = STRING_API_BASE,
+        cache_ttl: float = STRING_CACHE_TTL,
+        cache_size: int = STRING_CACHE_SIZE,
+        max_concurrency: int = STRING_MAX_CONCURRENCY,
+        timeout: float = STRING_TIMEOUT,
+        http2: Optional[bool] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.http2 = HTTP2_AVAILABLE if http2 is None else http2
+        self._cache: Optional[TTLCache] = (
+            TTLCache(maxsize=cache_size, ttl=cache_ttl)
+            if cache_ttl > 0 and cache_size > 0
+            else None
+        )
+        self._lock = threading.Lock()
+        self._inflight: Dict[NetworkKey, concurrent.futures.Future] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pid: Optional[int] = None
+
+    def _start(self) -> asyncio.AbstractEventLoop:
+        # called with self._lock held
+        if self._loop is not None and self._pid == os.getpid():
+            return self._loop
+        loop = asyncio.new_event_loop()
+        threading.Thread(target=loop.run_forever, name="string-client", daemon=True).start()
+        self._loop, self._pid = loop, os.getpid()
+        self._client = None
+        self._inflight.clear()
+        return loop
+
+    async def _get(self, params: Dict[str, Any]) -> str:
+        """GET the TSV network (on the client loop)."""
+        if self._client is None:
+            limits = httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+                keepalive_expiry=60,
+            )
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=limits, http2=self.http2)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            resp = await self._client.get(f"{self.base_url}/tsv/network", params=params)
+            resp.raise_for_status()
+            return resp.text
+
+    def _done(self, key: NetworkKey, future: concurrent.futures.Future) -> None:
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            # errors are not cached; the next request tries again
+            if self._cache is not None and not future.cancelled() and future.exception() is None:
+                self._cache[key] = future.result()
+
+    async def fetch_network_tsv(self, key: NetworkKey, params: Dict[str, Any]) -> str:
+        """TSV body for `key`, from the cache, a matching request in flight or a new request."""
+        with self._lock:
+            if self._cache is not None:
+                text = self._cache.get(key)
+                if text is not None:
+                    return text
+            future = self._inflight.get(key)
+            started = future is None
+            if started:
+                loop = self._start()
+                future = asyncio.run_coroutine_threadsafe(self._get(params), loop)
+                self._inflight[key] = future
+        if started:
+            # outside the lock: a future that already finished runs _done inline
+            future.add_done_callback(partial(self._done, key))
+        # a cancelled caller must not cancel the request other callers wait on
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def clear(self) -> None:
+        with self._lock:
+            if self._cache is not None:
+                self._cache.clear()
+
+    def close(self) -> None:
+        """Close the pooled connections and stop the client loop."""
+        with self._lock:
+            loop, client = self._loop, self._client
+            self._loop = self._client = None
+            self._inflight.clear()
+        if loop is None or self._pid != os.getpid():
+            return
+        if client is not None:
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(timeout=self.timeout)
+        loop.call_soon_threadsafe(loop.stop)
+
+
+string_client = StringClient()
+
 
 async def fetch_string_network(
     identifiers: List[str],
@@ -27,9 +168,10 @@ async def fetch_string_network(
     required_score: Optional[float] = None,
     network_type: str = "physical",
     add_nodes: Optional[int] = None,
+    client: Optional[StringClient] = None,
 ) -> Dict[str, Any]:
     """
-    Fetch interaction network from STRING DB API.
+    Fetch interaction network from STRING DB API (cached, see StringClient).
 
     Args:
         identifiers: STRING protein IDs (e.g. ["820.ERS852554_01920", "820.ERS852554_01919"])
@@ -38,6 +180,7 @@ async def fetch_string_network(
         network_type: "physical" or "functional"
         add_nodes: Number of additional interaction partners to add by confidence (default 10 for 1 protein).
             Set higher to get more interactors; STRING adds partners in order of confidence score.
+        client: StringClient to use (default: the process-wide one)
 
     Returns:
         Dict with "network" (list of edges), "network_url" (link to STRING page), "raw_text" (TSV body)
@@ -50,31 +193,31 @@ async def fetch_string_network(
             "error": "No identifiers provided",
         }
 
-    ids_str = "\r".join(identifiers)  # STRING expects newline or carriage return
     if species_taxid is None:
         raise ValueError(
             "species_taxid is required for STRING API. "
             "Resolve from species_acronym using SpeciesService (e.g. StringNetworkService._get_taxid_for_species)."
         )
     taxid = species_taxid
+    score = int(required_score) if required_score is not None else None
+    nodes = int(add_nodes) if add_nodes is not None else None
+    # the network does not depend on the order the identifiers were given in
+    sorted_ids = tuple(sorted(set(identifiers)))
+    key: NetworkKey = (sorted_ids, int(taxid), network_type, score, nodes)
 
     params = {
-        "identifiers": ids_str,
+        "identifiers": "\r".join(sorted_ids),  # STRING expects newline or carriage return
         "species": taxid,
         "caller_identity": CALLER_IDENTITY,
         "network_type": network_type,
     }
-    if required_score is not None:
-        params["required_score"] = int(required_score)
-    if add_nodes is not None:
-        params["add_nodes"] = int(add_nodes)
+    if score is not None:
+        params["required_score"] = score
+    if nodes is not None:
+        params["add_nodes"] = nodes
 
-    url = f"{STRING_API_BASE}/tsv/network"
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
-            resp = await client.get(url, params=params)
-            resp.raise_for_status()
-            text = resp.text
+        text = await (client or string_client).fetch_network_tsv(key, params)
     except httpx.HTTPStatusError as e:
         logger.warning(
             "STRING API request failed: %s %s response=%s body=%s",
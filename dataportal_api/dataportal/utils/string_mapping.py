@@ -0,0 +1,285 @@
+"""
+On-disk snapshot of the locus_tag <-> STRING protein ID mapping.
+
+The mapping comes from the feature index (genes with a dbxref db=STRING).
+Scanning it on every worker start takes seconds; the snapshot is written at
+ingest time instead and memory-mapped by every worker, so it loads in
+milliseconds and the pages are shared read-only between processes.
+
+Layout under STRING_MAPPING_DIR (see dataportal/utils/builds.py):
+
+    CURRENT                                   name of the live build directory
+    <build>/meta.json                         index, generation, species segments
+    <build>/<table>.keys.npy / .keys.off.npy  UTF-8 keys, concatenated, + int64 offsets
+    <build>/<table>.values.npy / .values.off.npy
+
+with one table per direction (locus_to_string, string_to_locus). Rows are
+sorted by (species, key), so each species is a contiguous segment and a
+lookup is a bisection over the segment's keys. The generation is the
+feature index_generation (concrete index, UUID, doc count) taken before the
+scan; a snapshot whose generation no longer matches the index is stale.
+Snapshots are only written by the ingest (build_string_mapping,
+import_dbxref), never by the services reading them.
+"""
+
+import bisect
+import json
+import logging
+import os
+import time
+from collections import ChainMap
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from elasticsearch_dsl import Q, Search
+
+from dataportal.elasticsearch.indexing import index_generation
+from dataportal.utils.builds import current_build_dir, new_build, publish_build
+
+logger = logging.getLogger(__name__)
+
+STRING_MAPPING_DIR = os.getenv(
+    "METT_STRING_MAPPING_DIR", os.path.join("~", ".cache", "mett-dataportal", "string_mapping")
+)
+SNAPSHOT_FORMAT_VERSION = 1
+TABLES = ("locus_to_string", "string_to_locus")
+
+# (species_acronym or "", locus_tag, STRING ID)
+StringRef = Tuple[str, str, str]
+
+
+def mapping_root(root: Optional[str] = None) -> str:
+    return os.path.expanduser(root or STRING_MAPPING_DIR)
+
+
+def _first(value):
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value
+
+
+def scan_string_refs(index_name: str, species_acronym: Optional[str] = None) -> Iterator[StringRef]:
+    """(species, locus_tag, STRING ID) of every gene with a STRING dbxref."""
+    search = (
+        Search(index=index_name)
+        .filter("term", feature_type="gene")
+        .filter("nested", path="dbxref", query=Q("term", dbxref__db="STRING"))
+        .source(["locus_tag", "feature_id", "dbxref", "species_acronym"])
+        .params(size=5000)
+    )
+    if species_acronym:
+        search = search.filter("term", species_acronym=species_acronym.strip().lower())
+    for hit in search.scan():
+        doc = hit.to_dict()
+        locus = _first(doc.get("locus_tag")) or _first(doc.get("feature_id")) or hit.meta.id
+        string_ref = next(
+            (entry.get("ref") for entry in doc.get("dbxref") or [] if entry.get("db") == "STRING"),
+            None,
+        )
+        if not locus or not string_ref:
+            continue
+        species = _first(doc.get("species_acronym")) or ""
+        yield str(species).strip().lower(), str(locus), str(string_ref)
+
+
+def _pack(strings: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def write_string_mapping(
+    root: Optional[str],
+    refs: Iterable[StringRef],
+    index_name: str,
+    generation,
+    keep: int = 2,
+) -> str:
+    """Write `refs` as a new snapshot build, switch CURRENT to it and prune old builds."""
+    # per species, last reference wins in both directions (as with plain dicts)
+    per_species: Dict[str, Tuple[Dict[str, str], Dict[str, str]]] = {}
+    for species, locus, string_ref in refs:
+        locus_to_string, string_to_locus = per_species.setdefault(species, ({}, {}))
+        locus_to_string[locus] = string_ref
+        string_to_locus[string_ref] = locus
+
+    parent = mapping_root(root)
+    os.makedirs(parent, exist_ok=True)
+    build, build_dir = new_build(parent)
+    segments: Dict[str, Dict[str, List[int]]] = {}
+    for t, table in enumerate(TABLES):
+        keys: List[str] = []
+        values: List[str] = []
+        segments[table] = {}
+        for species in sorted(per_species):
+            # UTF-8 byte order is code point order, so the bytes bisect like the strs
+            items = sorted(per_species[species][t].items())
+            segments[table][species] = [len(keys), len(keys) + len(items)]
+            keys.extend(k for k, _ in items)
+            values.extend(v for _, v in items)
+        for part, strings in (("keys", keys), ("values", values)):
+            blob, offsets = _pack(strings)
+            np.save(os.path.join(build_dir, f"{table}.{part}.npy"), blob)
+            np.save(os.path.join(build_dir, f"{table}.{part}.off.npy"), offsets)
+
+    meta = {
+        "format": SNAPSHOT_FORMAT_VERSION,
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "index": index_name,
+        "generation": generation,
+        "segments": segments,
+    }
+    with open(os.path.join(build_dir, "meta.json"), "w") as f:
+        json.dump(meta, f)
+
+    publish_build(parent, build, keep)
+    return build_dir
+
+
+def build_string_mapping(
+    index_name: str, root: Optional[str] = None, keep: int = 2
+) -> Tuple[str, int]:
+    """Scan `index_name` and write a snapshot of it; returns (build path, genes)."""
+    generation = index_generation(index_name)
+    refs = list(scan_string_refs(index_name))
+    return write_string_mapping(root, refs, index_name, generation, keep=keep), len(refs)
+
+
+def _load(path: str) -> np.ndarray:
+    try:
+        return np.load(path, mmap_mode="r")
+    except ValueError:
+        # numpy cannot map an empty array
+        return np.load(path)
+
+
+class _PackedStrings:
+    """Read-only sequence over concatenated UTF-8 strings and their offsets."""
+
+    __slots__ = ("_blob", "_offsets", "_size")
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        self._blob = memoryview(blob)
+        self._offsets = memoryview(offsets)
+        self._size = len(offsets) - 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    def raw(self, i: int) -> bytes:
+        return bytes(self._blob[self._offsets[i] : self._offsets[i + 1]])
+
+    def __getitem__(self, i: int) -> str:
+        return self.raw(i).decode("utf-8")
+
+
+class _RawKeys:
+    """Keys as bytes, for bisect."""
+
+    __slots__ = ("_strings",)
+
+    def __init__(self, strings: _PackedStrings):
+        self._strings = strings
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def __getitem__(self, i: int) -> bytes:
+        return self._strings.raw(i)
+
+
+class SortedStringMap(Mapping):
+    """Read-only str -> str mapping over the [lo, hi) segment of a snapshot table."""
+
+    __slots__ = ("_keys", "_raw", "_values", "_lo", "_hi")
+
+    def __init__(self, keys: _PackedStrings, values: _PackedStrings, lo: int, hi: int):
+        self._keys = keys
+        self._raw = _RawKeys(keys)
+        self._values = values
+        self._lo = lo
+        self._hi = hi
+
+    def _find(self, key) -> int:
+        if not isinstance(key, str):
+            return -1
+        raw = key.encode("utf-8")
+        i = bisect.bisect_left(self._raw, raw, self._lo, self._hi)
+        return i if i < self._hi and self._raw[i] == raw else -1
+
+    def __getitem__(self, key: str) -> str:
+        i = self._find(key)
+        if i < 0:
+            raise KeyError(key)
+        return self._values[i]
+
+    def __contains__(self, key) -> bool:
+        return self._find(key) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        return (self._keys[i] for i in range(self._lo, self._hi))
+
+    def __len__(self) -> int:
+        return self._hi - self._lo
+
+
+class StringMappingSnapshot:
+    """A memory-mapped snapshot build."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        if self.meta.get("format") != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported STRING mapping snapshot format in {path}: {self.meta.get('format')}"
+            )
+        self._tables = {
+            table: tuple(
+                _PackedStrings(
+                    _load(os.path.join(path, f"{table}.{part}.npy")),
+                    _load(os.path.join(path, f"{table}.{part}.off.npy")),
+                )
+                for part in ("keys", "values")
+            )
+            for table in TABLES
+        }
+
+    @classmethod
+    def open_current(cls, root: Optional[str] = None) -> Optional["StringMappingSnapshot"]:
+        """The live snapshot under `root`, or None if none was written."""
+        path = current_build_dir(mapping_root(root))
+        return cls(path) if path is not None else None
+
+    @property
+    def generation(self):
+        return self.meta.get("generation")
+
+    def is_current(self, generation) -> bool:
+        """Whether the snapshot was taken from the index `generation` (an index_generation)."""
+        # compare in the JSON form the generation was stored in
+        return json.loads(json.dumps(generation)) == self.generation
+
+    @property
+    def species(self) -> List[str]:
+        return [s for s in self.meta["segments"][TABLES[0]] if s]
+
+    def _segment(self, table: str, species: str) -> SortedStringMap:
+        keys, values = self._tables[table]
+        lo, hi = self.meta["segments"][table][species]
+        return SortedStringMap(keys, values, lo, hi)
+
+    def mapping(self, species_acronym: Optional[str] = None) -> Tuple[Mapping, Mapping]:
+        """
+        (locus_tag -> STRING ID, STRING ID -> locus_tag) of one species, or of
+        all genes when `species_acronym` is empty or not in the snapshot.
+        """
+        species = (species_acronym or "").strip().lower()
+        if species and species in self.meta["segments"][TABLES[0]]:
+            return tuple(self._segment(table, species) for table in TABLES)
+        return tuple(
+            ChainMap(*(self._segment(table, s) for s in self.meta["segments"][table]))
+            for table in TABLES
+        )
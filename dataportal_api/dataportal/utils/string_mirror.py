@@ -0,0 +1,245 @@
+"""
+Local mirror of the STRING networks of our species.
+
+STRING publishes per-species link files ({taxid}.protein.links.detailed.*,
+{taxid}.protein.physical.links.detailed.*). The ingest
+(dataportal/ingest/ppi/string_mirror.py) turns each into a CSR adjacency so
+networks can be answered without a round trip to string-db.org.
+
+Layout under STRING_MIRROR_DIR (builds switched as in dataportal/utils/builds.py):
+
+    <taxid>/<network_type>/CURRENT          name of the live build directory
+    <taxid>/<network_type>/<build>/index.json   protein IDs and preferred names
+    <build>/indptr.npy     int64 (proteins + 1), row offsets
+    <build>/indices.npy    int32 (links,), partner protein of each link
+    <build>/combined.npy   uint16 (links,), combined score 0-1000
+    <build>/channels.npy   uint16 (links, channels), per evidence channel scores
+
+Both directions of every link are stored, so a protein's partners are one
+slice. Readers memory-map the arrays; StringMirrorStore picks up a new build
+at most INDEX_VERSION_TTL seconds after it was switched in.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from dataportal.utils.builds import current_build_dir, new_build, publish_build
+from dataportal.utils.constants import STRING_EVIDENCE_CHANNELS
+
+logger = logging.getLogger(__name__)
+
+STRING_MIRROR_DIR = os.getenv(
+    "METT_STRING_MIRROR_DIR", os.path.join("~", ".cache", "mett-dataportal", "string_mirror")
+)
+MIRROR_FORMAT_VERSION = 1
+# STRING API score fields, in the order of the channels.npy columns
+MIRROR_CHANNELS = tuple(c[1] for c in STRING_EVIDENCE_CHANNELS)
+# STRING API defaults: medium confidence, 10 partners around a single protein
+DEFAULT_REQUIRED_SCORE = 400
+DEFAULT_SINGLE_PROTEIN_NODES = 10
+
+
+def mirror_root(root: Optional[str] = None) -> str:
+    return os.path.expanduser(root or STRING_MIRROR_DIR)
+
+
+def write_mirror(
+    root: Optional[str],
+    taxid: int,
+    network_type: str,
+    proteins: Sequence[str],
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    combined: np.ndarray,
+    channels: np.ndarray,
+    preferred_names: Optional[Sequence[Optional[str]]] = None,
+    source: Optional[str] = None,
+    keep: int = 2,
+) -> str:
+    """Write one species network as a new build, switch CURRENT to it and prune old builds."""
+    if len(indptr) != len(proteins) + 1:
+        raise ValueError(f"indptr has {len(indptr)} entries, expected {len(proteins) + 1}")
+    if not (len(indices) == len(combined) == len(channels)) or channels.shape[1:] != (
+        len(MIRROR_CHANNELS),
+    ):
+        raise ValueError("indices, combined and channels must describe the same links")
+
+    parent = os.path.join(mirror_root(root), str(taxid), network_type)
+    os.makedirs(parent, exist_ok=True)
+    build, build_dir = new_build(parent)
+    np.save(os.path.join(build_dir, "indptr.npy"), indptr.astype(np.int64))
+    np.save(os.path.join(build_dir, "indices.npy"), indices.astype(np.int32))
+    np.save(os.path.join(build_dir, "combined.npy"), combined.astype(np.uint16))
+    np.save(os.path.join(build_dir, "channels.npy"), channels.astype(np.uint16))
+
+    index = {
+        "format": MIRROR_FORMAT_VERSION,
+        "taxid": int(taxid),
+        "network_type": network_type,
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "source": source,
+        "channels": list(MIRROR_CHANNELS),
+        "proteins": list(proteins),
+        "preferred_names": (
+            list(preferred_names) if preferred_names is not None else [None] * len(proteins)
+        ),
+    }
+    with open(os.path.join(build_dir, "index.json"), "w") as f:
+        json.dump(index, f)
+
+    publish_build(parent, build, keep)
+    return build_dir
+
+
+class StringMirrorNetwork:
+    """A memory-mapped build of one species network."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "index.json")) as f:
+            index = json.load(f)
+        if index.get("format") != MIRROR_FORMAT_VERSION:
+            raise ValueError(f"Unsupported STRING mirror format in {path}: {index.get('format')}")
+        self.taxid: int = index["taxid"]
+        self.network_type: str = index["network_type"]
+        self.proteins: List[str] = index["proteins"]
+        self.preferred_names: List[str] = [
+            name or protein.split(".", 1)[-1]
+            for protein, name in zip(self.proteins, index["preferred_names"])
+        ]
+        self._ids: Dict[str, int] = {protein: i for i, protein in enumerate(self.proteins)}
+        self.indptr = np.load(os.path.join(path, "indptr.npy"), mmap_mode="r")
+        self.indices = np.load(os.path.join(path, "indices.npy"), mmap_mode="r")
+        self.combined = np.load(os.path.join(path, "combined.npy"), mmap_mode="r")
+        self.channels = np.load(os.path.join(path, "channels.npy"), mmap_mode="r")
+
+    def __len__(self) -> int:
+        return len(self.proteins)
+
+    @property
+    def link_count(self) -> int:
+        return len(self.indices) // 2
+
+    def __contains__(self, protein: str) -> bool:
+        return protein in self._ids
+
+    def _links(self, node: int, min_score: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(link positions, partners) of `node` with a combined score of at least `min_score`."""
+        lo, hi = int(self.indptr[node]), int(self.indptr[node + 1])
+        keep = np.flatnonzero(self.combined[lo:hi] >= min_score) + lo
+        return keep, self.indices[keep]
+
+    def expand(self, nodes: Sequence[int], add_nodes: int, min_score: int) -> List[int]:
+        """
+        Up to `add_nodes` partners of `nodes` (not in `nodes`), strongest
+        first by their best combined score to any of them.
+        """
+        if add_nodes <= 0:
+            return []
+        best: Dict[int, int] = {}
+        query = set(nodes)
+        for node in nodes:
+            links, partners = self._links(node, min_score)
+            for partner, score in zip(partners.tolist(), self.combined[links].tolist()):
+                if partner not in query and score > best.get(partner, -1):
+                    best[partner] = score
+        ranked = sorted(best, key=lambda p: (-best[p], self.proteins[p]))
+        return ranked[:add_nodes]
+
+    def network(
+        self,
+        identifiers: Iterable[str],
+        required_score: Optional[int] = None,
+        add_nodes: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Rows shaped like STRING /tsv/network: every link between the given
+        proteins plus `add_nodes` added partners (10 around a single protein
+        by default) scoring at least `required_score` (default 400). Scores
+        are 0-1 like the API; unknown identifiers are ignored.
+        """
+        min_score = DEFAULT_REQUIRED_SCORE if required_score is None else int(required_score)
+        nodes = sorted({self._ids[i] for i in identifiers if i in self._ids})
+        if add_nodes is None:
+            add_nodes = DEFAULT_SINGLE_PROTEIN_NODES if len(nodes) == 1 else 0
+        nodes += self.expand(nodes, int(add_nodes), min_score)
+
+        in_network = np.zeros(len(self.proteins), dtype=bool)
+        in_network[nodes] = True
+        rows = []
+        for a in sorted(nodes):
+            links, partners = self._links(a, min_score)
+            # each link once, from its lower-numbered protein
+            wanted = in_network[partners] & (partners > a)
+            for link, b in zip(links[wanted].tolist(), partners[wanted].tolist()):
+                row = {
+                    "stringId_A": self.proteins[a],
+                    "stringId_B": self.proteins[b],
+                    "preferredName_A": self.preferred_names[a],
+                    "preferredName_B": self.preferred_names[b],
+                    "ncbiTaxonId": self.taxid,
+                    "score": int(self.combined[link]) / 1000,
+                }
+                row.update(
+                    (channel, score / 1000)
+                    for channel, score in zip(MIRROR_CHANNELS, self.channels[link].tolist())
+                )
+                rows.append(row)
+        rows.sort(key=lambda r: (-r["score"], r["stringId_A"], r["stringId_B"]))
+        return rows
+
+
+class StringMirrorStore:
+    """
+    Opens and caches the live StringMirrorNetwork per (taxid, network type).
+
+    CURRENT is re-read at most every `ttl` seconds; a different build is
+    opened on the next access.
+    """
+
+    def __init__(self, root: Optional[str] = None, ttl: Optional[int] = None):
+        self.root = root
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._networks: Dict[Tuple[int, str], Tuple[Optional[StringMirrorNetwork], float]] = {}
+
+    @property
+    def ttl(self) -> int:
+        if self._ttl is None:
+            from django.conf import settings
+
+            return getattr(settings, "INDEX_VERSION_TTL", 60)
+        return self._ttl
+
+    def get(self, taxid: int, network_type: str) -> Optional[StringMirrorNetwork]:
+        key = (int(taxid), network_type)
+        cached = self._networks.get(key)
+        if cached is not None and time.monotonic() - cached[1] < self.ttl:
+            return cached[0]
+        with self._lock:
+            cached = self._networks.get(key)
+            if cached is not None and time.monotonic() - cached[1] < self.ttl:
+                return cached[0]
+            path = current_build_dir(
+                os.path.join(mirror_root(self.root), str(key[0]), network_type)
+            )
+            network = cached[0] if cached is not None else None
+            if path is None:
+                network = None
+            elif network is None or network.path != path:
+                network = StringMirrorNetwork(path)
+                logger.info(
+                    f"Opened STRING mirror {path}: {len(network)} proteins, {network.link_count} links"
+                )
+            self._networks[key] = (network, time.monotonic())
+            return network
+
+    def reset(self) -> None:
+        with self._lock:
+            self._networks.clear()